@@ -5,32 +5,185 @@ Runner script for the Production Check validation test.
 
 import os
 import sys
+import asyncio
 import logging
 import argparse
 import subprocess
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("inditex_automation.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
+def load_script_config(script_dir, overrides=None):
+    """Load tests/config.ini once for the whole run (with --set overrides)."""
+    from inditex_automation.config import load_config
+    
+    return load_config(str(script_dir / "tests" / "config.ini"), overrides=overrides)
+
+def configure_script_logging(config):
+    """Configure queue-based logging from the [LOGGING] section of the config."""
+    from inditex_automation.logs import configure_logging, logging_settings
+    
+    configure_logging(**logging_settings(config))
+
+def run_on_device_pool(devices, config, script_dir, use_async=False, daemon_url=None, batch=False):
+    """Run the production check on every device of a pool in parallel."""
+    sys.path.insert(0, str(script_dir / "tests"))
+    from inditex_automation.devices import format_results, run_on_devices
+    from test_production_check import run_test
+    
+    logger.info(f"Running Production Check on {len(devices)} devices in parallel...")
+    
+    if use_async:
+        results = asyncio.run(run_on_device_pool_async(devices, config))
+    else:
+        results = run_on_devices(
+            devices, lambda device: run_test(config, device=device, daemon_url=daemon_url, batch=batch)
+        )
+    logger.info("Results:\n" + format_results(results))
+    return 0 if all(result.success for result in results) else 1
+
+def load_audit_ids(audits=None, audits_file=None):
+    """
+    Collect audit ids from --audit values and an audit list file.
+    
+    Args:
+        audits: --audit values, each one id or a comma separated list
+        audits_file: File with one audit id per line ('#' starts a comment)
+        
+    Returns:
+        list: Audit ids in the given order, without duplicates
+    """
+    values = []
+    for value in audits or []:
+        values.extend(value.split(","))
+    if audits_file:
+        with open(audits_file, encoding="utf-8") as f:
+            values.extend(line.split("#", 1)[0] for line in f)
+    audit_ids = []
+    for value in values:
+        value = value.strip()
+        if value and value not in audit_ids:
+            audit_ids.append(value)
+    return audit_ids
+
+def configured_device(config, name=None):
+    """Device profile for the configured device and server (optionally renamed)."""
+    from inditex_automation.devices import DeviceProfile
+    
+    return DeviceProfile(
+        name or config.device.name,
+        server_url=config.server.url,
+        udid=config.device.udid,
+        platform_version=config.device.platform_version,
+    )
+
+def run_preflight(config, devices):
+    """
+    Check the servers, devices and app of a run in parallel before starting it.
+    
+    Returns:
+        bool: True if the run can start (or [PREFLIGHT] is disabled)
+    """
+    from inditex_automation.preflight import preflight_from_config
+    
+    preflight = preflight_from_config(config)
+    if preflight is None:
+        return True
+    package = config.app.package
+    report = preflight.check([(device.server_url, device.udid, package) for device in devices])
+    if report.ok:
+        logger.info("Preflight:\n" + report.format())
+    else:
+        logger.error("Preflight:\n" + report.format())
+    return report.ok
+
+def run_audits(audit_ids, devices, config, script_dir, daemon_url=None, batch=False):
+    """
+    Check many audits on a device pool, printing each result as it finishes.
+    
+    Audits are dealt out through a work-stealing queue so idle devices take
+    over the remaining audits of busy ones. Every device keeps one warm
+    session for all of its audits.
+    """
+    sys.path.insert(0, str(script_dir / "tests"))
+    from inditex_automation.devices import format_job_results, run_jobs_on_devices
+    from inditex_automation.session_pool import SessionPool
+    from test_production_check import run_test
+    
+    logger.info(f"Checking {len(audit_ids)} audits on {len(devices)} devices...")
+    pool = SessionPool()
+    
+    def check_audit(device, audit_id):
+        return run_test(config, device=device, daemon_url=daemon_url, batch=batch, audit_id=audit_id, pool=pool)
+    
+    def report(result):
+        status = "PASS" if result.success else "FAIL"
+        print(f"{status} audit {result.job} on {result.device.name} ({result.duration:.1f}s)", flush=True)
+    
+    try:
+        results = run_jobs_on_devices(devices, audit_ids, check_audit, on_result=report)
+    finally:
+        pool.close_all()
+    logger.info("Results:\n" + format_job_results(results))
+    return 0 if all(result.success for result in results) else 1
+
+async def run_on_device_pool_async(devices, config):
+    """Run the production check on every device from one event loop."""
+    from inditex_automation.async_driver import AsyncHTTPPool
+    from inditex_automation.devices import run_on_devices_async
+    from test_production_check import run_test_async
+    
+    pools = {}
+    
+    async def check_on_device(device):
+        pool = pools.setdefault(device.server_url, AsyncHTTPPool(device.server_url))
+        return await run_test_async(config, device=device, pool=pool)
+    
+    try:
+        return await run_on_devices_async(devices, check_on_device)
+    finally:
+        for pool in pools.values():
+            await pool.close()
+
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(description="Run INDITEX Production Check validation test")
-    parser.add_argument("--audit", "-a", help="Specify audit ID to test")
+    parser.add_argument("--audit", "-a", action="append",
+                        help="Audit ID to test; repeat or separate with commas for several audits")
+    parser.add_argument("--audits-file", metavar="FILE",
+                        help="File with one audit ID per line, checked across the device pool")
     parser.add_argument("--device", "-d", help="Specify device name")
+    parser.add_argument("--devices", metavar="FILE",
+                        help="Device pool file; runs the test on every device in parallel")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="With --devices, drive all devices from one asyncio event loop")
+    parser.add_argument("--batch", action="store_true",
+                        help="Confirm every item of the audit in one session, not just the first")
+    parser.add_argument("--skip-preflight", action="store_true",
+                        help="Start without checking the Appium server, devices and app first")
+    parser.add_argument("--daemon", metavar="URL",
+                        help="Attach to warm sessions from a warm session daemon "
+                             "(python -m inditex_automation.warm_daemon)")
+    parser.add_argument("--set", metavar="SECTION.key=VALUE", action="append", default=[],
+                        help="Override a tests/config.ini value for this run (repeatable), "
+                             "e.g. --set SERVER.explicit_wait=45")
     args = parser.parse_args()
+    if args.batch and args.use_async:
+        parser.error("--batch is not supported with --async")
+    audit_ids = load_audit_ids(args.audit, args.audits_file)
+    if args.use_async and audit_ids:
+        parser.error("--audit/--audits-file are not supported with --async")
     
     # Get the directory where this script is located
     script_dir = Path(__file__).resolve().parent
+    sys.path.insert(0, str(script_dir.parent))
+    from inditex_automation.config import parse_override
+    try:
+        overrides = dict(parse_override(value) for value in args.set)
+    except ValueError as e:
+        parser.error(str(e))
+    config = load_script_config(script_dir, overrides)
+    configure_script_logging(config)
     
     # Construct the path to the test script
     test_script_path = script_dir / "tests" / "test_production_check.py"
@@ -41,18 +194,35 @@ def main():
     
     logger.info("Starting Production Check test...")
     
-    # Check if Appium server is running
-    try:
-        # TODO: Add Appium server check here
-        pass
-    except Exception as e:
-        logger.warning(f"Error checking Appium server status: {e}")
-        logger.warning("Make sure Appium server is running before continuing!")
+    # Stop at once when the Appium server, a device or the app is not available
+    from inditex_automation.devices import load_device_pool
+    devices = load_device_pool(args.devices) if args.devices else [configured_device(config, args.device)]
+    if not args.skip_preflight and not run_preflight(config, devices):
+        logger.error("Preflight failed; not starting the run (use --skip-preflight to start anyway)")
+        return 1
+    
+    if args.devices and audit_ids:
+        return run_audits(audit_ids, devices, config, script_dir, args.daemon, args.batch)
+    if args.devices:
+        return run_on_device_pool(devices, config, script_dir, args.use_async, args.daemon, args.batch)
+    if len(audit_ids) > 1:
+        return run_audits(audit_ids, devices, config, script_dir, args.daemon, args.batch)
     
     # Run the test script
     try:
         logger.info(f"Running test script: {test_script_path}")
-        result = subprocess.run([sys.executable, str(test_script_path)], 
+        command = [sys.executable, str(test_script_path)]
+        if args.daemon:
+            command += ["--daemon", args.daemon]
+        if args.batch:
+            command.append("--batch")
+        if audit_ids:
+            command += ["--audit", audit_ids[0]]
+        if args.device:
+            command += ["--device", args.device]
+        for name, value in overrides.items():
+            command += ["--set", f"{name}={value}"]
+        result = subprocess.run(command, 
                                 capture_output=True, 
                                 text=True, 
                                 check=False)
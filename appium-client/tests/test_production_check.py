@@ -5,71 +5,303 @@ This script automates the workflow for validating production check functionality
 """
 
 import os
+import re
 import sys
 import time
 import logging
-import configparser
-from appium import webdriver
+from appium.options.common import AppiumOptions
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("inditex_automation.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Make the shared inditex_automation package importable from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from inditex_automation.artifacts import pipeline_from_config
+from inditex_automation.async_driver import AsyncAppiumDriver
+from inditex_automation.auth_state import auth_settings
+from inditex_automation.commands import instrument
+from inditex_automation.config import load_config, parse_override
+from inditex_automation.history import history_from_config
+from inditex_automation.locators import Locator, LocatorSet, compile_locator
+from inditex_automation.logs import configure_logging, logging_settings
+from inditex_automation.navigation import Shortcut, ShortcutNavigator, navigation_settings, read_app_version
+from inditex_automation.recording import recorder_from_config
+from inditex_automation.screens import FlowGraph, ScreenClassifier
+from inditex_automation.snapshot import PageSnapshot, snapshot_contains
+from inditex_automation.timing import RunTimer, timed_step
+from inditex_automation.tracing import trace_settings, tracer_from_config
+from inditex_automation.transport import connection_stats, transport_from_config
+from inditex_automation.waits import WaitEngine, element_present, text_changed
+from inditex_automation.warm_daemon import connect as connect_driver
 
 logger = logging.getLogger(__name__)
 
+# Login states reported by ProductionCheckTest.login_state
+LOGGED_IN = "logged_in"
+LOGGED_OUT = "logged_out"
+UNKNOWN_STATE = "unknown"
+
+# Screens of the production check flow, recognised by SCREENS
+LOGIN_SCREEN = "login"
+HOME_SCREEN = "home"
+AUDITS_SCREEN = "audits"
+AUDIT_DETAIL_SCREEN = "audit_detail"
+PRODUCTION_CHECK_SCREEN = "production_check"
+ITEM_DETAIL_SCREEN = "item_detail"
+CONFIRM_UNITS_SCREEN = "confirm_units"
+
+# Element locators, compiled at import time to native strategies where possible
+LOCATORS = LocatorSet(
+    "production_check",
+    audits_menu="//android.widget.TextView[contains(@text, 'Audits')]",
+    username_field="//android.widget.EditText[@resource-id='com.inditex.trazabilidapp:id/username']",
+    audit_list="//androidx.recyclerview.widget.RecyclerView[@resource-id='com.inditex.trazabilidapp:id/rvAudits']",
+    production_check_option="//android.widget.TextView[@text='PRODUCTION CHECK']",
+    production_check_title="//android.widget.TextView[@text='Production check']",
+    first_item="//android.view.ViewGroup[.//android.widget.TextView[contains(@resource-id, 'tvModel')]]",
+    item_list="//androidx.recyclerview.widget.RecyclerView[@resource-id='com.inditex.trazabilidapp:id/rvProductionItems']",
+    item_model="//android.widget.TextView[@resource-id='com.inditex.trazabilidapp:id/tvModel']",
+    confirm_units_tab="//android.view.View[.//android.widget.TextView[@text='CONFIRM UNITS']]",
+    real_units_field="//android.widget.EditText[@resource-id='com.inditex.trazabilidapp:id/edRealUnits']",
+    conclusion_icon="//android.widget.ImageView[@resource-id='com.inditex.trazabilidapp:id/ivConclusion']",
+    total_assigned="//android.widget.TextView[@resource-id='com.inditex.trazabilidapp:id/tvBottomAssignedTotal']",
+    total_real="//android.widget.TextView[@resource-id='com.inditex.trazabilidapp:id/tvBottomRealTotal']",
+)
+
+# Deeper screens come first: the confirm units tab also shows the item detail tabs
+SCREENS = ScreenClassifier([
+    (CONFIRM_UNITS_SCREEN, [LOCATORS.real_units_field]),
+    (ITEM_DETAIL_SCREEN, [LOCATORS.confirm_units_tab]),
+    (PRODUCTION_CHECK_SCREEN, [LOCATORS.production_check_title]),
+    (AUDIT_DETAIL_SCREEN, [LOCATORS.production_check_option]),
+    (AUDITS_SCREEN, [LOCATORS.audit_list]),
+    (HOME_SCREEN, [LOCATORS.audits_menu]),
+    (LOGIN_SCREEN, [LOCATORS.username_field]),
+])
+
+# Navigation steps of run() and the screen each one starts from
+FLOW = FlowGraph([
+    ("authenticate", LOGIN_SCREEN),
+    ("navigate_to_audits", HOME_SCREEN),
+    ("select_audit", AUDITS_SCREEN),
+    ("navigate_to_production_check", AUDIT_DETAIL_SCREEN),
+    ("select_first_item", PRODUCTION_CHECK_SCREEN),
+    ("navigate_to_confirm_units_tab", ITEM_DETAIL_SCREEN),
+], final=CONFIRM_UNITS_SCREEN)
+
+# Screens the app can open directly, most steps saved first; whether the
+# installed app version supports each one is detected on first use.
+# Neither route comes from the app's manifest or documentation: both were
+# written together with the bundled fake server scenario (deep_links and
+# exported_activities in scenario.json), which is the only place they have
+# been seen to work. Confirm them on a real build (adb shell dumpsys package
+# com.inditex.trazabilidapp lists the exported activities and URL schemes)
+# before setting [NAVIGATION] shortcuts = true.
+SHORTCUTS = [
+    Shortcut("production_check", PRODUCTION_CHECK_SCREEN, url="itrace://audits/{audit_id}/production-check"),
+    Shortcut("audit", AUDIT_DETAIL_SCREEN, activity=".AuditActivity", extras={"audit_id": "{audit_id}"}),
+]
+
+class ItemResult:
+    """Outcome of confirming the real units of one production check item."""
+    
+    def __init__(self, model, assigned_units=None, total_assigned=None, total_real=None, error=None):
+        self.model = model
+        self.assigned_units = assigned_units
+        self.total_assigned = total_assigned
+        self.total_real = total_real
+        self.error = error
+    
+    @property
+    def passed(self):
+        """Whether the real units of the item were updated"""
+        return self.error is None and self.total_real not in (None, "0")
+
+def format_item_results(results):
+    """
+    Format batch results as a per-item table.
+    
+    Args:
+        results: ItemResult list from ProductionCheckTest.run_batch
+        
+    Returns:
+        str: Multi-line table
+    """
+    width = max([len("Model")] + [len(result.model) for result in results])
+    lines = [f"{'Model':<{width}}  Result  Assigned  Real"]
+    for result in results:
+        status = "PASS" if result.passed else "FAIL"
+        line = f"{result.model:<{width}}  {status:<6}  {result.total_assigned or '-':>8}  {result.total_real or '-'}"
+        if result.error:
+            line += f"  ({result.error})"
+        lines.append(line)
+    passed = sum(1 for result in results if result.passed)
+    lines.append(f"{passed}/{len(results)} items passed")
+    return "\n".join(lines)
+
+def rows_scrolled(previous, shown):
+    """
+    Number of rows the production check list moved between two of its views.
+    
+    The rows both views show are aligned: the smallest shift for which the
+    rows after it in the previous view start the new view. A row matches when
+    its model matches and so do its assigned units, unless either row was cut
+    off and shows none.
+    
+    Args:
+        previous: visible_items() of the earlier view
+        shown: visible_items() of the later view
+        
+    Returns:
+        int: Rows scrolled out of view at the top (all of previous when no row is shared)
+    """
+    def same(a, b):
+        return a[0] == b[0] and (a[1] is None or b[1] is None or a[1] == b[1])
+    
+    for shift in range(len(previous)):
+        overlap = min(len(previous) - shift, len(shown))
+        if overlap and all(same(previous[shift + index], shown[index]) for index in range(overlap)):
+            return shift
+    return len(previous)
+
+
+def production_check_capabilities(config, device=None):
+    """
+    Build the desired capabilities of the production check session.
+    
+    Args:
+        config: Loaded AutomationConfig (already resolved for the device)
+        device: DeviceProfile from a device pool, if any
+        
+    Returns:
+        dict: Desired capabilities
+    """
+    desired_caps = {
+        'platformName': 'Android',
+        'platformVersion': config.device.platform_version,
+        'deviceName': config.device.name,
+        'appPackage': config.app.package,
+        'appActivity': config.app.activity,
+        'automationName': 'UiAutomator2',
+        'newCommandTimeout': 600,
+        'noReset': True
+    }
+    if device:
+        desired_caps.update(device.capabilities())
+    return desired_caps
+
+
 class ProductionCheckTest:
     """Class for automating the Production Check validation flow in INDITEX iTrace app."""
     
-    def __init__(self):
-        """Initialize the test automation with configuration parameters."""
-        # Read configuration
-        config = configparser.ConfigParser()
-        config.read('tests/config.ini')
-        
-        self.app_package = config.get('App', 'package', fallback='com.inditex.trazabilidapp')
-        self.app_activity = config.get('App', 'activity', fallback='.MainActivity')
-        self.device_name = config.get('Device', 'name', fallback='Pixel Tablet')
-        self.platform_version = config.get('Device', 'platform_version', fallback='13')
-        self.timeout = int(config.get('Settings', 'timeout', fallback='30'))
-        self.audit_id = config.get('Test', 'audit_id', fallback='206697')
-        
-        # Set up the driver
-        self.setup_driver()
+    def __init__(self, config_path='tests/config.ini', device=None, driver=None, connect=True, daemon_url=None,
+                 audit_id=None):
+        """
+        Initialize the test automation with configuration parameters.
+        
+        Args:
+            config_path: Path to the configuration file (loaded once per process)
+                or an already loaded AutomationConfig
+            device: DeviceProfile from a device pool (overrides device name and server URL)
+            driver: Warm session to reuse (e.g. from a SessionPool); a new session
+                is created when None and only self-created sessions are quit on teardown
+            connect: Set False to only load the settings (used by the asyncio flow,
+                which brings its own session)
+            daemon_url: Warm session daemon to attach to (overrides [DAEMON] url)
+            audit_id: Audit to check (overrides [Test] audit_id)
+        """
+        # Configuration shared by every flow of the process, values already typed
+        config = load_config(config_path).for_device(device)
+        configure_logging(**logging_settings(config))
+        
+        self.config = config
+        self.device = device
+        self.server_url = config.server.url
+        self.app_package = config.app.package
+        self.app_activity = config.app.activity
+        self.device_name = config.device.name
+        self.platform_version = config.device.platform_version
+        self.timeout = config.server.explicit_wait
+        self.page_transition_wait = config.timeouts.page_transition_wait
+        self.poll_interval = config.timeouts.poll_interval
+        self.audit_id = audit_id or config.test.audit_id
+        self.scroll_percent = config.test.scroll_percent
+        self.timings_dir = config.metrics.timings_dir
+        self.daemon_url = daemon_url or config.daemon.url
+        self.skip_login, self.auth_cache = auth_settings(config)
+        self.use_shortcuts, self.navigation_cache = navigation_settings(config)
+        self.timer = RunTimer("production_check")
+        self.artifacts = pipeline_from_config(config)
+        self.transport = transport_from_config(config)
+        self.history = history_from_config(config)
+        
+        self.recorder = None
+        self.tracer = None
+        self.shortcuts = None
+        self.trace_directory, self.trace_format = trace_settings(config)
+        if not connect:
+            self.driver = None
+            self.owns_driver = False
+            return
+        
+        # Set up the driver, reusing a warm session when one is given
+        self.owns_driver = driver is None
+        if driver is None:
+            self.setup_driver()
+        else:
+            self.driver = driver
         self.wait = WebDriverWait(self.driver, self.timeout)
+        self.waits = WaitEngine(self.driver, timeout=self.timeout, poll_frequency=self.poll_interval,
+                                timer=self.timer)
+        if self.use_shortcuts:
+            self.shortcuts = ShortcutNavigator(self.driver, self.app_package, SHORTCUTS, self.waits, SCREENS,
+                                               self.navigation_cache, self.page_transition_wait)
+        
+        # Charge every WebDriver command to the step that issued it
+        instrument(self.driver).add(self.timer)
+        
+        # Keep the command stream when [RECORDING] is enabled
+        self.recorder = recorder_from_config(config, self.driver, self.timer.flow, self.timer.run_id)
+        if self.recorder:
+            instrument(self.driver).add(self.recorder)
+        
+        # Keep a timeline of steps and commands when [TRACING] is enabled
+        self.tracer = tracer_from_config(config, self.timer, self.device_name)
+        if self.tracer:
+            instrument(self.driver).add(self.tracer)
+        
+    def capabilities(self):
+        """Get the desired capabilities for this test's session."""
+        return production_check_capabilities(self.config, self.device)
         
     def setup_driver(self):
-        """Configure and initialize the Appium WebDriver."""
-        desired_caps = {
-            'platformName': 'Android',
-            'platformVersion': self.platform_version,
-            'deviceName': self.device_name,
-            'appPackage': self.app_package,
-            'appActivity': self.app_activity,
-            'automationName': 'UiAutomator2',
-            'newCommandTimeout': 600,
-            'noReset': True
-        }
+        """
+        Configure and initialize the Appium WebDriver.
+        
+        Returns:
+            The new WebDriver session (also stored as self.driver)
+        """
+        desired_caps = self.capabilities()
         
         logger.info(f"Initializing driver with capabilities: {desired_caps}")
-        self.driver = webdriver.Remote('http://localhost:4723', desired_caps)
+        self.driver = connect_driver(self.server_url, self.options(), daemon_url=self.daemon_url,
+                                     transport=self.transport)
+        return self.driver
         
+    def options(self):
+        """Get the Appium options for this test's session."""
+        return AppiumOptions().load_capabilities(self.capabilities())
+        
+    @timed_step("login")
     def login(self, username, password):
         """Log into the iTrace application."""
         logger.info("Logging in to the application...")
         
         try:
             # Wait for login screen to load
-            self.wait.until(EC.presence_of_element_located((AppiumBy.ID, f"{self.app_package}:id/username")))
+            self.wait_for_element_present(f"{self.app_package}:id/username")
             
             # Enter username
             username_field = self.driver.find_element(AppiumBy.ID, f"{self.app_package}:id/username")
@@ -86,20 +318,109 @@ class ProductionCheckTest:
             login_button.click()
             
             # Wait for the main screen to load
-            self.wait_for_element_present("//android.widget.TextView[contains(@text, 'Audits')]", by=AppiumBy.XPATH)
+            self.wait_for_element_present(LOCATORS.audits_menu)
             logger.info("Login successful")
             
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Login failed: {e}")
             raise
             
+    def login_state(self, snapshot=None):
+        """
+        Tell from one page source whether the app is logged in.
+        
+        Args:
+            snapshot: PageSnapshot to inspect (a new one is captured if None)
+            
+        Returns:
+            str: LOGGED_IN (main menu shown), LOGGED_OUT (login form shown) or UNKNOWN_STATE
+        """
+        if snapshot is None:
+            snapshot = PageSnapshot.capture(self.driver)
+        screen = SCREENS.classify(snapshot)
+        if screen in (HOME_SCREEN, AUDITS_SCREEN):
+            return LOGGED_IN
+        if screen == LOGIN_SCREEN:
+            return LOGGED_OUT
+        return UNKNOWN_STATE
+    
+    def relaunch_app(self):
+        """
+        Restart the app and wait until it shows the main menu or the login form.
+        
+        Returns:
+            str: Login state after the restart
+        """
+        logger.info("Relaunching the application...")
+        self.driver.terminate_app(self.app_package)
+        return self.start_app()
+    
+    def start_app(self):
+        """
+        Bring the app to the front and wait until it shows the main menu or the login form.
+        
+        Returns:
+            str: Login state once the app is shown
+        """
+        self.driver.activate_app(self.app_package)
+        snapshot = self.waits.settle(
+            snapshot_contains(LOCATORS.audits_menu.xpath, LOCATORS.username_field.xpath, match_all=False),
+            self.timeout,
+            "app relaunched"
+        )
+        return self.login_state(snapshot or None)
+    
+    @timed_step("authenticate")
+    def ensure_logged_in(self, username, password, snapshot=None):
+        """
+        Get to the main menu, skipping the login sequence when possible.
+        
+        One page source probe detects a session that is still logged in (the
+        app runs with noReset). Otherwise a cached authenticated app-data
+        snapshot is restored; the full login only runs when there is none or
+        the app rejects it, and its result is cached for the next run.
+        
+        Args:
+            username: Login user name
+            password: Login password
+            snapshot: PageSnapshot already captured on the current screen (optional)
+        """
+        if not self.skip_login:
+            self.login(username, password)
+            return
+        
+        state = self.login_state(snapshot)
+        if state == UNKNOWN_STATE:
+            # Somewhere deeper in the app (e.g. a warm session); restarting
+            # lands on the main menu when the session is still valid
+            state = self.relaunch_app()
+        if state == LOGGED_IN:
+            logger.info("Already logged in - skipping login")
+            return
+        
+        key = None
+        if self.auth_cache:
+            key = self.auth_cache.key(self.device_name, self.app_package, username)
+            if self.auth_cache.restore(self.driver, self.app_package, key):
+                # restore() has stopped the app, so starting it picks up the files
+                if self.start_app() == LOGGED_IN:
+                    logger.info("Restored cached login - skipping login")
+                    return
+                logger.info("Cached login was not accepted; logging in")
+                self.auth_cache.invalidate(key)
+        
+        self.login(username, password)
+        if key:
+            self.auth_cache.save(self.driver, self.app_package, key)
+            
+    @timed_step("navigate_to_audits")
     def navigate_to_audits(self):
         """Navigate to the Audits screen."""
         logger.info("Navigating to Audits screen...")
         
         try:
             # Wait for and click on Audits menu option if needed
-            audits_element = self.wait_for_element_present("//android.widget.TextView[contains(@text, 'Audits')]", by=AppiumBy.XPATH)
+            audits_element = self.wait_for_element_present(LOCATORS.audits_menu)
             audits_element.click()
             
             logger.info("Successfully navigated to Audits screen")
@@ -107,113 +428,137 @@ class ProductionCheckTest:
             logger.error(f"Failed to navigate to Audits: {e}")
             raise
             
+    @timed_step("select_audit")
     def select_audit(self, audit_id):
         """Select an audit by its ID."""
         logger.info(f"Selecting audit #{audit_id}...")
         
         try:
             # Find and click on the specified audit
-            audit_xpath = f"//android.widget.TextView[@text='{audit_id}']"
-            audit_element = self.wait_for_element_present(audit_xpath, by=AppiumBy.XPATH)
+            audit_locator = compile_locator(f"//android.widget.TextView[@text='{audit_id}']")
+            audit_element = self.wait_for_element_present(audit_locator)
             audit_element.click()
             
             # Wait for audit details to load
-            time.sleep(2)
+            self.waits.settle(
+                element_present(*LOCATORS.production_check_option),
+                self.page_transition_wait,
+                "audit details loaded"
+            )
             logger.info(f"Successfully selected audit #{audit_id}")
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Failed to select audit #{audit_id}: {e}")
             raise
             
+    @timed_step("navigate_to_production_check")
     def navigate_to_production_check(self):
         """Navigate to the Production Check screen."""
         logger.info("Navigating to Production Check...")
         
         try:
             # Find and click on the Production Check option
-            production_check_xpath = "//android.widget.TextView[@text='PRODUCTION CHECK']"
-            production_check = self.wait_for_element_present(production_check_xpath, by=AppiumBy.XPATH)
+            production_check = self.wait_for_element_present(LOCATORS.production_check_option)
             production_check.click()
             
             # Wait for Production Check screen to load
-            self.wait_for_element_present("//android.widget.TextView[@text='Production check']", by=AppiumBy.XPATH)
+            self.wait_for_element_present(LOCATORS.production_check_title)
             logger.info("Successfully navigated to Production Check screen")
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Failed to navigate to Production Check: {e}")
             raise
             
+    @timed_step("select_first_item")
     def select_first_item(self):
         """Select the first item in the Production Check list."""
         logger.info("Selecting the first item in the list...")
         
         try:
             # Find and click on the first item in the list
-            item_xpath = "//android.view.ViewGroup[.//android.widget.TextView[contains(@resource-id, 'tvModel')]]"
-            item = self.wait_for_element_present(item_xpath, by=AppiumBy.XPATH)
+            item = self.wait_for_element_present(LOCATORS.first_item)
             item.click()
             
             # Wait for item details to load
-            time.sleep(2)
+            self.waits.settle(
+                element_present(*LOCATORS.confirm_units_tab),
+                self.page_transition_wait,
+                "item details loaded"
+            )
             logger.info("Successfully selected first item")
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Failed to select first item: {e}")
             raise
             
+    @timed_step("navigate_to_confirm_units_tab")
     def navigate_to_confirm_units_tab(self):
         """Navigate to the CONFIRM UNITS tab."""
         logger.info("Navigating to CONFIRM UNITS tab...")
         
         try:
             # Find and click on the CONFIRM UNITS tab
-            confirm_units_tab_xpath = "//android.view.View[.//android.widget.TextView[@text='CONFIRM UNITS']]"
-            confirm_units_tab = self.wait_for_element_present(confirm_units_tab_xpath, by=AppiumBy.XPATH)
+            confirm_units_tab = self.wait_for_element_present(LOCATORS.confirm_units_tab)
             confirm_units_tab.click()
             
             # Wait for the tab content to load
-            time.sleep(2)
+            self.waits.settle(
+                element_present(*LOCATORS.real_units_field),
+                self.page_transition_wait,
+                "confirm units tab loaded"
+            )
             logger.info("Successfully navigated to CONFIRM UNITS tab")
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Failed to navigate to CONFIRM UNITS tab: {e}")
             raise
     
+    @timed_step("enter_real_units")
     def enter_real_units(self, units_value):
         """Enter the real units value and confirm."""
         logger.info(f"Entering real units value: {units_value}...")
         
         try:
             # Find the edit text field
-            edit_field_xpath = "//android.widget.EditText[@resource-id='com.inditex.trazabilidapp:id/edRealUnits']"
-            edit_field = self.wait_for_element_present(edit_field_xpath, by=AppiumBy.XPATH)
+            edit_field = self.wait_for_element_present(LOCATORS.real_units_field)
             
             # Clear and enter the value
             edit_field.clear()
             edit_field.send_keys(str(units_value))
             
+            # Remember the real total so we can tell when the new value is processed
+            # (the total may not be shown yet; probing skips the implicit wait)
+            total_real = self.waits.probe(element_present(*LOCATORS.total_real))
+            total_real_before = total_real.text if total_real else None
+            
             # Click on the conclusion/check icon
-            conclusion_icon_xpath = "//android.widget.ImageView[@resource-id='com.inditex.trazabilidapp:id/ivConclusion']"
-            conclusion_icon = self.wait_for_element_present(conclusion_icon_xpath, by=AppiumBy.XPATH)
+            conclusion_icon = self.wait_for_element_present(LOCATORS.conclusion_icon)
             conclusion_icon.click()
             
             # Wait for value to be processed
-            time.sleep(2)
+            self.waits.settle(
+                text_changed(*LOCATORS.total_real, total_real_before),
+                self.page_transition_wait,
+                "real units processed"
+            )
             logger.info(f"Successfully entered and confirmed real units: {units_value}")
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Failed to enter real units: {e}")
             raise
     
+    @timed_step("verify_total_units")
     def verify_total_units(self):
         """Verify the total units value is displayed correctly."""
         logger.info("Verifying total units...")
         
         try:
-            # Find the total assigned units element
-            total_assigned_xpath = "//android.widget.TextView[@resource-id='com.inditex.trazabilidapp:id/tvBottomAssignedTotal']"
-            total_assigned_element = self.wait_for_element_present(total_assigned_xpath, by=AppiumBy.XPATH)
-            total_assigned = total_assigned_element.text
-            
-            # Find the total real units element
-            total_real_xpath = "//android.widget.TextView[@resource-id='com.inditex.trazabilidapp:id/tvBottomRealTotal']"
-            total_real_element = self.wait_for_element_present(total_real_xpath, by=AppiumBy.XPATH)
-            total_real = total_real_element.text
+            # Read both totals from a single page source dump
+            snapshot = self.waits.until(
+                snapshot_contains(LOCATORS.total_assigned.xpath, LOCATORS.total_real.xpath),
+                message="Total units not displayed"
+            )
+            totals = snapshot.read({
+                "total_assigned": LOCATORS.total_assigned.xpath,
+                "total_real": LOCATORS.total_real.xpath
+            })
+            total_assigned = totals["total_assigned"]
+            total_real = totals["total_real"]
             
             logger.info(f"Total assigned units: {total_assigned}")
             logger.info(f"Total real units: {total_real}")
@@ -231,71 +576,570 @@ class ProductionCheckTest:
         Wait for an element to be present and return it.
         
         Args:
-            locator: The locator to find the element
-            by: The method to use (default: AppiumBy.ID)
+            locator: The locator to find the element, or a compiled Locator
+            by: The method to use (default: AppiumBy.ID, ignored for a Locator)
             timeout: Custom timeout in seconds (default: None, uses self.timeout)
             
         Returns:
             The found WebElement
         """
+        if isinstance(locator, Locator):
+            by, locator = locator.by, locator.value
         if timeout is None:
             timeout = self.timeout
             
-        wait = WebDriverWait(self.driver, timeout)
-        return wait.until(EC.presence_of_element_located((by, locator)))
+        return self.waits.until(EC.presence_of_element_located((by, locator)), timeout)
         
-    def teardown(self):
-        """Tear down the test and close the driver."""
-        if hasattr(self, 'driver') and self.driver:
-            logger.info("Closing driver...")
-            self.driver.quit()
-
-def run_test():
-    """Run the production check validation test."""
-    test = None
-    try:
-        # Initialize test
-        test = ProductionCheckTest()
+    def remaining_steps(self):
+        """
+        Work out where the flow stands from one page source.
         
-        # Read config for credentials
-        config = configparser.ConfigParser()
-        config.read('tests/config.ini')
-        username = config.get('Credentials', 'username')
-        password = config.get('Credentials', 'password')
-        audit_id = test.audit_id
+        An app found part way through the flow (e.g. on a warm session) resumes
+        at the first step its screen still needs. Unrecognised screens and the
+        login form start with authentication, which relaunches the app when
+        needed. An audit detail screen of a different audit is left with back.
         
-        # Execute test flow
-        test.login(username, password)
-        test.navigate_to_audits()
-        test.select_audit(audit_id)
-        test.navigate_to_production_check()
-        test.select_first_item()
-        test.navigate_to_confirm_units_tab()
+        Returns:
+            tuple: (step names of FLOW to execute, PageSnapshot of the current screen)
+        """
+        screen, snapshot = SCREENS.identify(self.driver)
+        if screen == AUDIT_DETAIL_SCREEN and not snapshot.exists(
+                f"//android.widget.TextView[@text='Audit {self.audit_id}']"):
+            logger.info("Another audit is open; going back to the audit list")
+            self.driver.back()
+            screen = AUDITS_SCREEN
+        steps = FLOW.remaining(screen)
+        if steps is None or FLOW.steps[0][0] in steps:
+            return [name for name, _ in FLOW.steps], snapshot
+        logger.info(f"App is on the {screen} screen; skipping {len(FLOW.steps) - len(steps)} navigation steps")
+        return steps, snapshot
+    
+    @timed_step("open_shortcut")
+    def open_shortcut(self, name):
+        """Open a screen through one of SHORTCUTS; False if the app version does not support it."""
+        return self.shortcuts.open(name, audit_id=self.audit_id)
+    
+    def take_shortcut(self, steps, stop_before=None):
+        """
+        Replace tap navigation steps with a shortcut when the app supports one.
+        
+        Args:
+            steps: Step names of FLOW still to execute (the app is logged in)
+            stop_before: Step name the navigation stops at; shortcuts skipping it are not used
+            
+        Returns:
+            list: Step names still to execute after the shortcut
+        """
+        if self.shortcuts is None:
+            return steps
+        attempted = False
+        for shortcut in SHORTCUTS:
+            remaining = FLOW.remaining(shortcut.screen)
+            skipped = steps[:len(steps) - len(remaining)]
+            if len(remaining) >= len(steps) or stop_before in skipped:
+                continue
+            if self.shortcuts.supported(shortcut.name) is False:
+                continue
+            attempted = True
+            if self.open_shortcut(shortcut.name):
+                logger.info(f"Opened the {shortcut.screen} screen directly; skipping {len(skipped)} navigation steps")
+                return remaining
+        if attempted:
+            # A shortcut that did not work may still have left the screen
+            steps, _ = self.remaining_steps()
+        return steps
+    
+    def navigate(self, username, password, stop_before=None):
+        """
+        Execute the navigation steps of FLOW the current screen still needs,
+        jumping ahead with a shortcut once logged in when the app supports one.
+        
+        Args:
+            username: Login user name
+            password: Login password
+            stop_before: Step name of FLOW to stop at (runs to the confirm units tab if None)
+        """
+        if self.recorder:
+            self.recorder.add_secrets(username, password)
+        steps, snapshot = self.remaining_steps()
+        if steps[:1] == ["authenticate"] and stop_before != "authenticate":
+            self.ensure_logged_in(username, password, snapshot)
+            steps = self.take_shortcut(steps[1:], stop_before)
+        else:
+            steps = self.take_shortcut(steps, stop_before)
+        actions = {
+            "authenticate": lambda: self.ensure_logged_in(username, password, snapshot),
+            "navigate_to_audits": self.navigate_to_audits,
+            "select_audit": lambda: self.select_audit(self.audit_id),
+            "navigate_to_production_check": self.navigate_to_production_check,
+            "select_first_item": self.select_first_item,
+            "navigate_to_confirm_units_tab": self.navigate_to_confirm_units_tab,
+        }
+        for step in steps:
+            if step == stop_before:
+                break
+            actions[step]()
+    
+    def run(self, username, password):
+        """
+        Execute the whole production check flow on this test's session.
+        
+        Args:
+            username: Login user name
+            password: Login password
+            
+        Returns:
+            bool: True if the real units were updated
+        """
+        # Execute the navigation steps the current screen still needs
+        self.navigate(username, password)
         
         # Get initial total values for verification
-        initial_totals = test.verify_total_units()
+        initial_totals = self.verify_total_units()
         logger.info(f"Initial totals: {initial_totals}")
         
         # Extract assigned units and use that value
         assigned_units = initial_totals["total_assigned"].replace(".", "")  # Remove thousand separator
-        test.enter_real_units(assigned_units)
+        self.enter_real_units(assigned_units)
         
         # Verify updated total
-        final_totals = test.verify_total_units()
+        final_totals = self.verify_total_units()
         logger.info(f"Final totals: {final_totals}")
         
         # Simple validation
         if final_totals["total_real"] != "0":
             logger.info("Test PASSED: Real units updated successfully")
+            return True
+        logger.warning("Test FAILED: Real units not updated")
+        return False
+        
+    @timed_step("run_async")
+    async def run_async(self, driver, username, password):
+        """
+        Execute the production check flow on an asyncio driver.
+        
+        Same steps and upper bounds as run(), with every command awaited so
+        one event loop can run the check on many devices at once.
+        
+        Args:
+            driver: AsyncAppiumDriver session
+            username: Login user name
+            password: Login password
+            
+        Returns:
+            bool: True if the real units were updated
+        """
+        async def present(locator):
+            return await driver.wait_for_element(*locator, timeout=self.timeout, poll_frequency=self.poll_interval)
+        
+        def shown(locator):
+            async def _condition(d):
+                return bool(await d.find_elements(*locator))
+            return _condition
+        
+        async def totals():
+            snapshot = PageSnapshot(await driver.page_source())
+            return snapshot.read({
+                "total_assigned": LOCATORS.total_assigned.xpath,
+                "total_real": LOCATORS.total_real.xpath
+            })
+        
+        logger.info("Logging in to the application (async)...")
+        for field_id, value in (("username", username), ("password", password)):
+            field = await present(compile_locator(f"//*[@resource-id='{self.app_package}:id/{field_id}']"))
+            await field.clear()
+            await field.send_keys(value)
+        await (await present(compile_locator(f"//*[@resource-id='{self.app_package}:id/loginButton']"))).click()
+        await (await present(LOCATORS.audits_menu)).click()
+        
+        await (await present(compile_locator(f"//android.widget.TextView[@text='{self.audit_id}']"))).click()
+        await driver.settle(shown(LOCATORS.production_check_option), self.page_transition_wait, self.poll_interval)
+        await (await present(LOCATORS.production_check_option)).click()
+        await present(LOCATORS.production_check_title)
+        
+        await (await present(LOCATORS.first_item)).click()
+        await driver.settle(shown(LOCATORS.confirm_units_tab), self.page_transition_wait, self.poll_interval)
+        await (await present(LOCATORS.confirm_units_tab)).click()
+        await driver.settle(shown(LOCATORS.real_units_field), self.page_transition_wait, self.poll_interval)
+        
+        initial_totals = await totals()
+        logger.info(f"Initial totals: {initial_totals}")
+        edit_field = await present(LOCATORS.real_units_field)
+        await edit_field.clear()
+        await edit_field.send_keys(initial_totals["total_assigned"].replace(".", ""))
+        await (await present(LOCATORS.conclusion_icon)).click()
+        
+        async def real_total_changed(d):
+            return (await totals())["total_real"] != initial_totals["total_real"]
+        await driver.settle(real_total_changed, self.page_transition_wait, self.poll_interval)
+        
+        final_totals = await totals()
+        logger.info(f"Final totals: {final_totals}")
+        return final_totals["total_real"] != "0"
+        
+    def visible_items(self, snapshot):
+        """
+        Items of the production check list shown in a snapshot.
+        
+        The assigned units are read from the model's own row, so rows with the
+        same model (or any text) are told apart.
+        
+        Args:
+            snapshot: PageSnapshot of the production check list
+            
+        Returns:
+            list: (model, assigned units, (x, y) tap point) tuples in list order;
+                rows scrolled half out of view have no assigned units
+        """
+        items = []
+        for model in snapshot.find_all(LOCATORS.item_model.xpath):
+            if model.text and model.center:
+                assigned = None
+                row = snapshot.parent(model)
+                for cell in snapshot.children(row) if row is not None else []:
+                    if "tvAssignedUnits" in (cell.get_attribute("resource-id") or ""):
+                        assigned = cell.text
+                        break
+                items.append((model.text, assigned, model.center))
+        return items
+    
+    def scroll_items(self, snapshot):
+        """
+        Scroll the production check list down by scroll_percent of its height.
+        
+        Scrolling less than a page keeps the last rows on screen, so rows that
+        were cut off are seen whole after the scroll.
+        
+        Args:
+            snapshot: PageSnapshot of the production check list
+            
+        Returns:
+            bool: True if the list can scroll further
+        """
+        rect = snapshot.find(LOCATORS.item_list.xpath).rect
+        return bool(self.driver.execute_script("mobile: scrollGesture", {
+            "left": rect["x"], "top": rect["y"], "width": rect["width"], "height": rect["height"],
+            "direction": "down", "percent": self.scroll_percent
+        }))
+    
+    def return_to_items(self):
+        """
+        Go back to the production check list from an item.
+        
+        Returns:
+            PageSnapshot of the list
+        """
+        snapshot = PageSnapshot.capture(self.driver)
+        # The confirm units tab and the item detail are at most two screens away
+        for _ in range(2):
+            if SCREENS.classify(snapshot) == PRODUCTION_CHECK_SCREEN:
+                return snapshot
+            self.driver.back()
+            snapshot = self.waits.settle(
+                snapshot_contains(LOCATORS.production_check_title.xpath),
+                self.page_transition_wait,
+                "production check list shown"
+            ) or PageSnapshot.capture(self.driver)
+        if SCREENS.classify(snapshot) != PRODUCTION_CHECK_SCREEN:
+            raise TimeoutException("Production check list not shown")
+        return snapshot
+    
+    @timed_step("check_item")
+    def check_item(self, model, point):
+        """
+        Confirm the real units of one item of the production check list.
+        
+        Args:
+            model: Model shown in the item's row
+            point: (x, y) of the row on screen
+            
+        Returns:
+            ItemResult
+        """
+        logger.info(f"Checking item {model}...")
+        result = ItemResult(model)
+        try:
+            # Tap the row where the snapshot showed it instead of looking it up again
+            self.driver.execute_script("mobile: clickGesture", {"x": point[0], "y": point[1]})
+            self.navigate_to_confirm_units_tab()
+            
+            totals = self.verify_total_units()
+            result.total_assigned = totals["total_assigned"]
+            self.enter_real_units(totals["total_assigned"].replace(".", ""))
+            result.total_real = self.verify_total_units()["total_real"]
+        except (TimeoutException, NoSuchElementException) as e:
+            logger.error(f"Failed to check item {model}: {e}")
+            result.error = str(e).strip() or type(e).__name__
+            self.capture_failure("item_" + re.sub(r"[^\w.-]+", "_", model))
+        return result
+    
+    def run_batch(self, username, password, limit=None):
+        """
+        Confirm the real units of every item of the audit in one session.
+        
+        The list is walked top to bottom: each unchecked row of the current
+        snapshot is checked, then the list is scrolled by less than a page.
+        Rows are tracked by their position in the whole list (see
+        rows_scrolled), not by model, so items sharing a model are all checked.
+        
+        Args:
+            username: Login user name
+            password: Login password
+            limit: Stop after this many items (all items if None)
+            
+        Returns:
+            list: ItemResult per item, in list order
+        """
+        self.navigate(username, password, stop_before="select_first_item")
+        snapshot = self.return_to_items()
+        
+        results = []
+        checked = set()
+        rows = self.visible_items(snapshot)
+        first = 0  # position in the whole list of the first visible row
+        can_scroll = True
+        stalled = 0
+        while limit is None or len(results) < limit:
+            pending = [(first + index, item) for index, item in enumerate(rows) if first + index not in checked]
+            if pending:
+                stalled = 0
+                position, (model, assigned, point) = pending[0]
+                checked.add(position)
+                result = self.check_item(model, point)
+                result.assigned_units = assigned
+                results.append(result)
+                snapshot = self.return_to_items()
+            else:
+                # Stop at the end of the list, or if scrolling no longer shows new rows
+                if not can_scroll or stalled >= 2:
+                    break
+                can_scroll = self.scroll_items(snapshot)
+                stalled += 1
+                snapshot = PageSnapshot.capture(self.driver)
+            shown = self.visible_items(snapshot)
+            first += rows_scrolled(rows, shown)
+            rows = shown
+        
+        logger.info("Item results:\n" + format_item_results(results))
+        return results
+    
+    def leave_audit(self):
+        """
+        Go back to the audit list so the session can check another audit.
+        
+        Screens below the audit detail do not show which audit they belong to,
+        so a reused session must not be left on them.
+        """
+        for _ in range(4):
+            screen, _ = SCREENS.identify(self.driver)
+            if screen not in (AUDIT_DETAIL_SCREEN, PRODUCTION_CHECK_SCREEN, ITEM_DETAIL_SCREEN, CONFIRM_UNITS_SCREEN):
+                return
+            self.driver.back()
+            self.waits.settle(
+                SCREENS.shows(AUDITS_SCREEN, AUDIT_DETAIL_SCREEN, PRODUCTION_CHECK_SCREEN),
+                self.page_transition_wait,
+                "previous screen shown"
+            )
+    
+    def export_timings(self):
+        """Log the step timings and write them as JSON to [METRICS] timings_dir."""
+        if not self.timer.spans:
+            return None
+        logger.info("Step timings (seconds):\n" + self.timer.summary())
+        if not self.timings_dir:
+            return None
+        path = self.timer.export(self.timings_dir)
+        logger.info(f"Step timings written to {path}")
+        return path
+        
+    def record_history(self):
+        """
+        Store this run's durations, device and outcome in the [HISTORY] database.
+        
+        Returns:
+            bool: True if the run was stored
+        """
+        if self.history is None or not self.timer.spans:
+            return False
+        app_version = None
+        if self.shortcuts:
+            app_version = self.shortcuts.app_version()
+        elif self.driver:
+            app_version = read_app_version(self.driver, self.app_package)
+        self.history.record(self.timer, device=self.device_name, app_version=app_version)
+        return True
+        
+    def capture_failure(self, step):
+        """Queue a screenshot and page source of the screen a step failed on."""
+        if self.driver:
+            for path in self.artifacts.capture_failure(self.driver, f"production_check_failed_{step}_{int(time.time())}"):
+                logger.info(f"Failure artifact queued: {path}")
+        
+    def stop_recording(self):
+        """
+        Detach the command recorder and finish its file.
+        
+        Returns:
+            str: Path of the recording, or None if nothing was recorded
+        """
+        if self.recorder is None:
+            return None
+        instrument(self.driver).remove(self.recorder)
+        path = self.recorder.close()
+        self.recorder = None
+        logger.info(f"Command recording written to {path}")
+        return path
+    
+    def export_trace(self):
+        """
+        Detach the tracer and write the run's step/command timeline.
+        
+        Returns:
+            str: Path of the trace, or None if tracing is disabled
+        """
+        if self.tracer is None:
+            return None
+        instrument(self.driver).remove(self.tracer)
+        path = self.tracer.export(self.trace_directory, self.trace_format)
+        self.tracer = None
+        logger.info(f"Trace written to {path}")
+        return path
+    
+    def teardown(self):
+        """Tear down the test and close the driver."""
+        # Write queued artifacts before the run ends
+        self.artifacts.close()
+        try:
+            self.export_timings()
+        except Exception as e:
+            logger.warning(f"Could not export step timings: {e}")
+        try:
+            self.record_history()
+        except Exception as e:
+            logger.warning(f"Could not record the run history: {e}")
+        self.stop_recording()
+        try:
+            self.export_trace()
+        except Exception as e:
+            logger.warning(f"Could not export trace: {e}")
+        stats = connection_stats(self.driver)
+        if stats:
+            logger.info(f"WebDriver connections: {stats.summary()}")
+        if hasattr(self, 'driver') and self.driver and self.owns_driver:
+            logger.info("Closing driver...")
+            self.driver.quit()
+        elif self.driver:
+            # The session lives on; stop charging its commands to this run
+            instrument(self.driver).remove(self.timer)
+
+def run_test(config_path='tests/config.ini', device=None, daemon_url=None, batch=False, audit_id=None,
+             pool=None):
+    """
+    Run the production check validation test.
+    
+    Args:
+        config_path: Path to the configuration file or a loaded AutomationConfig
+        device: DeviceProfile to run on (single configured device if None)
+        daemon_url: Warm session daemon to attach to (uses [DAEMON] url if None)
+        batch: Confirm every item of the audit instead of only the first one
+        audit_id: Audit to check (uses [Test] audit_id if None)
+        pool: SessionPool to take the session from and return it to, so runs
+            of several audits on one device share a session
+        
+    Returns:
+        bool: True if the real units were updated (of every item in batch mode)
+    """
+    test = None
+    driver = None
+    passed = False
+    try:
+        # Initialize test
+        config = load_config(config_path)
+        if pool is not None:
+            # Only the session settings are needed here, not a whole test object
+            settings = config.for_device(device)
+            capabilities = production_check_capabilities(settings, device)
+            driver = pool.acquire(capabilities, lambda: connect_driver(
+                settings.server.url, AppiumOptions().load_capabilities(capabilities),
+                daemon_url=daemon_url or settings.daemon.url, transport=transport_from_config(settings)
+            ))
+        test = ProductionCheckTest(config, device=device, driver=driver, daemon_url=daemon_url,
+                                   audit_id=audit_id)
+        username = test.config.credentials.username
+        password = test.config.credentials.password
+        
+        # Execute test flow
+        if batch:
+            results = test.run_batch(username, password)
+            print(format_item_results(results))
+            passed = bool(results) and all(result.passed for result in results)
         else:
-            logger.warning("Test FAILED: Real units not updated")
+            passed = test.run(username, password)
+        if not passed:
+            test.capture_failure("result")
             
     except Exception as e:
         logger.error(f"Test failed with exception: {e}")
+        if test:
+            test.capture_failure(test.timer.spans[-1].name if test.timer.spans else "setup")
     finally:
         # Clean up resources
         if test:
+            if driver is not None:
+                try:
+                    test.leave_audit()
+                except Exception as e:
+                    logger.warning(f"Could not return to the audit list: {e}")
             test.teardown()
+        if driver is not None:
+            pool.release(driver)
+    return passed
+
+async def run_test_async(config_path='tests/config.ini', device=None, pool=None):
+    """
+    Run the production check validation test with the asyncio driver.
+    
+    Args:
+        config_path: Path to the configuration file or a loaded AutomationConfig
+        device: DeviceProfile to run on (single configured device if None)
+        pool: AsyncHTTPPool shared by sessions on the same server
+        
+    Returns:
+        bool: True if the real units were updated
+    """
+    test = ProductionCheckTest(config_path, device=device, connect=False)
+    try:
+        driver = await AsyncAppiumDriver.create(test.server_url, test.options().to_capabilities(), pool=pool)
+        try:
+            passed = await test.run_async(driver, test.config.credentials.username,
+                                          test.config.credentials.password)
+            logger.info(f"Test {'PASSED' if passed else 'FAILED'} (async)")
+            return passed
+        except Exception as e:
+            logger.error(f"Test failed with exception: {e}")
+            return False
+        finally:
+            await driver.quit()
+    finally:
+        # Store the run like run_test; the test has no driver of its own,
+        # so teardown() leaves the session (quit above) alone
+        test.teardown()
 
 if __name__ == "__main__":
-    run_test()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Production Check validation test")
+    parser.add_argument("--daemon", metavar="URL", help="Attach to a warm session daemon")
+    parser.add_argument("--batch", action="store_true", help="Confirm every item of the audit")
+    parser.add_argument("--audit", help="Audit to check (overrides [Test] audit_id)")
+    parser.add_argument("--device", help="Device name (overrides the configured device)")
+    parser.add_argument("--set", metavar="SECTION.key=VALUE", action="append", type=parse_override, default=[],
+                        help="Override a config.ini value (repeatable)")
+    args = parser.parse_args()
+    
+    config = load_config('tests/config.ini', overrides=dict(args.set))
+    device = None
+    if args.device:
+        from inditex_automation.devices import DeviceProfile
+        device = DeviceProfile(args.device, server_url=config.server.url)
+    sys.exit(0 if run_test(config, device=device, daemon_url=args.daemon, batch=args.batch, audit_id=args.audit)
+             else 1)
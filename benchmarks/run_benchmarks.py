@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the Inditex automation client
+
+Times the full login, every production check step, locator compilation and
+resolution, config loading and run_automation.py startup against the local
+fake Appium server, reports p50/p95/p99 per case and fails when a case is
+slower than the stored baseline by more than the threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # compare with baseline
+    python benchmarks/run_benchmarks.py --update-baseline  # record a new baseline
+    python benchmarks/run_benchmarks.py --only login --repeat 50
+"""
+
+import argparse
+import configparser
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+LOGIN_CONFIG = os.path.join(REPO_ROOT, "tests", "config.ini")
+PRODUCTION_CHECK_CONFIG = os.path.join(REPO_ROOT, "appium-client", "tests", "config.ini")
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+# Packages run_automation.py must not load before a flow actually runs
+HEAVY_MODULES = ("appium", "selenium", "pytest")
+
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "tests"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "appium-client", "tests"))
+
+from inditex_automation.benchmark import (
+    DEFAULT_MIN_DELTA,
+    DEFAULT_THRESHOLD,
+    Benchmark,
+    compare,
+    format_report,
+    load_baseline,
+    save_baseline,
+)
+from inditex_automation.fake_server import SCENARIOS_DIR, FakeAppiumServer
+
+
+def offline_config(source, server_url, path, settings=None):
+    """Copy a config pointing it at the fake server, without timing exports"""
+    config = configparser.ConfigParser()
+    config.read(source)
+    config.set("SERVER", "appium_server_url", server_url)
+    if config.has_section("METRICS"):
+        config.set("METRICS", "timings_dir", "")
+    for (section, key), value in (settings or {}).items():
+        config.set(section, key, value)
+    with open(path, "w") as f:
+        config.write(f)
+    return path
+
+
+def record_spans(bench, prefix, timer, names=None):
+    """Record the finished spans of a RunTimer (all if names is None) as samples"""
+    for span in timer.spans:
+        if span.duration is not None and (names is None or span.name in names):
+            bench.record(f"{prefix}.{span.name}", span.duration)
+
+
+class Environment:
+    """Fake servers and configs shared by the cases"""
+
+    def __init__(self, directory, latency):
+        self.directory = directory
+        self.login_server = FakeAppiumServer(latency=latency, delay_scale=0).start()
+        self.production_check_server = FakeAppiumServer(
+            latency=latency, delay_scale=0, initial_screen="login_native"
+        ).start()
+        self.login_config = offline_config(
+            LOGIN_CONFIG, self.login_server.url, os.path.join(directory, "login.ini")
+        )
+        self.production_check_config = offline_config(
+            PRODUCTION_CHECK_CONFIG, self.production_check_server.url, os.path.join(directory, "production_check.ini")
+        )
+        # Shortcuts ship disabled; the fake scenario serves their routes
+        self.shortcuts_config = offline_config(
+            PRODUCTION_CHECK_CONFIG, self.production_check_server.url, os.path.join(directory, "shortcuts.ini"),
+            settings={("NAVIGATION", "shortcuts"): "true"}
+        )
+
+    def close(self):
+        self.login_server.stop()
+        self.production_check_server.stop()
+
+
+def case_config(bench, env):
+    from inditex_automation.config import AutomationConfig, load_config
+
+    with bench.timed("config.login"):
+        config = AutomationConfig.from_file(LOGIN_CONFIG)
+        config.server.explicit_wait
+        config.timeouts.page_transition_wait
+    with bench.timed("config.production_check"):
+        config = AutomationConfig.from_file(PRODUCTION_CHECK_CONFIG)
+        config.test.audit_id
+    load_config(LOGIN_CONFIG)
+    with bench.timed("config.load_cached"):
+        config = load_config(LOGIN_CONFIG)
+        config.server.explicit_wait
+
+
+def case_locators(bench, env):
+    from inditex_automation.locators import compile_xpath
+    from inditex_automation.snapshot import PageSnapshot
+    import inditex_login_enhanced
+    import test_production_check
+
+    locator_sets = (inditex_login_enhanced.LOCATORS, test_production_check.LOCATORS)
+    xpaths = [locator.xpath for locators in locator_sets for locator in locators]
+    with bench.timed("locators.compile_all"):
+        for xpath in xpaths:
+            compile_xpath(xpath)
+
+    with open(os.path.join(SCENARIOS_DIR, "trazabilidapp", "confirm_units.xml")) as f:
+        source = f.read()
+    with bench.timed("locators.snapshot_read_totals"):
+        snapshot = PageSnapshot(source)
+        snapshot.read({
+            "total_assigned": test_production_check.LOCATORS.total_assigned.xpath,
+            "total_real": test_production_check.LOCATORS.total_real.xpath,
+        })
+
+    driver = env.locator_driver
+    for name in ("email_field", "continue_button"):
+        locator = inditex_login_enhanced.LOCATORS[name]
+        with bench.timed(f"locators.find.{name}"):
+            driver.find_element(*locator)
+        with bench.timed(f"locators.find_xpath.{name}"):
+            driver.find_element("xpath", locator.xpath)
+
+
+def case_login(bench, env):
+    from inditex_login_enhanced import InditexLoginAutomationEnhanced
+
+    automation = InditexLoginAutomationEnhanced(env.login_config)
+    try:
+        with bench.timed("login.setup_driver"):
+            assert automation.setup_driver(), "setup_driver failed"
+        assert automation.launch_app(), "launch_app failed"
+        with bench.timed("login.perform_login"):
+            assert automation.perform_login(), "perform_login failed"
+        record_spans(bench, "login.step", automation.timer)
+    finally:
+        automation.cleanup()
+
+
+def case_production_check(bench, env):
+    from test_production_check import ProductionCheckTest
+
+    test = ProductionCheckTest(env.production_check_config)
+    try:
+        credentials = test.config.credentials
+        with bench.timed("production_check.run"):
+            assert test.run(credentials.username, credentials.password)
+        record_spans(bench, "production_check.step", test.timer)
+    finally:
+        test.teardown()
+
+
+def case_production_check_shortcuts(bench, env):
+    from test_production_check import ProductionCheckTest
+
+    test = ProductionCheckTest(env.shortcuts_config)
+    try:
+        credentials = test.config.credentials
+        with bench.timed("production_check.run_shortcuts"):
+            assert test.run(credentials.username, credentials.password)
+        # The other steps are timed by the tap navigation run
+        record_spans(bench, "production_check.step", test.timer, names={"open_shortcut"})
+    finally:
+        test.teardown()
+
+
+def case_startup(bench, env):
+    with bench.timed("startup.run_automation_help"):
+        subprocess.run(
+            [sys.executable, os.path.join(REPO_ROOT, "run_automation.py"), "--help"],
+            cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+        )
+    
+    # Import time as measured by the interpreter, without process start-up
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import run_automation"],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+    )
+    imported = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                imported[module.strip()] = int(cumulative)
+    heavy = sorted({module for module in imported if module.split(".")[0] in HEAVY_MODULES})
+    if heavy:
+        raise AssertionError(f"run_automation.py imports {', '.join(heavy)} at startup")
+    bench.record("startup.import_run_automation", imported["run_automation"] / 1e6)
+
+
+# (group, case, repeat override)
+CASES = [
+    ("config", case_config, None),
+    ("locators", case_locators, None),
+    ("login", case_login, None),
+    ("production_check", case_production_check, None),
+    ("production_check", case_production_check_shortcuts, None),
+    ("startup", case_startup, 5),
+]
+
+
+def run_benchmarks(repeat=20, only=None, latency=0.0):
+    """
+    Run the selected case groups
+
+    Args:
+        repeat (int): Measured repetitions per case
+        only (list): Group names to run (all if None)
+        latency (float): Per-command latency of the fake server in seconds
+
+    Returns:
+        dict: Benchmark.results()
+    """
+    bench = Benchmark(repeat=repeat)
+    previous_cwd = os.getcwd()
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        # The login flow saves screenshots to the working directory
+        os.chdir(directory)
+        env = Environment(directory, latency)
+        try:
+            from appium import webdriver
+            from appium.options.common import AppiumOptions
+
+            env.locator_driver = webdriver.Remote(
+                env.login_server.url,
+                options=AppiumOptions().load_capabilities({"platformName": "Android"})
+            )
+            for group, case, case_repeat in CASES:
+                if only and group not in only:
+                    continue
+                print(f"⏱️  {group}...")
+                bench.run(lambda b: case(b, env), repeat=case_repeat and min(case_repeat, repeat))
+            env.locator_driver.quit()
+        finally:
+            env.close()
+            os.chdir(previous_cwd)
+            logging.disable(logging.NOTSET)
+    return bench.results()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the Inditex automation client")
+    parser.add_argument("--repeat", type=int, default=20, help="Measured repetitions per case")
+    parser.add_argument("--only", nargs="+", choices=sorted({group for group, _, _ in CASES}),
+                        help="Case groups to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake server latency per command (seconds)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                        help="Allowed absolute slowdown in seconds")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args()
+    if args.update_baseline and args.only:
+        parser.error("--update-baseline records every group; drop --only")
+
+    results = run_benchmarks(repeat=args.repeat, only=args.only, latency=args.latency)
+    baseline = load_baseline(args.baseline)
+    print(format_report(results, baseline))
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"💾 Baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("ℹ️  No baseline found; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, baseline, threshold=args.threshold, min_delta=args.min_delta)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for name, stat, before, after in regressions:
+            print(f"   {name} {stat}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        return 1
+    print("\n✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
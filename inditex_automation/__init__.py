@@ -0,0 +1,8 @@
+"""
+Shared building blocks for the Inditex Appium automation flows.
+
+The login automation (tests/inditex_login_enhanced.py) and the production
+check flow (appium-client/tests/test_production_check.py) both import their
+common infrastructure from this package. Modules are imported individually
+so that light-weight entry points do not pay for Selenium/Appium imports.
+"""
@@ -0,0 +1,300 @@
+"""
+Background pipeline for screenshots and page sources.
+
+Saving a screenshot inline costs the HTTP round trip plus base64 decoding,
+optional image processing and a disk write before the flow can continue.
+ArtifactPipeline only does the unavoidable part on the flow's thread
+(fetching the payload while the screen is still showing) and hands
+decoding, downscaling/recompression and writing to a worker thread through a
+bounded queue, so memory stays bounded and a slow disk only applies
+backpressure when the queue is full.
+
+Policies decide which checkpoint captures happen at all:
+
+    always     - every checkpoint capture is saved
+    on_failure - checkpoints are skipped; only failure captures are saved
+    every_n    - checkpoints are saved on the 1st, (N+1)th, (2N+1)th, ... run;
+                 runs are counted in a file next to the artifacts, so every
+                 CLI invocation taking a checkpoint is one run (the number is
+                 drawn on the first checkpoint, under a file lock)
+
+Failure captures (capture_failure) are saved under every policy.
+
+Pillow is used for downscaling when it is installed; otherwise screenshots
+are written as received.
+"""
+
+import base64
+import io
+import itertools
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None
+
+from inditex_automation.config import config_group
+
+ALWAYS = "always"
+ON_FAILURE = "on_failure"
+EVERY_N = "every_n"
+POLICIES = (ALWAYS, ON_FAILURE, EVERY_N)
+
+SCREENSHOT = "screenshot"
+PAGE_SOURCE = "page_source"
+
+# Run count of the EVERY_N policy, kept in the artifact directory
+RUN_COUNTER_FILE = ".artifact_runs"
+
+_run_numbers = itertools.count(1)
+_run_counter_lock = threading.Lock()
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock on `path` (created if missing) across processes"""
+    with open(path, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def next_run_number(path=None):
+    """
+    Draw the number of a new run
+
+    Args:
+        path (str): File holding the run count, so the count carries over
+            between processes (runs are counted per process if None); it is
+            updated under a lock on `<path>.lock` so parallel runs never
+            draw the same number
+
+    Returns:
+        int: 1 for the first run
+    """
+    if path is None:
+        return next(_run_numbers)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _run_counter_lock, _file_lock(f"{path}.lock"):
+        try:
+            with open(path) as f:
+                number = int(f.read().strip() or 0) + 1
+        except (OSError, ValueError):
+            number = 1
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(str(number))
+        os.replace(temporary, path)
+    return number
+
+
+class ArtifactPipeline:
+    """Queues captures to a background writer"""
+
+    def __init__(self, directory=".", policy=ALWAYS, every_n=10, queue_size=8, max_width=0, jpeg_quality=0,
+                 run_counter=None):
+        """
+        Initialize the pipeline (the worker thread starts on the first capture
+        and the run number is drawn on the first checkpoint)
+
+        Args:
+            directory (str): Output directory (created if missing)
+            policy (str): ALWAYS, ON_FAILURE or EVERY_N
+            every_n (int): Save checkpoint captures on every Nth run (EVERY_N policy)
+            queue_size (int): Captures held in memory before capture() blocks
+            max_width (int): Downscale screenshots wider than this (0 keeps the size; needs Pillow)
+            jpeg_quality (int): Re-encode screenshots as JPEG with this quality (0 keeps PNG; needs Pillow)
+            run_counter (str): File counting runs across processes for EVERY_N
+                (runs are counted per process if None)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown artifact policy: {policy} (expected one of {', '.join(POLICIES)})")
+        self.directory = directory
+        self.policy = policy
+        self.every_n = max(1, int(every_n))
+        self.max_width = max_width
+        self.jpeg_quality = jpeg_quality
+        self.run_counter = run_counter
+        self._run_number = None
+        self.saved = []
+        self.skipped = 0
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._worker = None
+        self._lock = threading.Lock()
+
+    @property
+    def run_number(self):
+        """Number of this run, drawn once so pipelines never taking a checkpoint are not counted"""
+        with self._lock:
+            if self._run_number is None:
+                self._run_number = next_run_number(self.run_counter if self.policy == EVERY_N else None)
+        return self._run_number
+
+    def checkpoints_enabled(self):
+        """Whether checkpoint captures are saved for this run"""
+        if self.policy == ON_FAILURE:
+            return False
+        if self.policy == EVERY_N:
+            return (self.run_number - 1) % self.every_n == 0
+        return True
+
+    def capture(self, driver, name, kinds=(SCREENSHOT,)):
+        """
+        Capture a checkpoint if the policy wants it for this run
+
+        Only the WebDriver call happens here; everything else is done by the
+        background worker.
+
+        Args:
+            driver: Appium WebDriver instance
+            name (str): File name stem, e.g. 'login_result_1700000000'
+            kinds (tuple): SCREENSHOT and/or PAGE_SOURCE
+
+        Returns:
+            list of str: Paths that will be written (empty if skipped)
+        """
+        if not self.checkpoints_enabled():
+            self.skipped += 1
+            return []
+        return self._capture(driver, name, kinds)
+
+    def capture_failure(self, driver, name):
+        """
+        Capture a screenshot and the page source after a failure (any policy)
+
+        Errors while capturing are logged, never raised, so they cannot hide
+        the original failure.
+
+        Returns:
+            list of str: Paths that will be written
+        """
+        try:
+            return self._capture(driver, name, (SCREENSHOT, PAGE_SOURCE))
+        except Exception as e:
+            logger.warning(f"Could not capture failure artifacts: {e}")
+            return []
+
+    def _capture(self, driver, name, kinds):
+        paths = []
+        for kind in kinds:
+            if kind == SCREENSHOT:
+                payload = driver.get_screenshot_as_base64()
+                extension = "jpg" if self.jpeg_quality and Image is not None else "png"
+            elif kind == PAGE_SOURCE:
+                payload = driver.page_source
+                extension = "xml"
+            else:
+                raise ValueError(f"Unknown artifact kind: {kind}")
+            path = os.path.join(self.directory, f"{name}.{extension}")
+            self._ensure_worker()
+            self._queue.put((kind, payload, path))
+            paths.append(path)
+        return paths
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._worker = threading.Thread(target=self._work, name="artifact-writer", daemon=True)
+                self._worker.start()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                kind, payload, path = item
+                self._write(kind, payload, path)
+                self.saved.append(path)
+            except Exception as e:
+                logger.warning(f"Could not write artifact: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, kind, payload, path):
+        if kind == PAGE_SOURCE:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            return
+        data = base64.b64decode(payload)
+        if Image is not None and (self.max_width or self.jpeg_quality):
+            data = self._process(data)
+        elif self.max_width or self.jpeg_quality:
+            logger.debug("Pillow is not installed; writing screenshot unprocessed")
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def _process(self, data):
+        image = Image.open(io.BytesIO(data))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height))
+        output = io.BytesIO()
+        if self.jpeg_quality:
+            image.convert("RGB").save(output, "JPEG", quality=self.jpeg_quality)
+        else:
+            image.save(output, "PNG", optimize=True)
+        return output.getvalue()
+
+    def flush(self):
+        """Block until every queued capture has been written"""
+        if self._worker is not None:
+            self._queue.join()
+
+    def close(self):
+        """Write the remaining captures and stop the worker"""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join()
+
+
+def pipeline_from_config(config, section="ARTIFACTS"):
+    """
+    Build a pipeline from a configparser-like object
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        section (str): Section holding the artifact settings
+
+    Returns:
+        ArtifactPipeline
+    """
+    settings = config_group(config, "artifacts", section)
+    return ArtifactPipeline(
+        directory=settings.directory,
+        policy=settings.policy or ALWAYS,
+        every_n=settings.every_n,
+        queue_size=settings.queue_size,
+        max_width=settings.max_width,
+        jpeg_quality=settings.jpeg_quality,
+        run_counter=os.path.join(settings.directory, RUN_COUNTER_FILE),
+    )
@@ -0,0 +1,337 @@
+"""
+Asyncio-native Appium client for driving many sessions from one process.
+
+webdriver.Remote blocks its thread on every HTTP round trip, so many devices
+means many threads. AsyncAppiumDriver speaks the same W3C/Appium protocol
+over AsyncHTTPPool, a small keep-alive HTTP/1.1 connection pool built on
+asyncio streams (no third-party dependency). One event loop can then drive
+dozens of sessions, each costing a coroutine and a pooled socket instead of a
+thread.
+
+Only the operations used by the flows are exposed: find (with client-side
+waiting), click, clear/send_keys, text, attributes, page_source,
+screenshot, activate_app, current_activity, back and execute_script.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+DEFAULT_POLL_FREQUENCY = 0.25
+
+W3C_ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "invalid session id": InvalidSessionIdException,
+    "timeout": TimeoutException,
+}
+
+logger = logging.getLogger(__name__)
+
+
+class _StaleConnection(Exception):
+    """Pooled connection was closed by the server before it answered"""
+
+
+class AsyncHTTPPool:
+    """Keep-alive HTTP/1.1 connections to one Appium server"""
+
+    def __init__(self, base_url, max_connections=8, timeout=60.0):
+        """
+        Initialize the pool (connections are opened on demand)
+
+        Args:
+            base_url (str): Appium server URL, e.g. http://127.0.0.1:4723
+            max_connections (int): Upper bound of concurrent connections
+            timeout (float): Seconds to wait for a response
+        """
+        parsed = urlsplit(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.prefix = parsed.path.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._idle = []
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self.connections_opened = 0
+        self.requests = 0
+
+    async def _connect(self):
+        self.connections_opened += 1
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        """
+        Send one request and return the decoded JSON response
+
+        Args:
+            method (str): GET, POST or DELETE
+            path (str): Path below the server URL
+            payload (dict): JSON body (POST requests always send a body)
+
+        Returns:
+            tuple: (status code, decoded JSON body or {})
+        """
+        if payload is None and method == "POST":
+            payload = {}
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (
+            f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+
+        async with self._semaphore:
+            self.requests += 1
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._connect()
+                try:
+                    writer.write(head + body)
+                    await writer.drain()
+                    status, headers, data = await asyncio.wait_for(self._read_response(reader), self.timeout)
+                except (_StaleConnection, ConnectionError) as e:
+                    writer.close()
+                    if reused:
+                        # Keep-alive connection expired on the server side; nothing was processed
+                        continue
+                    raise WebDriverException(f"Connection to {self.host}:{self.port} failed: {e}")
+                except BaseException:
+                    writer.close()
+                    raise
+                if headers.get("connection", "").lower() == "close":
+                    writer.close()
+                else:
+                    self._idle.append((reader, writer))
+                return status, json.loads(data) if data else {}
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise _StaleConnection("connection closed")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            data = b"".join(chunks)
+        else:
+            data = await reader.read()
+            headers["connection"] = "close"
+        return status, headers, data
+
+    async def close(self):
+        """Close every idle connection"""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+
+class AsyncElement:
+    """Element reference bound to an AsyncAppiumDriver"""
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+
+    async def click(self):
+        await self.driver.execute("POST", f"/element/{self.id}/click")
+
+    async def clear(self):
+        await self.driver.execute("POST", f"/element/{self.id}/clear")
+
+    async def send_keys(self, text):
+        text = str(text)
+        await self.driver.execute("POST", f"/element/{self.id}/value", {"text": text, "value": list(text)})
+
+    async def text(self):
+        return await self.driver.execute("GET", f"/element/{self.id}/text")
+
+    async def get_attribute(self, name):
+        return await self.driver.execute("GET", f"/element/{self.id}/attribute/{name}")
+
+    async def is_displayed(self):
+        return await self.driver.execute("GET", f"/element/{self.id}/displayed")
+
+    async def is_enabled(self):
+        return await self.driver.execute("GET", f"/element/{self.id}/enabled")
+
+
+class AsyncAppiumDriver:
+    """One Appium session driven through an AsyncHTTPPool"""
+
+    def __init__(self, pool, session_id, capabilities=None, owns_pool=False):
+        self.pool = pool
+        self.session_id = session_id
+        self.capabilities = capabilities or {}
+        self.owns_pool = owns_pool
+
+    @classmethod
+    async def create(cls, server_url, capabilities, pool=None):
+        """
+        Start a new session
+
+        Args:
+            server_url (str): Appium server URL
+            capabilities (dict): W3C capabilities (e.g. options.to_capabilities())
+            pool (AsyncHTTPPool): Shared pool for this server (a private one if None)
+
+        Returns:
+            AsyncAppiumDriver
+        """
+        owns_pool = pool is None
+        pool = pool or AsyncHTTPPool(server_url)
+        status, response = await pool.request(
+            "POST", "/session", {"capabilities": {"alwaysMatch": capabilities, "firstMatch": [{}]}}
+        )
+        value = _check(status, response)
+        return cls(pool, value["sessionId"], value.get("capabilities"), owns_pool)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.quit()
+
+    async def execute(self, method, path, payload=None):
+        """
+        Send a session command and return its value
+
+        Raises:
+            WebDriverException: Subclass matching the W3C error, if any
+        """
+        status, response = await self.pool.request(method, f"/session/{self.session_id}{path}", payload)
+        return _check(status, response)
+
+    async def quit(self):
+        """Delete the session (and close a private pool)"""
+        try:
+            if self.session_id:
+                await self.execute("DELETE", "")
+        finally:
+            self.session_id = None
+            if self.owns_pool:
+                await self.pool.close()
+
+    # -- element lookup ------------------------------------------------------
+
+    async def find_element(self, by, value):
+        result = await self.execute("POST", "/element", {"using": by, "value": value})
+        return AsyncElement(self, _element_id(result))
+
+    async def find_elements(self, by, value):
+        result = await self.execute("POST", "/elements", {"using": by, "value": value})
+        return [AsyncElement(self, _element_id(item)) for item in result]
+
+    async def wait_until(self, condition, timeout=30, poll_frequency=DEFAULT_POLL_FREQUENCY, message=""):
+        """
+        Poll an async condition until it returns a truthy value
+
+        Args:
+            condition (callable): Coroutine function taking the driver
+            timeout (float): Deadline in seconds
+            poll_frequency (float): Seconds between evaluations
+
+        Returns:
+            The condition's truthy result
+
+        Raises:
+            TimeoutException: If the condition does not hold before the deadline
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                result = await condition(self)
+                if result:
+                    return result
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+            if time.monotonic() >= deadline:
+                raise TimeoutException(message or getattr(condition, "description", "condition not met"))
+            await asyncio.sleep(poll_frequency)
+
+    async def settle(self, condition, upper_bound, poll_frequency=DEFAULT_POLL_FREQUENCY):
+        """Like wait_until but returns None at the bound instead of raising"""
+        try:
+            return await self.wait_until(condition, upper_bound, poll_frequency)
+        except TimeoutException:
+            return None
+
+    async def wait_for_element(self, by, value, timeout=30, poll_frequency=DEFAULT_POLL_FREQUENCY):
+        """Wait until an element matches and return it"""
+        async def _present(driver):
+            elements = await driver.find_elements(by, value)
+            return elements[0] if elements else False
+        _present.description = f"{by}={value} present"
+        return await self.wait_until(_present, timeout, poll_frequency)
+
+    # -- device and app ------------------------------------------------------
+
+    async def page_source(self):
+        return await self.execute("GET", "/source")
+
+    async def screenshot(self):
+        """Screenshot as PNG bytes"""
+        return base64.b64decode(await self.execute("GET", "/screenshot"))
+
+    async def current_activity(self):
+        return await self.execute("GET", "/appium/device/current_activity")
+
+    async def activate_app(self, app_id):
+        await self.execute("POST", "/appium/device/activate_app", {"appId": app_id})
+
+    async def terminate_app(self, app_id):
+        return await self.execute("POST", "/appium/device/terminate_app", {"appId": app_id})
+
+    async def back(self):
+        await self.execute("POST", "/back")
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": list(args)})
+
+    async def implicitly_wait(self, seconds):
+        await self.execute("POST", "/timeouts", {"implicit": int(seconds * 1000)})
+
+
+def _element_id(result):
+    return result.get(ELEMENT_KEY) or result.get("ELEMENT")
+
+
+def _check(status, response):
+    value = response.get("value") if isinstance(response, dict) else None
+    if status >= 400 or (isinstance(value, dict) and "error" in value):
+        value = value if isinstance(value, dict) else {}
+        error = value.get("error", "unknown error")
+        exception_class = W3C_ERRORS.get(error, WebDriverException)
+        raise exception_class(value.get("message", f"HTTP {status}: {error}"))
+    return value
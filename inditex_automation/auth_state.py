@@ -0,0 +1,184 @@
+"""
+Local cache of authenticated app-data snapshots.
+
+Both flows run with noReset, so the app usually still holds a logged in
+session and the login sequence can be skipped after one page-source probe.
+When it does not (new device, cleared data), AuthStateCache can restore the
+files the app keeps its session in (shared_prefs by default) from a snapshot
+taken after the last successful login, which is much faster than typing the
+credentials again.
+
+Snapshots are pulled and pushed with the UiAutomator2 app-container paths
+(@<package>/<folder>), which use `run-as` and therefore need a debuggable
+build. Any failure is logged and the flow falls back to a full login.
+
+Snapshots contain session tokens: keep the cache directory out of version
+control (auth_cache/ is in .gitignore) and on the local machine.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import time
+import zipfile
+
+from inditex_automation.config import config_group
+
+META_ENTRY = "auth_state.json"
+
+logger = logging.getLogger(__name__)
+
+
+class AuthStateCache:
+    """Saves and restores app-data snapshots per device, app and user"""
+
+    def __init__(self, directory="auth_cache", folders=("shared_prefs",), max_age=12 * 3600):
+        """
+        Initialize the cache
+
+        Args:
+            directory (str): Local directory holding the snapshots
+            folders (tuple): Folders of the app data directory to snapshot
+            max_age (float): Seconds after which a snapshot is considered expired
+                (0 never expires)
+        """
+        self.directory = directory
+        self.folders = tuple(folders)
+        self.max_age = max_age
+
+    def key(self, device_name, app_package, user):
+        """
+        Build the snapshot name for a device, app and user
+
+        The user is hashed so that account names don't end up in file names.
+
+        Returns:
+            str: File name stem
+        """
+        device = re.sub(r"[^\w.-]+", "_", device_name or "device")
+        user_hash = hashlib.sha256((user or "").encode("utf-8")).hexdigest()[:12]
+        return f"{device}_{app_package}_{user_hash}"
+
+    def path(self, key):
+        """Path of the snapshot file for a key"""
+        return os.path.join(self.directory, f"{key}.zip")
+
+    def save(self, driver, app_package, key):
+        """
+        Pull the app's session files from the device into the cache
+
+        Args:
+            driver: Appium WebDriver instance
+            app_package (str): Application package
+            key (str): Snapshot name from key()
+
+        Returns:
+            bool: True if a snapshot was written
+        """
+        try:
+            files = {}
+            for folder in self.folders:
+                payload = base64.b64decode(driver.pull_folder(f"@{app_package}/{folder}"))
+                with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+                    for name in archive.namelist():
+                        if not name.endswith("/"):
+                            files[f"{folder}/{name}"] = archive.read(name)
+            if not files:
+                logger.warning("No app data to snapshot; authenticated state not cached")
+                return False
+
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = self.path(key) + ".tmp"
+            with zipfile.ZipFile(temporary, "w", zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(META_ENTRY, json.dumps({"created": time.time(), "app_package": app_package}))
+                for name, content in files.items():
+                    archive.writestr(name, content)
+            os.replace(temporary, self.path(key))
+            logger.info(f"Cached authenticated state ({len(files)} files) in {self.path(key)}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not cache authenticated state: {e}")
+            return False
+
+    def load(self, key):
+        """
+        Read a snapshot from the cache
+
+        Args:
+            key (str): Snapshot name from key()
+
+        Returns:
+            dict: Path inside the app data directory -> content, or None if
+                there is no usable snapshot
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with zipfile.ZipFile(path) as archive:
+                meta = json.loads(archive.read(META_ENTRY))
+                if self.max_age and time.time() - meta["created"] > self.max_age:
+                    logger.info("Cached authenticated state has expired")
+                    return None
+                return {name: archive.read(name) for name in archive.namelist() if name != META_ENTRY}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable authenticated state {path}: {e}")
+            return None
+
+    def restore(self, driver, app_package, key):
+        """
+        Push a cached snapshot into the app data directory
+
+        The app is stopped first so it cannot overwrite the files; the caller
+        relaunches it and checks whether the session is accepted.
+
+        Args:
+            driver: Appium WebDriver instance
+            app_package (str): Application package
+            key (str): Snapshot name from key()
+
+        Returns:
+            bool: True if the snapshot was pushed
+        """
+        files = self.load(key)
+        if not files:
+            return False
+        try:
+            driver.terminate_app(app_package)
+            for name, content in files.items():
+                driver.push_file(f"@{app_package}/{name}", base64.b64encode(content).decode("ascii"))
+            logger.info(f"Restored authenticated state ({len(files)} files)")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not restore authenticated state: {e}")
+            return False
+
+    def invalidate(self, key):
+        """Delete a snapshot (e.g. after the app rejected the restored session)"""
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+
+def auth_settings(config, section="AUTH"):
+    """
+    Read the state-aware login settings
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        section (str): Section holding the settings
+
+    Returns:
+        tuple: (skip_login (bool), AuthStateCache or None when no cache_dir is set)
+    """
+    settings = config_group(config, "auth", section)
+    directory = settings.cache_dir.strip()
+    if not settings.skip_login or not directory:
+        return settings.skip_login, None
+    folders = [folder.strip() for folder in settings.folders.split(",") if folder.strip()]
+    return True, AuthStateCache(directory, folders, settings.max_age_hours * 3600)
@@ -0,0 +1,197 @@
+"""
+Benchmark harness with percentile statistics and baseline comparison.
+
+Cases are plain functions taking a Benchmark and recording one or more named
+samples per call (``with bench.timed("login.perform_login"): ...``). The
+harness repeats every case, reports p50/p95/p99 per sample name and compares
+them with a stored baseline, flagging names that got slower than the
+allowed threshold.
+
+The cases for the automation flows live in benchmarks/run_benchmarks.py and
+run offline against the fake Appium server.
+"""
+
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+
+DEFAULT_THRESHOLD = 0.25
+# Differences below this many seconds are noise for sub-millisecond cases
+DEFAULT_MIN_DELTA = 0.002
+COMPARED_STATS = ("p50", "p95")
+
+
+def percentile(samples, fraction):
+    """
+    Percentile with linear interpolation between closest ranks
+
+    Args:
+        samples (list): Numbers (need not be sorted)
+        fraction (float): Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        float: The interpolated percentile (0.0 for no samples)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """
+    Summary statistics for a list of durations
+
+    Returns:
+        dict: n, mean, p50, p95, p99 and max
+    """
+    return {
+        "n": len(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 0.50),
+        "p95": percentile(samples, 0.95),
+        "p99": percentile(samples, 0.99),
+        "max": max(samples) if samples else 0.0,
+    }
+
+
+class Benchmark:
+    """Runs cases repeatedly and collects named duration samples"""
+
+    def __init__(self, repeat=20, warmup=1, clock=time.perf_counter):
+        """
+        Initialize the harness
+
+        Args:
+            repeat (int): Measured calls per case
+            warmup (int): Unmeasured calls per case before measuring
+            clock (callable): Clock returning seconds
+        """
+        self.repeat = repeat
+        self.warmup = warmup
+        self.samples = {}
+        self._clock = clock
+        self._recording = True
+
+    @contextmanager
+    def timed(self, name):
+        """Record the duration of the block as one sample of `name`"""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.record(name, self._clock() - started)
+
+    def record(self, name, seconds):
+        """Record an externally measured sample"""
+        if self._recording:
+            self.samples.setdefault(name, []).append(seconds)
+
+    def run(self, case, repeat=None):
+        """
+        Call a case `warmup` times unmeasured, then `repeat` times measured
+
+        Args:
+            case (callable): Function taking this Benchmark
+            repeat (int): Overrides the default repeat count for this case
+        """
+        self._recording = False
+        try:
+            for _ in range(self.warmup):
+                case(self)
+        finally:
+            self._recording = True
+        for _ in range(repeat or self.repeat):
+            case(self)
+
+    def results(self):
+        """Summary statistics per sample name"""
+        return {name: summarize(samples) for name, samples in sorted(self.samples.items())}
+
+
+def load_baseline(path):
+    """
+    Load a baseline written by save_baseline
+
+    Returns:
+        dict: Statistics per sample name (empty if the file does not exist)
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path, results):
+    """Store results as the new baseline"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": {
+            name: {key: round(value, 6) for key, value in stats.items()}
+            for name, stats in results.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Find sample names slower than the baseline
+
+    A statistic regresses when it exceeds the baseline by more than
+    `threshold` (relative) and by more than `min_delta` seconds.
+
+    Args:
+        results (dict): Benchmark.results()
+        baseline (dict): load_baseline()
+        threshold (float): Allowed relative slowdown, e.g. 0.25 for 25%
+        min_delta (float): Allowed absolute slowdown in seconds
+
+    Returns:
+        list of (name, stat, baseline_value, current_value) tuples
+    """
+    regressions = []
+    for name, stats in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for stat in COMPARED_STATS:
+            before, after = reference.get(stat), stats.get(stat)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + threshold) and after - before > min_delta:
+                regressions.append((name, stat, before, after))
+    return regressions
+
+
+def format_report(results, baseline=None):
+    """
+    Table of p50/p95/p99 in milliseconds with the change against the baseline
+
+    Returns:
+        str: Multi-line report
+    """
+    baseline = baseline or {}
+    lines = [f"{'case':<56}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'vs base':>9}"]
+    for name, stats in results.items():
+        change = ""
+        reference = baseline.get(name, {}).get("p50")
+        if reference:
+            change = f"{(stats['p50'] / reference - 1) * 100:+.0f}%"
+        lines.append(
+            f"{name:<56}{stats['n']:>5}{stats['p50'] * 1000:>10.2f}"
+            f"{stats['p95'] * 1000:>10.2f}{stats['p99'] * 1000:>10.2f}{change:>9}"
+        )
+    return "\n".join(lines)
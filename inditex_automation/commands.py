@@ -0,0 +1,104 @@
+"""
+Hooks around every WebDriver command a driver sends.
+
+All element lookups, taps, page source dumps and app commands go through
+``driver.command_executor.execute(command, params)``. instrument() wraps that
+method once per executor and notifies listeners before and after each
+command, which is how timings and other per-command observers see the HTTP
+traffic without touching the flows.
+
+A listener is any object with optional ``command_started(event)`` and
+``command_finished(event)`` methods.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CommandEvent:
+    """One WebDriver command as seen by the listeners"""
+
+    def __init__(self, command, params):
+        self.command = command
+        # Copied: the executor removes the URL parameters (sessionId, element id) from its dict
+        self.params = dict(params) if isinstance(params, dict) else params
+        self.started = time.time()
+        self.duration = None
+        self.response = None
+        self.error = None
+
+
+class CommandHooks:
+    """Listener registry installed on a command executor"""
+
+    def __init__(self, execute):
+        self._execute = execute
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add(self, listener):
+        """
+        Register a listener (registering the same listener twice has no effect)
+
+        Args:
+            listener: Object with command_started/command_finished methods
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners = self._listeners + [listener]
+        return listener
+
+    def remove(self, listener):
+        """Unregister a listener if it is registered"""
+        with self._lock:
+            self._listeners = [registered for registered in self._listeners if registered is not listener]
+
+    def execute(self, command, params):
+        listeners = self._listeners
+        if not listeners:
+            return self._execute(command, params)
+
+        event = CommandEvent(command, params)
+        self._notify(listeners, "command_started", event)
+        started = time.perf_counter()
+        try:
+            event.response = self._execute(command, params)
+            return event.response
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            event.duration = time.perf_counter() - started
+            self._notify(listeners, "command_finished", event)
+
+    def _notify(self, listeners, method, event):
+        for listener in listeners:
+            callback = getattr(listener, method, None)
+            if callback is None:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"Command listener {listener!r} failed: {e}")
+
+
+def instrument(driver):
+    """
+    Install command hooks on the driver's executor (once) and return them
+
+    Args:
+        driver: Appium/Selenium WebDriver instance
+
+    Returns:
+        CommandHooks: Registry to add listeners to
+    """
+    executor = driver.command_executor
+    hooks = getattr(executor, "_command_hooks", None)
+    if hooks is None:
+        hooks = CommandHooks(executor.execute)
+        executor.execute = hooks.execute
+        executor._command_hooks = hooks
+    return hooks
@@ -0,0 +1,468 @@
+"""
+Typed run configuration, loaded once per process.
+
+Both config.ini schemas are read into one AutomationConfig:
+
+    login (tests/config.ini)      production check (appium-client/tests/config.ini)
+    [APP] app_package             [App] package
+    [CREDENTIALS] email           [Credentials] username
+    [TIMEOUTS] ...                [Settings] ..., [Settings] timeout (= explicit wait)
+
+Section names are case-insensitive and the production check spellings are
+aliases of the login ones, so config.get('App', 'package') and
+config.get('APP', 'app_package') return the same value. Where a file sets a
+value under both spellings the later one wins.
+
+Every value the flows use on their hot path is converted once, when the file
+is loaded, and exposed as a read-only attribute:
+
+    config = load_config("tests/config.ini")
+    config.server.explicit_wait      # 30.0
+    config.timeouts.poll_interval    # 0.25
+
+Values are overridden, from lowest to highest priority, by the file, the
+device pool entry (config.for_device), INDITEX_<SECTION>_<KEY> environment
+variables (e.g. INDITEX_CREDENTIALS_PASSWORD) and --set SECTION.key=value
+on the command line of the runners.
+
+The settings of the optional subsystems ([TRANSPORT], [LOGGING], [AUTH],
+...) are typed the same way; their *_from_config helpers read them through
+config_group(), which also accepts a plain ConfigParser.
+
+load_config() reads each file, and the INDITEX_* environment, once per
+process: later calls with the same path and overrides return the same
+object without touching the file system. load_config(path, reload=True)
+reads the file again.
+"""
+
+import configparser
+import os
+import threading
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:4723"
+ENV_PREFIX = "INDITEX_"
+
+# Production check section names and their login schema equivalents
+SECTION_ALIASES = {"SETTINGS": "TIMEOUTS"}
+# Production check keys and their login schema equivalents, after SECTION_ALIASES
+KEY_ALIASES = {
+    ("APP", "package"): ("APP", "app_package"),
+    ("APP", "activity"): ("APP", "app_activity"),
+    ("DEVICE", "name"): ("DEVICE", "device_name"),
+    ("CREDENTIALS", "email"): ("CREDENTIALS", "username"),
+    ("TIMEOUTS", "timeout"): ("SERVER", "explicit_wait"),
+}
+
+# Typed values: group -> attribute -> (section, key, type, default). A missing
+# value, or an empty one, is the default; empty text is kept as it is when the
+# default is empty or None (e.g. an empty [LOGGING] file means no log file).
+# None defaults of the subsystem groups are filled in by their own modules.
+SCHEMA = {
+    "device": {
+        "name": ("DEVICE", "device_name", str, "Pixel Tablet"),
+        "platform_name": ("DEVICE", "platform_name", str, "Android"),
+        "platform_version": ("DEVICE", "platform_version", str, "13"),
+        "udid": ("DEVICE", "udid", str, None),
+    },
+    "app": {
+        "package": ("APP", "app_package", str, "com.inditex.trazabilidapp"),
+        "activity": ("APP", "app_activity", str, ".MainActivity"),
+    },
+    "server": {
+        "url": ("SERVER", "appium_server_url", str, DEFAULT_SERVER_URL),
+        "implicit_wait": ("SERVER", "implicit_wait", float, 10.0),
+        "explicit_wait": ("SERVER", "explicit_wait", float, 30.0),
+    },
+    "credentials": {
+        "username": ("CREDENTIALS", "username", str, None),
+        "password": ("CREDENTIALS", "password", str, None),
+    },
+    "timeouts": {
+        "app_launch_wait": ("TIMEOUTS", "app_launch_wait", float, 3.0),
+        "page_transition_wait": ("TIMEOUTS", "page_transition_wait", float, 2.0),
+        "login_completion_wait": ("TIMEOUTS", "login_completion_wait", float, 5.0),
+        "page_load_wait": ("TIMEOUTS", "page_load_wait", float, 5.0),
+        "poll_interval": ("TIMEOUTS", "poll_interval", float, 0.25),
+    },
+    "test": {
+        "audit_id": ("TEST", "audit_id", str, "206697"),
+        "scroll_percent": ("TEST", "scroll_percent", float, 0.75),
+    },
+    "metrics": {
+        "timings_dir": ("METRICS", "timings_dir", str, ""),
+    },
+    "daemon": {
+        "url": ("DAEMON", "url", str, ""),
+    },
+    "transport": {
+        "keep_alive": ("TRANSPORT", "keep_alive", bool, True),
+        "pool_size": ("TRANSPORT", "pool_size", int, 1),
+        "pool_block": ("TRANSPORT", "pool_block", bool, False),
+        "connect_timeout": ("TRANSPORT", "connect_timeout", float, 0.0),
+        "read_timeout": ("TRANSPORT", "read_timeout", float, 0.0),
+        "compress": ("TRANSPORT", "compress", bool, True),
+        "command_timeouts": ("TRANSPORT", "command_timeouts", str, ""),
+    },
+    "history": {
+        "enabled": ("HISTORY", "enabled", bool, False),
+        "database": ("HISTORY", "database", str, None),
+    },
+    "artifacts": {
+        "policy": ("ARTIFACTS", "policy", str, None),
+        "every_n": ("ARTIFACTS", "every_n", int, 10),
+        "directory": ("ARTIFACTS", "directory", str, "."),
+        "queue_size": ("ARTIFACTS", "queue_size", int, 8),
+        "max_width": ("ARTIFACTS", "max_width", int, 0),
+        "jpeg_quality": ("ARTIFACTS", "jpeg_quality", int, 0),
+    },
+    "auth": {
+        "skip_login": ("AUTH", "skip_login", bool, False),
+        "cache_dir": ("AUTH", "cache_dir", str, ""),
+        "folders": ("AUTH", "folders", str, "shared_prefs"),
+        "max_age_hours": ("AUTH", "max_age_hours", float, 12.0),
+    },
+    "recording": {
+        "enabled": ("RECORDING", "enabled", bool, False),
+        "directory": ("RECORDING", "directory", str, "recordings"),
+    },
+    "tracing": {
+        "enabled": ("TRACING", "enabled", bool, False),
+        "directory": ("TRACING", "directory", str, "traces"),
+        "format": ("TRACING", "format", str, None),
+    },
+    "preflight": {
+        "enabled": ("PREFLIGHT", "enabled", bool, True),
+        "timeout": ("PREFLIGHT", "timeout", float, 0.8),
+        "cache_file": ("PREFLIGHT", "cache_file", str, None),
+        "ttl": ("PREFLIGHT", "ttl", float, 30.0),
+        "adb": ("PREFLIGHT", "adb", str, "adb"),
+    },
+    "navigation": {
+        "shortcuts": ("NAVIGATION", "shortcuts", bool, False),
+        "cache_file": ("NAVIGATION", "cache_file", str, ""),
+    },
+    "logging": {
+        "file": ("LOGGING", "file", str, None),
+        "level": ("LOGGING", "level", str, "INFO"),
+        "format": ("LOGGING", "format", str, "text"),
+        "max_bytes": ("LOGGING", "max_bytes", int, None),
+        "backup_count": ("LOGGING", "backup_count", int, None),
+        "per_run": ("LOGGING", "per_run", bool, False),
+    },
+}
+
+# Section of each group (a group's values all live in one section)
+_GROUP_SECTIONS = {group: next(iter(fields.values()))[0] for group, fields in SCHEMA.items()}
+
+_cache = {}
+_files = {}
+_cache_lock = threading.Lock()
+
+
+def parse_bool(value):
+    """
+    Parse a flag the way ConfigParser.getboolean does
+
+    Args:
+        value (str or bool): 1/yes/true/on or 0/no/false/off, any case
+
+    Returns:
+        bool
+
+    Raises:
+        ValueError: If the value is not a flag
+    """
+    if isinstance(value, bool):
+        return value
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[str(value).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value!r}") from None
+
+
+_CONVERTERS = {bool: parse_bool}
+
+
+def convert(section, key, kind, default, value):
+    """
+    Convert one raw value of SCHEMA
+
+    Args:
+        section (str): Section name (for the error message)
+        key (str): Option name (for the error message)
+        kind (type): str, int, float or bool
+        default: Value of a missing (or empty) option
+        value (str): Raw value, None if missing
+
+    Returns:
+        The typed value
+
+    Raises:
+        ValueError: If the value does not convert
+    """
+    if value is None or (value == "" and (kind is not str or default)):
+        return default
+    try:
+        return _CONVERTERS.get(kind, kind)(value)
+    except ValueError:
+        raise ValueError(f"[{section}] {key}: expected {kind.__name__}, got {value!r}") from None
+
+
+def canonical_name(section, key):
+    """
+    Map a section and key of either schema to the login schema spelling
+
+    Args:
+        section (str): Section name, any case ('App', 'Settings', 'SERVER')
+        key (str): Option name
+
+    Returns:
+        tuple: (SECTION, key)
+    """
+    section = section.upper()
+    section = SECTION_ALIASES.get(section, section)
+    key = key.lower()
+    return KEY_ALIASES.get((section, key), (section, key))
+
+
+def parse_override(text):
+    """
+    Parse a SECTION.key=value override (the argparse type of --set)
+
+    Returns:
+        tuple: ('SECTION.key', value)
+    """
+    name, separator, value = text.partition("=")
+    section, dot, key = name.strip().partition(".")
+    if not separator or not dot or not section or not key:
+        raise ValueError(f"Expected SECTION.key=value, got {text!r}")
+    return f"{section}.{key.strip()}", value.strip()
+
+
+class ConfigSection:
+    """Read-only group of typed values (config.server, config.timeouts, ...)"""
+
+    def __init__(self, name, values):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_values", dict(values))
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self._name} settings are read-only")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{self._name} settings are read-only")
+
+    def as_dict(self):
+        return dict(self._values)
+
+    def __repr__(self):
+        values = ", ".join(f"{key}={value!r}" for key, value in self._values.items() if key != "password")
+        return f"<{self._name} {values}>"
+
+
+class AutomationConfig:
+    """Immutable configuration of a run, shared by every flow of the process"""
+
+    def __init__(self, values, path=None):
+        """
+        Initialize the configuration
+
+        Args:
+            values (dict): Raw string values keyed by canonical (SECTION, key)
+            path (str): File the values were read from
+        """
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "_values", dict(values))
+        object.__setattr__(self, "_devices", {})
+        object.__setattr__(self, "_devices_lock", threading.Lock())
+        for group, fields in SCHEMA.items():
+            typed = {name: convert(section, key, kind, default, self._values.get((section, key)))
+                     for name, (section, key, kind, default) in fields.items()}
+            object.__setattr__(self, group, ConfigSection(group, typed))
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Read a config.ini of either schema
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Configuration file not found: {path}")
+        # Values are used as written: a % in a password is not an interpolation
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.read(path)
+        values = {}
+        for section in parser.sections():
+            for key, value in parser.items(section, raw=True):
+                values[canonical_name(section, key)] = value
+        return cls(values, path)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("AutomationConfig is read-only; use with_overrides()")
+
+    def __delattr__(self, key):
+        raise AttributeError("AutomationConfig is read-only; use with_overrides()")
+
+    def get(self, section, key, fallback=None):
+        """Get a raw string value (either schema's spelling), like ConfigParser.get"""
+        return self._values.get(canonical_name(section, key), fallback)
+
+    def getint(self, section, key, fallback=None):
+        """Get an integer value"""
+        value = self.get(section, key)
+        return fallback if value in (None, "") else int(value)
+
+    def getfloat(self, section, key, fallback=None):
+        """Get a float value"""
+        value = self.get(section, key)
+        return fallback if value in (None, "") else float(value)
+
+    def with_overrides(self, overrides):
+        """
+        Get a copy with some values replaced
+
+        Args:
+            overrides (dict): Values keyed by 'SECTION.key' (either schema's spelling)
+
+        Returns:
+            AutomationConfig (self when there is nothing to override)
+        """
+        if not overrides:
+            return self
+        values = dict(self._values)
+        for name, value in overrides.items():
+            section, _, key = name.partition(".")
+            values[canonical_name(section, key)] = str(value)
+        return AutomationConfig(values, self.path)
+
+    def for_device(self, device):
+        """
+        Get the configuration of one device of a pool
+
+        The device's name, server, udid and platform version replace the
+        [DEVICE] and [SERVER] values, then its SECTION.key entries (see
+        DeviceProfile.overrides) are applied. Copies are kept per distinct
+        profile, so two profiles sharing a name but not a server, udid or
+        port each get their own.
+
+        Args:
+            device (DeviceProfile): Device to run on (self is returned for None)
+
+        Returns:
+            AutomationConfig
+        """
+        if device is None:
+            return self
+        key = (device.name, device.server_url, device.udid, device.system_port, device.platform_version,
+               tuple(sorted(device.overrides.items())))
+        with self._devices_lock:
+            config = self._devices.get(key)
+            if config is None:
+                overrides = {"DEVICE.device_name": device.name, "SERVER.appium_server_url": device.server_url}
+                if device.udid:
+                    overrides["DEVICE.udid"] = device.udid
+                if device.platform_version:
+                    overrides["DEVICE.platform_version"] = device.platform_version
+                overrides.update(device.overrides)
+                config = self.with_overrides(overrides)
+                self._devices[key] = config
+            return config
+
+    def __repr__(self):
+        return f"<AutomationConfig {self.path}>"
+
+
+def environment_overrides(environ=None):
+    """
+    Collect INDITEX_<SECTION>_<KEY> variables
+
+    Returns:
+        dict: Values keyed by 'SECTION.key'
+    """
+    environ = os.environ if environ is None else environ
+    overrides = {}
+    for name, value in environ.items():
+        if name.startswith(ENV_PREFIX):
+            section, _, key = name[len(ENV_PREFIX):].partition("_")
+            if section and key:
+                overrides[f"{section}.{key.lower()}"] = value
+    return overrides
+
+
+def config_group(config, group, section=None):
+    """
+    Typed settings of one SCHEMA group, from either kind of config
+
+    Args:
+        config: AutomationConfig, or any object with get(section, key, fallback=...)
+            such as a ConfigParser
+        group (str): SCHEMA group ('transport', 'logging', ...)
+        section (str): Section to read instead of the group's own
+
+    Returns:
+        ConfigSection
+
+    Raises:
+        ValueError: If a value does not convert to its type
+    """
+    fields = SCHEMA[group]
+    if isinstance(config, AutomationConfig) and section in (None, _GROUP_SECTIONS[group]):
+        return getattr(config, group)
+    typed = {}
+    for name, (default_section, key, kind, default) in fields.items():
+        source = section or default_section
+        typed[name] = convert(source, key, kind, default, config.get(source, key, fallback=None))
+    return ConfigSection(group, typed)
+
+
+def load_config(path, overrides=None, environ=None, reload=False):
+    """
+    Load a configuration once per process
+
+    The file and the INDITEX_* environment are read by the first call for a
+    path; later calls with the same overrides return the same object.
+
+    Args:
+        path (str or AutomationConfig): config.ini of either schema; a loaded
+            config is returned as it is (with the overrides applied)
+        overrides (dict): Values keyed by 'SECTION.key' (e.g. from --set)
+        environ (dict): Environment to read INDITEX_* overrides from (os.environ,
+            read once per process, if None)
+        reload (bool): Read the file (and os.environ) again
+
+    Returns:
+        AutomationConfig
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    if isinstance(path, AutomationConfig):
+        return path.with_overrides(overrides)
+    if not os.path.isabs(path):
+        path = os.path.abspath(path)
+    key = (
+        path,
+        tuple(sorted(overrides.items())) if overrides else (),
+        None if environ is None else tuple(sorted(environment_overrides(environ).items())),
+    )
+    config = None if reload else _cache.get(key)
+    if config is not None:
+        return config
+    with _cache_lock:
+        if reload:
+            _files.pop(path, None)
+            for cached in [cached for cached in _cache if cached[0] == path]:
+                del _cache[cached]
+        config = _cache.get(key)
+        if config is None:
+            loaded = _files.get(path)
+            if loaded is None:
+                loaded = _files[path] = AutomationConfig.from_file(path)
+            values = environment_overrides(environ)
+            values.update(overrides or {})
+            config = _cache[key] = loaded.with_overrides(values)
+    return config
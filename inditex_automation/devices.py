@@ -0,0 +1,389 @@
+"""
+Device pools and the parallel multi-device runner.
+
+A device pool file lists one device per section:
+
+    [tablet-1]
+    udid = R52T1234ABC
+    server_url = http://127.0.0.1:4723
+    system_port = 8201
+    platform_version = 13
+
+run_on_devices() runs a flow on every device at once with one worker thread
+per device. Each worker gets its own UiAutomator2 systemPort and its own log
+file, and the per-device outcomes are aggregated into DeviceResult objects.
+run_on_devices_async() does the same with one coroutine per device on a
+single event loop, still writing one log file per device.
+
+run_jobs_on_devices() spreads many jobs (e.g. audit numbers) over the pool:
+each device worker takes jobs from a WorkStealingQueue until none are left,
+so fast devices end up doing more of them, and every JobResult is reported
+as soon as it finishes.
+"""
+
+import asyncio
+import configparser
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from inditex_automation.config import DEFAULT_SERVER_URL
+from inditex_automation.logs import DeviceFilter, add_handler, create_file_handler, device_context, remove_handler
+
+BASE_SYSTEM_PORT = 8200
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceProfile:
+    """Connection details for one device of the pool"""
+
+    def __init__(self, name, udid=None, server_url=DEFAULT_SERVER_URL, system_port=None,
+                 platform_version=None, log_file=None, overrides=None):
+        """
+        Initialize a device profile
+
+        Args:
+            name (str): Unique device name (also used as the Appium deviceName)
+            udid (str): ADB serial of the device
+            server_url (str): Appium server handling this device
+            system_port (int): UiAutomator2 systemPort, unique per device on a host
+            platform_version (str): Android version
+            log_file (str): Per-device log file (inditex_automation_<name>.log if None)
+            overrides (dict): Config values for this device only, keyed by
+                'SECTION.key' (see AutomationConfig.for_device)
+        """
+        self.name = name
+        self.udid = udid
+        self.server_url = server_url
+        self.system_port = system_port
+        self.platform_version = platform_version
+        self.log_file = log_file or f"inditex_automation_{name}.log"
+        self.overrides = dict(overrides or {})
+
+    def capabilities(self):
+        """
+        Get the capabilities that pin a session to this device
+
+        Returns:
+            dict: Appium capabilities (without the appium: vendor prefix)
+        """
+        caps = {"deviceName": self.name}
+        if self.udid:
+            caps["udid"] = self.udid
+        if self.system_port:
+            caps["systemPort"] = self.system_port
+        if self.platform_version:
+            caps["platformVersion"] = self.platform_version
+        return caps
+
+    def __repr__(self):
+        return f"<DeviceProfile {self.name} udid={self.udid} server={self.server_url}>"
+
+
+class DeviceResult:
+    """Outcome of one flow run on one device"""
+
+    def __init__(self, device, success, duration, error=None):
+        self.device = device
+        self.success = success
+        self.duration = duration
+        self.error = error
+
+
+class JobResult:
+    """Outcome of one job run on one device of the pool"""
+
+    def __init__(self, job, device, success, duration, error=None):
+        self.job = job
+        self.device = device
+        self.success = success
+        self.duration = duration
+        self.error = error
+
+
+class WorkStealingQueue:
+    """Jobs dealt out to one deque per worker; idle workers steal from the busiest"""
+
+    def __init__(self, workers, jobs):
+        """
+        Initialize the queue
+
+        Args:
+            workers (list of str): Worker names
+            jobs (iterable): Jobs, dealt round-robin so each worker starts with its own share
+        """
+        self._queues = {worker: deque() for worker in workers}
+        if not self._queues:
+            raise ValueError("At least one worker is required")
+        names = list(self._queues)
+        for index, job in enumerate(jobs):
+            self._queues[names[index % len(names)]].append(job)
+        self._lock = threading.Lock()
+        self.stolen = 0
+
+    def get(self, worker):
+        """
+        Take the next job for a worker
+
+        The worker's own jobs are taken from the front; once they are done the
+        back of the longest other queue is stolen, which keeps every worker busy
+        until the last job has been handed out.
+
+        Args:
+            worker (str): Worker name
+
+        Returns:
+            The next job, or None when no jobs are left
+        """
+        with self._lock:
+            own = self._queues[worker]
+            if own:
+                return own.popleft()
+            victim = max(self._queues.values(), key=len)
+            if not victim:
+                return None
+            self.stolen += 1
+            return victim.pop()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+
+def load_device_pool(path):
+    """
+    Load a device pool from an INI file
+
+    Devices without an explicit system_port get consecutive ports starting
+    at 8201 so that parallel UiAutomator2 sessions never collide. Keys of the
+    form SECTION.key (e.g. server.explicit_wait = 45) override the run
+    configuration for that device only.
+
+    Args:
+        path (str): Path to the device pool file
+
+    Returns:
+        list of DeviceProfile
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Device pool file not found: {path}")
+
+    parser = configparser.ConfigParser()
+    parser.read(path)
+
+    devices = []
+    used_ports = {parser.getint(name, "system_port") for name in parser.sections()
+                  if parser.has_option(name, "system_port")}
+    next_port = BASE_SYSTEM_PORT
+    for name in parser.sections():
+        section = parser[name]
+        system_port = section.getint("system_port", fallback=None)
+        if system_port is None:
+            next_port += 1
+            while next_port in used_ports:
+                next_port += 1
+            system_port = next_port
+        devices.append(DeviceProfile(
+            name,
+            udid=section.get("udid"),
+            server_url=section.get("server_url", DEFAULT_SERVER_URL),
+            system_port=system_port,
+            platform_version=section.get("platform_version"),
+            log_file=section.get("log_file"),
+            overrides={key: value for key, value in section.items() if "." in key},
+        ))
+    if not devices:
+        raise ValueError(f"No devices defined in {path}")
+    return devices
+
+
+@contextmanager
+def device_log_file(device, rename_thread=True):
+    """
+    Copy every log record emitted for a device to the device's log file
+
+    Records are tagged through logs.device_context(), so routing works for
+    worker threads and asyncio tasks alike without changing the flows. With
+    configure_logging() active the file is written by the log listener thread
+    and rotates like the main log file.
+
+    Args:
+        device (DeviceProfile): Device whose log file receives the records
+        rename_thread (bool): Also rename the current thread after the device
+    """
+    thread = threading.current_thread()
+    previous_name = thread.name
+    if rename_thread:
+        thread.name = f"device-{device.name}"
+
+    handler = create_file_handler(device.log_file)
+    handler.addFilter(DeviceFilter(device.name))
+    add_handler(handler)
+    try:
+        with device_context(device.name):
+            yield
+    finally:
+        remove_handler(handler)
+        handler.close()
+        thread.name = previous_name
+
+
+def _run_one(device, flow):
+    started = time.monotonic()
+    with device_log_file(device):
+        try:
+            success = bool(flow(device))
+            error = None
+        except Exception as e:
+            logger.error(f"Flow failed on {device.name}: {e}")
+            success = False
+            error = str(e)
+    return DeviceResult(device, success, time.monotonic() - started, error)
+
+
+def run_on_devices(devices, flow):
+    """
+    Run a flow on every device in parallel, one worker thread per device
+
+    Args:
+        devices (list of DeviceProfile): Device pool
+        flow (callable): Function taking a DeviceProfile and returning True on success
+
+    Returns:
+        list of DeviceResult in pool order
+    """
+    with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+        futures = [executor.submit(_run_one, device, flow) for device in devices]
+        return [future.result() for future in futures]
+
+
+def run_jobs_on_devices(devices, jobs, flow, on_result=None):
+    """
+    Run many jobs on a device pool, one worker thread per device
+
+    Each device works through its share of a WorkStealingQueue and then
+    helps the others, so the pool finishes as soon as possible even when
+    devices or jobs differ in speed. A job that raises is reported as failed
+    and the device carries on with the next one.
+
+    Args:
+        devices (list of DeviceProfile): Device pool
+        jobs (iterable): Jobs to run (e.g. audit numbers)
+        flow (callable): Function taking a DeviceProfile and a job and returning True on success
+        on_result (callable): Called with every JobResult as soon as it finishes
+
+    Returns:
+        list of JobResult in completion order
+    """
+    queue = WorkStealingQueue([device.name for device in devices], jobs)
+    results = []
+    lock = threading.Lock()
+
+    def work(device):
+        with device_log_file(device):
+            while True:
+                job = queue.get(device.name)
+                if job is None:
+                    return
+                started = time.monotonic()
+                try:
+                    success = bool(flow(device, job))
+                    error = None
+                except Exception as e:
+                    logger.error(f"Job {job} failed on {device.name}: {e}")
+                    success = False
+                    error = str(e)
+                result = JobResult(job, device, success, time.monotonic() - started, error)
+                with lock:
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+
+    with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+        for future in [executor.submit(work, device) for device in devices]:
+            future.result()
+    if queue.stolen:
+        logger.info(f"{queue.stolen} jobs were taken over by idle devices")
+    return results
+
+
+async def _run_one_async(device, flow):
+    started = time.monotonic()
+    with device_log_file(device, rename_thread=False):
+        try:
+            success = bool(await flow(device))
+            error = None
+        except Exception as e:
+            logger.error(f"Flow failed on {device.name}: {e}")
+            success = False
+            error = str(e)
+    return DeviceResult(device, success, time.monotonic() - started, error)
+
+
+async def run_on_devices_async(devices, flow):
+    """
+    Run a coroutine flow on every device concurrently on the current event loop
+
+    No thread is used per device; each coroutine still gets its own log
+    file because records are tagged with the device of the running task.
+
+    Args:
+        devices (list of DeviceProfile): Device pool
+        flow (callable): Coroutine function taking a DeviceProfile and returning True on success
+
+    Returns:
+        list of DeviceResult in pool order
+    """
+    return list(await asyncio.gather(*(_run_one_async(device, flow) for device in devices)))
+
+
+def format_results(results):
+    """
+    Format device results as a summary table
+
+    Args:
+        results (list of DeviceResult): Results from run_on_devices
+
+    Returns:
+        str: Multi-line table
+    """
+    width = max([len("Device")] + [len(result.device.name) for result in results])
+    lines = [f"{'Device':<{width}}  Result  Duration  Log file"]
+    for result in results:
+        status = "PASS" if result.success else "FAIL"
+        line = f"{result.device.name:<{width}}  {status:<6}  {result.duration:7.1f}s  {result.device.log_file}"
+        if result.error:
+            line += f"  ({result.error})"
+        lines.append(line)
+    passed = sum(1 for result in results if result.success)
+    lines.append(f"{passed}/{len(results)} devices passed")
+    return "\n".join(lines)
+
+
+def format_job_results(results):
+    """
+    Format job results as a summary table
+
+    Args:
+        results (list of JobResult): Results from run_jobs_on_devices
+
+    Returns:
+        str: Multi-line table
+    """
+    job_width = max([len("Job")] + [len(str(result.job)) for result in results])
+    device_width = max([len("Device")] + [len(result.device.name) for result in results])
+    lines = [f"{'Job':<{job_width}}  {'Device':<{device_width}}  Result  Duration"]
+    for result in results:
+        status = "PASS" if result.success else "FAIL"
+        line = f"{str(result.job):<{job_width}}  {result.device.name:<{device_width}}  {status:<6}  {result.duration:7.1f}s"
+        if result.error:
+            line += f"  ({result.error})"
+        lines.append(line)
+    passed = sum(1 for result in results if result.success)
+    lines.append(f"{passed}/{len(results)} jobs passed")
+    return "\n".join(lines)
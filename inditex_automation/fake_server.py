@@ -0,0 +1,843 @@
+"""
+Local stand-in Appium server that replays recorded UI hierarchies.
+
+FakeAppiumServer speaks enough of the W3C WebDriver / Appium HTTP protocol
+for the login and production-check flows to run unmodified against it:
+sessions, timeouts (including implicit-wait semantics), element lookup by
+xpath, id, -android uiautomator, accessibility id and class name, click,
+clear, send_keys, text/attribute/displayed/enabled/rect, page source,
+screenshots, activate/terminate app, current activity, back and a few
+`mobile:` scripts (including pulling and pushing files in the app's data
+directory, which is shared by the sessions of one device, scroll
+gestures on lists, deep links and starting exported activities).
+
+Screens are recorded page_source XML files plus a scenario.json describing
+which click leads to which screen (optionally after a delay) and what the
+back button does. Every command can be given an artificial latency so that
+client-side overhead can be measured deterministically without hardware.
+
+Usage:
+    python -m inditex_automation.fake_server --port 4723 --latency 0.05
+"""
+
+import argparse
+import base64
+import copy
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ElementTree
+import zipfile
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from inditex_automation.logs import configure_logging
+from inditex_automation.snapshot import PageSnapshot
+
+SCENARIOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios")
+DEFAULT_SCENARIO = "trazabilidapp"
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+POLL_INTERVAL = 0.05
+
+# 1x1 transparent PNG
+PNG_PIXEL = base64.b64encode(bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082"
+)).decode("ascii")
+
+LAUNCHER_SOURCE = (
+    "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>"
+    '<hierarchy index="0" class="hierarchy" rotation="0" width="1600" height="2560">'
+    '<android.widget.FrameLayout index="0" package="com.android.launcher3" '
+    'class="android.widget.FrameLayout" text="" displayed="true" bounds="[0,0][1600,2560]"/>'
+    "</hierarchy>"
+)
+
+_ID_ATTRIBUTE = "fake-id"
+_ID_PATTERN = re.compile(rf' {_ID_ATTRIBUTE}="\d+"')
+_UISELECTOR_CALL = re.compile(r'\.(\w+)\(\s*("(?:[^"\\]|\\.)*"|true|false|\d+)\s*\)')
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverError(Exception):
+    """W3C error returned to the client"""
+
+    def __init__(self, status, error, message):
+        super().__init__(message)
+        self.status = status
+        self.error = error
+        self.message = message
+
+
+class Scenario:
+    """Recorded screens and the transitions between them"""
+
+    def __init__(self, path):
+        """
+        Load a scenario directory
+
+        Args:
+            path (str): Directory containing scenario.json and the screen XML files
+        """
+        with open(os.path.join(path, "scenario.json"), encoding="utf-8") as f:
+            data = json.load(f)
+        self.path = path
+        self.package = data["package"]
+        self.initial_screen = data["initial_screen"]
+        self.activities = {}
+        self.screens = {}
+        for name, screen in data["screens"].items():
+            with open(os.path.join(path, screen["source"]), encoding="utf-8") as f:
+                self.screens[name] = ElementTree.fromstring(f.read())
+            self.activities[name] = screen.get("activity", ".MainActivity")
+        self.transitions = data.get("transitions", [])
+        self.back = data.get("back", {})
+        # Deep link template ('{name}' matches one path segment) -> screen,
+        # and the activities other apps may start directly
+        self.deep_links = data.get("deep_links", {})
+        self.exported_activities = data.get("exported_activities", [])
+        self.version = data.get("version", "1.0.0")
+        # Screen name -> XPath of a list that only shows the rows inside its
+        # bounds and moves them with mobile: scrollGesture
+        self.scrollable = data.get("scrollable", {})
+        # Files the app writes to its data directory once the user is logged in;
+        # relaunching the app with them present opens the authenticated screen
+        self.authenticated_screen = data.get("authenticated_screen")
+        self.app_data = data.get("app_data", {})
+
+    @classmethod
+    def named(cls, name=DEFAULT_SCENARIO):
+        """Load one of the scenarios bundled with the package"""
+        return cls(os.path.join(SCENARIOS_DIR, name))
+
+
+class FakeSession:
+    """State of one client session: current screen, elements and timeouts"""
+
+    def __init__(self, scenario, capabilities, initial_screen, delay_scale=1.0, app_data=None):
+        self.id = uuid.uuid4().hex
+        self.app_data = {} if app_data is None else app_data
+        self.delay_scale = delay_scale
+        self.scenario = scenario
+        self.capabilities = capabilities
+        self.initial_screen = initial_screen
+        self.implicit_wait = 0.0
+        self.lock = threading.RLock()
+        self.app_running = True
+        self.pending = None
+        self.next_node_id = 0
+        # Scroll position per screen, kept while navigating like a RecyclerView's
+        self.scroll_offsets = {}
+        self.load_screen(initial_screen)
+
+    # -- screen handling -------------------------------------------------
+
+    def load_screen(self, name):
+        """Show a screen; element references to the previous screen become stale"""
+        self.screen = name
+        self.pending = None
+        self.root = copy.deepcopy(self.scenario.screens[name])
+        self.nodes = {}
+        for node in self.root.iter():
+            self.next_node_id += 1
+            node.set(_ID_ATTRIBUTE, str(self.next_node_id))
+            self.nodes[str(self.next_node_id)] = node
+        self._apply_scroll()
+        self.parents = {child: parent for parent in self.root.iter() for child in parent}
+        self.elements = {}
+        if name == self.scenario.authenticated_screen:
+            for path, content in self.scenario.app_data.items():
+                self.app_data[path] = content.encode("utf-8")
+
+    def _scroll_area(self):
+        """
+        Vertical extent of the current screen's list as recorded
+
+        Returns:
+            tuple: (XPath, top, bottom, largest scroll offset), or None without a list
+        """
+        xpath = self.scenario.scrollable.get(self.screen)
+        if not xpath:
+            return None
+        recorded = PageSnapshot(ElementTree.tostring(self.scenario.screens[self.screen], encoding="unicode"))
+        container = recorded.find(xpath)
+        if container is None or container.rect is None:
+            return None
+        top = container.rect["y"]
+        bottom = top + container.rect["height"]
+        rows = [element.rect for element in recorded.find_all(xpath + "//*") if element.rect]
+        content_bottom = max([bottom] + [rect["y"] + rect["height"] for rect in rows])
+        return xpath, top, bottom, content_bottom - bottom
+
+    def _apply_scroll(self):
+        """Move the list rows by the scroll offset and drop the ones outside the list"""
+        area = self._scroll_area()
+        if area is None:
+            return
+        xpath, top, bottom, _ = area
+        offset = self.scroll_offsets.get(self.screen, 0)
+
+        def window(parent):
+            for child in list(parent):
+                rect = _bounds(child)
+                if rect:
+                    y1, y2 = rect[1] - offset, rect[3] - offset
+                    if y2 <= top or y1 >= bottom:
+                        parent.remove(child)
+                        continue
+                    child.set("bounds", f"[{rect[0]},{max(y1, top)}][{rect[2]},{min(y2, bottom)}]")
+                window(child)
+        for container in self._select_xpath(xpath)[:1]:
+            window(container)
+
+    def scroll(self, direction, percent):
+        """
+        Scroll the current screen's list like mobile: scrollGesture
+
+        Args:
+            direction (str): 'down' or 'up'
+            percent (float): Distance as a fraction of the list height
+
+        Returns:
+            bool: True if the list can still scroll further in that direction
+        """
+        area = self._scroll_area()
+        if area is None:
+            return False
+        _, top, bottom, limit = area
+        offset = self.scroll_offsets.get(self.screen, 0)
+        distance = int((bottom - top) * percent)
+        offset = min(limit, offset + distance) if direction == "down" else max(0, offset - distance)
+        self.scroll_offsets[self.screen] = offset
+        self.load_screen(self.screen)
+        return offset < limit if direction == "down" else offset > 0
+
+    def authenticated(self):
+        """Whether the app data holds a logged in session"""
+        return bool(self.scenario.app_data) and all(path in self.app_data for path in self.scenario.app_data)
+
+    def schedule_screen(self, name, delay):
+        delay *= self.delay_scale
+        if delay:
+            self.pending = (name, time.monotonic() + delay)
+        else:
+            self.load_screen(name)
+
+    def apply_pending(self):
+        if self.pending and time.monotonic() >= self.pending[1]:
+            self.load_screen(self.pending[0])
+
+    def source(self):
+        """Page source of the current screen as the device would return it"""
+        if not self.app_running:
+            return LAUNCHER_SOURCE
+        xml = ElementTree.tostring(self.root, encoding="unicode")
+        xml = _ID_PATTERN.sub("", xml)
+        return "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>\n" + xml
+
+    def activity(self):
+        if not self.app_running:
+            return ".Launcher"
+        return self.scenario.activities[self.screen]
+
+    # -- element lookup ----------------------------------------------------
+
+    def _select_xpath(self, xpath, scope=None):
+        document = ElementTree.tostring(scope if scope is not None else self.root, encoding="unicode")
+        try:
+            matches = PageSnapshot(document).find_all(xpath)
+        except ValueError as e:
+            raise WebDriverError(400, "invalid selector", str(e))
+        return [self.nodes[match.get_attribute(_ID_ATTRIBUTE)] for match in matches]
+
+    def _select_uiautomator(self, selector, scope):
+        if not selector.startswith("new UiSelector()"):
+            raise WebDriverError(400, "invalid selector", f"Unsupported UiSelector: {selector}")
+        calls = _UISELECTOR_CALL.findall(selector[len("new UiSelector()"):])
+        if "".join(f".{m}({a})" for m, a in calls).replace(" ", "") != \
+                selector[len("new UiSelector()"):].replace(" ", ""):
+            raise WebDriverError(400, "invalid selector", f"Unsupported UiSelector: {selector}")
+
+        def argument(raw):
+            if raw.startswith('"'):
+                return raw[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+            return raw
+
+        checks = []
+        for method, raw in calls:
+            value = argument(raw)
+            checks.append(_uiselector_check(method, value, selector))
+        return [node for node in scope.iter() if node is not scope and all(check(node) for check in checks)]
+
+    def find(self, using, value, parent=None, multiple=False):
+        """
+        Resolve a locator against the current screen, honouring the implicit wait
+
+        Returns:
+            list of element ids (empty when nothing matched within the implicit wait)
+        """
+        deadline = time.monotonic() + self.implicit_wait
+        while True:
+            self.apply_pending()
+            if not self.app_running:
+                nodes = []
+            else:
+                scope = self.root if parent is None else parent
+                nodes = self._select(using, value, scope)
+            if nodes or time.monotonic() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+        if not multiple:
+            nodes = nodes[:1]
+        return [self._element_id(node) for node in nodes]
+
+    def _select(self, using, value, scope):
+        if using == "xpath":
+            return self._select_xpath(value, scope if scope is not self.root else None)
+        if using == "id":
+            resource_id = value if ":id/" in value else f"{self.scenario.package}:id/{value}"
+            return [node for node in scope.iter()
+                    if node.get("resource-id") in (value, resource_id) and node is not scope]
+        if using == "-android uiautomator":
+            return self._select_uiautomator(value, scope)
+        if using == "accessibility id":
+            return [node for node in scope.iter() if node.get("content-desc") == value and node is not scope]
+        if using == "class name":
+            return [node for node in scope.iter() if node.tag == value and node is not scope]
+        raise WebDriverError(400, "invalid argument", f"Unsupported locator strategy: {using}")
+
+    def _element_id(self, node):
+        element_id = f"{self.id[:8]}-{node.get(_ID_ATTRIBUTE)}"
+        self.elements[element_id] = node
+        return element_id
+
+    def element(self, element_id):
+        self.apply_pending()
+        node = self.elements.get(element_id)
+        if node is None:
+            raise WebDriverError(404, "stale element reference",
+                                 f"Element {element_id} is not attached to the current screen")
+        return node
+
+    # -- actions -------------------------------------------------------------
+
+    def click(self, node):
+        """Run the scenario transitions triggered by tapping the node"""
+        chain = []
+        current = node
+        while current is not None:
+            chain.append(current)
+            current = self.parents.get(current)
+        for transition in self.scenario.transitions:
+            if transition["screen"] != self.screen:
+                continue
+            targets = self._select_xpath(transition["click"])
+            if not any(target in chain for target in targets):
+                continue
+            if "copy_text" in transition:
+                source = self._select_xpath(transition["copy_text"]["from"])
+                destination = self._select_xpath(transition["copy_text"]["to"])
+                if source and destination:
+                    destination[0].set("text", source[0].get("text", ""))
+            if "goto" in transition:
+                self.schedule_screen(transition["goto"], transition.get("delay", 0))
+            return
+
+    def tap(self, x, y):
+        """Click the deepest node whose bounds contain the point"""
+        hit = None
+        for node in self.root.iter():
+            rect = _bounds(node)
+            if rect and rect[0] <= x < rect[2] and rect[1] <= y < rect[3]:
+                hit = node
+        if hit is not None:
+            self.click(hit)
+
+    def back(self):
+        target = self.scenario.back.get(self.screen)
+        if target:
+            self.load_screen(target)
+
+    def activate_app(self):
+        if not self.app_running:
+            self.app_running = True
+            self.load_screen(self.scenario.authenticated_screen if self.authenticated() else self.initial_screen)
+
+    def open_deep_link(self, url):
+        for template, screen in self.scenario.deep_links.items():
+            pattern = re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(template))
+            if re.fullmatch(pattern, url):
+                return self._launch(screen)
+        raise WebDriverError(500, "unknown error", f"No activity found to handle intent for {url}")
+
+    def start_activity(self, intent):
+        activity = intent.split("/", 1)[-1]
+        if activity not in self.scenario.exported_activities:
+            raise WebDriverError(500, "unknown error", f"Permission Denial: {activity} is not exported")
+        screen = next(name for name, screen_activity in self.scenario.activities.items()
+                      if screen_activity == activity)
+        self._launch(screen)
+
+    def _launch(self, screen):
+        # Screens behind the login redirect to it like the app does
+        self.app_running = True
+        self.load_screen(screen if self.authenticated() else self.initial_screen)
+
+    def terminate_app(self):
+        self.app_running = False
+        self.elements = {}
+        self.scroll_offsets = {}
+
+    def clear_app(self):
+        self.terminate_app()
+        self.app_data.clear()
+        self.initial_screen = self.scenario.initial_screen
+
+    # -- app data ------------------------------------------------------------
+
+    def _app_path(self, remote_path):
+        # Only the app container syntax (@<package>/<path>) is supported
+        prefix = f"@{self.scenario.package}/"
+        if not remote_path.startswith(prefix):
+            raise WebDriverError(500, "unknown error", f"Cannot access {remote_path} on the fake device")
+        return remote_path[len(prefix):].strip("/")
+
+    def pull_file(self, remote_path):
+        path = self._app_path(remote_path)
+        if path not in self.app_data:
+            raise WebDriverError(500, "unknown error", f"Remote file {remote_path} does not exist")
+        return base64.b64encode(self.app_data[path]).decode("ascii")
+
+    def pull_folder(self, remote_path):
+        folder = self._app_path(remote_path)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for path, content in sorted(self.app_data.items()):
+                if path.startswith(folder + "/"):
+                    archive.writestr(path[len(folder) + 1:], content)
+        return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    def push_file(self, remote_path, payload):
+        self.app_data[self._app_path(remote_path)] = base64.b64decode(payload)
+
+
+def _bounds(node):
+    match = re.fullmatch(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]", node.get("bounds", ""))
+    return tuple(int(value) for value in match.groups()) if match else None
+
+
+def _uiselector_check(method, value, selector):
+    attribute_checks = {
+        "className": ("class", lambda actual: actual == value),
+        "text": ("text", lambda actual: actual == value),
+        "textContains": ("text", lambda actual: value in actual),
+        "textStartsWith": ("text", lambda actual: actual.startswith(value)),
+        "textMatches": ("text", lambda actual: re.fullmatch(value, actual) is not None),
+        "resourceId": ("resource-id", lambda actual: actual == value),
+        "resourceIdMatches": ("resource-id", lambda actual: re.fullmatch(value, actual) is not None),
+        "description": ("content-desc", lambda actual: actual == value),
+        "descriptionContains": ("content-desc", lambda actual: value in actual),
+        "descriptionStartsWith": ("content-desc", lambda actual: actual.startswith(value)),
+        "packageName": ("package", lambda actual: actual == value),
+    }
+    boolean_checks = {
+        "checkable": "checkable", "checked": "checked", "clickable": "clickable",
+        "enabled": "enabled", "focusable": "focusable", "focused": "focused",
+        "longClickable": "long-clickable", "scrollable": "scrollable", "selected": "selected",
+    }
+    if method == "className":
+        return lambda node: node.tag == value
+    if method in attribute_checks:
+        attribute, check = attribute_checks[method]
+        return lambda node: check(node.get(attribute, ""))
+    if method in boolean_checks:
+        attribute = boolean_checks[method]
+        return lambda node: node.get(attribute, "false") == value
+    raise WebDriverError(400, "invalid selector", f"Unsupported UiSelector method {method} in {selector}")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this every response
+    # waits for the client's delayed ACK (~40 ms on loopback)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self.server.app.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.app.handle(self, "POST")
+
+    def do_DELETE(self):
+        self.server.app.handle(self, "DELETE")
+
+
+class FakeAppiumServer:
+    """Threaded HTTP server replaying a scenario for any number of sessions"""
+
+    def __init__(self, scenario=None, latency=0.0, host="127.0.0.1", port=0, initial_screen=None,
+                 delay_scale=1.0, compress=False):
+        """
+        Initialize the server (call start() to begin serving)
+
+        Args:
+            scenario (Scenario): Scenario to replay (bundled 'trazabilidapp' if None)
+            latency (float or dict): Seconds added to every command, or a mapping of
+                command name (e.g. 'source', 'find_element', 'click') to seconds with
+                an optional 'default' entry
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            initial_screen (str): Screen new sessions start on (scenario default if None)
+            delay_scale (float): Multiplier for the scenario's transition delays
+                (0 makes every screen appear immediately)
+            compress (bool): Gzip responses for clients sending Accept-Encoding: gzip
+        """
+        self.scenario = scenario or Scenario.named()
+        self.latency = latency
+        self.initial_screen = initial_screen or self.scenario.initial_screen
+        self.delay_scale = delay_scale
+        self.compress = compress
+        self.sessions = {}
+        self.app_data = {}
+        self.command_counts = Counter()
+        self._counts_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self
+        self._thread = None
+        self._routes = [
+            ("GET", r"/status", "status", self._status),
+            ("POST", r"/session", "new_session", self._new_session),
+            ("DELETE", r"/session/(?P<sid>[^/]+)", "delete_session", self._delete_session),
+            ("POST", r"/session/(?P<sid>[^/]+)/timeouts", "set_timeouts", self._set_timeouts),
+            ("GET", r"/session/(?P<sid>[^/]+)/timeouts", "get_timeouts", self._get_timeouts),
+            ("POST", r"/session/(?P<sid>[^/]+)/element", "find_element", self._find_element),
+            ("POST", r"/session/(?P<sid>[^/]+)/elements", "find_elements", self._find_elements),
+            ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/element", "find_element", self._find_element),
+            ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/elements", "find_elements", self._find_elements),
+            ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/click", "click", self._click),
+            ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/clear", "clear", self._clear),
+            ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/value", "send_keys", self._send_keys),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/text", "text", self._text),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/attribute/(?P<name>[^/]+)", "attribute", self._attribute),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/displayed", "displayed", self._displayed),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/enabled", "enabled", self._enabled),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/selected", "selected", self._selected),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/rect", "rect", self._rect),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/name", "name", self._name),
+            ("GET", r"/session/(?P<sid>[^/]+)/source", "source", self._source),
+            ("GET", r"/session/(?P<sid>[^/]+)/screenshot", "screenshot", self._screenshot),
+            ("POST", r"/session/(?P<sid>[^/]+)/back", "back", self._back),
+            ("POST", r"/session/(?P<sid>[^/]+)/appium/device/activate_app", "activate_app", self._activate_app),
+            ("POST", r"/session/(?P<sid>[^/]+)/appium/device/terminate_app", "terminate_app", self._terminate_app),
+            ("POST", r"/session/(?P<sid>[^/]+)/appium/device/app_state", "app_state", self._app_state),
+            ("GET", r"/session/(?P<sid>[^/]+)/appium/device/current_activity", "current_activity", self._current_activity),
+            ("GET", r"/session/(?P<sid>[^/]+)/appium/device/current_package", "current_package", self._current_package),
+            ("POST", r"/session/(?P<sid>[^/]+)/execute/sync", "execute", self._execute),
+            ("POST", r"/session/(?P<sid>[^/]+)/actions", "actions", self._actions),
+            ("DELETE", r"/session/(?P<sid>[^/]+)/actions", "release_actions", lambda request: None),
+        ]
+        self._routes = [(method, re.compile(pattern + "$"), name, handler)
+                        for method, pattern, name, handler in self._routes]
+
+    @property
+    def url(self):
+        """Base URL clients should use as command_executor"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-appium", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def set_screen(self, name, session_id=None):
+        """
+        Jump sessions to a screen (all sessions when session_id is None)
+
+        Args:
+            name (str): Screen name from the scenario
+            session_id (str): Session to change
+        """
+        targets = [self.sessions[session_id]] if session_id else list(self.sessions.values())
+        for session in targets:
+            with session.lock:
+                session.app_running = True
+                session.load_screen(name)
+
+    # -- request dispatch ------------------------------------------------------
+
+    def handle(self, request, method):
+        length = int(request.headers.get("Content-Length") or 0)
+        raw_body = request.rfile.read(length) if length else b""
+        path = request.path.split("?", 1)[0]
+        if path.startswith("/wd/hub"):
+            path = path[len("/wd/hub"):]
+        try:
+            body = json.loads(raw_body) if raw_body.strip() else {}
+        except ValueError:
+            body = {}
+
+        status, payload = 200, None
+        try:
+            for route_method, pattern, name, handler in self._routes:
+                match = pattern.match(path)
+                if route_method == method and match:
+                    with self._counts_lock:
+                        self.command_counts[name] += 1
+                    self._sleep(name)
+                    request_args = dict(match.groupdict(), body=body)
+                    session = self.sessions.get(request_args.get("sid")) if "sid" in request_args else None
+                    if "sid" in request_args and session is None:
+                        raise WebDriverError(404, "invalid session id", f"Unknown session {request_args['sid']}")
+                    if session is not None:
+                        with session.lock:
+                            request_args["session"] = session
+                            payload = handler(request_args)
+                    else:
+                        payload = handler(request_args)
+                    break
+            else:
+                raise WebDriverError(404, "unknown command", f"{method} {path}")
+            response = {"value": payload}
+        except WebDriverError as e:
+            status = e.status
+            response = {"value": {"error": e.error, "message": e.message, "stacktrace": ""}}
+        except Exception as e:
+            logger.exception("Fake server error")
+            status = 500
+            response = {"value": {"error": "unknown error", "message": str(e), "stacktrace": ""}}
+
+        data = json.dumps(response).encode("utf-8")
+        compressed = self.compress and "gzip" in (request.headers.get("Accept-Encoding") or "")
+        if compressed:
+            data = gzip.compress(data)
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json; charset=utf-8")
+        if compressed:
+            request.send_header("Content-Encoding", "gzip")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+    def _sleep(self, command):
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(command, latency.get("default", 0.0))
+        if latency:
+            time.sleep(latency)
+
+    # -- handlers ----------------------------------------------------------------
+
+    def _status(self, request):
+        return {"ready": True, "message": "Fake Appium server ready", "build": {"version": "fake"}}
+
+    def _new_session(self, request):
+        capabilities = request["body"].get("capabilities", {}).get("alwaysMatch", {})
+        # App data lives on the device, so sessions for the same device share it
+        device = capabilities.get("appium:deviceName", capabilities.get("deviceName", ""))
+        session = FakeSession(self.scenario, capabilities, self.initial_screen, self.delay_scale,
+                              self.app_data.setdefault(device, {}))
+        self.sessions[session.id] = session
+        return {"sessionId": session.id, "capabilities": dict(capabilities, platformName="Android")}
+
+    def _delete_session(self, request):
+        self.sessions.pop(request["sid"], None)
+        return None
+
+    def _set_timeouts(self, request):
+        implicit = request["body"].get("implicit")
+        if implicit is not None:
+            request["session"].implicit_wait = implicit / 1000.0
+        return None
+
+    def _get_timeouts(self, request):
+        return {"implicit": int(request["session"].implicit_wait * 1000), "pageLoad": 300000, "script": 30000}
+
+    def _lookup(self, request, multiple):
+        session = request["session"]
+        parent = session.element(request["eid"]) if "eid" in request else None
+        body = request["body"]
+        ids = session.find(body.get("using"), body.get("value"), parent=parent, multiple=multiple)
+        return [{ELEMENT_KEY: element_id, "ELEMENT": element_id} for element_id in ids]
+
+    def _find_element(self, request):
+        found = self._lookup(request, multiple=False)
+        if not found:
+            body = request["body"]
+            raise WebDriverError(404, "no such element",
+                                 f"An element could not be located using {body.get('using')}={body.get('value')}")
+        return found[0]
+
+    def _find_elements(self, request):
+        return self._lookup(request, multiple=True)
+
+    def _click(self, request):
+        session = request["session"]
+        session.click(session.element(request["eid"]))
+
+    def _clear(self, request):
+        request["session"].element(request["eid"]).set("text", "")
+
+    def _send_keys(self, request):
+        body = request["body"]
+        text = body.get("text")
+        if text is None:
+            text = "".join(body.get("value", []))
+        request["session"].element(request["eid"]).set("text", text)
+
+    def _text(self, request):
+        return request["session"].element(request["eid"]).get("text", "")
+
+    def _attribute(self, request):
+        node = request["session"].element(request["eid"])
+        name = {"className": "class", "resourceId": "resource-id", "contentDescription": "content-desc"}.get(
+            request["name"], request["name"])
+        return node.get(name)
+
+    def _displayed(self, request):
+        return request["session"].element(request["eid"]).get("displayed", "true") == "true"
+
+    def _enabled(self, request):
+        return request["session"].element(request["eid"]).get("enabled", "true") == "true"
+
+    def _selected(self, request):
+        return request["session"].element(request["eid"]).get("selected", "false") == "true"
+
+    def _rect(self, request):
+        bounds = _bounds(request["session"].element(request["eid"])) or (0, 0, 0, 0)
+        return {"x": bounds[0], "y": bounds[1], "width": bounds[2] - bounds[0], "height": bounds[3] - bounds[1]}
+
+    def _name(self, request):
+        return request["session"].element(request["eid"]).tag
+
+    def _source(self, request):
+        session = request["session"]
+        session.apply_pending()
+        return session.source()
+
+    def _screenshot(self, request):
+        return PNG_PIXEL
+
+    def _back(self, request):
+        session = request["session"]
+        session.apply_pending()
+        session.back()
+
+    def _activate_app(self, request):
+        request["session"].activate_app()
+
+    def _terminate_app(self, request):
+        request["session"].terminate_app()
+        return True
+
+    def _app_state(self, request):
+        return 4 if request["session"].app_running else 1
+
+    def _current_activity(self, request):
+        session = request["session"]
+        session.apply_pending()
+        return session.activity()
+
+    def _current_package(self, request):
+        return request["session"].scenario.package
+
+    def _execute(self, request):
+        session = request["session"]
+        script = request["body"].get("script", "")
+        args = request["body"].get("args") or [{}]
+        params = args[0] if args else {}
+        session.apply_pending()
+        if script == "mobile: clearApp":
+            session.clear_app()
+            return None
+        if script == "mobile: activateApp":
+            session.activate_app()
+            return None
+        if script == "mobile: terminateApp":
+            session.terminate_app()
+            return True
+        if script == "mobile: clickGesture":
+            session.tap(params.get("x", 0), params.get("y", 0))
+            return None
+        if script == "mobile: pullFile":
+            return session.pull_file(params.get("remotePath", ""))
+        if script == "mobile: pullFolder":
+            return session.pull_folder(params.get("remotePath", ""))
+        if script == "mobile: pushFile":
+            session.push_file(params.get("remotePath", ""), params.get("payload", ""))
+            return None
+        if script == "mobile: deepLink":
+            session.open_deep_link(params.get("url", ""))
+            return None
+        if script == "mobile: startActivity":
+            session.start_activity(params.get("intent", ""))
+            return None
+        if script == "mobile: shell":
+            if params.get("command") == "dumpsys" and params.get("args", [])[:1] == ["package"]:
+                return f"Packages:\n  Package [{session.scenario.package}]\n    versionName={session.scenario.version}\n"
+            raise WebDriverError(500, "unknown error", "Potentially insecure feature 'adb_shell' has not been enabled")
+        if script == "mobile: scrollGesture":
+            return session.scroll(params.get("direction", "down"), float(params.get("percent", 1.0)))
+        raise WebDriverError(404, "unknown command", f"Unsupported script: {script}")
+
+    def _actions(self, request):
+        # Treat a pointer down/up sequence as a tap at the last pointer position
+        session = request["session"]
+        for source in request["body"].get("actions", []):
+            x = y = None
+            for action in source.get("actions", []):
+                if action.get("type") == "pointerMove":
+                    x, y = action.get("x"), action.get("y")
+                if action.get("type") == "pointerUp" and x is not None:
+                    session.tap(x, y)
+        return None
+
+
+def main():
+    """Run the fake server from the command line"""
+    parser = argparse.ArgumentParser(description="Local stand-in Appium server with scripted UI hierarchies")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=4723, help="Port to bind")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every command")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="Scenario name or directory")
+    parser.add_argument("--initial-screen", help="Screen new sessions start on")
+    args = parser.parse_args()
+
+    configure_logging(log_file=None)
+    scenario_path = args.scenario if os.path.isdir(args.scenario) else os.path.join(SCENARIOS_DIR, args.scenario)
+    server = FakeAppiumServer(Scenario(scenario_path), latency=args.latency, host=args.host,
+                              port=args.port, initial_screen=args.initial_screen)
+    logger.info(f"Fake Appium server listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+Run history with latency regression detection.
+
+Every flow run (run_automation.py, run_production_check.py, the pytest
+suites) stores its total and per-step durations, device, app version,
+command count and outcome in a local SQLite database. The history can then
+be queried for percentiles over time and checked for slowdowns:
+
+    # p50/p95/p99 of the login per day over the last two weeks
+    python -m inditex_automation.history report --flow login --since 14d --bucket 1d
+
+    # Compare the last day with the 14 days before it (exit code 1 on a regression)
+    python -m inditex_automation.history check --flow production_check --recent 1d --baseline 14d
+
+A slowdown is flagged when the recent durations of the run or a step are
+larger than the baseline's with a one-sided Mann-Whitney U test below
+``alpha`` *and* the median grew by more than ``min_change``. Only passed runs
+are compared, so failures that end early do not hide a slowdown.
+"""
+
+import argparse
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from inditex_automation.benchmark import summarize
+from inditex_automation.config import config_group
+
+DEFAULT_DATABASE = "run_history.sqlite"
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_CHANGE = 0.10
+# Fewer samples than this on either side cannot show a significant change
+MIN_SAMPLES = 5
+# Name under which the run total is reported next to the steps
+RUN_TOTAL = "(run)"
+
+PASSED = "passed"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    flow TEXT NOT NULL,
+    source TEXT,
+    device TEXT,
+    app_version TEXT,
+    started_at TEXT,
+    started_epoch REAL NOT NULL,
+    duration REAL NOT NULL,
+    commands INTEGER NOT NULL,
+    wait REAL, http REAL, sleep REAL, other REAL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_flow_time ON runs (flow, started_epoch);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    name TEXT NOT NULL,
+    parent TEXT,
+    start REAL NOT NULL,
+    duration REAL NOT NULL,
+    commands INTEGER NOT NULL,
+    wait REAL, http REAL, sleep REAL, other REAL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS steps_run ON steps (run_id);
+"""
+
+_DURATION_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_duration(text):
+    """
+    Parse a window such as '90s', '30m', '12h', '7d' or '2w'
+
+    Returns:
+        float: Seconds
+    """
+    match = _DURATION_PATTERN.match(str(text))
+    if not match:
+        raise ValueError(f"Invalid duration: {text}")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def run_outcome(timer):
+    """PASSED unless a top-level step of the run failed or raised"""
+    failed = any(span.parent is None and span.status != "ok" for span in timer.spans if span.duration is not None)
+    return FAILED if failed else PASSED
+
+
+def entry_point():
+    """Name of the program that started this run ('pytest', 'run_automation', ...)"""
+    if "pytest" in sys.modules:
+        return "pytest"
+    return os.path.splitext(os.path.basename(sys.argv[0] or ""))[0] or None
+
+
+def mann_whitney_greater(current, baseline):
+    """
+    One-sided Mann-Whitney U test that current tends to be larger than baseline
+
+    Uses the normal approximation with tie correction.
+
+    Args:
+        current (list of float): Recent samples
+        baseline (list of float): Baseline samples
+
+    Returns:
+        float: p-value (1.0 when either side is empty)
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        rank = (index + end) / 2 + 1
+        for position in range(index, end + 1):
+            ranks[position] = rank
+        tied = end - index + 1
+        tie_term += tied ** 3 - tied
+        index = end + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class Regression:
+    """A run total or step that got significantly slower"""
+
+    def __init__(self, name, baseline, current, p_value):
+        self.name = name
+        self.baseline = baseline
+        self.current = current
+        self.p_value = p_value
+
+    @property
+    def change(self):
+        """Relative growth of the median"""
+        if not self.baseline["p50"]:
+            return 0.0
+        return self.current["p50"] / self.baseline["p50"] - 1
+
+
+class RunHistory:
+    """SQLite store of flow runs and their step durations"""
+
+    def __init__(self, path=DEFAULT_DATABASE):
+        """
+        Open (and create if needed) the database
+
+        Args:
+            path (str): Database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Parallel device runs write from several threads and processes
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def record(self, timer, device=None, app_version=None, outcome=None, source=None):
+        """
+        Store a finished run
+
+        Args:
+            timer (RunTimer): Timer of the run
+            device (str): Device the run used
+            app_version (str): Installed app version
+            outcome (str): PASSED or FAILED (derived from the step statuses if None)
+            source (str): Entry point (detected if None)
+        """
+        totals = timer.totals()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (timer.run_id, timer.flow, source or entry_point(), device, app_version, timer.started_at,
+                 timer.started_epoch, totals["duration"], totals["commands"], totals["wait"], totals["http"],
+                 totals["sleep"], totals["other"], outcome or run_outcome(timer)),
+            )
+            db.execute("DELETE FROM steps WHERE run_id = ?", (timer.run_id,))
+            db.executemany(
+                "INSERT INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(timer.run_id, span.name, span.parent, span.start, span.duration, span.commands,
+                  span.breakdown["wait"], span.breakdown["http"], span.breakdown["sleep"], span.breakdown["other"],
+                  span.status)
+                 for span in timer.spans if span.duration is not None],
+            )
+
+    def durations(self, flow, step=None, since=None, until=None, device=None, outcome=PASSED):
+        """
+        Durations of a flow's runs or of one of its steps
+
+        Args:
+            flow (str): Flow name
+            step (str): Step name (run totals if None)
+            since (float): Earliest run start (epoch seconds)
+            until (float): Latest run start, exclusive (epoch seconds)
+            device (str): Only runs on this device
+            outcome (str): Only runs with this outcome (all if None)
+
+        Returns:
+            list of tuple: (started_epoch, duration) ordered by time
+        """
+        if step is None:
+            query = "SELECT runs.started_epoch, runs.duration FROM runs WHERE runs.flow = ?"
+        else:
+            query = ("SELECT runs.started_epoch, steps.duration FROM steps JOIN runs USING (run_id) "
+                     "WHERE runs.flow = ? AND steps.name = ? AND steps.status = 'ok'")
+        params = [flow] if step is None else [flow, step]
+        for clause, value in (("runs.started_epoch >= ?", since), ("runs.started_epoch < ?", until),
+                              ("runs.device = ?", device), ("runs.outcome = ?", outcome)):
+            if value is not None:
+                query += f" AND {clause}"
+                params.append(value)
+        with self._connect() as db:
+            return db.execute(query + " ORDER BY runs.started_epoch", params).fetchall()
+
+    def step_names(self, flow):
+        """Names of the steps recorded for a flow"""
+        with self._connect() as db:
+            rows = db.execute("SELECT DISTINCT steps.name FROM steps JOIN runs USING (run_id) WHERE runs.flow = ? "
+                              "ORDER BY steps.name", (flow,)).fetchall()
+        return [name for (name,) in rows]
+
+    def trend(self, flow, bucket, step=None, since=None, until=None, device=None):
+        """
+        Percentiles per time bucket
+
+        Args:
+            flow (str): Flow name
+            bucket (float): Bucket length in seconds
+            step (str): Step name (run totals if None)
+            since, until, device: See durations()
+
+        Returns:
+            list of tuple: (bucket start epoch, summary dict) for buckets with runs
+        """
+        buckets = {}
+        for started, duration in self.durations(flow, step, since, until, device):
+            buckets.setdefault(math.floor(started / bucket) * bucket, []).append(duration)
+        return [(start, summarize(samples)) for start, samples in sorted(buckets.items())]
+
+    def regressions(self, flow, recent, baseline, now=None, device=None, alpha=DEFAULT_ALPHA,
+                    min_change=DEFAULT_MIN_CHANGE):
+        """
+        Compare the recent window with the rolling baseline before it
+
+        Args:
+            flow (str): Flow name
+            recent (float): Seconds of recent runs to check
+            baseline (float): Seconds of runs before the recent window to compare with
+            now (float): End of the recent window (current time if None)
+            device (str): Only runs on this device
+            alpha (float): Significance level of the one-sided test
+            min_change (float): Smallest relative growth of the median worth flagging
+
+        Returns:
+            list of Regression: Slower run total and steps, largest change first
+        """
+        now = time.time() if now is None else now
+        split = now - recent
+        found = []
+        for step in [None] + self.step_names(flow):
+            before = [duration for _, duration in self.durations(flow, step, split - baseline, split, device)]
+            after = [duration for _, duration in self.durations(flow, step, split, now, device)]
+            if len(before) < MIN_SAMPLES or len(after) < MIN_SAMPLES:
+                continue
+            regression = Regression(step or RUN_TOTAL, summarize(before), summarize(after),
+                                    mann_whitney_greater(after, before))
+            if regression.p_value < alpha and regression.change > min_change:
+                found.append(regression)
+        return sorted(found, key=lambda regression: regression.change, reverse=True)
+
+
+def history_from_config(config, section="HISTORY"):
+    """
+    Open the run history if the config enables it
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        section (str): Section holding the history settings
+
+    Returns:
+        RunHistory or None
+    """
+    settings = config_group(config, "history", section)
+    if not settings.enabled:
+        return None
+    return RunHistory(settings.database or DEFAULT_DATABASE)
+
+
+def format_trend(rows):
+    """Table of a trend() result"""
+    lines = [f"{'from':<17}{'n':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+    for start, stats in rows:
+        lines.append(
+            f"{datetime.fromtimestamp(start).strftime('%Y-%m-%d %H:%M'):<17}{stats['n']:>5}"
+            + "".join(f"{stats[key]:>9.3f}" for key in ("p50", "p95", "p99", "max"))
+        )
+    return "\n".join(lines)
+
+
+def format_regressions(regressions):
+    """Table of a regressions() result"""
+    if not regressions:
+        return "No significant slowdown"
+    width = max(len(regression.name) for regression in regressions)
+    lines = [f"{'step':<{width}}  {'baseline p50':>12}  {'recent p50':>10}  {'change':>7}  {'p-value':>8}"]
+    for regression in regressions:
+        lines.append(f"{regression.name:<{width}}  {regression.baseline['p50']:>12.3f}  "
+                     f"{regression.current['p50']:>10.3f}  {regression.change:>+7.0%}  {regression.p_value:>8.4f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Query the run history and detect latency regressions")
+    parser.add_argument("--db", default=DEFAULT_DATABASE, help="History database")
+    commands = parser.add_subparsers(dest="action", required=True)
+    report_parser = commands.add_parser("report", help="Duration percentiles per time bucket")
+    report_parser.add_argument("--flow", required=True, help="Flow name (login, production_check)")
+    report_parser.add_argument("--step", help="Step name (run totals if omitted)")
+    report_parser.add_argument("--device", help="Only runs on this device")
+    report_parser.add_argument("--since", default="7d", help="Window to report, e.g. 12h, 7d, 2w")
+    report_parser.add_argument("--bucket", default="1d", help="Bucket length, e.g. 1h, 1d")
+    check_parser = commands.add_parser("check", help="Flag steps slower than the rolling baseline")
+    check_parser.add_argument("--flow", required=True, help="Flow name (login, production_check)")
+    check_parser.add_argument("--device", help="Only runs on this device")
+    check_parser.add_argument("--recent", default="1d", help="Recent window to check")
+    check_parser.add_argument("--baseline", default="14d", help="Baseline window before the recent one")
+    check_parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level")
+    check_parser.add_argument("--min-change", type=float, default=DEFAULT_MIN_CHANGE,
+                              help="Smallest relative slowdown of the median to flag")
+    args = parser.parse_args(argv)
+
+    history = RunHistory(args.db)
+    if args.action == "report":
+        since = time.time() - parse_duration(args.since)
+        rows = history.trend(args.flow, parse_duration(args.bucket), args.step, since=since, device=args.device)
+        print(format_trend(rows))
+        return 0
+
+    regressions = history.regressions(args.flow, parse_duration(args.recent), parse_duration(args.baseline),
+                                      device=args.device, alpha=args.alpha, min_change=args.min_change)
+    print(format_regressions(regressions))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
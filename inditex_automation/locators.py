@@ -0,0 +1,247 @@
+"""
+Locator compiler for the Inditex automation flows.
+
+Flows declare their locators as XPath, which is the slowest strategy in
+UiAutomator2 because the server serializes the whole hierarchy for every
+lookup. The compiler rewrites each declared XPath, once at load time, into
+the fastest equivalent native strategy:
+
+    //android.widget.TextView[@resource-id='pkg:id/tvTotal']  ->  id
+    //*[@content-desc='Back']                                 ->  accessibility id
+    //android.widget.EditText[@resource-id='idToken7']        ->  -android uiautomator
+    //android.widget.TextView[contains(@text, 'Audits')]      ->  -android uiautomator
+
+Structural queries (nested paths, axes, positions, `or`) keep XPath and are
+listed by optimization_report() so they can be reviewed.
+"""
+
+import re
+from functools import lru_cache
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+_SIMPLE_XPATH = re.compile(r"^//(?P<cls>\*|[A-Za-z_][\w.$]*)(?:\[(?P<predicate>[^\[\]]*)\])?$")
+_CONDITION = re.compile(r"""^(?:
+    @(?P<attr>[\w-]+)\s*=\s*(?P<quote>['"])(?P<value>.*?)(?P=quote)
+  | (?P<func>contains|starts-with)\(\s*@(?P<func_attr>[\w-]+)\s*,\s*
+        (?P<func_quote>['"])(?P<func_value>.*?)(?P=func_quote)\s*\)
+)$""", re.VERBOSE)
+_PLAIN_ID_FRAGMENT = re.compile(r"^[\w:/]+$")
+
+# UiSelector methods per (attribute, comparison)
+_UISELECTOR_METHODS = {
+    ("text", "="): "text",
+    ("text", "contains"): "textContains",
+    ("text", "starts-with"): "textStartsWith",
+    ("content-desc", "="): "description",
+    ("content-desc", "contains"): "descriptionContains",
+    ("content-desc", "starts-with"): "descriptionStartsWith",
+    ("resource-id", "="): "resourceId",
+    ("class", "="): "className",
+    ("package", "="): "packageName",
+}
+_BOOLEAN_ATTRIBUTES = {
+    "checkable": "checkable",
+    "checked": "checked",
+    "clickable": "clickable",
+    "enabled": "enabled",
+    "focusable": "focusable",
+    "focused": "focused",
+    "long-clickable": "longClickable",
+    "scrollable": "scrollable",
+    "selected": "selected",
+}
+
+_REGISTRY = []
+
+
+class Locator:
+    """A declared XPath locator together with its compiled strategy"""
+
+    def __init__(self, name, xpath, by, value, reason=None):
+        """
+        Initialize a compiled locator
+
+        Args:
+            name (str): Name the locator was declared with
+            xpath (str): Original XPath (kept for page snapshot lookups)
+            by (str): Compiled AppiumBy strategy
+            value (str): Compiled locator value
+            reason (str): Why the XPath could not be optimized (None if it was)
+        """
+        self.name = name
+        self.xpath = xpath
+        self.by = by
+        self.value = value
+        self.reason = reason
+
+    @property
+    def optimized(self):
+        """True when the locator no longer uses XPath"""
+        return self.by != AppiumBy.XPATH
+
+    def __iter__(self):
+        # Allows `driver.find_element(*locator)` and `EC.presence_of_element_located(tuple(locator))`
+        yield self.by
+        yield self.value
+
+    def __repr__(self):
+        return f"<Locator {self.name}: {self.by}={self.value!r}>"
+
+
+def _split_conditions(predicate):
+    """Split a predicate on top-level `and`, honouring quoted strings"""
+    parts = []
+    current = []
+    quote = None
+    index = 0
+    while index < len(predicate):
+        char = predicate[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif predicate.startswith(" and ", index):
+            parts.append("".join(current).strip())
+            current = []
+            index += len(" and ")
+            continue
+        elif predicate.startswith(" or ", index):
+            return None
+        current.append(char)
+        index += 1
+    parts.append("".join(current).strip())
+    return parts
+
+
+def _uiselector_string(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def compile_xpath(xpath):
+    """
+    Compile an XPath into the fastest equivalent locator strategy
+
+    Args:
+        xpath (str): XPath locator
+
+    Returns:
+        tuple: (by, value, reason) where reason is None when optimized
+    """
+    match = _SIMPLE_XPATH.match(xpath.strip())
+    if not match:
+        return AppiumBy.XPATH, xpath, "structural query (nested path, axis or position)"
+
+    class_name = match.group("cls")
+    conditions = []
+    predicate = match.group("predicate")
+    if predicate is not None:
+        parts = _split_conditions(predicate)
+        if parts is None:
+            return AppiumBy.XPATH, xpath, "'or' predicate"
+        for part in parts:
+            condition = _CONDITION.match(part)
+            if not condition:
+                return AppiumBy.XPATH, xpath, f"unsupported predicate: {part}"
+            if condition.group("attr"):
+                conditions.append((condition.group("attr"), "=", condition.group("value")))
+            else:
+                conditions.append((condition.group("func_attr"), condition.group("func"),
+                                   condition.group("func_value")))
+
+    # A fully qualified resource-id identifies the view on its own
+    if len(conditions) == 1:
+        attribute, comparison, value = conditions[0]
+        if attribute == "resource-id" and comparison == "=" and ":id/" in value:
+            return AppiumBy.ID, value, None
+        if attribute == "content-desc" and comparison == "=" and class_name == "*":
+            return AppiumBy.ACCESSIBILITY_ID, value, None
+
+    selector = "new UiSelector()"
+    if class_name != "*":
+        selector += f".className({_uiselector_string(class_name)})"
+    for attribute, comparison, value in conditions:
+        method = _UISELECTOR_METHODS.get((attribute, comparison))
+        if method:
+            selector += f".{method}({_uiselector_string(value)})"
+        elif attribute == "resource-id" and _PLAIN_ID_FRAGMENT.match(value):
+            pattern = f".*{value}.*" if comparison == "contains" else f"{value}.*"
+            selector += f".resourceIdMatches({_uiselector_string(pattern)})"
+        elif attribute in _BOOLEAN_ATTRIBUTES and comparison == "=" and value in ("true", "false"):
+            selector += f".{_BOOLEAN_ATTRIBUTES[attribute]}({value})"
+        else:
+            return AppiumBy.XPATH, xpath, f"no native equivalent for {comparison} on @{attribute}"
+    return AppiumBy.ANDROID_UIAUTOMATOR, selector, None
+
+
+@lru_cache(maxsize=256)
+def compile_locator(xpath, name=None):
+    """
+    Compile a single (possibly dynamic) XPath into a Locator
+
+    Args:
+        xpath (str): XPath locator
+        name (str): Optional name for reports (defaults to the XPath)
+
+    Returns:
+        Locator
+    """
+    by, value, reason = compile_xpath(xpath)
+    return Locator(name or xpath, xpath, by, value, reason)
+
+
+class LocatorSet:
+    """Named group of locators compiled when the set is declared"""
+
+    def __init__(self, name, **xpaths):
+        """
+        Compile and register a group of locators
+
+        Args:
+            name (str): Name of the set used in reports (e.g. 'login')
+            **xpaths (str): Locator name to XPath
+        """
+        self.name = name
+        self._locators = {
+            key: compile_locator(xpath, f"{name}.{key}") for key, xpath in xpaths.items()
+        }
+        _REGISTRY.append(self)
+
+    def __getattr__(self, key):
+        try:
+            return self.__dict__["_locators"][key]
+        except KeyError:
+            raise AttributeError(f"Unknown locator '{key}' in set '{self.name}'") from None
+
+    def __getitem__(self, key):
+        return self._locators[key]
+
+    def __iter__(self):
+        return iter(self._locators.values())
+
+    def unoptimized(self):
+        """
+        Get the locators that still use XPath
+
+        Returns:
+            list of Locator
+        """
+        return [locator for locator in self if not locator.optimized]
+
+
+def optimization_report():
+    """
+    Describe how every declared locator was compiled
+
+    Returns:
+        list of str: One line per locator, unoptimized ones flagged with the reason
+    """
+    lines = []
+    for locator_set in _REGISTRY:
+        for locator in locator_set:
+            if locator.optimized:
+                lines.append(f"OK    {locator.name}: {locator.by} -> {locator.value}")
+            else:
+                lines.append(f"XPATH {locator.name}: {locator.xpath} ({locator.reason})")
+    return lines
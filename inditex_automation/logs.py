@@ -0,0 +1,281 @@
+"""
+Queue-based logging shared by every entry point.
+
+configure_logging() installs a single QueueHandler on the root logger. The
+flow threads only put records on an in-memory queue; a QueueListener thread
+formats them and does the console and file I/O, so a slow disk or terminal
+never blocks a WebDriver step.
+
+The log file rotates by size, can be written as JSON lines, and can be made
+per run (a timestamp and pid in the file name) so parallel processes don't
+interleave their writes. Per-device files are attached with add_handler();
+records are tagged with the device set via device_context(), which works for
+worker threads and asyncio tasks alike.
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from inditex_automation.config import config_group
+
+DEFAULT_LOG_FILE = "inditex_automation.log"
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+_current_device = contextvars.ContextVar("inditex_device", default=None)
+_lock = threading.Lock()
+_listener = None
+_queue_handler = None
+_settings = {}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        device = getattr(record, "device", None)
+        if device:
+            entry["device"] = device
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def create_formatter(json_lines=None):
+    """
+    Formatter matching the configured output format
+
+    Args:
+        json_lines (bool): Force JSON lines (True) or text (False); configured format if None
+    """
+    if json_lines is None:
+        json_lines = _settings.get("json_lines", False)
+    return JsonLinesFormatter() if json_lines else logging.Formatter(TEXT_FORMAT)
+
+
+class _DeviceTagFilter(logging.Filter):
+    """Stamp records with the current device before they leave the emitting context"""
+
+    def filter(self, record):
+        if not hasattr(record, "device"):
+            record.device = _current_device.get()
+        return True
+
+
+class DeviceFilter(logging.Filter):
+    """Only pass records emitted while the given device was current"""
+
+    def __init__(self, device_name):
+        super().__init__()
+        self.device_name = device_name
+
+    def filter(self, record):
+        device = getattr(record, "device", None)
+        if device is None:
+            device = _current_device.get()
+        return device == self.device_name
+
+
+@contextmanager
+def device_context(device_name):
+    """Tag every record logged inside the block (thread or asyncio task) with a device"""
+    token = _current_device.set(device_name)
+    try:
+        yield
+    finally:
+        _current_device.reset(token)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves the formatting, tracebacks included, to the listener"""
+
+    def prepare(self, record):
+        # The stock prepare() formats the record here and drops exc_info, so the
+        # listener's formatters (e.g. the JSON "exception" field) never saw it.
+        # Only the message arguments are merged; they may not survive a thread hop.
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        return record
+
+
+class _Listener(logging.handlers.QueueListener):
+    """QueueListener that also acknowledges flush markers"""
+
+    def handle(self, record):
+        marker = getattr(record, "flush_marker", None)
+        if marker is not None:
+            marker.set()
+            return
+        super().handle(record)
+
+
+def _per_run_name(log_file):
+    stem, extension = os.path.splitext(log_file)
+    return f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}{extension}"
+
+
+def create_file_handler(log_file, json_lines=None, max_bytes=None, backup_count=None):
+    """
+    Size-rotated log file handler with the configured format and rotation
+
+    Args:
+        log_file (str): Log file path
+        json_lines (bool): Force JSON lines (True) or text (False); configured format if None
+        max_bytes (int): Rotation size; configured size if None
+        backup_count (int): Rotated files to keep; configured count if None
+    """
+    if max_bytes is None:
+        max_bytes = _settings.get("max_bytes", DEFAULT_MAX_BYTES)
+    if backup_count is None:
+        backup_count = _settings.get("backup_count", DEFAULT_BACKUP_COUNT)
+    handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    handler.setFormatter(create_formatter(json_lines))
+    return handler
+
+
+def configure_logging(log_file=DEFAULT_LOG_FILE, level=logging.INFO, json_lines=False, console=True,
+                      max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT, per_run=False):
+    """
+    Route all logging through a background listener (first call wins, like basicConfig)
+
+    Args:
+        log_file (str): Log file path (no file if empty or None)
+        level (int or str): Root log level
+        json_lines (bool): Write the file as one JSON object per line
+        console (bool): Also log to stdout
+        max_bytes (int): Rotate the file when it reaches this size (0 never rotates)
+        backup_count (int): Rotated files to keep
+        per_run (bool): Add a timestamp and the pid to the file name
+
+    Returns:
+        str: Path of the log file in use (None without a file)
+    """
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is not None:
+            return _settings.get("log_file")
+
+        if per_run and log_file:
+            log_file = _per_run_name(log_file)
+        _settings.update(log_file=log_file or None, json_lines=json_lines,
+                         max_bytes=max_bytes, backup_count=backup_count)
+
+        handlers = []
+        if log_file:
+            directory = os.path.dirname(log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handlers.append(create_file_handler(log_file, json_lines, max_bytes, backup_count))
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+            handlers.append(console_handler)
+
+        _queue_handler = _QueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(_DeviceTagFilter())
+        root = logging.getLogger()
+        root.addHandler(_queue_handler)
+        root.setLevel(level if isinstance(level, int) else logging.getLevelName(str(level).upper()))
+
+        _listener = _Listener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _settings["log_file"]
+
+
+def logging_settings(config, section="LOGGING"):
+    """
+    Read configure_logging() keyword arguments from a config
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        section (str): Section holding the logging settings
+
+    Returns:
+        dict: Keyword arguments for configure_logging()
+    """
+    settings = config_group(config, "logging", section)
+    return {
+        "log_file": DEFAULT_LOG_FILE if settings.file is None else settings.file,
+        "level": settings.level,
+        "json_lines": settings.format.strip().lower() == "json",
+        "max_bytes": DEFAULT_MAX_BYTES if settings.max_bytes is None else settings.max_bytes,
+        "backup_count": DEFAULT_BACKUP_COUNT if settings.backup_count is None else settings.backup_count,
+        "per_run": settings.per_run,
+    }
+
+
+def add_handler(handler):
+    """
+    Attach an extra handler (e.g. a per-device file) off the hot path
+
+    With configure_logging() active the handler runs on the listener thread;
+    otherwise it is added to the root logger.
+    """
+    with _lock:
+        if _listener is not None:
+            _listener.handlers = _listener.handlers + (handler,)
+            return
+    logging.getLogger().addHandler(handler)
+
+
+def remove_handler(handler):
+    """Detach a handler added with add_handler() once its pending records are written"""
+    flush()
+    with _lock:
+        if _listener is not None and handler in _listener.handlers:
+            _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+            return
+    logging.getLogger().removeHandler(handler)
+
+
+def flush(timeout=5.0):
+    """
+    Wait until every record queued so far has been handled
+
+    Returns:
+        bool: False if the listener did not catch up within the timeout
+    """
+    with _lock:
+        listener = _listener
+    if listener is None:
+        return True
+    marker = threading.Event()
+    record = logging.makeLogRecord({"flush_marker": marker})
+    listener.queue.put_nowait(record)
+    return marker.wait(timeout)
+
+
+def shutdown_logging():
+    """Drain the queue, stop the listener and remove the queue handler"""
+    global _listener, _queue_handler
+    with _lock:
+        listener, _listener = _listener, None
+        handler, _queue_handler = _queue_handler, None
+        _settings.clear()
+    if listener is None:
+        return
+    logging.getLogger().removeHandler(handler)
+    listener.stop()
+    for target in listener.handlers:
+        target.close()
@@ -0,0 +1,231 @@
+"""
+Shortcut navigation with deep links and activity intents.
+
+Reaching a screen deep in the app by tapping through every screen before it
+costs a lookup, a tap and a screen render per step. When the app can open
+the screen directly, a single `mobile: deepLink` or `mobile: startActivity`
+call replaces all of them.
+
+Whether a shortcut works depends on the app build (exported activities,
+registered URL schemes), so ShortcutNavigator finds out the first time a
+shortcut is used - it counts as supported only if the target screen shows
+up - and remembers the answer per app package and version in a small JSON
+cache. Unsupported shortcuts are never tried again for that version and the
+caller falls back to tap navigation.
+
+The app version is read with `mobile: shell` (dumpsys package), which needs
+the Appium server's adb_shell insecure feature. Without it the results are
+only kept for the lifetime of the process.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+from inditex_automation.config import config_group
+
+logger = logging.getLogger(__name__)
+
+_VERSION_PATTERN = re.compile(r"versionName=(\S+)")
+
+# Results of detections whose app version is unknown, kept per process
+_process_cache = {}
+_cache_lock = threading.Lock()
+
+
+def read_app_version(driver, app_package):
+    """
+    Read the installed version of an app with mobile: shell (dumpsys package)
+
+    Args:
+        driver: Appium WebDriver instance
+        app_package (str): Application package
+
+    Returns:
+        str or None: versionName, or None if it cannot be read
+    """
+    try:
+        output = driver.execute_script("mobile: shell", {"command": "dumpsys", "args": ["package", app_package]})
+    except WebDriverException as e:
+        logger.debug(f"App version not available: {e}")
+        return None
+    match = _VERSION_PATTERN.search(output or "")
+    return match.group(1) if match else None
+
+
+class Shortcut:
+    """A way to open one screen of the app directly"""
+
+    def __init__(self, name, screen, url=None, activity=None, extras=None):
+        """
+        Initialize a shortcut
+
+        Args:
+            name (str): Shortcut name used in the cache
+            screen (str): Screen name (of a ScreenClassifier) the shortcut opens
+            url (str): Deep link template, e.g. 'itrace://audits/{audit_id}'
+            activity (str): Activity to start instead of a deep link, e.g. '.AuditActivity'
+            extras (dict): Intent string extras for the activity (values are templates)
+        """
+        if not url and not activity:
+            raise ValueError(f"Shortcut {name} needs a deep link or an activity")
+        self.name = name
+        self.screen = screen
+        self.url = url
+        self.activity = activity
+        self.extras = extras or {}
+
+    def open(self, driver, app_package, **params):
+        """
+        Fire the deep link or intent
+
+        Args:
+            driver: Appium WebDriver instance
+            app_package (str): Application package
+            **params: Values for the placeholders of the url and extras
+        """
+        if self.url:
+            driver.execute_script("mobile: deepLink", {
+                "url": self.url.format(**params), "package": app_package, "waitForLaunch": False
+            })
+        else:
+            driver.execute_script("mobile: startActivity", {
+                "intent": f"{app_package}/{self.activity}",
+                "extras": [["s", key, value.format(**params)] for key, value in self.extras.items()],
+            })
+
+
+class ShortcutNavigator:
+    """Opens screens through shortcuts the app version is known to support"""
+
+    def __init__(self, driver, app_package, shortcuts, waits, classifier, cache_file=None,
+                 settle_timeout=2):
+        """
+        Initialize the navigator
+
+        Args:
+            driver: Appium WebDriver instance
+            app_package (str): Application package
+            shortcuts (list of Shortcut): Available shortcuts
+            waits (WaitEngine): Engine used to wait for the target screen
+            classifier (ScreenClassifier): Recognises the target screens
+            cache_file (str): JSON file remembering supported shortcuts per app version
+                (only kept in memory if None)
+            settle_timeout (float): Seconds the target screen has to show up
+        """
+        self.driver = driver
+        self.app_package = app_package
+        self.shortcuts = {shortcut.name: shortcut for shortcut in shortcuts}
+        self.waits = waits
+        self.classifier = classifier
+        self.cache_file = cache_file
+        self.settle_timeout = settle_timeout
+        self._version = None
+
+    def app_version(self):
+        """
+        Installed version of the app (read once)
+
+        Returns:
+            str or None: versionName, or None if it cannot be read
+        """
+        if self._version is None:
+            self._version = read_app_version(self.driver, self.app_package) or ""
+        return self._version or None
+
+    def _cache_key(self):
+        return f"{self.app_package}@{self.app_version() or 'unknown'}"
+
+    def _load(self):
+        if not self.cache_file or not self.app_version() or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable navigation cache {self.cache_file}: {e}")
+            return {}
+
+    def supported(self, name):
+        """
+        Cached detection result for a shortcut
+
+        Returns:
+            bool or None: None if the shortcut has not been tried on this app version
+        """
+        key = self._cache_key()
+        with _cache_lock:
+            results = _process_cache.get(key)
+            if results is None:
+                results = _process_cache[key] = self._load().get(key, {})
+            return results.get(name)
+
+    def _remember(self, name, supported):
+        key = self._cache_key()
+        with _cache_lock:
+            _process_cache.setdefault(key, {})[name] = supported
+            if not self.cache_file or not self.app_version():
+                return
+            try:
+                data = self._load()
+                data.setdefault(key, {})[name] = supported
+                directory = os.path.dirname(self.cache_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                temporary = f"{self.cache_file}.{os.getpid()}.tmp"
+                with open(temporary, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, sort_keys=True)
+                os.replace(temporary, self.cache_file)
+            except OSError as e:
+                logger.warning(f"Could not write navigation cache {self.cache_file}: {e}")
+
+    def open(self, name, **params):
+        """
+        Open a screen through a shortcut unless it is known not to work
+
+        Args:
+            name (str): Shortcut name
+            **params: Values for the shortcut's placeholders
+
+        Returns:
+            bool: True if the target screen is shown; False means the caller
+                has to navigate by tapping
+        """
+        shortcut = self.shortcuts[name]
+        if self.supported(name) is False:
+            return False
+
+        detecting = self.supported(name) is None
+        try:
+            shortcut.open(self.driver, self.app_package, **params)
+            shown = self.waits.settle(self.classifier.shows(shortcut.screen), self.settle_timeout,
+                                      f"{shortcut.screen} opened by shortcut")
+        except WebDriverException as e:
+            logger.info(f"Shortcut {name} failed: {str(e).strip()}")
+            shown = None
+        if detecting:
+            version = self.app_version() or "unknown version"
+            logger.info(f"Shortcut {name} {'is' if shown else 'is not'} supported by {self.app_package} {version}")
+            self._remember(name, bool(shown))
+        elif not shown:
+            logger.warning(f"Shortcut {name} did not open {shortcut.screen}; falling back to tap navigation")
+        return bool(shown)
+
+
+def navigation_settings(config, section="NAVIGATION"):
+    """
+    Read the shortcut navigation settings
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        section (str): Section holding the settings
+
+    Returns:
+        tuple: (shortcuts enabled (bool), cache file or None)
+    """
+    settings = config_group(config, "navigation", section)
+    return settings.shortcuts, settings.cache_file.strip() or None
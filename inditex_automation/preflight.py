@@ -0,0 +1,255 @@
+"""
+Fail-fast health checks before a run.
+
+A dead Appium server, an unplugged device or a missing app otherwise show up
+as a setup_driver failure after the session creation timeout, once per run.
+Preflight checks them up front and in parallel, each with a short timeout:
+
+- server: GET <server>/status answers with ready
+- device: ``adb get-state`` reports the device (any attached device without a udid)
+- app: ``adb shell pm path`` finds the package on the device
+
+The device and app checks need the local adb and are skipped for servers on
+other hosts or when adb is not installed. Healthy results are cached in a
+small JSON file for a few seconds, so back-to-back runs do not repeat them.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+from inditex_automation.config import config_group
+
+logger = logging.getLogger(__name__)
+
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+CACHED = "cached"
+
+
+class CheckResult:
+    """Outcome of one preflight check"""
+
+    def __init__(self, name, status, detail="", duration=0.0):
+        self.name = name
+        self.status = status
+        self.detail = detail
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.status != FAILED
+
+    def __repr__(self):
+        return f"<CheckResult {self.name} {self.status}>"
+
+
+class PreflightReport:
+    """Results of all checks of one preflight"""
+
+    def __init__(self, results, duration):
+        self.results = results
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return all(result.ok for result in self.results)
+
+    @property
+    def failures(self):
+        return [result for result in self.results if not result.ok]
+
+    def format(self):
+        """One line per check"""
+        lines = []
+        for result in self.results:
+            detail = f" - {result.detail}" if result.detail else ""
+            lines.append(f"{result.status.upper():<8}{result.name}{detail}")
+        lines.append(f"Preflight {'passed' if self.ok else 'FAILED'} in {self.duration:.2f}s")
+        return "\n".join(lines)
+
+
+class Preflight:
+    """Runs the server, device and app checks in parallel"""
+
+    def __init__(self, timeout=0.8, cache_file=None, ttl=30, adb="adb", run=subprocess.run):
+        """
+        Initialize the preflight
+
+        Args:
+            timeout (float): Seconds the whole preflight may take; checks still
+                running then fail
+            cache_file (str): JSON file remembering healthy checks (no caching if None)
+            ttl (float): Seconds a healthy result stays valid
+            adb (str): adb executable
+            run: subprocess.run compatible function (replaced in tests)
+        """
+        self.timeout = timeout
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.adb = adb
+        self.run = run
+
+    # -- checks ----------------------------------------------------------------
+
+    def check_server(self, server_url):
+        """Appium /status reports the server ready"""
+        try:
+            with urllib.request.urlopen(f"{server_url.rstrip('/')}/status", timeout=self.timeout) as response:
+                value = json.loads(response.read()).get("value", {})
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return FAILED, f"{server_url} not reachable: {getattr(e, 'reason', e)}"
+        if value.get("ready") is False:
+            return FAILED, f"{server_url} not ready: {value.get('message', '')}"
+        version = value.get("build", {}).get("version")
+        return PASSED, f"Appium {version}" if version else server_url
+
+    def _adb(self, udid, *args):
+        command = [self.adb] + (["-s", udid] if udid else []) + list(args)
+        result = self.run(command, capture_output=True, text=True, timeout=self.timeout)
+        return result.returncode, (result.stdout or "").strip(), (result.stderr or "").strip()
+
+    def check_device(self, udid):
+        """adb sees the device"""
+        if udid:
+            code, output, error = self._adb(udid, "get-state")
+            if code != 0 or output != "device":
+                return FAILED, f"{udid} not available: {error or output or 'no answer'}"
+            return PASSED, udid
+        _, output, _ = self._adb(None, "devices")
+        attached = [line.split()[0] for line in output.splitlines()[1:] if line.strip().endswith("device")]
+        if not attached:
+            return FAILED, "no device attached"
+        return PASSED, ", ".join(attached)
+
+    def check_app(self, udid, package):
+        """The app package is installed on the device"""
+        code, output, error = self._adb(udid, "shell", "pm", "path", package)
+        if code != 0 or not output.startswith("package:"):
+            return FAILED, f"{package} not installed on {udid or 'the device'}: {error or output or 'not found'}"
+        return PASSED, package
+
+    def _guarded(self, check, *args):
+        started = time.perf_counter()
+        try:
+            status, detail = check(*args)
+        except FileNotFoundError:
+            status, detail = SKIPPED, f"{self.adb} not found"
+        except subprocess.TimeoutExpired:
+            status, detail = FAILED, f"no answer within {self.timeout}s"
+        except Exception as e:
+            status, detail = FAILED, str(e)
+        return status, detail, time.perf_counter() - started
+
+    # -- running ---------------------------------------------------------------
+
+    def plan(self, targets):
+        """
+        Checks needed for the given targets, each check once
+
+        Args:
+            targets (list): (server URL, udid or None, app package) tuples
+
+        Returns:
+            dict: Check name -> (check method, args)
+        """
+        checks = {}
+        for server_url, udid, package in targets:
+            checks.setdefault(f"server {server_url}", (self.check_server, (server_url,)))
+            if urlsplit(server_url).hostname not in LOCAL_HOSTS:
+                continue
+            device = udid or "default device"
+            checks.setdefault(f"device {device}", (self.check_device, (udid,)))
+            if package:
+                checks.setdefault(f"app {package} on {device}", (self.check_app, (udid, package)))
+        return checks
+
+    def _load_cache(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache):
+        try:
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            logger.debug(f"Could not write preflight cache {self.cache_file}: {e}")
+
+    def check(self, targets):
+        """
+        Run the checks for the given targets
+
+        Args:
+            targets (list): (server URL, udid or None, app package) tuples
+
+        Returns:
+            PreflightReport
+        """
+        started = time.perf_counter()
+        now = time.time()
+        cache = {name: checked for name, checked in self._load_cache().items() if now - checked < self.ttl}
+        results = {}
+        pending = {}
+        for name, (check, args) in self.plan(targets).items():
+            if name in cache:
+                results[name] = CheckResult(name, CACHED, f"healthy {now - cache[name]:.0f}s ago")
+            else:
+                pending[name] = (check, args)
+
+        if pending:
+            executor = ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="preflight")
+            futures = {executor.submit(self._guarded, check, *args): name for name, (check, args) in pending.items()}
+            healthy = False
+            done, _ = wait(futures, timeout=self.timeout)
+            # Do not wait for hung checks; their threads end with their own timeouts
+            executor.shutdown(wait=False)
+            for future, name in futures.items():
+                if future in done:
+                    status, detail, duration = future.result()
+                    results[name] = CheckResult(name, status, detail, duration)
+                    if status == PASSED:
+                        cache[name] = now
+                        healthy = True
+                else:
+                    results[name] = CheckResult(name, FAILED, f"no answer within {self.timeout}s", self.timeout)
+            if self.cache_file and healthy:
+                self._save_cache(cache)
+
+        ordered = [results[name] for name in self.plan(targets)]
+        return PreflightReport(ordered, time.perf_counter() - started)
+
+
+def preflight_from_config(config, section="PREFLIGHT"):
+    """
+    Build a preflight from a configparser-like object
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        section (str): Section holding the preflight settings
+
+    Returns:
+        Preflight, or None if the section disables it
+    """
+    settings = config_group(config, "preflight", section)
+    if not settings.enabled:
+        return None
+    return Preflight(
+        timeout=settings.timeout,
+        cache_file=settings.cache_file or None,
+        ttl=settings.ttl,
+        adb=settings.adb,
+    )
@@ -0,0 +1,365 @@
+"""
+Record and replay the WebDriver command stream of a flow.
+
+CommandRecorder is a command listener (see commands.instrument) writing every
+command a run sends - name, parameters, response and latency - as gzipped
+JSON lines. Text typed into fields, pushed and pulled app data and any
+registered secret (user name, password) are replaced by '***'; large
+responses such as page sources and screenshots are stored as a digest and
+length only.
+
+A recording can be summarised (command counts and latency percentiles, the
+simulated replay), compared with the recording of another release, or
+re-executed against a server:
+
+    python -m inditex_automation.recording summary recordings/login_20250101_120000_000000.commands.jsonl.gz
+    python -m inditex_automation.recording diff old.commands.jsonl.gz new.commands.jsonl.gz
+    python -m inditex_automation.recording replay run.commands.jsonl.gz --server http://127.0.0.1:4723
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from inditex_automation.benchmark import summarize
+from inditex_automation.config import config_group
+
+FORMAT = "commands/1"
+REDACTED = "***"
+# Responses longer than this are stored as a digest
+MAX_INLINE = 1024
+# W3C element reference key in requests and responses
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# Parameters holding typed text or app data
+_TYPED_COMMANDS = {"sendKeysToElement", "setValue", "replaceValue"}
+_SECRET_PARAMS = {"payload"}
+# Scripts whose response is app data (session tokens)
+_SECRET_SCRIPTS = {"mobile: pullFile", "mobile: pullFolder"}
+# Commands that end the session, never replayed
+_SESSION_COMMANDS = {"newSession", "quit"}
+
+
+def _describe(error):
+    return f"{type(error).__name__}: {error}".splitlines()[0]
+
+
+def _error_response(response):
+    """Error of a W3C error response (the executor returns them, WebDriver.execute raises)"""
+    value = response.get("value") if isinstance(response, dict) else None
+    if isinstance(value, dict) and "error" in value:
+        return f"{value['error']}: {value.get('message', '')}".splitlines()[0]
+    return None
+
+
+def command_label(command, params):
+    """Name a command for summaries; scripts are named after the script"""
+    script = (params or {}).get("script")
+    if script:
+        return f"{command}[{script}]"
+    return command
+
+
+class CommandRecorder:
+    """Command listener writing a compact recording of the stream"""
+
+    def __init__(self, path, flow, run_id=None, capabilities=None, secrets=()):
+        """
+        Start a recording
+
+        Args:
+            path (str): File to write (gzipped JSON lines)
+            flow (str): Flow name stored in the header
+            run_id (str): Run the recording belongs to (e.g. RunTimer.run_id)
+            capabilities (dict): Session capabilities, used to create a session on replay
+            secrets (iterable of str): Values to redact wherever they appear
+        """
+        self.path = path
+        self.secrets = set()
+        self.add_secrets(*secrets)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._started = time.time()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write({
+            "format": FORMAT, "flow": flow, "run_id": run_id,
+            "started": datetime.fromtimestamp(self._started).isoformat(timespec="seconds"),
+            "capabilities": self._compact(capabilities or {}),
+        })
+
+    def add_secrets(self, *values):
+        """Redact these values (e.g. credentials known only at run time) from now on"""
+        self.secrets.update(str(value) for value in values if value)
+
+    def _redact_text(self, text):
+        for secret in self.secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+    def _compact(self, value):
+        if isinstance(value, str):
+            value = self._redact_text(value)
+            if len(value) > MAX_INLINE:
+                return {"$digest": hashlib.sha1(value.encode("utf-8")).hexdigest()[:12], "$length": len(value)}
+            return value
+        if isinstance(value, dict):
+            return {key: REDACTED if key in _SECRET_PARAMS else self._compact(item)
+                    for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._compact(item) for item in value]
+        return value
+
+    def _params(self, command, params):
+        params = {key: value for key, value in (params or {}).items() if key != "sessionId"}
+        if command in _TYPED_COMMANDS:
+            params = {key: REDACTED if key in ("text", "value") else value for key, value in params.items()}
+        return self._compact(params)
+
+    def _response(self, command, params, response):
+        value = response.get("value") if isinstance(response, dict) else response
+        if (params or {}).get("script") in _SECRET_SCRIPTS and value is not None:
+            return REDACTED
+        return self._compact(value)
+
+    def command_finished(self, event):
+        record = {
+            "at": round(event.started - self._started, 4),
+            "command": event.command,
+            "params": self._params(event.command, event.params),
+            "duration": round(event.duration, 6),
+        }
+        error = event.error if event.error is not None else _error_response(event.response)
+        if error is not None:
+            record["error"] = self._redact_text(error if isinstance(error, str) else _describe(error))
+        else:
+            record["response"] = self._response(event.command, event.params, event.response)
+        with self._lock:
+            if self._file is not None:
+                self._write(record)
+                self.count += 1
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+
+    def close(self):
+        """Finish the file (commands sent afterwards are not recorded)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        return self.path
+
+
+def recorder_from_config(config, driver, flow, run_id, secrets=(), section="RECORDING"):
+    """
+    Start a recording if the config enables it
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        driver: Driver whose capabilities go into the header
+        flow (str): Flow name
+        run_id (str): Run id used as the file name
+        secrets (iterable of str): Values to redact
+        section (str): Section holding the recording settings
+
+    Returns:
+        CommandRecorder or None
+    """
+    settings = config_group(config, "recording", section)
+    if not settings.enabled:
+        return None
+    path = os.path.join(settings.directory, f"{run_id}.commands.jsonl.gz")
+    return CommandRecorder(path, flow, run_id, getattr(driver, "capabilities", None), secrets)
+
+
+def load(path):
+    """
+    Read a recording
+
+    Args:
+        path (str): Recording file (gzipped or plain JSON lines)
+
+    Returns:
+        tuple: (header dict, list of command records)
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("format") != FORMAT:
+        raise ValueError(f"{path} is not a command recording")
+    return lines[0], lines[1:]
+
+
+def command_stats(records):
+    """
+    Command counts and latency distribution per command
+
+    Args:
+        records (list): Command records of a recording or a replay
+
+    Returns:
+        dict: Label -> benchmark.summarize() stats (seconds) plus the error count
+    """
+    durations = {}
+    errors = {}
+    for record in records:
+        label = command_label(record["command"], record.get("params"))
+        durations.setdefault(label, []).append(record["duration"])
+        errors[label] = errors.get(label, 0) + ("error" in record)
+    stats = {}
+    for label in sorted(durations):
+        stats[label] = summarize(durations[label])
+        stats[label]["errors"] = errors[label]
+    return stats
+
+
+def format_stats(stats):
+    """Table of command counts and p50/p95/max latency in milliseconds"""
+    lines = [f"{'command':<48}{'n':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+    for label, item in stats.items():
+        lines.append(f"{label:<48}{item['n']:>6}{item['errors']:>8}{item['p50'] * 1000:>10.2f}"
+                     f"{item['p95'] * 1000:>10.2f}{item['max'] * 1000:>10.2f}")
+    lines.append(f"{'total':<48}{sum(item['n'] for item in stats.values()):>6}")
+    return "\n".join(lines)
+
+
+def diff_stats(baseline, current):
+    """
+    Compare the command stats of two recordings
+
+    Returns:
+        list: (label, baseline count, current count, baseline p50, current p50)
+            for every command whose count changed, largest change first
+    """
+    rows = []
+    for label in sorted(set(baseline) | set(current)):
+        before, after = baseline.get(label, {}), current.get(label, {})
+        if before.get("n", 0) != after.get("n", 0):
+            rows.append((label, before.get("n", 0), after.get("n", 0), before.get("p50"), after.get("p50")))
+    return sorted(rows, key=lambda row: -abs(row[2] - row[1]))
+
+
+def format_diff(rows, baseline_total, current_total):
+    """Table of the changed command counts"""
+    change = f"{(current_total / baseline_total - 1) * 100:+.0f}%" if baseline_total else "n/a"
+    lines = [f"commands: {baseline_total} -> {current_total} ({change})"]
+    if not rows:
+        lines.append("No command count changed")
+        return "\n".join(lines)
+    lines.append(f"{'command':<48}{'before':>8}{'after':>8}{'p50 ms before':>15}{'p50 ms after':>14}")
+    for label, before, after, p50_before, p50_after in rows:
+        def ms(value):
+            return f"{value * 1000:.2f}" if value is not None else "-"
+        lines.append(f"{label:<48}{before:>8}{after:>8}{ms(p50_before):>15}{ms(p50_after):>14}")
+    return "\n".join(lines)
+
+
+def _element_ids(recorded, replayed, mapping):
+    """Pair the element references of a recorded and a replayed response"""
+    if isinstance(recorded, dict) and isinstance(replayed, dict):
+        if ELEMENT_KEY in recorded and ELEMENT_KEY in replayed:
+            mapping[recorded[ELEMENT_KEY]] = replayed[ELEMENT_KEY]
+            return
+        for key in recorded.keys() & replayed.keys():
+            _element_ids(recorded[key], replayed[key], mapping)
+    elif isinstance(recorded, list) and isinstance(replayed, list):
+        for recorded_item, replayed_item in zip(recorded, replayed):
+            _element_ids(recorded_item, replayed_item, mapping)
+
+
+def _substitute(value, mapping):
+    if isinstance(value, str):
+        return mapping.get(value, value)
+    if isinstance(value, dict):
+        return {key: _substitute(item, mapping) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, mapping) for item in value]
+    return value
+
+
+def replay(records, driver):
+    """
+    Re-execute a recorded stream on a live session
+
+    Element ids of the recording are mapped to the ids the new session
+    returns. Redacted text is typed as '***', so screens behind a login only
+    replay faithfully on an app that is already logged in.
+
+    Args:
+        records (list): Command records from load()
+        driver: WebDriver session to send the commands to
+
+    Returns:
+        list: Records of the replayed commands with their new latency
+    """
+    executor = driver.command_executor
+    mapping = {}
+    replayed = []
+    for record in records:
+        if record["command"] in _SESSION_COMMANDS:
+            continue
+        params = _substitute(record.get("params") or {}, mapping)
+        params["sessionId"] = driver.session_id
+        result = {"command": record["command"], "params": record.get("params")}
+        started = time.perf_counter()
+        try:
+            response = executor.execute(record["command"], params)
+            error = _error_response(response)
+            if error is not None:
+                result["error"] = error
+            else:
+                _element_ids(record.get("response"), (response or {}).get("value"), mapping)
+        except Exception as e:
+            result["error"] = _describe(e)
+        result["duration"] = time.perf_counter() - started
+        replayed.append(result)
+    return replayed
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Summarise, compare or replay WebDriver command recordings")
+    commands = parser.add_subparsers(dest="action", required=True)
+    summary_parser = commands.add_parser("summary", help="Command counts and latencies of a recording")
+    summary_parser.add_argument("recording")
+    diff_parser = commands.add_parser("diff", help="Commands whose count changed between two recordings")
+    diff_parser.add_argument("baseline")
+    diff_parser.add_argument("current")
+    replay_parser = commands.add_parser("replay", help="Re-execute a recording on a new session")
+    replay_parser.add_argument("recording")
+    replay_parser.add_argument("--server", required=True, help="Appium server URL")
+    args = parser.parse_args(argv)
+
+    if args.action == "summary":
+        header, records = load(args.recording)
+        print(f"{header['flow']} run {header.get('run_id')} ({header.get('started')})")
+        print(format_stats(command_stats(records)))
+        return
+
+    if args.action == "diff":
+        _, baseline = load(args.baseline)
+        _, current = load(args.current)
+        print(format_diff(diff_stats(command_stats(baseline), command_stats(current)), len(baseline), len(current)))
+        return
+
+    from appium import webdriver
+    from appium.options.common import AppiumOptions
+
+    header, records = load(args.recording)
+    driver = webdriver.Remote(args.server, options=AppiumOptions().load_capabilities(header["capabilities"]))
+    try:
+        print(format_stats(command_stats(replay(records, driver))))
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Screen recognition and resumable flows.
+
+A ScreenClassifier fingerprints the screen the app is on from a single page
+source dump: each known screen is described by anchor locators that must all
+be present, and screens are tried in order so that more specific ones (e.g.
+the confirm units tab) are listed before the screens they extend.
+
+A FlowGraph lists the steps of a flow with the screen each step starts from.
+Given the classified screen it returns only the steps still needed, so a run
+that finds the app half way through the flow (a warm session, a retry after
+a failure) continues from there instead of waiting for a screen that is not
+coming back.
+"""
+
+from inditex_automation.snapshot import PageSnapshot
+
+UNKNOWN_SCREEN = "unknown"
+
+
+def _xpath(anchor):
+    """XPath of an anchor given as a string or a compiled Locator"""
+    return getattr(anchor, "xpath", anchor)
+
+
+class ScreenClassifier:
+    """Identifies the current screen from anchor locators"""
+
+    def __init__(self, screens):
+        """
+        Initialize the classifier
+
+        Args:
+            screens (list): (screen name, anchors) pairs in matching order; the
+                anchors are XPaths or Locators that must all be present
+        """
+        self.screens = [(name, tuple(_xpath(anchor) for anchor in anchors)) for name, anchors in screens]
+
+    @property
+    def names(self):
+        """Names of the known screens in matching order"""
+        return [name for name, _ in self.screens]
+
+    def classify(self, snapshot):
+        """
+        Identify the screen shown in a snapshot
+
+        Args:
+            snapshot (PageSnapshot): Page source to inspect
+
+        Returns:
+            str: Screen name, or UNKNOWN_SCREEN if no screen matches
+        """
+        for name, anchors in self.screens:
+            if all(snapshot.exists(anchor) for anchor in anchors):
+                return name
+        return UNKNOWN_SCREEN
+
+    def identify(self, driver):
+        """
+        Capture one page source and identify the screen
+
+        Args:
+            driver: Appium WebDriver instance
+
+        Returns:
+            tuple: (screen name, PageSnapshot)
+        """
+        snapshot = PageSnapshot.capture(driver)
+        return self.classify(snapshot), snapshot
+
+    def shows(self, *names):
+        """
+        Wait condition that is met once one of the given screens is shown
+
+        Args:
+            *names (str): Screen names to wait for
+
+        Returns:
+            callable: Condition returning the screen name once shown, else False
+        """
+        def _condition(driver):
+            screen, _ = self.identify(driver)
+            return screen if screen in names else False
+        _condition.description = f"screen is one of {names}"
+        return _condition
+
+
+class FlowGraph:
+    """Ordered flow steps with the screen each one starts from"""
+
+    def __init__(self, steps, final=None):
+        """
+        Initialize the flow
+
+        Args:
+            steps (list): (step name, start screen) pairs in execution order
+            final (str): Screen the last step leads to (nothing left to do there)
+        """
+        self.steps = list(steps)
+        self.final = final
+
+    @property
+    def screens(self):
+        """Screens the flow passes through, in order"""
+        screens = []
+        for _, screen in self.steps:
+            if screen not in screens:
+                screens.append(screen)
+        if self.final is not None and self.final not in screens:
+            screens.append(self.final)
+        return screens
+
+    def remaining(self, screen):
+        """
+        Steps still needed when the app shows a screen
+
+        Args:
+            screen (str): Classified screen name
+
+        Returns:
+            list: Step names from the first step starting on that screen, an
+                empty list on the final screen, or None if the screen is not
+                part of the flow
+        """
+        for index, (_, start) in enumerate(self.steps):
+            if start == screen:
+                return [name for name, _ in self.steps[index:]]
+        if screen == self.final:
+            return []
+        return None
+
+    def between(self, screen, target):
+        """
+        Steps leading from one screen of the flow to a later one
+
+        Args:
+            screen (str): Current screen
+            target (str): Screen to reach
+
+        Returns:
+            list: Step names, or None if the target cannot be reached moving forward
+        """
+        order = self.screens
+        if screen not in order or target not in order or order.index(target) < order.index(screen):
+            return None
+        return [name for name, start in self.steps
+                if order.index(screen) <= order.index(start) < order.index(target)]
@@ -0,0 +1,169 @@
+"""
+Pool of warm Appium sessions keyed by capabilities.
+
+Creating a webdriver.Remote session (UiAutomator2 server start, app
+activation) costs several seconds. The pool keeps sessions alive between
+tests and hands out an idle session with identical capabilities instead of
+creating a new one. Tests then bring the app to the screen they need with
+cheap navigation rather than replaying the whole flow.
+"""
+
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def capabilities_key(capabilities):
+    """
+    Build a stable pool key from a capabilities dict
+
+    Args:
+        capabilities (dict): Session capabilities
+
+    Returns:
+        str: Canonical JSON representation
+    """
+    return json.dumps(capabilities, sort_keys=True, default=str)
+
+
+def _default_close(session):
+    if hasattr(session, "cleanup"):
+        session.cleanup()
+    else:
+        session.quit()
+
+
+def _default_alive(session):
+    driver = getattr(session, "driver", session)
+    if driver is None or driver.session_id is None:
+        return False
+    try:
+        driver.current_activity
+        return True
+    except Exception:
+        return False
+
+
+class SessionPool:
+    """Keeps idle sessions per capabilities key for reuse"""
+
+    def __init__(self, close=_default_close, alive=_default_alive):
+        """
+        Initialize the pool
+
+        Args:
+            close (callable): Closes a session for good (calls cleanup() or quit())
+            alive (callable): Returns True if an idle session can still be used
+        """
+        self._close = close
+        self._alive = alive
+        self._idle = {}
+        self._leased = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, capabilities, factory):
+        """
+        Get a warm session for the capabilities, creating one if none is idle
+
+        Args:
+            capabilities (dict): Capabilities the session must have
+            factory (callable): Creates a new session when none can be reused
+
+        Returns:
+            The session object returned by the factory
+        """
+        key = capabilities_key(capabilities)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key, [])
+                session = idle.pop() if idle else None
+            if session is None:
+                break
+            if self._alive(session):
+                self.reused += 1
+                logger.info("Reusing warm Appium session")
+                with self._lock:
+                    self._leased[id(session)] = key
+                return session
+            logger.warning("Discarding dead pooled session")
+            self._discard(session)
+
+        session = factory()
+        self.created += 1
+        with self._lock:
+            self._leased[id(session)] = key
+        return session
+
+    def release(self, session):
+        """
+        Return a session to the pool so later tests can reuse it
+
+        Args:
+            session: Session previously returned by acquire()
+        """
+        with self._lock:
+            key = self._leased.pop(id(session), None)
+            if key is not None:
+                self._idle.setdefault(key, []).append(session)
+        if key is None:
+            raise ValueError("Session was not acquired from this pool")
+
+    def discard(self, session):
+        """
+        Close a leased session instead of returning it to the pool
+
+        Args:
+            session: Session previously returned by acquire()
+        """
+        with self._lock:
+            self._leased.pop(id(session), None)
+        self._discard(session)
+
+    def prune(self):
+        """
+        Check every idle session and close the dead ones
+
+        The check is a real command, so pruning regularly also keeps idle
+        sessions from hitting the server's newCommandTimeout.
+
+        Returns:
+            list of str: Capabilities keys that lost a session
+        """
+        with self._lock:
+            idle = [(key, session) for key, sessions in self._idle.items() for session in sessions]
+        lost = []
+        for key, session in idle:
+            if self._alive(session):
+                continue
+            with self._lock:
+                sessions = self._idle.get(key, [])
+                if session not in sessions:
+                    continue
+                sessions.remove(session)
+            logger.warning("Discarding dead pooled session")
+            self._discard(session)
+            lost.append(key)
+        return lost
+
+    def idle_count(self):
+        """Number of sessions waiting to be reused"""
+        with self._lock:
+            return sum(len(sessions) for sessions in self._idle.values())
+
+    def close_all(self):
+        """Close every idle session"""
+        with self._lock:
+            sessions = [session for idle in self._idle.values() for session in idle]
+            self._idle.clear()
+        for session in sessions:
+            self._discard(session)
+
+    def _discard(self, session):
+        try:
+            self._close(session)
+        except Exception as e:
+            logger.warning(f"Error closing pooled session: {e}")
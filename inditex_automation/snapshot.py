@@ -0,0 +1,532 @@
+"""
+Single-round-trip page snapshots with local XPath evaluation.
+
+A PageSnapshot fetches `driver.page_source` once and answers any number of
+locator and attribute queries from the parsed hierarchy, instead of sending
+one findElement/getText request per value through the Appium server.
+
+lxml is used for full XPath 1.0 support when it is installed. Otherwise a
+small built-in evaluator handles the subset of XPath used by the flows:
+`//` and `/` steps, `*`, `.` and `..`, attribute comparisons, `contains()`,
+`starts-with()`, `not()`, `and`/`or`, nested relative paths and positional
+predicates such as `(//android.view.ViewGroup)[1]`.
+
+`text()` is rejected by both evaluators: UiAutomator2 keeps the visible text
+in the `text` attribute and the page source has no text nodes, so locators
+must use `@text`.
+"""
+
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from functools import lru_cache
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+_BOUNDS_PATTERN = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+_STRING_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"")
+_TEXT_NODE_TEST = re.compile(r"\btext\s*\(\s*\)")
+
+
+@lru_cache(maxsize=256)
+def _check_supported(xpath):
+    """Reject text() so lxml and the built-in evaluator give the same answer"""
+    if _TEXT_NODE_TEST.search(_STRING_LITERAL.sub("''", xpath)):
+        raise ValueError(f"text() is not supported, use @text (UiAutomator2 sources have no text nodes): {xpath!r}")
+
+
+class SnapshotElement:
+    """Read-only view of one node of a page snapshot"""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def tag(self):
+        """Class name of the node (e.g. android.widget.TextView)"""
+        return self._node.tag
+
+    @property
+    def text(self):
+        """Value of the node's text attribute (empty string if missing)"""
+        return self._node.get("text", "")
+
+    @property
+    def attrib(self):
+        """All attributes of the node"""
+        return dict(self._node.attrib)
+
+    def get_attribute(self, name):
+        """
+        Get an attribute value
+
+        Args:
+            name (str): Attribute name as it appears in page_source (e.g. resource-id)
+
+        Returns:
+            str or None
+        """
+        return self._node.get(name)
+
+    @property
+    def rect(self):
+        """Bounds as a dict with x, y, width and height, or None if unknown"""
+        match = _BOUNDS_PATTERN.fullmatch(self._node.get("bounds", ""))
+        if not match:
+            return None
+        x1, y1, x2, y2 = (int(value) for value in match.groups())
+        return {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+
+    @property
+    def center(self):
+        """Center point (x, y) of the node's bounds, or None if unknown"""
+        rect = self.rect
+        if rect is None:
+            return None
+        return rect["x"] + rect["width"] // 2, rect["y"] + rect["height"] // 2
+
+    def __repr__(self):
+        return f"<SnapshotElement {self.tag} resource-id={self.get_attribute('resource-id')!r}>"
+
+
+class PageSnapshot:
+    """Parsed UI hierarchy that resolves many locators against one dump"""
+
+    def __init__(self, source, captured_at=None):
+        """
+        Initialize a snapshot from page source XML
+
+        Args:
+            source (str): XML returned by driver.page_source
+            captured_at (float): time.time() of the capture (now if None)
+        """
+        self.source = source
+        self.captured_at = captured_at or time.time()
+        if lxml_etree is not None:
+            self._root = lxml_etree.fromstring(source.encode("utf-8"))
+            self._select = self._select_lxml
+        else:
+            self._document = ElementTree.Element("#document")
+            self._document.append(ElementTree.fromstring(source))
+            self._tree = _Tree(self._document)
+            self._select = lambda xpath: _compile(xpath).select(self._document, self._tree)
+
+    def _evaluate(self, xpath):
+        _check_supported(xpath)
+        return self._select(xpath)
+
+    def _select_lxml(self, xpath):
+        try:
+            nodes = self._root.xpath(xpath)
+        except lxml_etree.XPathError as e:
+            raise ValueError(f"Invalid XPath {xpath!r}: {e}") from e
+        return [node for node in nodes if isinstance(getattr(node, "tag", None), str)]
+
+    @classmethod
+    def capture(cls, driver):
+        """
+        Capture a snapshot with a single page_source round trip
+
+        Args:
+            driver: Appium WebDriver instance
+
+        Returns:
+            PageSnapshot
+        """
+        return cls(driver.page_source)
+
+    def find_all(self, xpath):
+        """
+        Find all nodes matching an XPath
+
+        Args:
+            xpath (str): XPath locator
+
+        Returns:
+            list of SnapshotElement
+        """
+        return [SnapshotElement(node) for node in self._evaluate(xpath)]
+
+    def find(self, xpath):
+        """
+        Find the first node matching an XPath
+
+        Args:
+            xpath (str): XPath locator
+
+        Returns:
+            SnapshotElement or None
+        """
+        nodes = self._evaluate(xpath)
+        return SnapshotElement(nodes[0]) if nodes else None
+
+    def parent(self, element):
+        """
+        Get the parent of a node found in this snapshot
+
+        Args:
+            element (SnapshotElement): Node from find() or find_all()
+
+        Returns:
+            SnapshotElement or None for the root node
+        """
+        if lxml_etree is not None:
+            node = element._node.getparent()
+        else:
+            node = self._tree.parents.get(element._node)
+            if node is self._document:
+                node = None
+        return SnapshotElement(node) if node is not None else None
+
+    def children(self, element):
+        """
+        Get the child nodes of a node found in this snapshot, in document order
+
+        Args:
+            element (SnapshotElement): Node from find() or find_all()
+
+        Returns:
+            list of SnapshotElement
+        """
+        return [SnapshotElement(node) for node in element._node if isinstance(node.tag, str)]
+
+    def exists(self, xpath):
+        """Check whether any node matches the XPath"""
+        return bool(self._evaluate(xpath))
+
+    def text(self, xpath, default=None):
+        """
+        Get the text of the first node matching an XPath
+
+        Args:
+            xpath (str): XPath locator
+            default: Value returned when nothing matches
+
+        Returns:
+            str or default
+        """
+        element = self.find(xpath)
+        return element.text if element is not None else default
+
+    def attribute(self, xpath, name, default=None):
+        """
+        Get an attribute of the first node matching an XPath
+
+        Args:
+            xpath (str): XPath locator
+            name (str): Attribute name
+            default: Value returned when nothing matches
+
+        Returns:
+            str or default
+        """
+        element = self.find(xpath)
+        if element is None:
+            return default
+        value = element.get_attribute(name)
+        return default if value is None else value
+
+    def read(self, locators):
+        """
+        Read the text of several locators at once
+
+        Args:
+            locators (dict): Mapping of result key to XPath
+
+        Returns:
+            dict: Mapping of result key to text (None for missing elements)
+        """
+        return {key: self.text(xpath) for key, xpath in locators.items()}
+
+
+def snapshot_contains(*xpaths, match_all=True):
+    """
+    Wait condition that captures one snapshot per poll
+
+    Args:
+        *xpaths (str): XPath locators to look for
+        match_all (bool): Require every locator (True) or any of them (False)
+
+    Returns:
+        callable: Condition returning the PageSnapshot once it matches, else False
+    """
+    def _condition(driver):
+        snapshot = PageSnapshot.capture(driver)
+        found = (snapshot.exists(xpath) for xpath in xpaths)
+        matched = all(found) if match_all else any(found)
+        return snapshot if matched else False
+    _condition.description = f"snapshot contains {'all' if match_all else 'any'} of {xpaths}"
+    return _condition
+
+
+# ---------------------------------------------------------------------------
+# Built-in XPath subset evaluator (used when lxml is not installed)
+# ---------------------------------------------------------------------------
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<string>'[^']*'|"[^"]*")
+  | (?P<number>\d+)
+  | (?P<op>//|/|\(|\)|\[|\]|@|,|!=|=)
+  | (?P<name>\.\.|\.|\*|[A-Za-z_][\w.\-]*(?::[\w.\-]+)?)
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+_FUNCTIONS = {"contains", "starts-with", "not"}
+
+
+class _Tree:
+    """Parent links and document order for an ElementTree document"""
+
+    def __init__(self, document):
+        self.parents = {}
+        self.order = {}
+        for index, node in enumerate(document.iter()):
+            self.order[id(node)] = index
+            for child in node:
+                self.parents[child] = node
+
+
+def _tokenize(xpath):
+    tokens = []
+    position = 0
+    while position < len(xpath):
+        match = _TOKEN_PATTERN.match(xpath, position)
+        if not match:
+            raise ValueError(f"Unsupported XPath syntax at {position}: {xpath!r}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind != "space":
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, xpath):
+        self.xpath = xpath
+        self.tokens = _tokenize(xpath)
+        self.index = 0
+
+    def peek(self, offset=0):
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if value is not None and token[1] != value:
+            raise ValueError(f"Expected {value!r} in XPath {self.xpath!r}")
+        self.index += 1
+        return token
+
+    def parse(self):
+        expression = self.parse_path_expression()
+        if self.peek() != (None, None):
+            raise ValueError(f"Unsupported XPath syntax: {self.xpath!r}")
+        return expression
+
+    def parse_path_expression(self):
+        if self.peek()[1] == "(":
+            self.take("(")
+            inner = self.parse_path_expression()
+            self.take(")")
+            return _FilteredPath(inner, self.parse_predicates())
+        return self.parse_path()
+
+    def parse_path(self):
+        steps = []
+        absolute = self.peek()[1] in ("/", "//")
+        axis = "child"
+        if absolute:
+            axis = "descendant" if self.take()[1] == "//" else "child"
+        while True:
+            steps.append(self.parse_step(axis))
+            separator = self.peek()[1]
+            if separator not in ("/", "//"):
+                break
+            self.take()
+            axis = "descendant" if separator == "//" else "child"
+        return _Path(absolute, steps)
+
+    def parse_step(self, axis):
+        kind, value = self.take()
+        if kind != "name":
+            raise ValueError(f"Unsupported XPath step {value!r} in {self.xpath!r}")
+        if value in (".", ".."):
+            return _Step(value, value, [])
+        return _Step(axis, value, self.parse_predicates())
+
+    def parse_predicates(self):
+        predicates = []
+        while self.peek()[1] == "[":
+            self.take("[")
+            if self.peek()[0] == "number" and self.peek(1)[1] == "]":
+                predicates.append(int(self.take()[1]))
+            else:
+                predicates.append(self.parse_or())
+            self.take("]")
+        return predicates
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.peek() == ("name", "or"):
+            self.take()
+            terms.append(self.parse_and())
+        return terms[0] if len(terms) == 1 else ("or", terms)
+
+    def parse_and(self):
+        terms = [self.parse_term()]
+        while self.peek() == ("name", "and"):
+            self.take()
+            terms.append(self.parse_term())
+        return terms[0] if len(terms) == 1 else ("and", terms)
+
+    def parse_term(self):
+        kind, value = self.peek()
+        if value == "(":
+            self.take("(")
+            term = self.parse_or()
+            self.take(")")
+            return term
+        if kind == "name" and value in _FUNCTIONS and self.peek(1)[1] == "(":
+            self.take()
+            self.take("(")
+            if value == "not":
+                term = ("not", self.parse_or())
+                self.take(")")
+                return term
+            first = self.parse_operand()
+            self.take(",")
+            second = self.parse_operand()
+            self.take(")")
+            return (value, first, second)
+        return self.parse_comparison(self.parse_operand())
+
+    def parse_operand(self):
+        kind, value = self.peek()
+        if kind == "string":
+            self.take()
+            return ("literal", value[1:-1])
+        if kind == "number":
+            self.take()
+            return ("literal", value)
+        if value == "@":
+            self.take("@")
+            return ("attr", self.take()[1])
+        return ("path", self.parse_path())
+
+    def parse_comparison(self, operand):
+        if self.peek()[1] in ("=", "!="):
+            operator = self.take()[1]
+            return (operator, operand, self.parse_operand())
+        return ("exists", operand)
+
+
+class _Step:
+    def __init__(self, axis, name, predicates):
+        self.axis = axis
+        self.name = name
+        self.predicates = predicates
+
+    def select(self, context, tree):
+        if self.axis == ".":
+            return [context]
+        if self.axis == "..":
+            parent = tree.parents.get(context)
+            return [parent] if parent is not None else []
+        if self.axis == "child":
+            groups = [list(context)]
+        else:
+            # `//name` is descendant-or-self::node()/child::name, so positional
+            # predicates count per parent, exactly as in XPath
+            groups = [list(node) for node in context.iter()]
+        selected = []
+        for group in groups:
+            nodes = [node for node in group if self.name == "*" or node.tag == self.name]
+            selected.extend(_apply_predicates(nodes, self.predicates, tree))
+        return selected
+
+
+class _Path:
+    def __init__(self, absolute, steps):
+        self.absolute = absolute
+        self.steps = steps
+
+    def select(self, context, tree):
+        if self.absolute:
+            while tree.parents.get(context) is not None:
+                context = tree.parents[context]
+        nodes = [context]
+        for step in self.steps:
+            selected = []
+            seen = set()
+            for node in nodes:
+                for match in step.select(node, tree):
+                    if id(match) not in seen:
+                        seen.add(id(match))
+                        selected.append(match)
+            if step.axis == "descendant" or len(nodes) > 1:
+                selected.sort(key=lambda node: tree.order[id(node)])
+            nodes = selected
+        return nodes
+
+
+class _FilteredPath:
+    def __init__(self, inner, predicates):
+        self.inner = inner
+        self.predicates = predicates
+
+    def select(self, context, tree):
+        return _apply_predicates(self.inner.select(context, tree), self.predicates, tree)
+
+
+def _apply_predicates(nodes, predicates, tree):
+    for predicate in predicates:
+        if isinstance(predicate, int):
+            nodes = nodes[predicate - 1:predicate] if predicate > 0 else []
+        else:
+            nodes = [node for node in nodes if _truthy(predicate, node, tree)]
+    return nodes
+
+
+def _values(operand, node, tree):
+    kind, value = operand
+    if kind == "literal":
+        return [value]
+    if kind == "attr":
+        attribute = node.get(value)
+        return [] if attribute is None else [attribute]
+    # XPath string value of an element: its text nodes, never the @text attribute
+    return ["".join(match.itertext()) for match in value.select(node, tree)]
+
+
+def _truthy(expression, node, tree):
+    operator = expression[0]
+    if operator == "or":
+        return any(_truthy(term, node, tree) for term in expression[1])
+    if operator == "and":
+        return all(_truthy(term, node, tree) for term in expression[1])
+    if operator == "not":
+        return not _truthy(expression[1], node, tree)
+    if operator == "exists":
+        kind, value = expression[1]
+        if kind == "path":
+            return bool(value.select(node, tree))
+        return bool(_values(expression[1], node, tree))
+    left = _values(expression[1], node, tree)
+    right = _values(expression[2], node, tree)
+    if operator == "=":
+        return any(a == b for a in left for b in right)
+    if operator == "!=":
+        return any(a != b for a in left for b in right)
+    if operator == "contains":
+        return any(b in a for a in left for b in right)
+    if operator == "starts-with":
+        return any(a.startswith(b) for a in left for b in right)
+    raise ValueError(f"Unsupported XPath operator: {operator}")
+
+
+@lru_cache(maxsize=256)
+def _compile(xpath):
+    return _Parser(xpath).parse()
@@ -0,0 +1,238 @@
+"""
+Per-step latency instrumentation for the automation flows.
+
+A RunTimer records one named span per flow step. Elapsed time is charged to
+exactly one category at any moment, so each span splits cleanly into:
+
+    wait   - polling for a screen or element (the idle part of a wait)
+    http   - WebDriver HTTP round trips (the device and Appium server)
+    sleep  - deliberate fixed delays
+    other  - everything else, i.e. our own client-side code
+
+Nested spans (the 'login' span around its steps) see the same breakdown as
+the sum of their children. Results are exported as one JSON file per run.
+"""
+
+import functools
+import inspect
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+WAIT = "wait"
+HTTP = "http"
+SLEEP = "sleep"
+OTHER = "other"
+CATEGORIES = (WAIT, HTTP, SLEEP, OTHER)
+
+
+class Span:
+    """Timing of one flow step"""
+
+    def __init__(self, name, parent, start):
+        self.name = name
+        self.parent = parent
+        self.start = start
+        self.duration = None
+        self.breakdown = dict.fromkeys(CATEGORIES, 0.0)
+        self.commands = 0
+        self.status = "ok"
+
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "parent": self.parent,
+            "start": round(self.start, 6),
+            "duration": round(self.duration or 0.0, 6),
+            "commands": self.commands,
+            "status": self.status,
+        }
+        data.update((category, round(seconds, 6)) for category, seconds in self.breakdown.items())
+        return data
+
+
+class RunTimer:
+    """Collects step spans for one flow run"""
+
+    def __init__(self, flow, run_id=None, clock=time.perf_counter):
+        """
+        Initialize the timer
+
+        Args:
+            flow (str): Flow name, e.g. 'login' or 'production_check'
+            run_id (str): Identifier used for the export file name (generated if None)
+            clock (callable): Monotonic clock returning seconds
+        """
+        self.flow = flow
+        self.run_id = run_id or f"{flow}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        self.started_at = datetime.now().isoformat(timespec="milliseconds")
+        # Wall clock time of the origin, to place span offsets on a timeline
+        self.started_epoch = time.time()
+        self.spans = []
+        self._clock = clock
+        self._origin = clock()
+        self._mark = self._origin
+        self._open = []
+        self._categories = []
+
+    def elapsed(self):
+        """Seconds since the timer was created (the time base of span starts)"""
+        return self._clock() - self._origin
+
+    def _charge(self):
+        now = self._clock()
+        elapsed = now - self._mark
+        self._mark = now
+        category = self._categories[-1] if self._categories else OTHER
+        for span in self._open:
+            span.breakdown[category] += elapsed
+
+    @contextmanager
+    def span(self, name):
+        """
+        Time a flow step
+
+        Args:
+            name (str): Step name, e.g. 'enter_email'
+
+        Yields:
+            Span: The open span (set .status to record a soft failure)
+        """
+        self._charge()
+        span = Span(name, self._open[-1].name if self._open else None, self._mark - self._origin)
+        self.spans.append(span)
+        self._open.append(span)
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            self._charge()
+            span.duration = self._mark - self._origin - span.start
+            self._open.remove(span)
+
+    @contextmanager
+    def measure(self, category):
+        """
+        Charge the time spent inside the block to a category
+
+        Args:
+            category (str): WAIT, HTTP, SLEEP or OTHER
+        """
+        self._charge()
+        self._categories.append(category)
+        try:
+            yield
+        finally:
+            self._charge()
+            self._categories.pop()
+
+    def sleep(self, seconds):
+        """Deliberate fixed delay, recorded as sleep time"""
+        with self.measure(SLEEP):
+            time.sleep(seconds)
+
+    # Command hook listener interface (see inditex_automation.commands)
+
+    def command_started(self, event):
+        self._charge()
+        self._categories.append(HTTP)
+        for span in self._open:
+            span.commands += 1
+
+    def command_finished(self, event):
+        self._charge()
+        self._categories.pop()
+
+    def totals(self):
+        """Breakdown summed over the top-level spans"""
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        totals["duration"] = 0.0
+        totals["commands"] = 0
+        for span in self.spans:
+            if span.parent is None and span.duration is not None:
+                totals["duration"] += span.duration
+                totals["commands"] += span.commands
+                for category in CATEGORIES:
+                    totals[category] += span.breakdown[category]
+        return totals
+
+    def to_dict(self):
+        return {
+            "flow": self.flow,
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "totals": {key: round(value, 6) for key, value in self.totals().items()},
+            "spans": [span.to_dict() for span in self.spans if span.duration is not None],
+        }
+
+    def export(self, directory):
+        """
+        Write the run's spans as JSON
+
+        Args:
+            directory (str): Output directory (created if missing)
+
+        Returns:
+            str: Path of the written file
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.run_id}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def summary(self):
+        """Human readable table of the finished spans"""
+        lines = [f"{'step':<32}{'total':>8}{'wait':>8}{'http':>8}{'sleep':>8}{'other':>8}{'cmds':>6}"]
+        for span in self.spans:
+            if span.duration is None:
+                continue
+            name = ("  " if span.parent else "") + span.name
+            lines.append(
+                f"{name:<32}{span.duration:>8.3f}"
+                + "".join(f"{span.breakdown[category]:>8.3f}" for category in CATEGORIES)
+                + f"{span.commands:>6}"
+            )
+        return "\n".join(lines)
+
+
+def timed_step(name):
+    """
+    Decorator running a flow method inside a span of ``self.timer``
+
+    A method returning False marks its span as failed. Coroutine methods are
+    timed until they complete.
+
+    Args:
+        name (str): Step name
+    """
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                timer = getattr(self, "timer", None)
+                if timer is None:
+                    return await method(self, *args, **kwargs)
+                with timer.span(name) as span:
+                    result = await method(self, *args, **kwargs)
+                    if result is False:
+                        span.status = "failed"
+                    return result
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            timer = getattr(self, "timer", None)
+            if timer is None:
+                return method(self, *args, **kwargs)
+            with timer.span(name) as span:
+                result = method(self, *args, **kwargs)
+                if result is False:
+                    span.status = "failed"
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,302 @@
+"""
+Timeline traces of a flow run.
+
+FlowTracer is a command listener (see commands.instrument) that keeps the
+start and end of every WebDriver command a run sends. Together with the step
+spans of the run's RunTimer it exports a trace in which each command is
+nested under the flow step that issued it:
+
+    chrome - Chrome trace event JSON, opens in Perfetto (ui.perfetto.dev)
+             and chrome://tracing
+    otlp   - OpenTelemetry OTLP/JSON, for trace viewers fed from a collector
+
+Typed text is never written; find commands carry their locator and scripts
+their name so slow lookups can be told apart.
+
+Traces of several runs (e.g. the same flow on every device of a pool) can be
+merged into one file with one process per run, aligned on wall clock time:
+
+    python -m inditex_automation.tracing merge traces/*.trace.json -o devices.trace.json
+"""
+
+import argparse
+import json
+import os
+import threading
+import uuid
+
+from inditex_automation.config import config_group
+
+CHROME = "chrome"
+OTLP = "otlp"
+FORMATS = (CHROME, OTLP)
+
+_SUFFIXES = {CHROME: ".trace.json", OTLP: ".otlp.json"}
+# Command parameters copied to the span (never typed text or app data)
+_TRACED_PARAMS = ("using", "value", "script")
+_FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+
+
+class TraceSpan:
+    """One step or command on the timeline"""
+
+    def __init__(self, name, category, start, end, args=None, error=None):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = end
+        self.args = args or {}
+        self.error = error
+        self.parent = None
+        self.span_id = os.urandom(8).hex()
+
+
+def nest(spans):
+    """
+    Set each span's parent to the innermost span containing it
+
+    Args:
+        spans (list of TraceSpan): Spans of one run
+
+    Returns:
+        list of TraceSpan: The spans ordered by start, parents first
+    """
+    ordered = sorted(spans, key=lambda span: (span.start, -(span.end - span.start), span.category != "step"))
+    stack = []
+    for span in ordered:
+        while stack and not (stack[-1].start <= span.start and span.end <= stack[-1].end):
+            stack.pop()
+        span.parent = stack[-1] if stack else None
+        stack.append(span)
+    return ordered
+
+
+def _traced_params(command, params):
+    if not isinstance(params, dict):
+        return {}
+    args = {}
+    for key in _TRACED_PARAMS:
+        if key == "value" and command not in _FIND_COMMANDS:
+            continue
+        if isinstance(params.get(key), str):
+            args[key] = params[key]
+    return args
+
+
+class FlowTracer:
+    """Command listener collecting the spans of one run"""
+
+    def __init__(self, timer, device=None):
+        """
+        Initialize the tracer
+
+        Args:
+            timer (RunTimer): Timer of the run; its step spans and time base are used
+            device (str): Device name shown on the run's track
+        """
+        self.timer = timer
+        self.device = device
+        self.commands = []
+        self._started = {}
+        self._lock = threading.Lock()
+
+    # Command hook listener interface (see inditex_automation.commands)
+
+    def command_started(self, event):
+        self._started[id(event)] = self.timer.elapsed()
+
+    def command_finished(self, event):
+        end = self.timer.elapsed()
+        start = self._started.pop(id(event), end - (event.duration or 0.0))
+        error = None
+        if event.error is not None:
+            error = f"{type(event.error).__name__}: {event.error}".splitlines()[0]
+        span = TraceSpan(event.command, "command", start, end, _traced_params(event.command, event.params), error)
+        with self._lock:
+            self.commands.append(span)
+
+    def spans(self):
+        """
+        Build the run's spans: a root span, the finished steps and the commands
+
+        Returns:
+            list of TraceSpan: Ordered by start with parents set
+        """
+        steps = []
+        for span in self.timer.spans:
+            if span.duration is None:
+                continue
+            args = {category: round(seconds, 6) for category, seconds in span.breakdown.items()}
+            args["commands"] = span.commands
+            error = None if span.status == "ok" else span.status
+            steps.append(TraceSpan(span.name, "step", span.start, span.start + span.duration, args, error))
+        with self._lock:
+            commands = list(self.commands)
+        children = steps + commands
+        end = max([span.end for span in children] + [0.0])
+        root = TraceSpan(self.timer.flow, "run", 0.0, end, {"run_id": self.timer.run_id, "device": self.device})
+        return nest([root] + children)
+
+    def to_chrome(self):
+        """Chrome trace event JSON (times in microseconds from the run start)"""
+        label = f"{self.timer.flow} {self.device}" if self.device else self.timer.flow
+        events = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": label}},
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": self.timer.run_id}},
+        ]
+        for span in self.spans():
+            args = dict(span.args)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name, "cat": span.category, "ph": "X", "pid": 1, "tid": 1,
+                "ts": round(span.start * 1e6, 3), "dur": round((span.end - span.start) * 1e6, 3), "args": args,
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "flow": self.timer.flow, "run_id": self.timer.run_id, "device": self.device,
+                "started_at": self.timer.started_at, "started_epoch": self.timer.started_epoch,
+            },
+        }
+
+    def to_otlp(self):
+        """OTLP/JSON export request with one resource for the run"""
+        trace_id = uuid.uuid4().hex
+        origin_ns = int(self.timer.started_epoch * 1e9)
+        spans = []
+        for span in self.spans():
+            record = {
+                "traceId": trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(origin_ns + int(span.start * 1e9)),
+                "endTimeUnixNano": str(origin_ns + int(span.end * 1e9)),
+                "attributes": _attributes(dict(span.args, category=span.category)),
+            }
+            if span.parent is not None:
+                record["parentSpanId"] = span.parent.span_id
+            if span.error:
+                record["status"] = {"code": 2, "message": span.error}
+            spans.append(record)
+        resource = {"service.name": "inditex_automation", "flow": self.timer.flow, "run_id": self.timer.run_id}
+        if self.device:
+            resource["device"] = self.device
+        return {"resourceSpans": [{
+            "resource": {"attributes": _attributes(resource)},
+            "scopeSpans": [{"scope": {"name": "inditex_automation.tracing"}, "spans": spans}],
+        }]}
+
+    def export(self, directory, format=CHROME):
+        """
+        Write the trace
+
+        Args:
+            directory (str): Output directory (created if missing)
+            format (str): CHROME or OTLP
+
+        Returns:
+            str: Path of the written file
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown trace format: {format}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.timer.run_id}{_SUFFIXES[format]}")
+        data = self.to_chrome() if format == CHROME else self.to_otlp()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        return path
+
+
+def _attributes(values):
+    attributes = []
+    for key, value in values.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": typed})
+    return attributes
+
+
+def tracer_from_config(config, timer, device=None, section="TRACING"):
+    """
+    Start tracing if the config enables it
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        timer (RunTimer): Timer of the run
+        device (str): Device name shown on the trace
+        section (str): Section holding the tracing settings
+
+    Returns:
+        FlowTracer or None
+    """
+    if not config_group(config, "tracing", section).enabled:
+        return None
+    return FlowTracer(timer, device)
+
+
+def trace_settings(config, section="TRACING"):
+    """
+    Read where and how traces are written
+
+    Returns:
+        tuple: (directory, format)
+    """
+    settings = config_group(config, "tracing", section)
+    return settings.directory, (settings.format or CHROME).strip().lower()
+
+
+def merge(paths):
+    """
+    Merge Chrome traces of several runs into one, one process per run
+
+    Runs are placed on a shared timeline by their wall clock start.
+
+    Args:
+        paths (list of str): Chrome trace files written by FlowTracer.export
+
+    Returns:
+        dict: Chrome trace event JSON
+    """
+    traces = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            traces.append(json.load(f))
+    origin = min((trace.get("otherData", {}).get("started_epoch", 0.0) for trace in traces), default=0.0)
+    events = []
+    for pid, trace in enumerate(traces, 1):
+        offset = (trace.get("otherData", {}).get("started_epoch", origin) - origin) * 1e6
+        for event in trace["traceEvents"]:
+            event = dict(event, pid=pid)
+            if "ts" in event:
+                event["ts"] = round(event["ts"] + offset, 3)
+            events.append(event)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Work with flow traces")
+    commands = parser.add_subparsers(dest="action", required=True)
+    merge_parser = commands.add_parser("merge", help="Merge Chrome traces of several runs into one file")
+    merge_parser.add_argument("traces", nargs="+")
+    merge_parser.add_argument("-o", "--output", required=True, help="File to write")
+    args = parser.parse_args(argv)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(merge(args.traces), f, separators=(",", ":"))
+    print(f"Merged {len(args.traces)} traces into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+HTTP transport for the WebDriver command executor.
+
+Every WebDriver command is one HTTP request to the Appium server, and an
+audit sends hundreds of them. PooledAppiumConnection is an AppiumConnection
+whose urllib3 pool is sized and tuned from the [TRANSPORT] settings:
+
+    - a bounded pool of keep-alive connections per session, so commands
+      reuse one TCP connection and a process driving many sessions keeps a
+      known number of sockets open
+    - connect and read timeouts, with per-command read timeouts (e.g. a
+      short one for getPageSource, none for newSession)
+    - Accept-Encoding: gzip, so a server that compresses sends page sources
+      and screenshots in a fraction of the bytes (urllib3 decodes them)
+
+The connection counts its requests, new TCP connections and compressed
+responses in ``connection.stats`` so reuse can be checked after a run.
+
+Usage:
+    transport = transport_from_config(config)
+    driver = webdriver.Remote(transport.connection(server_url), options=options)
+    ...
+    logger.info(connection_stats(driver).summary())
+"""
+
+import threading
+
+import urllib3
+from appium.webdriver.appium_connection import AppiumConnection
+
+from inditex_automation.config import config_group
+
+
+class ConnectionStats:
+    """Request and connection counters of one command executor"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.compressed = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def reused(self):
+        """Requests sent over an already open connection"""
+        return max(self.requests - self.connections, 0)
+
+    def record(self, connections, compressed=False, error=False):
+        with self._lock:
+            self.requests += 1
+            self.connections += connections
+            self.compressed += int(compressed)
+            self.errors += int(error)
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": self.reused,
+            "compressed": self.compressed,
+            "errors": self.errors,
+        }
+
+    def summary(self):
+        """One line for the log"""
+        ratio = self.reused / self.requests if self.requests else 0.0
+        return (f"{self.requests} requests over {self.connections} connections "
+                f"({ratio:.0%} reused, {self.compressed} compressed, {self.errors} failed)")
+
+
+class TransportSettings:
+    """Pool size, timeouts and compression for command executors"""
+
+    def __init__(self, keep_alive=True, pool_size=1, pool_block=False, connect_timeout=None, read_timeout=None,
+                 compress=True, command_timeouts=None):
+        """
+        Initialize the settings
+
+        Args:
+            keep_alive (bool): Keep connections open between commands
+            pool_size (int): Connections kept open per session (a session sends one command at a time)
+            pool_block (bool): Wait for a free connection instead of opening a throw-away
+                one when all pooled connections are busy
+            connect_timeout (float): Seconds to wait for a TCP connection (None waits forever)
+            read_timeout (float): Seconds to wait for a response (None waits forever)
+            compress (bool): Ask the server to gzip responses
+            command_timeouts (dict): Read timeout per WebDriver command name
+                (e.g. {'getPageSource': 30}); None waits forever for that command
+        """
+        self.keep_alive = keep_alive
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.compress = compress
+        self.command_timeouts = dict(command_timeouts or {})
+
+    def timeout(self, command=None):
+        """
+        Get the urllib3 timeout for a command
+
+        Args:
+            command (str): WebDriver command name (the default read timeout if None or not listed)
+
+        Returns:
+            urllib3.Timeout
+        """
+        read = self.command_timeouts.get(command, self.read_timeout)
+        return urllib3.Timeout(connect=self.connect_timeout, read=read)
+
+    def connection(self, server_url):
+        """
+        Build a command executor for one session
+
+        Args:
+            server_url (str): Appium server URL
+
+        Returns:
+            PooledAppiumConnection
+        """
+        return PooledAppiumConnection(server_url, self)
+
+
+# Connection failures are retried, but a command that timed out waiting for
+# its response is not resent: it may already have run on the device
+RETRIES = urllib3.Retry(3, read=False)
+
+
+class _CountingPoolManager(urllib3.PoolManager):
+    """PoolManager applying the executor's per-command timeout and counting connections"""
+
+    def __init__(self, executor, **kwargs):
+        super().__init__(**kwargs)
+        self._executor = executor
+
+    def urlopen(self, method, url, redirect=True, **kwargs):
+        settings = self._executor.settings
+        kwargs["timeout"] = settings.timeout(self._executor.current_command)
+        kwargs.setdefault("retries", RETRIES)
+        if settings.compress:
+            kwargs["headers"] = dict(kwargs.get("headers") or self.headers, **{"Accept-Encoding": "gzip"})
+        pool = self.connection_from_url(url)
+        opened = pool.num_connections
+        try:
+            response = super().urlopen(method, url, redirect=redirect, **kwargs)
+        except Exception:
+            self._executor.stats.record(pool.num_connections - opened, error=True)
+            raise
+        compressed = "gzip" in (response.headers.get("Content-Encoding") or "")
+        self._executor.stats.record(pool.num_connections - opened, compressed=compressed)
+        return response
+
+
+class PooledAppiumConnection(AppiumConnection):
+    """AppiumConnection with a tuned connection pool and per-command timeouts"""
+
+    def __init__(self, server_url, settings=None):
+        """
+        Initialize the executor
+
+        Args:
+            server_url (str): Appium server URL
+            settings (TransportSettings): Transport tuning (defaults if None)
+        """
+        self.settings = settings or TransportSettings()
+        self.stats = ConnectionStats()
+        self._local = threading.local()
+        super().__init__(server_url, keep_alive=self.settings.keep_alive, init_args_for_pool_manager={
+            "maxsize": self.settings.pool_size,
+            "block": self.settings.pool_block,
+        })
+
+    @property
+    def current_command(self):
+        """Name of the command this thread is sending (None outside execute())"""
+        return getattr(self._local, "command", None)
+
+    def execute(self, command, params):
+        self._local.command = command
+        try:
+            return super().execute(command, params)
+        finally:
+            self._local.command = None
+
+    def _get_connection_manager(self):
+        if self._proxy_url:
+            return super()._get_connection_manager()
+        pool_manager_init_args = {"timeout": self.settings.timeout()}
+        if self._ca_certs:
+            pool_manager_init_args["cert_reqs"] = "CERT_REQUIRED"
+            pool_manager_init_args["ca_certs"] = self._ca_certs
+        else:
+            pool_manager_init_args["cert_reqs"] = "CERT_NONE"
+        pool_manager_init_args.update(self._init_args_for_pool_manager)
+        return _CountingPoolManager(self, **pool_manager_init_args)
+
+
+def connection_stats(driver):
+    """
+    Get the connection counters of a driver's command executor
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        ConnectionStats or None when the driver does not use a PooledAppiumConnection
+    """
+    return getattr(getattr(driver, "command_executor", None), "stats", None)
+
+
+def transport_from_config(config, section="TRANSPORT"):
+    """
+    Read the transport settings
+
+    Args:
+        config: Object with get(section, key, fallback=...) (ConfigParser or AutomationConfig)
+        section (str): Section holding the transport settings
+
+    Returns:
+        TransportSettings
+    """
+    settings = config_group(config, "transport", section)
+
+    def seconds(value):
+        # 0 (or empty) waits forever
+        value = float(value or 0)
+        return value if value > 0 else None
+
+    command_timeouts = {}
+    for entry in settings.command_timeouts.split(","):
+        if ":" in entry:
+            command, value = entry.split(":", 1)
+            command_timeouts[command.strip()] = seconds(value.strip())
+    return TransportSettings(
+        keep_alive=settings.keep_alive,
+        pool_size=settings.pool_size,
+        pool_block=settings.pool_block,
+        connect_timeout=seconds(settings.connect_timeout),
+        read_timeout=seconds(settings.read_timeout),
+        compress=settings.compress,
+        command_timeouts=command_timeouts,
+    )
@@ -0,0 +1,298 @@
+"""
+Condition-driven wait engine for the Inditex automation flows.
+
+Instead of sleeping for a fixed amount of time after every tap, a flow asks
+the engine to wait until the next screen's anchor element (or activity) shows
+up. The configured timeouts become upper bounds: the engine returns as soon
+as the condition holds and only pays the full amount when it never does.
+
+The driver's implicit wait is zeroed while the engine polls, so it neither
+stacks on top of the explicit deadline nor turns an expected absence (e.g.
+the login form being gone after a successful login) into a full implicit
+wait. probe(), is_present() and is_absent() answer such checks with their
+own short deadline.
+"""
+
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from inditex_automation.timing import WAIT
+
+DEFAULT_POLL_FREQUENCY = 0.25
+
+logger = logging.getLogger(__name__)
+
+
+def element_present(by, value):
+    """
+    Condition that holds once at least one element matches the locator
+
+    Args:
+        by (str): Locator strategy (AppiumBy.XPATH, AppiumBy.ID, ...)
+        value (str): Locator value
+
+    Returns:
+        callable: Condition returning the first matching WebElement or False
+    """
+    def _condition(driver):
+        elements = driver.find_elements(by, value)
+        return elements[0] if elements else False
+    _condition.description = f"{by}={value} present"
+    return _condition
+
+
+def element_absent(by, value):
+    """
+    Condition that holds once no element matches the locator
+
+    Args:
+        by (str): Locator strategy
+        value (str): Locator value
+
+    Returns:
+        callable: Condition returning True when nothing matches
+    """
+    def _condition(driver):
+        return len(driver.find_elements(by, value)) == 0
+    _condition.description = f"{by}={value} absent"
+    return _condition
+
+
+def activity_is(*activities):
+    """
+    Condition that holds once the foreground activity matches one of the names
+
+    Activity names are compared by suffix so both '.MainActivity' and the
+    fully qualified class name match.
+
+    Args:
+        *activities (str): Accepted activity names
+
+    Returns:
+        callable: Condition returning the current activity or False
+    """
+    def _condition(driver):
+        current = driver.current_activity or ""
+        if any(current.endswith(activity) for activity in activities):
+            return current
+        return False
+    _condition.description = f"activity in {activities}"
+    return _condition
+
+
+def activity_changed_from(activity):
+    """
+    Condition that holds once the foreground activity is no longer `activity`
+
+    Args:
+        activity (str): Activity that was in the foreground before the action
+
+    Returns:
+        callable: Condition returning the new activity or False
+    """
+    def _condition(driver):
+        current = driver.current_activity
+        if current and current != activity:
+            return current
+        return False
+    _condition.description = f"activity changed from {activity}"
+    return _condition
+
+
+def text_changed(by, value, previous):
+    """
+    Condition that holds once the element text differs from `previous`
+
+    Args:
+        by (str): Locator strategy
+        value (str): Locator value
+        previous (str): Text observed before the action
+
+    Returns:
+        callable: Condition returning the new text or False
+    """
+    def _condition(driver):
+        elements = driver.find_elements(by, value)
+        if not elements:
+            return False
+        text = elements[0].text
+        return text if text != previous else False
+    _condition.description = f"{by}={value} text changed from {previous!r}"
+    return _condition
+
+
+def any_of(*conditions):
+    """
+    Condition that holds as soon as any of the given conditions holds
+
+    Args:
+        *conditions (callable): Conditions to evaluate in order on every poll
+
+    Returns:
+        callable: Condition returning the first truthy result or False
+    """
+    def _condition(driver):
+        for condition in conditions:
+            result = condition(driver)
+            if result:
+                return result
+        return False
+    _condition.description = " or ".join(
+        getattr(condition, "description", repr(condition)) for condition in conditions
+    )
+    return _condition
+
+
+class WaitEngine:
+    """Polls conditions against a driver with a tunable interval and deadline"""
+
+    def __init__(self, driver, timeout=30, poll_frequency=DEFAULT_POLL_FREQUENCY,
+                 implicit_wait=0, log=None, timer=None):
+        """
+        Initialize the wait engine
+
+        Args:
+            driver: Appium WebDriver instance
+            timeout (float): Default deadline in seconds for until()
+            poll_frequency (float): Seconds between condition evaluations
+            implicit_wait (float): Implicit wait configured on the driver; it is
+                suspended while polling so a single lookup cannot overrun the deadline
+            log (logging.Logger): Logger to use (module logger if None)
+            timer (RunTimer): Records polling time as wait time of the current step
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.implicit_wait = implicit_wait
+        self.logger = log or logger
+        self.timer = timer
+        self._suspended = False
+
+    @contextmanager
+    def implicit_wait_suspended(self):
+        """Temporarily zero the driver's implicit wait (nested uses reset it once)"""
+        if not self.implicit_wait or self._suspended:
+            yield
+            return
+        self._suspended = True
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self._suspended = False
+            self.driver.implicitly_wait(self.implicit_wait)
+
+    def until(self, condition, timeout=None, message=""):
+        """
+        Wait until the condition returns a truthy value
+
+        Args:
+            condition (callable): Condition taking the driver
+            timeout (float): Deadline in seconds (uses engine default if None)
+            message (str): Message for the TimeoutException
+
+        Returns:
+            The condition's truthy result
+
+        Raises:
+            TimeoutException: If the condition does not hold before the deadline
+        """
+        if timeout is None:
+            timeout = self.timeout
+        wait = WebDriverWait(
+            self.driver,
+            timeout,
+            poll_frequency=self.poll_frequency,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+        )
+        measured = self.timer.measure(WAIT) if self.timer else nullcontext()
+        with measured, self.implicit_wait_suspended():
+            return wait.until(condition, message)
+
+    def settle(self, condition, upper_bound, description=None):
+        """
+        Wait for the condition but never longer than `upper_bound` seconds
+
+        Used where the flows previously slept for a fixed time: the
+        configured wait becomes the maximum, not the cost. A condition that
+        never holds is not an error; the step simply continues after the bound.
+
+        Args:
+            condition (callable): Condition taking the driver
+            upper_bound (float): Maximum number of seconds to wait
+            description (str): Human readable name used in log messages
+
+        Returns:
+            The condition's truthy result, or None if the bound was reached
+        """
+        description = description or getattr(condition, "description", "condition")
+        started = time.monotonic()
+        try:
+            result = self.until(condition, timeout=upper_bound)
+        except TimeoutException:
+            self.logger.debug(f"Wait bound of {upper_bound}s reached for: {description}")
+            return None
+        except WebDriverException as e:
+            self.logger.warning(f"Wait for {description} aborted: {e}")
+            return None
+        self.logger.debug(f"{description} after {time.monotonic() - started:.2f}s")
+        return result
+
+    def probe(self, condition, timeout=0):
+        """
+        Check a condition without paying the driver's implicit wait
+
+        Args:
+            condition (callable): Condition taking the driver
+            timeout (float): Short deadline in seconds; 0 evaluates the condition once
+
+        Returns:
+            The condition's truthy result, or None if it does not hold
+        """
+        if timeout > 0:
+            return self.settle(condition, timeout)
+        with self.implicit_wait_suspended():
+            try:
+                return condition(self.driver) or None
+            except (NoSuchElementException, StaleElementReferenceException):
+                return None
+
+    def is_present(self, by, value, timeout=0):
+        """
+        Check whether an element is shown, waiting at most `timeout` seconds
+
+        Args:
+            by (str): Locator strategy
+            value (str): Locator value
+            timeout (float): Short deadline in seconds (0 checks once)
+
+        Returns:
+            bool: True if a matching element was found
+        """
+        return self.probe(element_present(by, value), timeout) is not None
+
+    def is_absent(self, by, value, timeout=0):
+        """
+        Check whether no element matches, waiting at most `timeout` seconds for it to go
+
+        On the happy path the element is already gone and the check costs a
+        single lookup instead of the full implicit wait.
+
+        Args:
+            by (str): Locator strategy
+            value (str): Locator value
+            timeout (float): Short deadline in seconds (0 checks once)
+
+        Returns:
+            bool: True if nothing matched
+        """
+        return self.probe(element_absent(by, value), timeout) is not None
@@ -0,0 +1,481 @@
+"""
+Long-lived daemon that keeps Appium sessions warm between runs.
+
+Creating a webdriver.Remote session (UiAutomator2 server install/start, app
+activation) costs several seconds, which dominates short repeated checks.
+WarmSessionDaemon owns the sessions instead of the CLIs: a run leases a
+session by capabilities, attaches to it by session id, runs its flow and
+releases it again. The session stays open on the Appium server in between.
+
+A keep-alive thread pings idle sessions (so they never hit the server's
+newCommandTimeout), replaces sessions that died and ends the sessions of
+leases whose client went away without releasing: such a client may still be
+driving the session, so it is never handed to another run. Leases are also
+checked before they are handed out, so a client never attaches to a dead
+session.
+
+The daemon has no authentication: anyone who can reach it can drive the
+leased devices, so it only binds loopback interfaces.
+
+Usage:
+    python -m inditex_automation.warm_daemon --port 4799
+
+Clients use connect(), which attaches through the daemon when one is
+reachable and falls back to a new session otherwise:
+
+    driver = connect(server_url, options, daemon_url="http://127.0.0.1:4799")
+    ...
+    driver.quit()   # releases the warm session instead of ending it
+"""
+
+import argparse
+import ipaddress
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from appium import webdriver
+from appium.options.common import AppiumOptions
+
+from inditex_automation.logs import configure_logging
+from inditex_automation.session_pool import SessionPool, capabilities_key
+
+DEFAULT_PORT = 4799
+DEFAULT_DAEMON_URL = f"http://127.0.0.1:{DEFAULT_PORT}"
+
+logger = logging.getLogger(__name__)
+
+
+class DaemonError(Exception):
+    """Error reported by (or while talking to) the warm session daemon"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def create_session(server_url, capabilities):
+    """
+    Default session factory: a new webdriver.Remote session
+
+    Args:
+        server_url (str): Appium server URL
+        capabilities (dict): Session capabilities
+
+    Returns:
+        WebDriver
+    """
+    return webdriver.Remote(server_url, options=AppiumOptions().load_capabilities(capabilities))
+
+
+def is_loopback(host):
+    """
+    Check whether a bind address only accepts local connections
+
+    Args:
+        host (str): Host name or IP address
+
+    Returns:
+        bool
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _loopback_host(text):
+    # argparse type of --host
+    if not is_loopback(text):
+        raise argparse.ArgumentTypeError(f"{text} is not a loopback address (the daemon has no authentication)")
+    return text
+
+
+def _pool_capabilities(server_url, capabilities):
+    # Sessions are pooled per server as well as per capabilities
+    return dict(capabilities, **{"daemon:serverUrl": server_url})
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self.server.app.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.app.handle(self, "POST")
+
+
+class WarmSessionDaemon:
+    """Threaded HTTP service leasing warm Appium sessions"""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, factory=create_session, keepalive=30.0,
+                 lease_timeout=900.0, pool=None):
+        """
+        Initialize the daemon (call start() to begin serving)
+
+        Args:
+            host (str): Loopback interface to bind
+            port (int): Port to bind (0 picks a free port)
+            factory (callable): Creates a session from (server_url, capabilities)
+            keepalive (float): Seconds between idle-session checks (0 disables the thread)
+            lease_timeout (float): Seconds after which an unreleased lease's session is ended
+            pool (SessionPool): Pool holding the sessions (a new one if None)
+
+        Raises:
+            ValueError: If host is not a loopback address
+        """
+        if not is_loopback(host):
+            raise ValueError(f"Refusing to bind {host}: the warm session daemon only serves loopback clients")
+        self.factory = factory
+        self.keepalive = keepalive
+        self.lease_timeout = lease_timeout
+        self.pool = pool or SessionPool()
+        self.reconnects = 0
+        self._leases = {}
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._keepalive_thread = None
+        self._serving = False
+        self._httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self
+        self._routes = {
+            ("POST", "/lease"): self._lease,
+            ("POST", "/release"): self._release,
+            ("GET", "/status"): lambda body: self.status(),
+        }
+
+    @property
+    def url(self):
+        """Base URL clients should use as daemon_url"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving (and the keep-alive thread) in the background"""
+        threading.Thread(target=self._httpd.serve_forever, args=(0.1,), name="warm-daemon", daemon=True).start()
+        self._serving = True
+        if self.keepalive:
+            self._keepalive_thread = threading.Thread(target=self._keep_alive, name="warm-daemon-keepalive",
+                                                      daemon=True)
+            self._keepalive_thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close every session"""
+        self._stopped.set()
+        if self._serving:
+            self._httpd.shutdown()
+            self._serving = False
+        self._httpd.server_close()
+        if self._keepalive_thread is not None:
+            self._keepalive_thread.join()
+        with self._lock:
+            leased = [driver for driver, _ in self._leases.values()]
+            self._leases.clear()
+        for driver in leased:
+            self.pool.discard(driver)
+        self.pool.close_all()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # -- leasing ---------------------------------------------------------------
+
+    def lease(self, server_url, capabilities):
+        """
+        Hand out a live session for the capabilities, creating one if none is idle
+
+        Args:
+            server_url (str): Appium server the session must live on
+            capabilities (dict): Session capabilities
+
+        Returns:
+            dict: session_id, server_url, capabilities (as returned by the server) and reused
+        """
+        key_capabilities = _pool_capabilities(server_url, capabilities)
+        with self._lock:
+            self._targets[capabilities_key(key_capabilities)] = (server_url, capabilities)
+        created = []
+        driver = self.pool.acquire(key_capabilities,
+                                   lambda: created.append(1) or self.factory(server_url, capabilities))
+        with self._lock:
+            self._leases[driver.session_id] = (driver, time.monotonic())
+        reused = not created
+        logger.info(f"Leased {'warm' if reused else 'new'} session {driver.session_id} on {server_url}")
+        return {
+            "session_id": driver.session_id,
+            "server_url": server_url,
+            "capabilities": getattr(driver, "caps", {}) or {},
+            "reused": reused,
+        }
+
+    def release(self, session_id):
+        """
+        Return a leased session to the pool
+
+        Args:
+            session_id (str): Session id from lease()
+        """
+        with self._lock:
+            lease = self._leases.pop(session_id, None)
+        if lease is None:
+            raise DaemonError(404, f"Session {session_id} is not leased")
+        self.pool.release(lease[0])
+        logger.info(f"Released session {session_id}")
+
+    def status(self):
+        """
+        Get the daemon counters
+
+        Returns:
+            dict: created, reused, reconnects, leased and idle session counts
+        """
+        with self._lock:
+            leased = len(self._leases)
+        return {
+            "created": self.pool.created,
+            "reused": self.pool.reused,
+            "reconnects": self.reconnects,
+            "leased": leased,
+            "idle": self.pool.idle_count(),
+        }
+
+    def check_sessions(self):
+        """
+        End expired leases, ping idle sessions and replace the dead ones
+
+        The session of an expired lease is closed, not returned to the idle
+        pool: its client may only be slow and still driving it. Called
+        periodically by the keep-alive thread.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [self._leases.pop(session_id) for session_id, (_, leased_at) in list(self._leases.items())
+                       if now - leased_at > self.lease_timeout]
+        for driver, _ in expired:
+            logger.warning(f"Ending session {driver.session_id}: lease not released in {self.lease_timeout:.0f}s")
+            self.pool.discard(driver)
+
+        for key in self.pool.prune():
+            with self._lock:
+                target = self._targets.get(key)
+            if target is None:
+                continue
+            server_url, capabilities = target
+            created_before = self.pool.created
+            try:
+                replacement = self.pool.acquire(_pool_capabilities(server_url, capabilities),
+                                                lambda: self.factory(server_url, capabilities))
+            except Exception as e:
+                logger.warning(f"Could not reconnect session on {server_url}: {e}")
+                continue
+            # Park the replacement so the next run gets it warm
+            self.pool.release(replacement)
+            if self.pool.created > created_before:
+                self.reconnects += 1
+                logger.info(f"Reconnected dead session on {server_url} as {replacement.session_id}")
+
+    def _keep_alive(self):
+        while not self._stopped.wait(self.keepalive):
+            try:
+                self.check_sessions()
+            except Exception as e:
+                logger.warning(f"Keep-alive check failed: {e}")
+
+    # -- request dispatch ------------------------------------------------------
+
+    def _lease(self, body):
+        if not body.get("server_url"):
+            raise DaemonError(400, "server_url is required")
+        return self.lease(body["server_url"], body.get("capabilities") or {})
+
+    def _release(self, body):
+        self.release(body.get("session_id"))
+        return None
+
+    def handle(self, request, method):
+        length = int(request.headers.get("Content-Length") or 0)
+        raw_body = request.rfile.read(length) if length else b""
+        status = 200
+        try:
+            handler = self._routes.get((method, request.path.split("?", 1)[0]))
+            if handler is None:
+                raise DaemonError(404, f"Unknown command {method} {request.path}")
+            body = json.loads(raw_body) if raw_body.strip() else {}
+            response = {"value": handler(body)}
+        except DaemonError as e:
+            status = e.status
+            response = {"value": {"error": str(e)}}
+        except Exception as e:
+            logger.exception("Warm session daemon error")
+            status = 500
+            response = {"value": {"error": str(e)}}
+
+        data = json.dumps(response).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json; charset=utf-8")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+
+class AttachedDriver(webdriver.Remote):
+    """webdriver.Remote bound to an existing session instead of creating one"""
+
+    def __init__(self, command_executor, session_id, capabilities, options, on_quit=None):
+        """
+        Attach to a running session
+
+        Args:
+            command_executor (str or AppiumConnection): Appium server URL or executor
+            session_id (str): Existing session id
+            capabilities (dict): Capabilities the server reported for the session
+            options (AppiumOptions): Options the session was requested with
+            on_quit (callable): Called with the session id by quit() instead of
+                ending the session (e.g. to release it to the daemon)
+        """
+        self._attach_to = (session_id, capabilities)
+        self._on_quit = on_quit
+        super().__init__(command_executor=command_executor, options=options, direct_connection=False)
+
+    def start_session(self, capabilities, browser_profile=None):
+        self.session_id, self.caps = self._attach_to
+
+    def quit(self):
+        """Hand the session back (or end it when there is no on_quit callback)"""
+        if self._on_quit is None:
+            super().quit()
+            return
+        try:
+            self._on_quit(self.session_id)
+        finally:
+            self.session_id = None
+            self.command_executor.close()
+
+
+class WarmSessionClient:
+    """Client for a running WarmSessionDaemon"""
+
+    def __init__(self, daemon_url=DEFAULT_DAEMON_URL, timeout=300.0):
+        """
+        Initialize the client
+
+        Args:
+            daemon_url (str): Daemon base URL
+            timeout (float): Seconds to wait for a reply (leasing may create a session)
+        """
+        self.daemon_url = daemon_url.rstrip("/")
+        self.timeout = timeout
+
+    def _call(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(f"{self.daemon_url}{path}", data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())["value"]
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read())["value"]["error"]
+            except Exception:
+                message = str(e)
+            raise DaemonError(e.code, message) from None
+        except (urllib.error.URLError, OSError) as e:
+            raise DaemonError(503, f"Warm session daemon not reachable at {self.daemon_url}: {e}") from None
+
+    def lease(self, server_url, capabilities):
+        """Lease a session (see WarmSessionDaemon.lease)"""
+        return self._call("POST", "/lease", {"server_url": server_url, "capabilities": capabilities})
+
+    def release(self, session_id):
+        """Release a leased session"""
+        self._call("POST", "/release", {"session_id": session_id})
+
+    def status(self):
+        """Get the daemon counters"""
+        return self._call("GET", "/status")
+
+    def attach(self, server_url, options, transport=None):
+        """
+        Lease a session and attach a driver to it
+
+        Args:
+            server_url (str): Appium server URL
+            options (AppiumOptions): Session options
+            transport (TransportSettings): Connection pool and timeout tuning (defaults if None)
+
+        Returns:
+            AttachedDriver: quit() releases the session to the daemon
+        """
+        lease = self.lease(server_url, options.to_capabilities())
+        executor = transport.connection(server_url) if transport else server_url
+        return AttachedDriver(executor, lease["session_id"], lease["capabilities"], options,
+                              on_quit=self.release)
+
+
+def connect(server_url, options, daemon_url=None, transport=None):
+    """
+    Get a driver, attaching to a warm daemon session when possible
+
+    Args:
+        server_url (str): Appium server URL
+        options (AppiumOptions): Session options
+        daemon_url (str): Warm session daemon URL (a new session is created if empty)
+        transport (TransportSettings): Connection pool and timeout tuning (defaults if None)
+
+    Returns:
+        WebDriver: AttachedDriver from the daemon, or a new webdriver.Remote session
+            when no daemon is configured or it cannot be reached
+    """
+    if daemon_url:
+        try:
+            driver = WarmSessionClient(daemon_url).attach(server_url, options, transport)
+            logger.info(f"Attached to warm session {driver.session_id}")
+            return driver
+        except DaemonError as e:
+            logger.warning(f"{e}; creating a new session")
+    executor = transport.connection(server_url) if transport else server_url
+    return webdriver.Remote(command_executor=executor, options=options)
+
+
+def main():
+    """Run the daemon from the command line"""
+    parser = argparse.ArgumentParser(description="Keep Appium sessions warm between automation runs")
+    parser.add_argument("--host", type=_loopback_host, default="127.0.0.1",
+                        help="Loopback interface to bind (the daemon has no authentication)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to bind")
+    parser.add_argument("--keepalive", type=float, default=30.0, help="Seconds between idle-session checks")
+    parser.add_argument("--lease-timeout", type=float, default=900.0,
+                        help="Seconds after which an unreleased lease's session is ended")
+    args = parser.parse_args()
+
+    configure_logging(log_file=None)
+    daemon = WarmSessionDaemon(args.host, args.port, keepalive=args.keepalive, lease_timeout=args.lease_timeout)
+    daemon.start()
+    logger.info(f"Warm session daemon listening on {daemon.url}")
+    try:
+        daemon._stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,42 +8,55 @@ Simple script to run Inditex login automation with different options.
 import sys
 import os
 import argparse
-from pathlib import Path
+import importlib.util
 
 # Add tests directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'tests'))
 
-try:
-    from tests.inditex_login_enhanced import InditexLoginAutomationEnhanced
-except ImportError:
-    print("❌ Error: Could not import automation modules")
-    print("Make sure you're running from the correct directory")
-    sys.exit(1)
+# Modules below are imported by the code paths that need them, so --help,
+# --check and --test do not pay for loading Appium and Selenium
 
+CONFIG_PATH = os.path.join("tests", "config.ini")
 
-def run_basic_automation():
+
+def load_run_config(config=None):
+    """Load tests/config.ini once per process (a loaded config is returned as it is)"""
+    from inditex_automation.config import load_config
+    return load_config(config or CONFIG_PATH)
+
+
+def load_automation():
+    """Import the login automation (and with it Appium and Selenium)"""
+    try:
+        from tests.inditex_login_enhanced import InditexLoginAutomationEnhanced
+    except ImportError:
+        print("❌ Error: Could not import automation modules")
+        print("Make sure you're running from the correct directory")
+        sys.exit(1)
+    return InditexLoginAutomationEnhanced
+
+
+def run_basic_automation(daemon_url=None, config=None):
     """Run basic automation"""
     print("🔄 Running Basic Automation...")
-    config_path = os.path.join("tests", "config.ini")
     
-    automation = InditexLoginAutomationEnhanced(config_path)
+    automation = load_automation()(load_run_config(config), daemon_url=daemon_url)
     
     try:
         if automation.setup_driver():
             if automation.launch_app():
-                success = automation.perform_login()
+                success = automation.ensure_logged_in()
                 return success
         return False
     finally:
         automation.cleanup()
 
 
-def run_with_custom_credentials(email, password):
+def run_with_custom_credentials(email, password, daemon_url=None, config=None):
     """Run automation with custom credentials"""
     print(f"🔄 Running Automation with custom credentials...")
-    config_path = os.path.join("tests", "config.ini")
     
-    automation = InditexLoginAutomationEnhanced(config_path)
+    automation = load_automation()(load_run_config(config), daemon_url=daemon_url)
     
     try:
         if automation.setup_driver():
@@ -55,24 +68,73 @@ def run_with_custom_credentials(email, password):
         automation.cleanup()
 
 
-def run_tests():
-    """Run pytest test suite"""
+def run_on_device_pool(devices_file, email=None, password=None, use_async=False, daemon_url=None, config=None):
+    """Run the login automation on every device of a pool in parallel"""
+    from inditex_automation.devices import format_results, load_device_pool, run_on_devices
+    
+    devices = load_device_pool(devices_file)
+    print(f"🔄 Running Automation on {len(devices)} devices in parallel...")
+    config = load_run_config(config)
+    
+    if use_async:
+        import asyncio
+        results = asyncio.run(run_on_device_pool_async(devices, config, email, password))
+        print(format_results(results))
+        return all(result.success for result in results)
+    
+    automation_class = load_automation()
+    
+    def login_on_device(device):
+        automation = automation_class(config, device=device, daemon_url=daemon_url)
+        try:
+            if automation.setup_driver():
+                if automation.launch_app():
+                    if email is None and password is None:
+                        return automation.ensure_logged_in()
+                    return automation.perform_login(email=email, password=password)
+            return False
+        finally:
+            automation.cleanup()
+    
+    results = run_on_devices(devices, login_on_device)
+    print(format_results(results))
+    return all(result.success for result in results)
+
+
+async def run_on_device_pool_async(devices, config, email=None, password=None):
+    """Log in on every device from one event loop, sharing a connection pool per server"""
+    from inditex_automation.async_driver import AsyncHTTPPool
+    from inditex_automation.devices import run_on_devices_async
+    from tests.inditex_login_enhanced import run_login_async
+    
+    pools = {}
+    
+    async def login_on_device(device):
+        pool = pools.setdefault(device.server_url, AsyncHTTPPool(device.server_url))
+        return await run_login_async(config, device=device, pool=pool, email=email, password=password)
+    
+    try:
+        return await run_on_devices_async(devices, login_on_device)
+    finally:
+        for pool in pools.values():
+            await pool.close()
+
+
+def run_tests(daemon_url=None):
+    """Run pytest test suite (in this process)"""
     print("🧪 Running Test Suite...")
-    import subprocess
     
     try:
-        result = subprocess.run([
-            sys.executable, "-m", "pytest", 
+        import pytest
+        
+        args = [
             "tests/test_inditex_login.py", 
             "-v", 
             "--tb=short"
-        ], capture_output=True, text=True)
-        
-        print(result.stdout)
-        if result.stderr:
-            print("Errors:", result.stderr)
-        
-        return result.returncode == 0
+        ]
+        if daemon_url:
+            args += ["--warm-daemon", daemon_url]
+        return pytest.main(args) == 0
     except Exception as e:
         print(f"❌ Error running tests: {e}")
         return False
@@ -89,6 +151,11 @@ Examples:
   python run_automation.py -e user@example.com -p password123  # Custom credentials
   python run_automation.py --test                    # Run test suite
   python run_automation.py --check                   # Check prerequisites
+  python run_automation.py --check --locators        # Also list locators still using XPath
+  python run_automation.py --devices devices.ini     # Run on a device pool in parallel
+  python run_automation.py --devices devices.ini --async  # Same, one event loop for all devices
+  python run_automation.py --daemon http://127.0.0.1:4799  # Attach to a warm session daemon
+  python run_automation.py --set SERVER.explicit_wait=45    # Override a config.ini value
         """
     )
     
@@ -102,6 +169,33 @@ Examples:
         help="Password for login"
     )
     
+    parser.add_argument(
+        "--devices",
+        metavar="FILE",
+        help="Device pool file; runs the login on every device in parallel"
+    )
+    
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="With --devices, drive all devices from one asyncio event loop instead of threads"
+    )
+    
+    parser.add_argument(
+        "--daemon",
+        metavar="URL",
+        help="Attach to warm sessions from a warm session daemon (python -m inditex_automation.warm_daemon)"
+    )
+    
+    parser.add_argument(
+        "--set",
+        metavar="SECTION.key=VALUE",
+        action="append",
+        default=[],
+        help="Override a tests/config.ini value for this run (repeatable)"
+    )
+    
     parser.add_argument(
         "--test",
         action="store_true",
@@ -114,16 +208,31 @@ Examples:
         help="Check prerequisites and configuration"
     )
     
+    parser.add_argument(
+        "--locators",
+        action="store_true",
+        help="With --check, also list the locators that still use XPath (imports Appium)"
+    )
+    
     args = parser.parse_args()
     
+    from inditex_automation.config import ENV_PREFIX, parse_override
+    try:
+        overrides = dict(parse_override(value) for value in args.set)
+    except ValueError as e:
+        parser.error(str(e))
+    
     # Check prerequisites
     if args.check:
-        check_prerequisites()
+        check_prerequisites(args.locators, overrides)
         return
     
-    # Run tests
+    # Run tests (the in-process suite picks the overrides up from the environment)
     if args.test:
-        success = run_tests()
+        for name, value in overrides.items():
+            section, _, key = name.partition(".")
+            os.environ[f"{ENV_PREFIX}{section.upper()}_{key.upper()}"] = value
+        success = run_tests(args.daemon)
         if success:
             print("✅ All tests passed!")
         else:
@@ -132,10 +241,15 @@ Examples:
     
     # Run automation
     try:
-        if args.email and args.password:
-            success = run_with_custom_credentials(args.email, args.password)
+        from inditex_automation.config import load_config
+        config = load_config(CONFIG_PATH, overrides=overrides)
+        if args.devices:
+            success = run_on_device_pool(args.devices, args.email, args.password, args.use_async, args.daemon,
+                                         config)
+        elif args.email and args.password:
+            success = run_with_custom_credentials(args.email, args.password, args.daemon, config)
         else:
-            success = run_basic_automation()
+            success = run_basic_automation(args.daemon, config)
         
         if success:
             print("✅ Automation completed successfully!")
@@ -148,8 +262,14 @@ Examples:
         print(f"❌ Unexpected error: {e}")
 
 
-def check_prerequisites():
-    """Check if all prerequisites are met"""
+def check_prerequisites(locators=False, overrides=None):
+    """
+    Check if all prerequisites are met
+    
+    Args:
+        locators (bool): Also import the flow and report locators still using XPath
+        overrides (dict): --set values applied to tests/config.ini
+    """
     print("🔍 Checking Prerequisites...")
     
     issues = []
@@ -167,17 +287,15 @@ def check_prerequisites():
     else:
         print("✅ Configuration file found")
     
-    # Check if required modules can be imported
-    try:
-        import appium
+    # Check if required modules are installed (located without importing them)
+    if importlib.util.find_spec("appium"):
         print("✅ Appium Python client available")
-    except ImportError:
+    else:
         issues.append("Appium Python client not installed (pip install Appium-Python-Client)")
     
-    try:
-        import selenium
+    if importlib.util.find_spec("selenium"):
         print("✅ Selenium available")
-    except ImportError:
+    else:
         issues.append("Selenium not installed (pip install selenium)")
     
     # Check if tests directory exists
@@ -198,6 +316,28 @@ def check_prerequisites():
         else:
             issues.append(f"Required file missing: {file_path}")
     
+    # Report locators that still fall back to XPath (compiled when the flow is imported)
+    if locators:
+        load_automation()
+        from inditex_automation.locators import optimization_report
+        unoptimized = [line for line in optimization_report() if line.startswith("XPATH")]
+        print(f"✅ Locators compiled ({len(unoptimized)} still using XPath)")
+        for line in unoptimized:
+            print(f"  - {line}")
+    
+    # Check the Appium server, device and app (in parallel, under a second)
+    if os.path.exists(config_path):
+        from inditex_automation.config import load_config
+        from inditex_automation.preflight import preflight_from_config
+        config = load_config(config_path, overrides=overrides)
+        preflight = preflight_from_config(config)
+        if preflight is not None:
+            report = preflight.check([(config.server.url, None, config.app.package)])
+            for result in report.results:
+                mark = "❌" if not result.ok else "✅"
+                print(f"{mark} {result.name}: {result.status} {result.detail}".rstrip())
+            issues.extend(f"{result.name}: {result.detail}" for result in report.failures)
+    
     # Summary
     if issues:
         print("\n❌ Issues found:")
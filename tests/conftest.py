@@ -0,0 +1,43 @@
+"""
+Shared pytest fixtures for the Inditex automation test suites
+"""
+
+import os
+
+import pytest
+
+from inditex_automation.config import load_config
+from inditex_automation.preflight import preflight_from_config
+from inditex_automation.session_pool import SessionPool
+
+
+def pytest_addoption(parser):
+    parser.addoption("--warm-daemon", metavar="URL", default=None,
+                     help="Attach device tests to sessions from a warm session daemon")
+
+
+@pytest.fixture(scope="session")
+def warm_daemon_url(request):
+    """Warm session daemon URL from --warm-daemon (None uses the config's [DAEMON] url)"""
+    return request.config.getoption("--warm-daemon")
+
+
+@pytest.fixture(scope="session")
+def session_pool():
+    """Pool of warm Appium sessions shared by every test of the run"""
+    pool = SessionPool()
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture(scope="session")
+def appium_preflight():
+    """Fail every device test at once when the Appium server, device or app is unavailable"""
+    config = load_config(os.path.join(os.path.dirname(__file__), "config.ini"))
+    preflight = preflight_from_config(config)
+    if preflight is None:
+        return None
+    report = preflight.check([(config.server.url, None, config.app.package)])
+    if not report.ok:
+        pytest.fail("Appium preflight failed:\n" + report.format(), pytrace=False)
+    return report
@@ -6,9 +6,8 @@ using Appium WebDriver with Python and configuration file support.
 """
 
 import os
+import sys
 import time
-import configparser
-from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.support.ui import WebDriverWait
@@ -16,94 +15,183 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import logging
 
+# Make the shared inditex_automation package importable when run from tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-class InditexLoginConfig:
-    """Configuration manager for Inditex automation"""
-    
-    def __init__(self, config_file_path):
-        self.config = configparser.ConfigParser()
-        self.config_file_path = config_file_path
-        self.load_config()
-    
-    def load_config(self):
-        """Load configuration from file"""
-        if os.path.exists(self.config_file_path):
-            self.config.read(self.config_file_path)
-        else:
-            raise FileNotFoundError(f"Configuration file not found: {self.config_file_path}")
-    
-    def get(self, section, key, fallback=None):
-        """Get configuration value"""
-        return self.config.get(section, key, fallback=fallback)
+from inditex_automation.artifacts import pipeline_from_config
+from inditex_automation.async_driver import AsyncAppiumDriver
+from inditex_automation.auth_state import auth_settings
+from inditex_automation.commands import instrument
+from inditex_automation.config import load_config
+from inditex_automation.history import history_from_config
+from inditex_automation.locators import LocatorSet
+from inditex_automation.logs import configure_logging, logging_settings
+from inditex_automation.navigation import read_app_version
+from inditex_automation.recording import recorder_from_config
+from inditex_automation.screens import UNKNOWN_SCREEN, FlowGraph, ScreenClassifier
+from inditex_automation.snapshot import PageSnapshot, snapshot_contains
+from inditex_automation.timing import RunTimer, timed_step
+from inditex_automation.tracing import trace_settings, tracer_from_config
+from inditex_automation.transport import connection_stats, transport_from_config
+from inditex_automation.waits import (
+    WaitEngine,
+    any_of,
+    activity_changed_from,
+    element_present,
+)
+from inditex_automation.warm_daemon import connect
+
+# Element locators, compiled at import time to native strategies where possible
+LOCATORS = LocatorSet(
+    "login",
+    email_field="//android.widget.EditText[@resource-id='idToken7']",
+    continue_button="//android.widget.Button[@resource-id='loginButton_0']",
+    password_field="//android.widget.EditText[@resource-id='idToken3']",
+    login_button="//android.widget.Button[@resource-id='idToken11_0']",
+    home_anchor="//android.widget.TextView[contains(@text, 'Audits')]",
+)
+
+# Login flow states used by navigate_to_state
+LOGIN_SCREEN = "login"
+PASSWORD_SCREEN = "password"
+HOME_SCREEN = "home"
+
+# Screens of the login flow, recognised from one page source dump
+LOGIN_SCREENS = ScreenClassifier([
+    (LOGIN_SCREEN, [LOCATORS.email_field]),
+    (PASSWORD_SCREEN, [LOCATORS.password_field]),
+    (HOME_SCREEN, [LOCATORS.home_anchor]),
+])
+
+# Login steps and the screen each one starts from
+LOGIN_FLOW = FlowGraph([
+    ("enter_email", LOGIN_SCREEN),
+    ("click_continue", LOGIN_SCREEN),
+    ("enter_password", PASSWORD_SCREEN),
+    ("click_login", PASSWORD_SCREEN),
+], final=HOME_SCREEN)
+
+# Supported locator types for wait_for_element / wait_for_clickable_element
+LOCATOR_STRATEGIES = {
+    "xpath": AppiumBy.XPATH,
+    "id": AppiumBy.ID,
+    "uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
+    "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
+    AppiumBy.ANDROID_UIAUTOMATOR: AppiumBy.ANDROID_UIAUTOMATOR,
+    AppiumBy.ACCESSIBILITY_ID: AppiumBy.ACCESSIBILITY_ID,
+}
+
+
+def login_options(config, device=None):
+    """
+    Build the UiAutomator2 capabilities of the login flow
     
-    def getint(self, section, key, fallback=None):
-        """Get integer configuration value"""
-        return self.config.getint(section, key, fallback=fallback)
+    Args:
+        config (AutomationConfig): Loaded configuration
+        device (DeviceProfile): Device from a device pool, if any
+        
+    Returns:
+        UiAutomator2Options
+    """
+    options = UiAutomator2Options()
+    options.device_name = config.device.name
+    options.platform_name = config.device.platform_name
+    options.app_package = config.app.package
+    options.app_activity = config.app.activity
+    options.automation_name = "UiAutomator2"
+    options.no_reset = True
+    options.full_reset = False
+    if device:
+        options.load_capabilities(device.capabilities())
+    return options
 
 
 class InditexLoginAutomationEnhanced:
-    def __init__(self, config_file_path="config.ini"):
+    def __init__(self, config_file_path="config.ini", device=None, daemon_url=None):
         """
         Initialize the Enhanced Inditex Login Automation
         
         Args:
-            config_file_path (str): Path to configuration file
+            config_file_path (str or AutomationConfig): Path to configuration file
+                (loaded once per process) or an already loaded configuration
+            device (DeviceProfile): Device from a device pool; overrides the
+                [DEVICE] section and server URL when given
+            daemon_url (str): Warm session daemon to attach to (overrides [DAEMON] url)
         """
-        # Load configuration
-        self.config = InditexLoginConfig(config_file_path)
+        # Load configuration (shared by every flow of the process)
+        self.config = load_config(config_file_path).for_device(device)
+        self.device = device
+        self.daemon_url = daemon_url or self.config.daemon.url
+        self.skip_login, self.auth_cache = auth_settings(self.config)
         
         # Initialize variables
         self.driver = None
         self.wait = None
+        self.waits = None
+        self.timer = RunTimer("login")
+        self.recorder = None
+        self.tracer = None
+        self.artifacts = pipeline_from_config(self.config)
+        self.transport = transport_from_config(self.config)
+        self.history = history_from_config(self.config)
         
         # Setup logging
         self.setup_logging()
         
     def setup_logging(self):
-        """Setup logging configuration"""
-        log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        logging.basicConfig(
-            level=logging.INFO,
-            format=log_format,
-            handlers=[
-                logging.FileHandler('inditex_automation.log'),
-                logging.StreamHandler()
-            ]
-        )
+        """Setup logging configuration (queue-based, see [LOGGING] in the config)"""
+        configure_logging(**logging_settings(self.config))
         self.logger = logging.getLogger(__name__)
         
+    def get_server_url(self):
+        """Get the Appium server URL for this run"""
+        return self.config.server.url
+    
+    def build_options(self):
+        """Build the UiAutomator2 capabilities from configuration"""
+        return login_options(self.config, self.device)
+    
     def setup_driver(self):
         """Setup Appium driver with configuration"""
         try:
-            # Get configuration values
-            device_name = self.config.get('DEVICE', 'device_name')
-            platform_name = self.config.get('DEVICE', 'platform_name')
-            app_package = self.config.get('APP', 'app_package')
-            app_activity = self.config.get('APP', 'app_activity')
-            server_url = self.config.get('SERVER', 'appium_server_url')
-            
-            # Configure desired capabilities
-            options = UiAutomator2Options()
-            options.device_name = device_name
-            options.platform_name = platform_name
-            options.app_package = app_package
-            options.app_activity = app_activity
-            options.automation_name = "UiAutomator2"
-            options.no_reset = True
-            options.full_reset = False
-            
-            # Initialize driver
-            self.driver = webdriver.Remote(
-                command_executor=server_url,
-                options=options
-            )
+            options = self.build_options()
+            device_name = options.device_name
+            
+            # Initialize driver (attached to a warm daemon session when one is configured)
+            self.driver = connect(self.get_server_url(), options, daemon_url=self.daemon_url,
+                                  transport=self.transport)
             
             # Setup waits
-            implicit_wait = self.config.getint('SERVER', 'implicit_wait', 10)
-            explicit_wait = self.config.getint('SERVER', 'explicit_wait', 30)
+            implicit_wait = self.config.server.implicit_wait
+            explicit_wait = self.config.server.explicit_wait
+            poll_interval = self.config.timeouts.poll_interval
             
             self.driver.implicitly_wait(implicit_wait)
             self.wait = WebDriverWait(self.driver, explicit_wait)
+            self.waits = WaitEngine(
+                self.driver,
+                timeout=explicit_wait,
+                poll_frequency=poll_interval,
+                implicit_wait=implicit_wait,
+                log=self.logger,
+                timer=self.timer
+            )
+            
+            # Charge every WebDriver command to the step that issued it
+            instrument(self.driver).add(self.timer)
+            
+            # Keep the command stream when [RECORDING] is enabled
+            self.recorder = recorder_from_config(
+                self.config, self.driver, self.timer.flow, self.timer.run_id,
+                secrets=(self.config.credentials.username, self.config.credentials.password)
+            )
+            if self.recorder:
+                instrument(self.driver).add(self.recorder)
+            
+            # Keep a timeline of steps and commands when [TRACING] is enabled
+            self.tracer = tracer_from_config(self.config, self.timer, device_name)
+            if self.tracer:
+                instrument(self.driver).add(self.tracer)
             
             self.logger.info(f"Successfully connected to device: {device_name}")
             return True
@@ -115,12 +203,22 @@ class InditexLoginAutomationEnhanced:
     def launch_app(self):
         """Launch the Inditex application"""
         try:
-            app_package = self.config.get('APP', 'app_package')
-            app_launch_wait = self.config.getint('TIMEOUTS', 'app_launch_wait', 3)
+            app_package = self.config.app.package
+            app_launch_wait = self.config.timeouts.app_launch_wait
             
             self.driver.activate_app(app_package)
             self.logger.info(f"Launched app: {app_package}")
-            time.sleep(app_launch_wait)
+            
+            # Continue as soon as either the login form or the home screen is shown
+            self.waits.settle(
+                snapshot_contains(
+                    LOCATORS.email_field.xpath,
+                    LOCATORS.home_anchor.xpath,
+                    match_all=False
+                ),
+                app_launch_wait,
+                "app launched"
+            )
             return True
         except Exception as e:
             self.logger.error(f"Failed to launch app: {str(e)}")
@@ -131,7 +229,7 @@ class InditexLoginAutomationEnhanced:
         Wait for an element to be present and return it
         
         Args:
-            locator_type (str): Type of locator (xpath, id, etc.)
+            locator_type (str): Type of locator (xpath, id, uiautomator, accessibility_id)
             locator_value (str): Locator value
             timeout (int): Maximum time to wait (uses config default if None)
             
@@ -139,21 +237,19 @@ class InditexLoginAutomationEnhanced:
             WebElement or None
         """
         if timeout is None:
-            timeout = self.config.getint('SERVER', 'explicit_wait', 30)
+            timeout = self.config.server.explicit_wait
             
-        try:
-            if locator_type.lower() == "xpath":
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((AppiumBy.XPATH, locator_value))
-                )
-            elif locator_type.lower() == "id":
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located((AppiumBy.ID, locator_value))
-                )
-            else:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
+        by = LOCATOR_STRATEGIES.get(locator_type.lower())
+        if by is None:
+            raise ValueError(f"Unsupported locator type: {locator_type}")
             
-            return element
+        try:
+            # The engine suspends the implicit wait so it cannot stack on the timeout
+            return self.waits.until(
+                EC.presence_of_element_located((by, locator_value)),
+                timeout,
+                f"Element not found: {locator_type}={locator_value}"
+            )
         except TimeoutException:
             self.logger.error(f"Element not found: {locator_type}={locator_value}")
             return None
@@ -163,7 +259,7 @@ class InditexLoginAutomationEnhanced:
         Wait for an element to be clickable and return it
         
         Args:
-            locator_type (str): Type of locator (xpath, id, etc.)
+            locator_type (str): Type of locator (xpath, id, uiautomator, accessibility_id)
             locator_value (str): Locator value
             timeout (int): Maximum time to wait (uses config default if None)
             
@@ -171,25 +267,24 @@ class InditexLoginAutomationEnhanced:
             WebElement or None
         """
         if timeout is None:
-            timeout = self.config.getint('SERVER', 'explicit_wait', 30)
+            timeout = self.config.server.explicit_wait
             
-        try:
-            if locator_type.lower() == "xpath":
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.element_to_be_clickable((AppiumBy.XPATH, locator_value))
-                )
-            elif locator_type.lower() == "id":
-                element = WebDriverWait(self.driver, timeout).until(
-                    EC.element_to_be_clickable((AppiumBy.ID, locator_value))
-                )
-            else:
-                raise ValueError(f"Unsupported locator type: {locator_type}")
+        by = LOCATOR_STRATEGIES.get(locator_type.lower())
+        if by is None:
+            raise ValueError(f"Unsupported locator type: {locator_type}")
             
-            return element
+        try:
+            # The engine suspends the implicit wait so it cannot stack on the timeout
+            return self.waits.until(
+                EC.element_to_be_clickable((by, locator_value)),
+                timeout,
+                f"Clickable element not found: {locator_type}={locator_value}"
+            )
         except TimeoutException:
             self.logger.error(f"Clickable element not found: {locator_type}={locator_value}")
             return None
     
+    @timed_step("enter_email")
     def enter_email(self, email=None):
         """
         Enter email in the email field
@@ -198,13 +293,13 @@ class InditexLoginAutomationEnhanced:
             email (str): Email address to enter (uses config if None)
         """
         if email is None:
-            email = self.config.get('CREDENTIALS', 'email')
+            email = self.config.credentials.username
             
         try:
             self.logger.info("Looking for email input field...")
             
             # Wait for email field to be present
-            email_field = self.wait_for_element("xpath", "//android.widget.EditText[@resource-id='idToken7']")
+            email_field = self.wait_for_element(*LOCATORS.email_field)
             
             if email_field:
                 email_field.clear()
@@ -219,20 +314,26 @@ class InditexLoginAutomationEnhanced:
             self.logger.error(f"Failed to enter email: {str(e)}")
             return False
     
+    @timed_step("click_continue")
     def click_continue_button(self):
         """Click the Continue button after entering email"""
         try:
             self.logger.info("Looking for Continue button...")
             
             # Wait for continue button to be clickable
-            continue_btn = self.wait_for_clickable_element("xpath", "//android.widget.Button[@resource-id='loginButton_0']")
+            continue_btn = self.wait_for_clickable_element(*LOCATORS.continue_button)
             
             if continue_btn:
                 continue_btn.click()
                 self.logger.info("Clicked Continue button")
                 
-                page_transition_wait = self.config.getint('TIMEOUTS', 'page_transition_wait', 2)
-                time.sleep(page_transition_wait)
+                # Wait for the password page instead of a fixed transition delay
+                page_transition_wait = self.config.timeouts.page_transition_wait
+                self.waits.settle(
+                    element_present(*LOCATORS.password_field),
+                    page_transition_wait,
+                    "password page shown"
+                )
                 return True
             else:
                 self.logger.error("Continue button not found or not clickable")
@@ -242,6 +343,7 @@ class InditexLoginAutomationEnhanced:
             self.logger.error(f"Failed to click continue button: {str(e)}")
             return False
     
+    @timed_step("enter_password")
     def enter_password(self, password=None):
         """
         Enter password in the password field
@@ -250,13 +352,13 @@ class InditexLoginAutomationEnhanced:
             password (str): Password to enter (uses config if None)
         """
         if password is None:
-            password = self.config.get('CREDENTIALS', 'password')
+            password = self.config.credentials.password
             
         try:
             self.logger.info("Looking for password input field...")
             
             # Wait for password field to be present
-            password_field = self.wait_for_element("xpath", "//android.widget.EditText[@resource-id='idToken3']")
+            password_field = self.wait_for_element(*LOCATORS.password_field)
             
             if password_field:
                 password_field.clear()
@@ -271,20 +373,30 @@ class InditexLoginAutomationEnhanced:
             self.logger.error(f"Failed to enter password: {str(e)}")
             return False
     
+    @timed_step("click_login")
     def click_login_button(self):
         """Click the final Login button"""
         try:
             self.logger.info("Looking for Login button...")
             
             # Wait for login button to be clickable
-            login_btn = self.wait_for_clickable_element("xpath", "//android.widget.Button[@resource-id='idToken11_0']")
+            login_btn = self.wait_for_clickable_element(*LOCATORS.login_button)
             
             if login_btn:
+                activity_before = self.driver.current_activity
                 login_btn.click()
                 self.logger.info("Clicked Login button")
                 
-                login_completion_wait = self.config.getint('TIMEOUTS', 'login_completion_wait', 5)
-                time.sleep(login_completion_wait)
+                # Continue once the app leaves the login page
+                login_completion_wait = self.config.timeouts.login_completion_wait
+                self.waits.settle(
+                    any_of(
+                        activity_changed_from(activity_before),
+                        element_present(*LOCATORS.home_anchor)
+                    ),
+                    login_completion_wait,
+                    "login completed"
+                )
                 return True
             else:
                 self.logger.error("Login button not found or not clickable")
@@ -294,29 +406,31 @@ class InditexLoginAutomationEnhanced:
             self.logger.error(f"Failed to click login button: {str(e)}")
             return False
     
+    @timed_step("verify")
     def verify_login_success(self):
         """Verify if login was successful"""
         try:
-            # Wait a bit for the app to load after login
-            time.sleep(3)
+            # Wait for the home screen to load before taking screenshot
+            page_load_wait = self.config.timeouts.page_load_wait
+            self.waits.settle(
+                element_present(*LOCATORS.home_anchor),
+                3 + page_load_wait,
+                "home screen loaded"
+            )
             
             # Get current activity
             current_activity = self.driver.current_activity
             self.logger.info(f"Current activity after login: {current_activity}")
-            # Wait for page to load before taking screenshot
-            page_load_wait = self.config.getint('TIMEOUTS', 'page_load_wait', 5)
-            time.sleep(page_load_wait)
-            # Take a screenshot for verification
-            screenshot_path = f"login_result_{int(time.time())}.png"
-            self.driver.save_screenshot(screenshot_path)
-            self.logger.info(f"Screenshot saved: {screenshot_path}")
+            # Queue a screenshot for verification; it is written in the background
+            for path in self.artifacts.capture(self.driver, f"login_result_{int(time.time())}"):
+                self.logger.info(f"Screenshot queued: {path}")
             
             # Check if we're no longer on the login page
             # This can be enhanced based on specific success indicators
             try:
-                # Try to find login elements - if they're not present, login likely succeeded
-                login_elements = self.driver.find_elements(AppiumBy.XPATH, "//android.widget.EditText[@resource-id='idToken7']")
-                if len(login_elements) == 0:
+                # One lookup with the implicit wait suspended: on success the
+                # login form is gone, which must not cost the full implicit wait
+                if self.waits.is_absent(*LOCATORS.email_field):
                     self.logger.info("Login elements not found - likely successful login")
                     return True
                 else:
@@ -330,10 +444,15 @@ class InditexLoginAutomationEnhanced:
             self.logger.error(f"Failed to verify login: {str(e)}")
             return False
     
+    @timed_step("login")
     def perform_login(self, email=None, password=None):
         """
         Perform the complete login workflow
         
+        The current screen is identified first, so a run that finds the app
+        on the password page (or already logged in) only performs the steps
+        still missing instead of waiting for the email field.
+        
         Args:
             email (str): Email address (uses config if None)
             password (str): Password (uses config if None)
@@ -341,38 +460,253 @@ class InditexLoginAutomationEnhanced:
         Returns:
             bool: True if login successful, False otherwise
         """
+        steps = {
+            "enter_email": ("📧 Step 1: Entering email...", lambda: self.enter_email(email)),
+            "click_continue": ("➡️ Step 2: Clicking Continue...", self.click_continue_button),
+            "enter_password": ("🔒 Step 3: Entering password...", lambda: self.enter_password(password)),
+            "click_login": ("🔑 Step 4: Clicking Login...", self.click_login_button),
+        }
+        if self.recorder:
+            self.recorder.add_secrets(email, password)
         try:
             self.logger.info("🚀 Starting Inditex login automation...")
             
-            # Step 1: Enter email
-            self.logger.info("📧 Step 1: Entering email...")
-            if not self.enter_email(email):
-                return False
+            # Every lookup below goes through the wait engine: suspend the
+            # implicit wait once for the whole flow instead of around each wait
+            with self.waits.implicit_wait_suspended():
+                state = self.current_login_state()
+                remaining = LOGIN_FLOW.remaining(state)
+                if remaining is None:
+                    # Not recognised yet (e.g. still loading): every step waits for its screen
+                    remaining = list(steps)
+                elif len(remaining) < len(steps):
+                    self.logger.info(f"⏭️ App is on the {state} screen - resuming at step {len(steps) - len(remaining) + 1}")
+                
+                for step in remaining:
+                    message, action = steps[step]
+                    self.logger.info(message)
+                    if not action():
+                        return self.login_failed(step)
+                
+                # Step 5: Verify login success
+                self.logger.info("✅ Step 5: Verifying login...")
+                if self.verify_login_success():
+                    self.logger.info("🎉 Login automation completed successfully!")
+                    return True
+                else:
+                    self.logger.error("❌ Login verification failed")
+                    return self.login_failed("verify")
+                
+        except Exception as e:
+            self.logger.error(f"❌ Login automation failed: {str(e)}")
+            return self.login_failed("error")
+    
+    def login_failed(self, step):
+        """
+        Queue a screenshot and page source of the failed step
+        
+        Args:
+            step (str): Name of the step that failed
             
-            # Step 2: Click Continue
-            self.logger.info("➡️ Step 2: Clicking Continue...")
-            if not self.click_continue_button():
-                return False
+        Returns:
+            bool: Always False, so callers can return it directly
+        """
+        if self.driver:
+            for path in self.artifacts.capture_failure(self.driver, f"login_failed_{step}_{int(time.time())}"):
+                self.logger.info(f"Failure artifact queued: {path}")
+        return False
+    
+    def current_login_state(self):
+        """
+        Identify where the app is in the login flow from one page source dump
+        
+        Returns:
+            str: LOGIN_SCREEN, PASSWORD_SCREEN, HOME_SCREEN or UNKNOWN_SCREEN
+        """
+        try:
+            state, _ = LOGIN_SCREENS.identify(self.driver)
+        except Exception as e:
+            self.logger.warning(f"Could not capture page source: {str(e)}")
+            return UNKNOWN_SCREEN
+        return state
+    
+    def restart_app(self):
+        """Terminate and relaunch the app; its data (and login) is kept"""
+        app_package = self.config.app.package
+        self.logger.info("Restarting app...")
+        self.driver.terminate_app(app_package)
+        return self.launch_app()
+    
+    def reset_app(self):
+        """Clear the app data and relaunch it, which logs out and returns to the login screen"""
+        app_package = self.config.app.package
+        self.logger.info("Clearing app data to return to the login screen...")
+        self.driver.execute_script('mobile: clearApp', {'appId': app_package})
+        return self.launch_app()
+    
+    def navigate_to_state(self, target, allow_reset=False):
+        """
+        Bring the app to a login flow state with as few steps as possible
+        
+        Going back from the password page uses the back button and an
+        unknown screen is left by restarting the app, which keeps its data.
+        The app has no scripted logout, so reaching the login screen from a
+        logged in session needs clearing the app data, which only happens
+        with allow_reset. Forward moves perform just the missing steps.
+        
+        Args:
+            target (str): LOGIN_SCREEN, PASSWORD_SCREEN or HOME_SCREEN
+            allow_reset (bool): Clear the app data (mobile: clearApp) when
+                the login screen cannot be reached otherwise
             
-            # Step 3: Enter password
-            self.logger.info("🔒 Step 3: Entering password...")
-            if not self.enter_password(password):
+        Returns:
+            bool: True if the app ended up in the target state
+        """
+        if target not in LOGIN_FLOW.screens:
+            raise ValueError(f"Unknown login state: {target}")
+        state = self.current_login_state()
+        self.logger.info(f"Navigating from {state} to {target}")
+        if state == UNKNOWN_SCREEN:
+            self.restart_app()
+            state = self.current_login_state()
+        if state == target:
+            return True
+        
+        if target == LOGIN_SCREEN:
+            if state == PASSWORD_SCREEN:
+                self.driver.back()
+                page_transition_wait = self.config.timeouts.page_transition_wait
+                self.waits.settle(element_present(*LOCATORS.email_field), page_transition_wait, "login page shown")
+                state = self.current_login_state()
+            if state != LOGIN_SCREEN and allow_reset:
+                self.reset_app()
+                state = self.current_login_state()
+            return state == LOGIN_SCREEN
+        
+        if target == HOME_SCREEN:
+            if state not in (LOGIN_SCREEN, PASSWORD_SCREEN):
                 return False
-            
-            # Step 4: Click Login
-            self.logger.info("🔑 Step 4: Clicking Login...")
-            if not self.click_login_button():
+            # perform_login resumes at the first step the current screen still needs
+            return self.perform_login()
+        
+        steps = LOGIN_FLOW.between(state, target)
+        if steps is None:
+            if not self.navigate_to_state(LOGIN_SCREEN, allow_reset):
                 return False
+            steps = LOGIN_FLOW.between(LOGIN_SCREEN, target)
+        actions = {
+            "enter_email": self.enter_email,
+            "click_continue": self.click_continue_button,
+            "enter_password": self.enter_password,
+            "click_login": self.click_login_button,
+        }
+        return all(actions[step]() for step in steps)
+    
+    @timed_step("authenticate")
+    def ensure_logged_in(self):
+        """
+        Reach the home screen, skipping the login sequence when possible
+        
+        With [AUTH] skip_login enabled, one page source probe detects a
+        session that is still logged in. Otherwise a cached authenticated
+        app-data snapshot is restored and the app relaunched; only when that
+        is missing or rejected does the full login run, after which a new
+        snapshot is cached. The probe does not check which account is logged
+        in, so runs with explicit credentials should call perform_login.
+        
+        Returns:
+            bool: True if the app ended up logged in on the home screen
+        """
+        if not self.skip_login:
+            return self.perform_login()
+        
+        state = self.current_login_state()
+        if state == UNKNOWN_SCREEN and self.launch_app():
+            # Bring the app to the front before deciding anything
+            state = self.current_login_state()
+        if state == HOME_SCREEN:
+            self.logger.info("✅ Already logged in - skipping login")
+            return True
+        
+        app_package = self.config.app.package
+        key = None
+        if self.auth_cache:
+            key = self.auth_cache.key(self.build_options().device_name, app_package,
+                                      self.config.credentials.username)
+            if self.auth_cache.restore(self.driver, app_package, key) and self.launch_app():
+                state = self.current_login_state()
+                if state == HOME_SCREEN:
+                    self.logger.info("✅ Restored cached login - skipping login")
+                    return True
+                self.logger.info("Cached login was not accepted; logging in")
+                self.auth_cache.invalidate(key)
+        
+        if not self.navigate_to_state(HOME_SCREEN):
+            return False
+        if key:
+            self.auth_cache.save(self.driver, app_package, key)
+        return True
+    
+    @timed_step("login")
+    async def perform_login_async(self, driver, email=None, password=None):
+        """
+        Perform the login workflow on an asyncio driver
+        
+        Same steps and upper bounds as perform_login, but every command is
+        awaited so one event loop can log in on many devices at once.
+        
+        Args:
+            driver (AsyncAppiumDriver): Session to log in on
+            email (str): Email address (uses config if None)
+            password (str): Password (uses config if None)
             
-            # Step 5: Verify login success
-            self.logger.info("✅ Step 5: Verifying login...")
-            if self.verify_login_success():
-                self.logger.info("🎉 Login automation completed successfully!")
-                return True
-            else:
+        Returns:
+            bool: True if login successful, False otherwise
+        """
+        email = email if email is not None else self.config.credentials.username
+        password = password if password is not None else self.config.credentials.password
+        explicit_wait = self.config.server.explicit_wait
+        poll_interval = self.config.timeouts.poll_interval
+        page_transition_wait = self.config.timeouts.page_transition_wait
+        login_completion_wait = self.config.timeouts.login_completion_wait
+        page_load_wait = self.config.timeouts.page_load_wait
+        
+        async def present(locator):
+            return await driver.wait_for_element(*locator, timeout=explicit_wait, poll_frequency=poll_interval)
+        
+        def shown(locator):
+            async def _condition(d):
+                return bool(await d.find_elements(*locator))
+            return _condition
+        
+        try:
+            self.logger.info("🚀 Starting Inditex login automation (async)...")
+            email_field = await present(LOCATORS.email_field)
+            await email_field.clear()
+            await email_field.send_keys(email)
+            
+            await (await present(LOCATORS.continue_button)).click()
+            await driver.settle(shown(LOCATORS.password_field), page_transition_wait, poll_interval)
+            
+            password_field = await present(LOCATORS.password_field)
+            await password_field.clear()
+            await password_field.send_keys(password)
+            
+            activity_before = await driver.current_activity()
+            await (await present(LOCATORS.login_button)).click()
+            
+            async def login_completed(d):
+                return await d.current_activity() != activity_before or bool(
+                    await d.find_elements(*LOCATORS.home_anchor))
+            await driver.settle(login_completed, login_completion_wait, poll_interval)
+            await driver.settle(shown(LOCATORS.home_anchor), 3 + page_load_wait, poll_interval)
+            
+            snapshot = PageSnapshot(await driver.page_source())
+            if snapshot.exists(LOCATORS.email_field.xpath):
                 self.logger.error("❌ Login verification failed")
                 return False
-                
+            self.logger.info("🎉 Login automation completed successfully!")
+            return True
         except Exception as e:
             self.logger.error(f"❌ Login automation failed: {str(e)}")
             return False
@@ -384,8 +718,90 @@ class InditexLoginAutomationEnhanced:
         except:
             return None
     
+    def export_timings(self):
+        """
+        Log this run's step timings and write them as JSON
+        
+        Returns:
+            str: Path of the JSON file, or None if nothing was written
+        """
+        if not self.timer.spans:
+            return None
+        self.logger.info("Step timings (seconds):\n" + self.timer.summary())
+        timings_dir = self.config.metrics.timings_dir
+        if not timings_dir:
+            return None
+        path = self.timer.export(timings_dir)
+        self.logger.info(f"Step timings written to {path}")
+        return path
+    
+    def record_history(self):
+        """
+        Store this run's durations, device and outcome in the [HISTORY] database
+        
+        Returns:
+            bool: True if the run was stored
+        """
+        if self.history is None or not self.timer.spans:
+            return False
+        device_name = self.config.device.name
+        app_version = None
+        if self.driver:
+            app_version = read_app_version(self.driver, self.config.app.package)
+        self.history.record(self.timer, device=device_name, app_version=app_version)
+        return True
+    
+    def stop_recording(self):
+        """
+        Detach the command recorder and finish its file
+        
+        Returns:
+            str: Path of the recording, or None if nothing was recorded
+        """
+        if self.recorder is None:
+            return None
+        instrument(self.driver).remove(self.recorder)
+        path = self.recorder.close()
+        self.recorder = None
+        self.logger.info(f"Command recording written to {path}")
+        return path
+    
+    def export_trace(self):
+        """
+        Detach the tracer and write the run's step/command timeline
+        
+        Returns:
+            str: Path of the trace, or None if tracing is disabled
+        """
+        if self.tracer is None:
+            return None
+        instrument(self.driver).remove(self.tracer)
+        directory, trace_format = trace_settings(self.config)
+        path = self.tracer.export(directory, trace_format)
+        self.tracer = None
+        self.logger.info(f"Trace written to {path}")
+        return path
+    
     def cleanup(self):
         """Clean up resources"""
+        # Write queued screenshots before the run ends
+        self.artifacts.close()
+        try:
+            self.export_timings()
+        except Exception as e:
+            self.logger.warning(f"Could not export step timings: {str(e)}")
+        try:
+            self.record_history()
+        except Exception as e:
+            self.logger.warning(f"Could not record the run history: {str(e)}")
+        self.stop_recording()
+        try:
+            self.export_trace()
+        except Exception as e:
+            self.logger.warning(f"Could not export trace: {str(e)}")
+        stats = connection_stats(self.driver)
+        if stats:
+            self.logger.info(f"WebDriver connections: {stats.summary()}")
         try:
             if self.driver:
                 self.driver.quit()
@@ -394,6 +810,37 @@ class InditexLoginAutomationEnhanced:
             self.logger.error(f"Error during cleanup: {str(e)}")
 
 
+async def run_login_async(config_file_path, device=None, pool=None, email=None, password=None):
+    """
+    Launch the app and log in on one device using the asyncio driver
+    
+    Args:
+        config_file_path (str or AutomationConfig): Path to configuration file or a loaded configuration
+        device (DeviceProfile): Device from a device pool (single configured device if None)
+        pool (AsyncHTTPPool): Connection pool shared by sessions on the same server
+        email (str): Email address (uses config if None)
+        password (str): Password (uses config if None)
+        
+    Returns:
+        bool: True if login successful
+    """
+    automation = InditexLoginAutomationEnhanced(config_file_path, device=device)
+    try:
+        driver = await AsyncAppiumDriver.create(
+            automation.get_server_url(), automation.build_options().to_capabilities(), pool=pool
+        )
+        try:
+            app_package = automation.config.app.package
+            await driver.activate_app(app_package)
+            return await automation.perform_login_async(driver, email=email, password=password)
+        finally:
+            await driver.quit()
+    finally:
+        # Store the run like the synchronous flow; automation.driver is None,
+        # so cleanup() leaves the session (quit above) alone
+        automation.cleanup()
+
+
 def main():
     """Main function to run the enhanced automation"""
     config_path = os.path.join(os.path.dirname(__file__), "config.ini")
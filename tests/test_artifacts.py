@@ -0,0 +1,150 @@
+"""
+Pytest test suite for the background artifact pipeline
+"""
+
+import base64
+import configparser
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from inditex_automation.artifacts import (
+    ALWAYS,
+    EVERY_N,
+    ON_FAILURE,
+    PAGE_SOURCE,
+    SCREENSHOT,
+    ArtifactPipeline,
+    pipeline_from_config,
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PNG = b"\x89PNG\r\n\x1a\nfake"
+
+
+class FakeDriver:
+    """Driver stand-in counting screenshot calls"""
+
+    def __init__(self, fail=False):
+        self.screenshots = 0
+        self.fail = fail
+        self.page_source = "<hierarchy/>"
+
+    def get_screenshot_as_base64(self):
+        if self.fail:
+            raise RuntimeError("session gone")
+        self.screenshots += 1
+        return base64.b64encode(PNG).decode("ascii")
+
+
+class TestArtifactPipeline:
+    """Test class for ArtifactPipeline"""
+
+    def test_capture_is_written_in_background(self, tmp_path):
+        pipeline = ArtifactPipeline(str(tmp_path / "artifacts"))
+        driver = FakeDriver()
+
+        paths = pipeline.capture(driver, "login_result", kinds=(SCREENSHOT, PAGE_SOURCE))
+        pipeline.close()
+
+        assert [path.rsplit(".", 1)[1] for path in paths] == ["png", "xml"]
+        assert (tmp_path / "artifacts" / "login_result.png").read_bytes() == PNG
+        assert (tmp_path / "artifacts" / "login_result.xml").read_text() == "<hierarchy/>"
+        assert sorted(pipeline.saved) == sorted(paths)
+
+    def test_on_failure_skips_checkpoints(self, tmp_path):
+        pipeline = ArtifactPipeline(str(tmp_path), policy=ON_FAILURE)
+        driver = FakeDriver()
+
+        assert pipeline.capture(driver, "checkpoint") == []
+        assert driver.screenshots == 0
+
+        pipeline.capture_failure(driver, "failed")
+        pipeline.close()
+        assert (tmp_path / "failed.png").exists()
+        assert (tmp_path / "failed.xml").exists()
+
+    def test_every_n_runs(self, tmp_path):
+        counter = str(tmp_path / "runs")
+        pipelines = [ArtifactPipeline(str(tmp_path), policy=EVERY_N, every_n=3, run_counter=counter)
+                     for _ in range(6)]
+
+        enabled = [pipeline.checkpoints_enabled() for pipeline in pipelines]
+
+        assert enabled == [True, False, False, True, False, False]
+
+    def test_every_n_counts_across_processes(self, tmp_path):
+        config = tmp_path / "config.ini"
+        config.write_text(f"[ARTIFACTS]\npolicy = every_n\nevery_n = 3\ndirectory = {tmp_path}\n")
+        script = ("import configparser, sys; from inditex_automation.artifacts import pipeline_from_config; "
+                  "config = configparser.ConfigParser(); config.read(sys.argv[1]); "
+                  "print(pipeline_from_config(config).checkpoints_enabled())")
+
+        enabled = [subprocess.run([sys.executable, "-c", script, str(config)], capture_output=True, text=True,
+                                  check=True, cwd=ROOT_DIR).stdout.strip() for _ in range(4)]
+
+        assert enabled == ["True", "False", "False", "True"]
+
+    def test_parallel_processes_draw_distinct_runs(self, tmp_path):
+        counter = str(tmp_path / "runs")
+        script = ("import sys; from inditex_automation.artifacts import next_run_number; "
+                  "print(*[next_run_number(sys.argv[1]) for _ in range(25)])")
+
+        processes = [subprocess.Popen([sys.executable, "-c", script, counter], stdout=subprocess.PIPE, text=True,
+                                      cwd=ROOT_DIR) for _ in range(6)]
+        numbers = [int(number) for process in processes for number in process.communicate()[0].split()]
+
+        assert sorted(numbers) == list(range(1, 151))
+
+    def test_run_is_counted_at_the_first_checkpoint(self, tmp_path):
+        counter = str(tmp_path / "runs")
+        idle = ArtifactPipeline(str(tmp_path), policy=EVERY_N, every_n=2, run_counter=counter)
+        idle.capture_failure(FakeDriver(), "failed")
+        idle.close()
+        first = ArtifactPipeline(str(tmp_path), policy=EVERY_N, every_n=2, run_counter=counter)
+        second = ArtifactPipeline(str(tmp_path), policy=EVERY_N, every_n=2, run_counter=counter)
+
+        assert second.capture(FakeDriver(), "checkpoint") != []
+        assert first.capture(FakeDriver(), "checkpoint") == []
+        assert (idle._run_number, second.run_number, first.run_number) == (None, 1, 2)
+
+    def test_failure_capture_never_raises(self, tmp_path):
+        pipeline = ArtifactPipeline(str(tmp_path))
+
+        assert pipeline.capture_failure(FakeDriver(fail=True), "failed") == []
+
+    def test_queue_bounds_memory(self, tmp_path, monkeypatch):
+        pipeline = ArtifactPipeline(str(tmp_path), queue_size=1)
+        release = threading.Event()
+        original_write = pipeline._write
+        monkeypatch.setattr(pipeline, "_write", lambda *item: release.wait(5) and original_write(*item))
+        driver = FakeDriver()
+
+        pipeline.capture(driver, "first")
+        pipeline.capture(driver, "second")
+        blocked = threading.Thread(target=pipeline.capture, args=(driver, "third"))
+        blocked.start()
+        blocked.join(0.2)
+
+        assert blocked.is_alive(), "A full queue should make capture wait for the writer"
+        release.set()
+        blocked.join(5)
+        pipeline.close()
+        assert len(pipeline.saved) == 3
+
+    def test_unknown_policy(self, tmp_path):
+        with pytest.raises(ValueError):
+            ArtifactPipeline(str(tmp_path), policy="sometimes")
+
+    def test_from_config(self, tmp_path):
+        config = configparser.ConfigParser()
+        config.read_string(f"[ARTIFACTS]\npolicy = every_n\nevery_n = 5\ndirectory = {tmp_path}\nmax_width =\n")
+
+        pipeline = pipeline_from_config(config)
+
+        assert (pipeline.policy, pipeline.every_n, pipeline.directory) == (EVERY_N, 5, str(tmp_path))
+        assert pipeline.max_width == 0
+        assert pipeline_from_config(configparser.ConfigParser()).policy == ALWAYS
@@ -0,0 +1,118 @@
+"""
+Pytest test suite for the asyncio driver facade
+
+Sessions run against the local fake Appium server; coroutines are driven
+with asyncio.run so no pytest plugin is needed.
+"""
+
+import asyncio
+import os
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from inditex_automation.async_driver import AsyncAppiumDriver, AsyncHTTPPool
+from inditex_automation.devices import DeviceProfile, format_results, run_on_devices_async
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.history import RunHistory
+from inditex_login_enhanced import run_login_async
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PRODUCTION_CHECK_DIR = os.path.join(os.path.dirname(TESTS_DIR), "appium-client", "tests")
+CAPABILITIES = {"platformName": "Android", "appium:automationName": "UiAutomator2"}
+
+
+def write_config(source, server_url, destination):
+    """Copy a config file pointing it at the fake server"""
+    with open(source) as f:
+        content = f.read().replace("http://127.0.0.1:4723", server_url)
+    destination.write_text(content)
+    return str(destination)
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer(delay_scale=0) as server:
+        yield server
+
+
+class TestAsyncAppiumDriver:
+    """Test class for AsyncAppiumDriver"""
+
+    def test_basic_commands(self, server):
+        async def scenario():
+            async with await AsyncAppiumDriver.create(server.url, CAPABILITIES) as driver:
+                email = await driver.find_element("id", "idToken7")
+                await email.send_keys("user")
+                assert await email.text() == "user"
+                assert await driver.current_activity() == ".LoginActivity"
+                assert "idToken7" in await driver.page_source()
+                assert (await driver.screenshot()).startswith(b"\x89PNG")
+                await (await driver.find_element("id", "loginButton_0")).click()
+                return await driver.wait_for_element("id", "idToken3", timeout=2)
+
+        assert asyncio.run(scenario()) is not None
+        assert server.command_counts["delete_session"] == 1
+
+    def test_w3c_errors_are_mapped(self, server):
+        async def scenario():
+            async with await AsyncAppiumDriver.create(server.url, CAPABILITIES) as driver:
+                with pytest.raises(NoSuchElementException):
+                    await driver.find_element("id", "missing")
+                with pytest.raises(TimeoutException):
+                    await driver.wait_for_element("id", "missing", timeout=0.2, poll_frequency=0.05)
+                assert await driver.settle(lambda d: asyncio.sleep(0, result=False), 0.1, 0.05) is None
+
+        asyncio.run(scenario())
+
+    def test_sessions_share_a_bounded_pool(self, server):
+        async def scenario():
+            pool = AsyncHTTPPool(server.url, max_connections=3)
+            drivers = await asyncio.gather(*(AsyncAppiumDriver.create(server.url, CAPABILITIES, pool) for _ in range(12)))
+            await asyncio.gather(*(driver.page_source() for driver in drivers for _ in range(5)))
+            await asyncio.gather(*(driver.quit() for driver in drivers))
+            await pool.close()
+            return pool
+
+        pool = asyncio.run(scenario())
+
+        assert pool.connections_opened <= 3
+        assert pool.requests == 12 * 7
+
+
+class TestAsyncFlows:
+    """Test class for the coroutine versions of both flows"""
+
+    def test_login_on_many_devices_from_one_loop(self, server, tmp_path, monkeypatch):
+        config_path = write_config(os.path.join(TESTS_DIR, "config.ini"), server.url, tmp_path / "config.ini")
+        monkeypatch.chdir(tmp_path)
+        devices = [DeviceProfile(f"dev{index}", server_url=server.url) for index in range(10)]
+
+        async def scenario():
+            pool = AsyncHTTPPool(server.url)
+            try:
+                return await run_on_devices_async(
+                    devices, lambda device: run_login_async(config_path, device=device, pool=pool)
+                )
+            finally:
+                await pool.close()
+
+        results = asyncio.run(scenario())
+
+        assert all(result.success for result in results), format_results(results)
+        assert server.command_counts["new_session"] == 10
+        assert len(RunHistory(str(tmp_path / "run_history.sqlite")).durations("login")) == 10
+        assert len(os.listdir(tmp_path / "timings")) == 10
+
+    def test_production_check_coroutine(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.syspath_prepend(PRODUCTION_CHECK_DIR)
+        import test_production_check
+
+        with FakeAppiumServer(initial_screen="login_native", delay_scale=0) as server:
+            config_path = write_config(
+                os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url, tmp_path / "config.ini"
+            )
+            assert asyncio.run(test_production_check.run_test_async(config_path))
+
+        assert len(RunHistory(str(tmp_path / "run_history.sqlite")).durations("production_check")) == 1
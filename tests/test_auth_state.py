@@ -0,0 +1,162 @@
+"""
+Pytest test suite for the authenticated state cache and the state-aware login
+
+The fake Appium server keeps per-device app data: reaching the home screen
+writes a session file, and relaunching the app with it present opens home.
+"""
+
+import os
+import time
+import zipfile
+
+import pytest
+from appium import webdriver
+from appium.options.common import AppiumOptions
+
+from inditex_automation.auth_state import META_ENTRY, AuthStateCache, auth_settings
+from inditex_automation.fake_server import FakeAppiumServer, FakeSession
+from inditex_login_enhanced import HOME_SCREEN, InditexLoginAutomationEnhanced
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PRODUCTION_CHECK_DIR = os.path.join(os.path.dirname(TESTS_DIR), "appium-client", "tests")
+PACKAGE = "com.inditex.trazabilidapp"
+
+
+def write_config(source, server_url, destination):
+    """Copy a config file pointing it at the fake server, with login skipping and the cache enabled"""
+    with open(source) as f:
+        content = f.read().replace("http://127.0.0.1:4723", server_url)
+    content = content.replace("skip_login = false", "skip_login = true").replace("cache_dir =", "cache_dir = auth_cache")
+    destination.write_text(content)
+    return str(destination)
+
+
+def span_names(timer):
+    return [span.name for span in timer.spans]
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer(initial_screen="login_native", delay_scale=0) as server:
+        yield server
+
+
+@pytest.fixture
+def driver(server):
+    options = AppiumOptions().load_capabilities({"platformName": "Android", "appium:deviceName": "tablet"})
+    driver = webdriver.Remote(server.url, options=options)
+    yield driver
+    driver.quit()
+
+
+class TestAuthStateCache:
+    """Test class for AuthStateCache"""
+
+    def test_key_hides_the_user(self, tmp_path):
+        cache = AuthStateCache(str(tmp_path))
+
+        key = cache.key("Pixel Tablet", PACKAGE, "amitks")
+
+        assert key.startswith(f"Pixel_Tablet_{PACKAGE}_")
+        assert "amitks" not in key
+        assert key != cache.key("Pixel Tablet", PACKAGE, "someone-else")
+
+    def test_save_and_restore_round_trip(self, tmp_path, server, driver):
+        cache = AuthStateCache(str(tmp_path))
+        server.set_screen("home")
+        assert cache.save(driver, PACKAGE, "tablet")
+
+        driver.execute_script("mobile: clearApp", {"appId": PACKAGE})
+        assert cache.restore(driver, PACKAGE, "tablet")
+        driver.activate_app(PACKAGE)
+
+        assert driver.current_activity == ".MainActivity"
+
+    def test_nothing_to_save(self, tmp_path, driver):
+        cache = AuthStateCache(str(tmp_path))
+
+        assert not cache.save(driver, PACKAGE, "tablet")
+        assert not cache.restore(driver, PACKAGE, "tablet")
+
+    def test_expired_snapshot_is_ignored(self, tmp_path):
+        cache = AuthStateCache(str(tmp_path), max_age=60)
+        with zipfile.ZipFile(cache.path("tablet"), "w") as archive:
+            archive.writestr(META_ENTRY, f'{{"created": {time.time() - 120}}}')
+            archive.writestr("shared_prefs/session.xml", "<map/>")
+
+        assert cache.load("tablet") is None
+        cache.max_age = 0
+        assert cache.load("tablet") == {"shared_prefs/session.xml": b"<map/>"}
+
+    def test_settings(self, tmp_path):
+        class Config(dict):
+            def get(self, section, key, fallback=None):
+                return dict.get(self, key, fallback)
+
+        skip_login, cache = auth_settings(Config(skip_login="true", cache_dir=str(tmp_path),
+                                                 folders="shared_prefs, databases"))
+        assert skip_login and cache.folders == ("shared_prefs", "databases")
+        assert auth_settings(Config(skip_login="false", cache_dir=str(tmp_path))) == (False, None)
+        assert auth_settings(Config()) == (False, None)
+
+
+class TestStateAwareLogin:
+    """Test class for the flows skipping the login sequence"""
+
+    def test_production_check_skips_login(self, tmp_path, monkeypatch, server):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.syspath_prepend(PRODUCTION_CHECK_DIR)
+        from test_production_check import ProductionCheckTest
+        config_path = write_config(os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url,
+                                   tmp_path / "config.ini")
+
+        terminations = []
+        terminate_app = FakeSession.terminate_app
+        monkeypatch.setattr(FakeSession, "terminate_app", lambda session: terminations.append(1) or terminate_app(session))
+
+        def run(initial_screen):
+            server.initial_screen = initial_screen
+            terminations.clear()
+            test = ProductionCheckTest(config_path)
+            try:
+                assert test.run("amitks", "secret")
+            finally:
+                test.teardown()
+            return span_names(test.timer), len(terminations)
+
+        steps, _ = run("login_native")
+        assert "login" in steps
+        assert list((tmp_path / "auth_cache").glob("*.zip"))
+
+        steps, relaunches = run("home")
+        assert "login" not in steps and relaunches == 0, "One probe should detect the logged in app"
+
+        steps, relaunches = run("login_email")
+        assert "login" not in steps and relaunches == 1, "A relaunch should leave an unknown screen"
+
+        server.app_data.clear()
+        steps, relaunches = run("login_native")
+        assert "login" not in steps and relaunches == 1, "The cached snapshot should be restored"
+
+    def test_rejected_snapshot_falls_back_to_login(self, tmp_path, monkeypatch, server):
+        monkeypatch.chdir(tmp_path)
+        config_path = write_config(os.path.join(TESTS_DIR, "config.ini"), server.url, tmp_path / "config.ini")
+        server.initial_screen = "login_email"
+        automation = InditexLoginAutomationEnhanced(config_path)
+        key = automation.auth_cache.key(automation.build_options().device_name, PACKAGE, "amitks")
+        os.makedirs(automation.auth_cache.directory)
+        with zipfile.ZipFile(automation.auth_cache.path(key), "w") as archive:
+            archive.writestr(META_ENTRY, f'{{"created": {time.time()}}}')
+            archive.writestr("shared_prefs/expired.xml", "<map/>")
+
+        try:
+            assert automation.setup_driver()
+            assert automation.launch_app()
+            assert automation.ensure_logged_in()
+            assert automation.current_login_state() == HOME_SCREEN
+        finally:
+            automation.cleanup()
+
+        assert "login" in span_names(automation.timer)
+        with zipfile.ZipFile(automation.auth_cache.path(key)) as archive:
+            assert "shared_prefs/session.xml" in archive.namelist(), "A fresh snapshot should replace it"
@@ -0,0 +1,96 @@
+"""
+Pytest test suite for the benchmark harness
+"""
+
+import pytest
+
+from inditex_automation.benchmark import (
+    Benchmark,
+    compare,
+    format_report,
+    load_baseline,
+    percentile,
+    save_baseline,
+    summarize,
+)
+
+
+class TestStatistics:
+    """Test class for percentile and summarize"""
+
+    def test_percentile_interpolates(self):
+        samples = [4, 1, 3, 2]
+
+        assert percentile(samples, 0.0) == 1
+        assert percentile(samples, 0.5) == pytest.approx(2.5)
+        assert percentile(samples, 1.0) == 4
+
+    def test_summarize(self):
+        stats = summarize([float(value) for value in range(1, 101)])
+
+        assert stats["n"] == 100
+        assert stats["p50"] == pytest.approx(50.5)
+        assert stats["p95"] == pytest.approx(95.05)
+        assert stats["p99"] == pytest.approx(99.01)
+
+    def test_empty_samples(self):
+        assert summarize([])["p99"] == 0.0
+
+
+class TestBenchmark:
+    """Test class for Benchmark"""
+
+    def test_warmup_is_not_recorded(self):
+        calls = []
+        bench = Benchmark(repeat=3, warmup=2)
+
+        def case(b):
+            calls.append(1)
+            b.record("case", 0.01)
+
+        bench.run(case)
+
+        assert len(calls) == 5
+        assert bench.results()["case"]["n"] == 3
+
+    def test_timed_uses_clock(self):
+        ticks = iter([1.0, 1.5])
+        bench = Benchmark(clock=lambda: next(ticks))
+
+        with bench.timed("step"):
+            pass
+
+        assert bench.samples["step"] == [0.5]
+
+
+class TestBaseline:
+    """Test class for baseline storage and regression detection"""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        results = {"login": summarize([0.1, 0.2, 0.3])}
+
+        save_baseline(path, results)
+
+        assert load_baseline(path)["login"]["p50"] == pytest.approx(0.2)
+
+    def test_missing_baseline(self, tmp_path):
+        assert load_baseline(str(tmp_path / "missing.json")) == {}
+
+    def test_regression_beyond_threshold(self):
+        baseline = {"login": {"p50": 1.0, "p95": 1.2}, "config": {"p50": 0.001, "p95": 0.001}}
+        results = {"login": {"p50": 1.3, "p95": 1.25}, "config": {"p50": 0.0015, "p95": 0.0015}}
+
+        regressions = compare(results, baseline, threshold=0.2, min_delta=0.002)
+
+        # login p95 is within 20%; config doubled but only by half a millisecond
+        assert regressions == [("login", "p50", 1.0, 1.3)]
+
+    def test_new_case_is_not_a_regression(self):
+        assert compare({"new": {"p50": 5.0, "p95": 5.0}}, {}) == []
+
+    def test_report_shows_change(self):
+        report = format_report({"login": summarize([0.2])}, {"login": {"p50": 0.1}})
+
+        assert "login" in report
+        assert "+100%" in report
@@ -0,0 +1,162 @@
+"""
+Pytest test suite for the typed run configuration
+"""
+
+import configparser
+import os
+
+import pytest
+
+from inditex_automation.config import AutomationConfig, config_group, load_config, parse_bool, parse_override
+from inditex_automation.devices import DeviceProfile, load_device_pool
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGIN_CONFIG = os.path.join(TESTS_DIR, "config.ini")
+PRODUCTION_CHECK_CONFIG = os.path.join(os.path.dirname(TESTS_DIR), "appium-client", "tests", "config.ini")
+
+
+class TestAutomationConfig:
+    """Test class for AutomationConfig"""
+
+    def test_both_schemas(self):
+        login = load_config(LOGIN_CONFIG, environ={})
+        production_check = load_config(PRODUCTION_CHECK_CONFIG, environ={})
+
+        for config in (login, production_check):
+            assert config.app.package == "com.inditex.trazabilidapp"
+            assert config.credentials.username == "amitks"
+            assert config.server.explicit_wait == 30.0
+            assert config.timeouts.poll_interval == 0.25
+        assert login.timeouts.page_load_wait == 5.0
+        assert production_check.test.scroll_percent == 0.75
+        assert production_check.device.name == "Pixel Tablet"
+
+    def test_either_spelling(self):
+        config = load_config(PRODUCTION_CHECK_CONFIG, environ={})
+
+        assert config.get("App", "package") == config.get("APP", "app_package")
+        assert config.get("CREDENTIALS", "email") == "amitks"
+        assert config.getint("Settings", "timeout") == 30
+        assert config.get("TRANSPORT", "pool_size") == "1"
+        assert config.get("NOPE", "missing", fallback="x") == "x"
+
+    def test_loaded_once(self):
+        assert load_config(LOGIN_CONFIG, environ={}) is load_config(LOGIN_CONFIG, environ={})
+        config = load_config(LOGIN_CONFIG, environ={})
+        assert load_config(config) is config
+
+    def test_cached_without_touching_the_file(self, tmp_path):
+        path = tmp_path / "config.ini"
+        path.write_text("[SERVER]\nexplicit_wait = 30\n")
+        first = load_config(str(path))
+        path.unlink()
+
+        assert load_config(str(path)) is first
+
+    def test_reload(self, tmp_path):
+        path = tmp_path / "config.ini"
+        path.write_text("[SERVER]\nexplicit_wait = 30\n")
+        first = load_config(str(path), environ={})
+        path.write_text("[SERVER]\nexplicit_wait = 12\n")
+
+        assert load_config(str(path), environ={}) is first
+        assert load_config(str(path), environ={}, reload=True).server.explicit_wait == 12.0
+        assert load_config(str(path), environ={}).server.explicit_wait == 12.0
+        assert first.server.explicit_wait == 30.0
+
+    def test_read_only(self):
+        config = load_config(LOGIN_CONFIG, environ={})
+
+        with pytest.raises(AttributeError):
+            config.server.explicit_wait = 1
+        with pytest.raises(AttributeError):
+            config.server = None
+
+    def test_overrides(self):
+        config = load_config(LOGIN_CONFIG, overrides={"server.explicit_wait": "45"},
+                             environ={"INDITEX_TIMEOUTS_POLL_INTERVAL": "0.5", "INDITEX_CREDENTIALS_PASSWORD": "env"})
+
+        assert config.server.explicit_wait == 45.0
+        assert config.timeouts.poll_interval == 0.5
+        assert config.credentials.password == "env"
+        assert load_config(LOGIN_CONFIG, environ={}).server.explicit_wait == 30.0
+
+    def test_command_line_wins_over_environment(self):
+        config = load_config(LOGIN_CONFIG, overrides={"SERVER.explicit_wait": "5"},
+                             environ={"INDITEX_SERVER_EXPLICIT_WAIT": "9"})
+
+        assert config.server.explicit_wait == 5.0
+
+    def test_bad_number(self):
+        with pytest.raises(ValueError, match="explicit_wait"):
+            AutomationConfig({("SERVER", "explicit_wait"): "soon"})
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_config(str(tmp_path / "missing.ini"))
+
+    def test_subsystem_groups(self):
+        config = load_config(PRODUCTION_CHECK_CONFIG, environ={"INDITEX_TRANSPORT_POOL_SIZE": "4"})
+
+        assert config.transport.pool_size == 4 and config.transport.keep_alive is True
+        assert config.logging.max_bytes == 10485760 and config.logging.per_run is False
+        assert config.preflight.ttl == 30.0
+        assert config.navigation.shortcuts is False
+
+    def test_config_group_reads_a_config_parser(self):
+        parser = configparser.ConfigParser()
+        parser.read_string("[TRACING]\nenabled = Yes\n[OTHER]\nenabled = off\n")
+
+        assert config_group(parser, "tracing").enabled is True
+        assert config_group(parser, "tracing").directory == "traces"
+        assert config_group(parser, "tracing", section="OTHER").enabled is False
+        parser.set("TRACING", "enabled", "maybe")
+        with pytest.raises(ValueError, match="enabled"):
+            config_group(parser, "tracing")
+
+    def test_parse_bool(self):
+        assert [parse_bool(value) for value in ("1", "TRUE", " yes", "on", True)] == [True] * 5
+        assert [parse_bool(value) for value in ("0", "false", "No", "off")] == [False] * 4
+        with pytest.raises(ValueError):
+            parse_bool("")
+
+    def test_parse_override(self):
+        assert parse_override("SERVER.explicit_wait=45") == ("SERVER.explicit_wait", "45")
+        assert parse_override("CREDENTIALS.password=a=b") == ("CREDENTIALS.password", "a=b")
+        with pytest.raises(ValueError):
+            parse_override("explicit_wait=45")
+
+
+class TestDeviceProfiles:
+    """Test class for per-device configuration"""
+
+    def test_device_replaces_device_and_server(self):
+        config = load_config(LOGIN_CONFIG, environ={})
+        device = DeviceProfile("tablet-2", server_url="http://10.0.0.2:4723", platform_version="14",
+                               overrides={"timeouts.page_transition_wait": "4"})
+
+        tablet = config.for_device(device)
+
+        assert tablet.device.name == "tablet-2"
+        assert tablet.server.url == "http://10.0.0.2:4723"
+        assert tablet.device.platform_version == "14"
+        assert tablet.timeouts.page_transition_wait == 4.0
+        assert config.timeouts.page_transition_wait == 2.0
+        assert config.for_device(device) is tablet
+        assert config.for_device(None) is config
+
+    def test_same_name_on_another_server(self):
+        config = load_config(LOGIN_CONFIG, environ={})
+        first = config.for_device(DeviceProfile("tablet-3", server_url="http://10.0.0.3:4723"))
+
+        second = config.for_device(DeviceProfile("tablet-3", server_url="http://10.0.0.4:4723", udid="R58N"))
+
+        assert (first.server.url, second.server.url) == ("http://10.0.0.3:4723", "http://10.0.0.4:4723")
+        assert second.device.udid == "R58N"
+        assert config.for_device(DeviceProfile("tablet-3", server_url="http://10.0.0.3:4723")) is first
+
+    def test_pool_file_overrides(self):
+        devices = {device.name: device for device in load_device_pool(os.path.join(TESTS_DIR, "devices.example.ini"))}
+
+        assert devices["tablet-1"].overrides == {}
+        assert devices["tablet-2"].overrides == {"timeouts.page_transition_wait": "4"}
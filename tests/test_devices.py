@@ -0,0 +1,167 @@
+"""
+Pytest test suite for device pools and the parallel multi-device runner
+"""
+
+import logging
+import time
+
+import pytest
+
+from inditex_automation.devices import (
+    DeviceProfile,
+    WorkStealingQueue,
+    format_job_results,
+    format_results,
+    load_device_pool,
+    run_jobs_on_devices,
+    run_on_devices,
+)
+
+
+@pytest.fixture
+def pool_file(tmp_path):
+    path = tmp_path / "devices.ini"
+    path.write_text(
+        "[tablet-1]\n"
+        "udid = SERIAL1\n"
+        "system_port = 8201\n"
+        "\n"
+        "[tablet-2]\n"
+        "udid = SERIAL2\n"
+        "server_url = http://10.0.0.2:4723\n"
+        "\n"
+        "[tablet-3]\n"
+        "udid = SERIAL3\n"
+        "platform_version = 14\n"
+    )
+    return str(path)
+
+
+class TestDevicePool:
+    """Test class for device pool loading"""
+
+    def test_load_assigns_unique_system_ports(self, pool_file):
+        devices = load_device_pool(pool_file)
+
+        assert [device.name for device in devices] == ["tablet-1", "tablet-2", "tablet-3"]
+        assert [device.system_port for device in devices] == [8201, 8202, 8203]
+        assert devices[1].server_url == "http://10.0.0.2:4723"
+        assert devices[0].server_url == "http://127.0.0.1:4723"
+
+    def test_capabilities(self, pool_file):
+        device = load_device_pool(pool_file)[2]
+
+        assert device.capabilities() == {
+            "deviceName": "tablet-3",
+            "udid": "SERIAL3",
+            "systemPort": 8203,
+            "platformVersion": "14",
+        }
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_device_pool(str(tmp_path / "missing.ini"))
+
+
+class TestRunOnDevices:
+    """Test class for run_on_devices"""
+
+    def make_devices(self, tmp_path, count):
+        return [
+            DeviceProfile(f"dev{index}", log_file=str(tmp_path / f"dev{index}.log"))
+            for index in range(count)
+        ]
+
+    def test_runs_devices_concurrently(self, tmp_path):
+        devices = self.make_devices(tmp_path, 4)
+
+        started = time.monotonic()
+        results = run_on_devices(devices, lambda device: time.sleep(0.3) or True)
+
+        assert all(result.success for result in results)
+        assert time.monotonic() - started < 1.0, "Devices should not run one after another"
+
+    def test_per_device_log_files(self, tmp_path):
+        devices = self.make_devices(tmp_path, 2)
+        flow_logger = logging.getLogger("test_devices.flow")
+        flow_logger.setLevel(logging.INFO)
+
+        def flow(device):
+            flow_logger.info(f"hello from {device.name}")
+            return True
+
+        run_on_devices(devices, flow)
+
+        for device in devices:
+            content = (tmp_path / f"{device.name}.log").read_text()
+            assert f"hello from {device.name}" in content
+            other = [d.name for d in devices if d is not device][0]
+            assert f"hello from {other}" not in content
+
+    def test_failures_are_aggregated(self, tmp_path):
+        devices = self.make_devices(tmp_path, 3)
+
+        def flow(device):
+            if device.name == "dev1":
+                raise RuntimeError("device offline")
+            return device.name == "dev0"
+
+        results = run_on_devices(devices, flow)
+
+        assert [result.success for result in results] == [True, False, False]
+        assert results[1].error == "device offline"
+        table = format_results(results)
+        assert "1/3 devices passed" in table
+        assert "device offline" in table
+
+
+class TestWorkStealingQueue:
+    """Test class for WorkStealingQueue"""
+
+    def test_jobs_are_dealt_round_robin(self):
+        queue = WorkStealingQueue(["a", "b"], range(5))
+
+        assert [queue.get("a"), queue.get("a"), queue.get("a")] == [0, 2, 4]
+        assert [queue.get("b"), queue.get("b")] == [1, 3]
+        assert queue.get("a") is None and queue.stolen == 0
+
+    def test_idle_worker_steals_from_the_busiest(self):
+        queue = WorkStealingQueue(["a", "b", "c"], range(7))
+        queue.get("b"), queue.get("b"), queue.get("c"), queue.get("c")
+
+        assert queue.get("b") == 6, "The back of the longest queue should be stolen"
+        assert queue.stolen == 1 and len(queue) == 2
+
+
+class TestRunJobsOnDevices:
+    """Test class for run_jobs_on_devices"""
+
+    def test_fast_devices_take_over_jobs(self, tmp_path):
+        devices = [DeviceProfile(name, log_file=str(tmp_path / f"{name}.log")) for name in ("fast", "slow")]
+        streamed = []
+
+        def flow(device, job):
+            time.sleep(0.01 if device.name == "fast" else 0.2)
+            return job != 3
+
+        results = run_jobs_on_devices(devices, range(8), flow, on_result=streamed.append)
+
+        assert sorted(result.job for result in results) == list(range(8))
+        assert streamed == results, "Every result should be reported as it finishes"
+        assert sum(result.device.name == "fast" for result in results) > 4
+        assert [result.job for result in results if not result.success] == [3]
+        assert "7/8 jobs passed" in format_job_results(results)
+
+    def test_failed_job_does_not_stop_the_device(self, tmp_path):
+        devices = [DeviceProfile("dev0", log_file=str(tmp_path / "dev0.log"))]
+
+        def flow(device, job):
+            if job == "bad":
+                raise RuntimeError("session lost")
+            return True
+
+        results = run_jobs_on_devices(devices, ["bad", "good"], flow)
+
+        assert [(result.job, result.success, result.error) for result in results] == [
+            ("bad", False, "session lost"), ("good", True, None)
+        ]
@@ -0,0 +1,229 @@
+"""
+Pytest test suite for the local fake Appium server
+
+Runs the real login and production check flows against recorded screens,
+so the whole stack can be exercised without a device.
+"""
+
+import json
+import os
+import shutil
+import time
+
+import pytest
+from appium import webdriver
+from appium.options.common import AppiumOptions
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from inditex_automation.fake_server import FakeAppiumServer, Scenario
+from inditex_login_enhanced import HOME_SCREEN, InditexLoginAutomationEnhanced
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PRODUCTION_CHECK_DIR = os.path.join(os.path.dirname(TESTS_DIR), "appium-client", "tests")
+
+
+def write_config(source, server_url, destination):
+    """Copy a config file pointing it at the fake server"""
+    with open(source) as f:
+        content = f.read().replace("http://127.0.0.1:4723", server_url)
+    destination.write_text(content)
+    return str(destination)
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer() as server:
+        yield server
+
+
+@pytest.fixture
+def driver(server):
+    options = AppiumOptions().load_capabilities({"platformName": "Android", "automationName": "UiAutomator2"})
+    driver = webdriver.Remote(server.url, options=options)
+    yield driver
+    driver.quit()
+
+
+class TestFakeServerProtocol:
+    """Test class for the WebDriver commands the flows rely on"""
+
+    def test_locator_strategies(self, driver):
+        assert driver.find_element(AppiumBy.XPATH, "//android.widget.EditText[@resource-id='idToken7']")
+        assert driver.find_element(AppiumBy.ID, "loginButton_0").text == "Continue"
+        assert driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().className("android.widget.EditText")')
+        assert driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.Button")
+
+    def test_missing_element_waits_for_implicit_timeout(self, driver):
+        driver.implicitly_wait(0.3)
+        started = time.monotonic()
+
+        with pytest.raises(NoSuchElementException):
+            driver.find_element(AppiumBy.ID, "doesNotExist")
+
+        assert time.monotonic() - started >= 0.3
+
+    def test_click_transitions_and_stales_old_elements(self, driver):
+        email = driver.find_element(AppiumBy.ID, "idToken7")
+        email.send_keys("user")
+        assert email.text == "user"
+
+        driver.find_element(AppiumBy.ID, "loginButton_0").click()
+
+        assert driver.find_element(AppiumBy.ID, "idToken3")
+        with pytest.raises(StaleElementReferenceException):
+            email.text
+
+        driver.back()
+        assert driver.find_element(AppiumBy.ID, "idToken7")
+
+    def test_source_and_app_lifecycle(self, driver):
+        assert "fake-id" not in driver.page_source
+        assert driver.current_activity == ".LoginActivity"
+
+        driver.terminate_app("com.inditex.trazabilidapp")
+        assert driver.current_activity == ".Launcher"
+
+        driver.activate_app("com.inditex.trazabilidapp")
+        assert driver.current_activity == ".LoginActivity"
+
+    def test_scroll_gesture_moves_list_rows(self, server, driver):
+        server.set_screen("production_check")
+        models = "//*[@resource-id='com.inditex.trazabilidapp:id/tvModel']"
+        first_page = [element.text for element in driver.find_elements(AppiumBy.XPATH, models)]
+
+        area = {"left": 0, "top": 160, "width": 1600, "height": 2240, "direction": "down", "percent": 0.2}
+        assert driver.execute_script("mobile: scrollGesture", area) is True
+        assert driver.execute_script("mobile: scrollGesture", {**area, "percent": 1.0}) is False
+        last_page = [element.text for element in driver.find_elements(AppiumBy.XPATH, models)]
+
+        assert first_page[0] == "1234/567" and "3444/546" not in first_page
+        assert last_page[-1] == "3444/546" and "1234/567" not in last_page
+        driver.find_element(AppiumBy.XPATH, models).click()
+        driver.back()
+        assert driver.find_element(AppiumBy.XPATH, models).text == last_page[0], "Back should keep the position"
+
+    def test_per_command_latency(self, server, driver):
+        server.latency = {"source": 0.2, "default": 0.0}
+
+        started = time.monotonic()
+        driver.current_activity
+        fast = time.monotonic() - started
+        started = time.monotonic()
+        driver.page_source
+        slow = time.monotonic() - started
+
+        assert slow >= 0.2 > fast
+        assert server.command_counts["source"] == 1
+
+
+class TestFlowsAgainstFakeServer:
+    """Test class running the automation flows end to end offline"""
+
+    def test_login_flow(self, server, tmp_path, monkeypatch):
+        config_path = write_config(os.path.join(TESTS_DIR, "config.ini"), server.url, tmp_path / "config.ini")
+        monkeypatch.chdir(tmp_path)
+        automation = InditexLoginAutomationEnhanced(config_path)
+        try:
+            assert automation.setup_driver()
+            assert automation.launch_app()
+            assert automation.perform_login()
+            assert automation.current_login_state() == HOME_SCREEN
+        finally:
+            automation.cleanup()
+
+        assert list(tmp_path.glob("login_result_*.png")), "Screenshot should be written by cleanup"
+        timings = json.loads(next((tmp_path / "timings").glob("login_*.json")).read_text())
+        steps = [span["name"] for span in timings["spans"]]
+        assert steps == ["login", "enter_email", "click_continue", "enter_password", "click_login", "verify"]
+        assert timings["spans"][0]["duration"] < 10, "The configured 10s implicit wait should never be paid"
+        assert timings["totals"]["http"] > 0
+        assert 0 < timings["totals"]["commands"] < server.command_counts.total()
+
+    def test_production_check_flow(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.syspath_prepend(PRODUCTION_CHECK_DIR)
+        import test_production_check
+
+        with FakeAppiumServer(initial_screen="login_native") as server:
+            config_path = write_config(
+                os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url, tmp_path / "config.ini"
+            )
+            assert test_production_check.run_test(config_path)
+
+    def test_audits_share_a_pooled_session(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.syspath_prepend(PRODUCTION_CHECK_DIR)
+        import test_production_check
+        from inditex_automation.session_pool import SessionPool
+
+        pool = SessionPool()
+        created = []
+        init = test_production_check.ProductionCheckTest.__init__
+        monkeypatch.setattr(test_production_check.ProductionCheckTest, "__init__",
+                            lambda test, *args, **kwargs: created.append(test) or init(test, *args, **kwargs))
+        with FakeAppiumServer(initial_screen="login_native", delay_scale=0) as server:
+            config_path = write_config(
+                os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url, tmp_path / "config.ini"
+            )
+            try:
+                for audit_id in ("206697", "206698"):
+                    assert test_production_check.run_test(config_path, audit_id=audit_id, pool=pool)
+                    assert server.sessions[next(iter(server.sessions))].screen == "audits"
+            finally:
+                pool.close_all()
+
+        assert (server.command_counts["new_session"], pool.reused) == (1, 1)
+        assert len(created) == 2, "The pool path should not build a throwaway test object"
+
+    def test_production_check_batch(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.syspath_prepend(PRODUCTION_CHECK_DIR)
+        import test_production_check
+
+        with FakeAppiumServer(initial_screen="login_native", delay_scale=0) as server:
+            config_path = write_config(
+                os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url, tmp_path / "config.ini"
+            )
+            test = test_production_check.ProductionCheckTest(config_path)
+            try:
+                results = test.run_batch("amitks", "secret")
+            finally:
+                test.teardown()
+
+        models = [result.model for result in results]
+        assert len(models) == 12 and len(set(models)) == 12, "Every item should be checked exactly once"
+        assert models[:2] == ["1234/567", "8910/111"] and models[-1] == "3444/546"
+        assert all(result.passed for result in results)
+        assert [span.name for span in test.timer.spans].count("login") == 1
+        table = test_production_check.format_item_results(results)
+        assert table.splitlines()[-1] == "12/12 items passed"
+
+    def test_production_check_batch_repeated_models(self, tmp_path, monkeypatch):
+        scenario_dir = tmp_path / "scenario"
+        shutil.copytree(os.path.join(os.path.dirname(TESTS_DIR), "inditex_automation", "scenarios", "trazabilidapp"),
+                        scenario_dir)
+        source = (scenario_dir / "production_check.xml").read_text()
+        for old, new in (('text="8910/111"', 'text="1234/567"'), ('text="5161/718"', 'text="O\'Neil/718"'),
+                         ('text="3334/353"', 'text="2627/282"'), ('text="640"', 'text="7.450"')):
+            source = source.replace(old, new)
+        (scenario_dir / "production_check.xml").write_text(source)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.syspath_prepend(PRODUCTION_CHECK_DIR)
+        import test_production_check
+
+        with FakeAppiumServer(Scenario(str(scenario_dir)), initial_screen="login_native", delay_scale=0) as server:
+            config_path = write_config(
+                os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url, tmp_path / "config.ini"
+            )
+            test = test_production_check.ProductionCheckTest(config_path)
+            try:
+                results = test.run_batch("amitks", "secret")
+            finally:
+                test.teardown()
+
+        assert [(result.model, result.assigned_units) for result in results][:4] == [
+            ("1234/567", "16.351"), ("1234/567", "2.400"), ("1213/141", "5.120"), ("O'Neil/718", "980")
+        ]
+        assert [result.model for result in results].count("2627/282") == 2
+        assert len(results) == 12 and all(result.passed for result in results)
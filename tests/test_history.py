@@ -0,0 +1,191 @@
+"""
+Pytest test suite for the run history and its regression detection
+"""
+
+import os
+import time
+
+import pytest
+
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.history import (
+    FAILED,
+    PASSED,
+    RUN_TOTAL,
+    RunHistory,
+    format_regressions,
+    format_trend,
+    main,
+    mann_whitney_greater,
+    parse_duration,
+)
+from inditex_automation.timing import RunTimer
+from inditex_login_enhanced import InditexLoginAutomationEnhanced
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DAY = 86400.0
+NOW = 1_800_000_000.0
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def finished_run(started_epoch, steps, run_id=None, failed_step=None):
+    """RunTimer of a login run whose steps took the given seconds"""
+    clock = FakeClock()
+    timer = RunTimer("login", run_id=run_id or f"login_{started_epoch}", clock=clock)
+    timer.started_epoch = started_epoch
+    with timer.span("login") as login:
+        for name, seconds in steps.items():
+            with timer.span(name) as span:
+                clock.advance(seconds)
+                if name == failed_step:
+                    span.status = "failed"
+                    login.status = "failed"
+    return timer
+
+
+@pytest.fixture
+def history(tmp_path):
+    return RunHistory(str(tmp_path / "history.sqlite"))
+
+
+def fill(history, enter_email, click_login, start, count, spacing=3600.0):
+    for index in range(count):
+        jitter = (index % 5) * 0.01
+        history.record(finished_run(start + index * spacing,
+                                    {"enter_email": enter_email + jitter, "click_login": click_login + jitter}),
+                       device="tablet")
+
+
+class TestRunHistory:
+    """Test class for RunHistory"""
+
+    def test_record_and_query(self, history):
+        history.record(finished_run(NOW, {"enter_email": 1.0, "click_login": 2.0}), device="tablet",
+                       app_version="3.4.0", source="run_automation")
+
+        assert history.durations("login") == [(NOW, pytest.approx(3.0))]
+        assert history.durations("login", "click_login") == [(NOW, pytest.approx(2.0))]
+        assert history.durations("login", device="phone") == []
+        assert history.step_names("login") == ["click_login", "enter_email", "login"]
+
+    def test_failed_runs_are_kept_apart(self, history):
+        history.record(finished_run(NOW, {"enter_email": 1.0}, failed_step="enter_email"))
+
+        assert history.durations("login") == []
+        assert len(history.durations("login", outcome=FAILED)) == 1
+        assert history.durations("login", "enter_email", outcome=None) == []
+
+    def test_recording_a_run_twice_replaces_it(self, history):
+        timer = finished_run(NOW, {"enter_email": 1.0})
+        history.record(timer)
+        history.record(timer, outcome=PASSED)
+
+        assert len(history.durations("login")) == 1
+        assert len(history.durations("login", "enter_email")) == 1
+
+    def test_trend_buckets(self, history):
+        fill(history, 1.0, 2.0, NOW - 2 * DAY, 48)
+
+        rows = history.trend("login", DAY, since=NOW - 2 * DAY, until=NOW)
+
+        assert sum(stats["n"] for _, stats in rows) == 48
+        assert all(3.0 <= stats["p50"] <= 3.08 for _, stats in rows)
+        assert "p95" in format_trend(rows)
+
+    def test_slower_step_is_flagged(self, history):
+        fill(history, 1.0, 2.0, NOW - 8 * DAY, 7 * 24)
+        fill(history, 1.0, 2.6, NOW - DAY, 24)
+
+        regressions = history.regressions("login", recent=DAY, baseline=7 * DAY, now=NOW)
+
+        names = [regression.name for regression in regressions]
+        assert names[0] == "click_login"
+        assert RUN_TOTAL in names and "enter_email" not in names
+        assert regressions[0].change == pytest.approx(0.3, abs=0.01)
+        assert "click_login" in format_regressions(regressions)
+
+    def test_stable_history_has_no_regression(self, history):
+        fill(history, 1.0, 2.0, NOW - 8 * DAY, 8 * 24)
+
+        assert history.regressions("login", recent=DAY, baseline=7 * DAY, now=NOW) == []
+        assert format_regressions([]) == "No significant slowdown"
+
+    def test_few_samples_are_not_compared(self, history):
+        fill(history, 1.0, 2.0, NOW - 8 * DAY, 10, spacing=DAY / 2)
+        fill(history, 1.0, 5.0, NOW - DAY, 3)
+
+        assert history.regressions("login", recent=DAY, baseline=7 * DAY, now=NOW) == []
+
+
+class TestStatistics:
+    """Test class for the helpers"""
+
+    def test_mann_whitney(self):
+        baseline = [1.0, 1.1, 1.2, 1.0, 1.1, 1.2, 1.0, 1.1]
+
+        assert mann_whitney_greater([2.0, 2.1, 2.2, 2.0, 2.1], baseline) < 0.01
+        assert mann_whitney_greater(baseline, baseline) > 0.4
+        assert mann_whitney_greater([0.5] * 5, baseline) > 0.99
+        assert mann_whitney_greater([], baseline) == 1.0
+
+    def test_parse_duration(self):
+        assert parse_duration("90s") == 90
+        assert parse_duration("12h") == 12 * 3600
+        assert parse_duration("2w") == 14 * DAY
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+
+class TestCommandLine:
+    """Test class for the history CLI"""
+
+    def test_check_exit_code(self, history, capsys):
+        now = time.time()
+        fill(history, 1.0, 2.0, now - 8 * DAY, 7 * 24)
+
+        assert main(["--db", history.path, "check", "--flow", "login", "--recent", "1d", "--baseline", "7d"]) == 0
+        fill(history, 1.0, 3.0, now - DAY + 60, 23)
+        assert main(["--db", history.path, "check", "--flow", "login", "--recent", "1d", "--baseline", "7d"]) == 1
+        assert "click_login" in capsys.readouterr().out
+
+    def test_report(self, history, capsys):
+        fill(history, 1.0, 2.0, time.time() - DAY, 5)
+
+        main(["--db", history.path, "report", "--flow", "login", "--step", "enter_email", "--since", "2d"])
+
+        assert "p50" in capsys.readouterr().out
+
+
+class TestRecordedFlow:
+    """Test class for runs recorded by the flows"""
+
+    def test_login_run_is_recorded(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with open(os.path.join(TESTS_DIR, "config.ini")) as f:
+            content = f.read()
+        with FakeAppiumServer(delay_scale=0) as server:
+            config_path = tmp_path / "config.ini"
+            config_path.write_text(content.replace("http://127.0.0.1:4723", server.url))
+            automation = InditexLoginAutomationEnhanced(str(config_path))
+            try:
+                assert automation.setup_driver()
+                assert automation.perform_login()
+            finally:
+                automation.cleanup()
+
+        history = RunHistory(str(tmp_path / "run_history.sqlite"))
+        runs = history.durations("login")
+        assert len(runs) == 1
+        assert "enter_email" in history.step_names("login")
@@ -8,32 +8,63 @@ login automation.
 import pytest
 import os
 import time
-from inditex_login_enhanced import InditexLoginAutomationEnhanced
+from inditex_login_enhanced import (
+    HOME_SCREEN,
+    LOGIN_SCREEN,
+    PASSWORD_SCREEN,
+    InditexLoginAutomationEnhanced,
+    login_options,
+)
+from inditex_automation.config import load_config
 
 
 class TestInditexLogin:
     """Test class for Inditex login automation"""
     
-    @pytest.fixture(scope="class")
-    def automation(self):
-        """Fixture to setup automation instance"""
-        config_path = os.path.join(os.path.dirname(__file__), "config.ini")
-        automation = InditexLoginAutomationEnhanced(config_path)
+    @pytest.fixture
+    def automation(self, appium_preflight, session_pool, warm_daemon_url):
+        """Fixture to lease a launched automation instance from the warm session pool"""
+        config = load_config(os.path.join(os.path.dirname(__file__), "config.ini"))
         
-        # Setup driver
-        assert automation.setup_driver(), "Failed to setup Appium driver"
+        def create_session():
+            # Only built when no warm session is idle; the pool keeps the whole object
+            automation = InditexLoginAutomationEnhanced(config, daemon_url=warm_daemon_url)
+            assert automation.setup_driver(), "Failed to setup Appium driver"
+            assert automation.launch_app(), "Failed to launch app"
+            return automation
         
-        yield automation
+        session = session_pool.acquire(login_options(config).to_capabilities(), create_session)
         
-        # Cleanup
-        automation.cleanup()
+        yield session
+        
+        # Return the session to the pool for the next test; it is closed at the end of the run
+        session_pool.release(session)
     
-    @pytest.fixture(scope="class")
+    @pytest.fixture
     def launched_app(self, automation):
-        """Fixture to launch the app"""
-        assert automation.launch_app(), "Failed to launch app"
+        """Fixture to get the app launched (pooled sessions are launched once)"""
         return automation
     
+    @pytest.fixture
+    def login_screen(self, launched_app):
+        """Fixture to start a test on the login (email) screen"""
+        # The suite logs in and out repeatedly, so it opts in to clearing the app data
+        assert launched_app.navigate_to_state(LOGIN_SCREEN, allow_reset=True), "Could not reach the login screen"
+        return launched_app
+    
+    @pytest.fixture
+    def password_screen(self, launched_app):
+        """Fixture to start a test on the password screen"""
+        assert launched_app.navigate_to_state(PASSWORD_SCREEN, allow_reset=True), \
+            "Could not reach the password screen"
+        return launched_app
+    
+    @pytest.fixture
+    def home_screen(self, launched_app):
+        """Fixture to start a test logged in on the home screen"""
+        assert launched_app.navigate_to_state(HOME_SCREEN), "Could not log in"
+        return launched_app
+    
     def test_driver_setup(self, automation):
         """Test that the Appium driver is properly set up"""
         assert automation.driver is not None, "Driver should be initialized"
@@ -45,54 +76,47 @@ class TestInditexLogin:
         current_activity = launched_app.driver.current_activity
         assert current_activity is not None, "App should be running"
     
-    def test_email_entry(self, launched_app):
+    def test_email_entry(self, login_screen):
         """Test email entry functionality"""
         # Test with default email from config
-        result = launched_app.enter_email()
+        result = login_screen.enter_email()
         assert result, "Email entry should succeed"
     
-    def test_continue_button_click(self, launched_app):
+    def test_continue_button_click(self, login_screen):
         """Test continue button click after email entry"""
         # First enter email
-        launched_app.enter_email()
+        login_screen.enter_email()
         
         # Then test continue button
-        result = launched_app.click_continue_button()
+        result = login_screen.click_continue_button()
         assert result, "Continue button click should succeed"
     
-    def test_password_entry(self, launched_app):
+    def test_password_entry(self, password_screen):
         """Test password entry functionality"""
-        # Navigate to password screen first
-        launched_app.enter_email()
-        launched_app.click_continue_button()
-        
-        # Test password entry
-        result = launched_app.enter_password()
+        result = password_screen.enter_password()
         assert result, "Password entry should succeed"
     
-    def test_login_button_click(self, launched_app):
+    def test_login_button_click(self, password_screen):
         """Test final login button click"""
-        # Navigate to login screen
-        launched_app.enter_email()
-        launched_app.click_continue_button()
-        launched_app.enter_password()
+        password_screen.enter_password()
         
         # Test login button
-        result = launched_app.click_login_button()
+        result = password_screen.click_login_button()
         assert result, "Login button click should succeed"
     
-    def test_complete_login_flow(self, launched_app):
+    def test_complete_login_flow(self, login_screen):
         """Test the complete login workflow"""
-        result = launched_app.perform_login()
+        result = login_screen.perform_login()
         assert result, "Complete login flow should succeed"
     
-    def test_login_with_custom_credentials(self, automation):
+    def test_logged_in_home_screen(self, home_screen):
+        """Test that a logged in session shows the home screen"""
+        assert home_screen.current_login_state() == HOME_SCREEN, "Home screen should be shown"
+    
+    def test_login_with_custom_credentials(self, login_screen):
         """Test login with custom credentials"""
-        # Launch app
-        assert automation.launch_app(), "App should launch"
-        
         # Test with specific credentials
-        result = automation.perform_login(
+        result = login_screen.perform_login(
             email="amitks", 
             password="Pl@tinum@82026"
         )
@@ -103,13 +127,10 @@ class TestInditexLogin:
         "invalid",  # Invalid format
         "test@",  # Incomplete email
     ])
-    def test_invalid_email_handling(self, automation, invalid_email):
+    def test_invalid_email_handling(self, login_screen, invalid_email):
         """Test handling of invalid email inputs"""
-        # Launch app
-        automation.launch_app()
-        
         # Try with invalid email
-        result = automation.enter_email(invalid_email)
+        result = login_screen.enter_email(invalid_email)
         
         # The function should still succeed in entering the text
         # But continue button may not be enabled
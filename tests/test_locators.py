@@ -0,0 +1,99 @@
+"""
+Pytest test suite for the locator compiler
+"""
+
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+
+from inditex_automation.locators import LocatorSet, compile_locator, compile_xpath, optimization_report
+
+
+class TestCompileXpath:
+    """Test class for XPath to native strategy compilation"""
+
+    @pytest.mark.parametrize("xpath, expected", [
+        (
+            "//android.widget.TextView[@resource-id='com.inditex.trazabilidapp:id/tvBottomRealTotal']",
+            (AppiumBy.ID, "com.inditex.trazabilidapp:id/tvBottomRealTotal"),
+        ),
+        (
+            "//android.widget.EditText[@resource-id='idToken7']",
+            (AppiumBy.ANDROID_UIAUTOMATOR,
+             'new UiSelector().className("android.widget.EditText").resourceId("idToken7")'),
+        ),
+        (
+            "//android.widget.TextView[contains(@text, 'Audits')]",
+            (AppiumBy.ANDROID_UIAUTOMATOR,
+             'new UiSelector().className("android.widget.TextView").textContains("Audits")'),
+        ),
+        (
+            "//android.widget.TextView[@text='206697']",
+            (AppiumBy.ANDROID_UIAUTOMATOR,
+             'new UiSelector().className("android.widget.TextView").text("206697")'),
+        ),
+        (
+            "//*[@content-desc='Navigate up']",
+            (AppiumBy.ACCESSIBILITY_ID, "Navigate up"),
+        ),
+        (
+            "//android.widget.Button[@enabled='true' and starts-with(@text, \"Log\")]",
+            (AppiumBy.ANDROID_UIAUTOMATOR,
+             'new UiSelector().className("android.widget.Button").enabled(true).textStartsWith("Log")'),
+        ),
+        (
+            "//*[contains(@resource-id, 'tvModel')]",
+            (AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().resourceIdMatches(".*tvModel.*")'),
+        ),
+    ])
+    def test_optimized(self, xpath, expected):
+        by, value, reason = compile_xpath(xpath)
+
+        assert (by, value) == expected
+        assert reason is None
+
+    @pytest.mark.parametrize("xpath", [
+        "//android.view.ViewGroup[.//android.widget.TextView[contains(@resource-id, 'tvModel')]]",
+        "(//androidx.recyclerview.widget.RecyclerView//android.view.ViewGroup)[1]",
+        "//android.widget.TextView[@text='a' or @text='b']",
+        "//android.widget.TextView[@bounds='[0,0][1,1]']",
+        "//android.widget.FrameLayout/android.widget.TextView",
+    ])
+    def test_structural_queries_keep_xpath(self, xpath):
+        by, value, reason = compile_xpath(xpath)
+
+        assert (by, value) == (AppiumBy.XPATH, xpath)
+        assert reason
+
+    def test_quotes_escaped_in_uiselector(self):
+        by, value, _ = compile_xpath("//*[@text='Say \"hi\"']")
+
+        assert value == 'new UiSelector().text("Say \\"hi\\"")'
+
+
+class TestLocatorSet:
+    """Test class for declared locator sets"""
+
+    def test_locator_unpacks_to_strategy_and_value(self):
+        locators = LocatorSet("test_unpack", total="//*[@resource-id='pkg:id/total']")
+
+        assert tuple(locators.total) == (AppiumBy.ID, "pkg:id/total")
+        assert locators["total"].xpath == "//*[@resource-id='pkg:id/total']"
+
+    def test_unoptimized_report(self):
+        locators = LocatorSet(
+            "test_report",
+            tab="//android.view.View[.//android.widget.TextView[@text='CONFIRM UNITS']]",
+            title="//android.widget.TextView[@text='Production check']",
+        )
+
+        assert [locator.name for locator in locators.unoptimized()] == ["test_report.tab"]
+        assert any(line.startswith("XPATH test_report.tab") for line in optimization_report())
+
+    def test_unknown_locator(self):
+        with pytest.raises(AttributeError):
+            LocatorSet("test_unknown").missing
+
+    def test_dynamic_locators_are_cached(self):
+        xpath = "//android.widget.TextView[@text='206697']"
+
+        assert compile_locator(xpath) is compile_locator(xpath)
@@ -0,0 +1,156 @@
+"""
+Pytest test suite for the queue-based logging subsystem
+"""
+
+import asyncio
+import configparser
+import json
+import logging
+import threading
+
+import pytest
+
+from inditex_automation import logs
+from inditex_automation.devices import DeviceProfile, run_on_devices, run_on_devices_async
+
+
+@pytest.fixture(autouse=True)
+def fresh_logging():
+    logs.shutdown_logging()
+    yield
+    logs.shutdown_logging()
+
+
+class BlockingHandler(logging.Handler):
+    """Handler that holds the listener until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.release.wait(5)
+        self.messages.append(record.getMessage())
+
+
+class TestConfigureLogging:
+    """Test class for configure_logging"""
+
+    def test_json_lines(self, tmp_path):
+        log_file = logs.configure_logging(str(tmp_path / "run.log"), json_lines=True, console=False)
+
+        logging.getLogger("test_logs").info("hello %s", "world")
+        logs.flush()
+
+        entry = json.loads((tmp_path / "run.log").read_text().splitlines()[-1])
+        assert log_file == str(tmp_path / "run.log")
+        assert (entry["level"], entry["logger"], entry["message"]) == ("INFO", "test_logs", "hello world")
+
+    def test_json_lines_exception(self, tmp_path):
+        logs.configure_logging(str(tmp_path / "run.log"), json_lines=True, console=False)
+
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger("test_logs").exception("step %s failed", "login")
+        logs.flush()
+
+        entry = json.loads((tmp_path / "run.log").read_text().splitlines()[-1])
+        assert entry["message"] == "step login failed"
+        assert "RuntimeError: boom" in entry["exception"]
+
+    def test_first_call_wins(self, tmp_path):
+        first = logs.configure_logging(str(tmp_path / "first.log"), console=False)
+
+        assert logs.configure_logging(str(tmp_path / "second.log"), console=False) == first
+        assert not (tmp_path / "second.log").exists()
+
+    def test_rotation(self, tmp_path):
+        logs.configure_logging(str(tmp_path / "run.log"), console=False, max_bytes=500, backup_count=2)
+
+        for index in range(50):
+            logging.getLogger("test_logs").info(f"line {index:03d} " + "x" * 40)
+        logs.flush()
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["run.log", "run.log.1", "run.log.2"]
+
+    def test_per_run_file_name(self, tmp_path):
+        log_file = logs.configure_logging(str(tmp_path / "run.log"), console=False, per_run=True)
+
+        assert log_file != str(tmp_path / "run.log")
+        assert log_file.endswith(".log")
+
+    def test_logging_does_not_wait_for_handlers(self, tmp_path):
+        logs.configure_logging(None, console=False)
+        handler = BlockingHandler()
+        logs.add_handler(handler)
+
+        logger = logging.getLogger("test_logs")
+        emitter = threading.Thread(target=lambda: [logger.info(f"record {i}") for i in range(100)])
+        emitter.start()
+        emitter.join(2)
+
+        assert not emitter.is_alive(), "Logging calls should only enqueue records"
+        handler.release.set()
+        logs.remove_handler(handler)
+        assert len(handler.messages) == 100
+
+    def test_settings_from_config(self):
+        config = configparser.ConfigParser()
+        config.read_string("[LOGGING]\nfile = out/run.log\nformat = JSON\nmax_bytes = 1000\nper_run = yes\n")
+
+        settings = logs.logging_settings(config)
+
+        assert settings["log_file"] == "out/run.log"
+        assert settings["json_lines"] and settings["per_run"]
+        assert settings["max_bytes"] == 1000
+        assert logs.logging_settings(configparser.ConfigParser())["log_file"] == logs.DEFAULT_LOG_FILE
+
+
+class TestDeviceLogs:
+    """Test class for per-device log files through the listener"""
+
+    def test_threaded_devices_are_separated(self, tmp_path):
+        logs.configure_logging(None, console=False)
+        devices = [DeviceProfile(f"dev{index}", log_file=str(tmp_path / f"dev{index}.log")) for index in range(4)]
+        logger = logging.getLogger("test_logs.flow")
+
+        def flow(device):
+            for step in range(20):
+                logger.info(f"{device.name} step {step}")
+            return True
+
+        run_on_devices(devices, flow)
+
+        for device in devices:
+            lines = (tmp_path / f"{device.name}.log").read_text().splitlines()
+            assert len(lines) == 20
+            assert all(f"{device.name} step" in line for line in lines)
+
+    def test_device_file_rotates(self, tmp_path):
+        logs.configure_logging(None, console=False, max_bytes=500, backup_count=1)
+        device = DeviceProfile("dev0", log_file=str(tmp_path / "dev0.log"))
+        logger = logging.getLogger("test_logs.flow")
+
+        run_on_devices([device], lambda device: [logger.info("x" * 60) for _ in range(30)])
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["dev0.log", "dev0.log.1"]
+
+    def test_async_devices_are_separated(self, tmp_path):
+        logs.configure_logging(None, console=False)
+        devices = [DeviceProfile(f"dev{index}", log_file=str(tmp_path / f"dev{index}.log")) for index in range(4)]
+        logger = logging.getLogger("test_logs.flow")
+
+        async def flow(device):
+            for step in range(5):
+                logger.info(f"{device.name} step {step}")
+                await asyncio.sleep(0)
+            return True
+
+        asyncio.run(run_on_devices_async(devices, flow))
+
+        for device in devices:
+            lines = (tmp_path / f"{device.name}.log").read_text().splitlines()
+            assert len(lines) == 5
+            assert all(f"{device.name} step" in line for line in lines)
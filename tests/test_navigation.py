@@ -0,0 +1,158 @@
+"""
+Pytest test suite for the shortcut navigation
+
+The fake Appium server opens screens from the scenario's deep links and
+exported activities and reports the app version through mobile: shell.
+"""
+
+import json
+import os
+
+import pytest
+from appium import webdriver
+from appium.options.common import AppiumOptions
+
+from inditex_automation import navigation
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.navigation import Shortcut, ShortcutNavigator, navigation_settings
+from inditex_automation.waits import WaitEngine
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PRODUCTION_CHECK_DIR = os.path.join(os.path.dirname(TESTS_DIR), "appium-client", "tests")
+PACKAGE = "com.inditex.trazabilidapp"
+
+
+def write_config(source, server_url, destination):
+    """Copy a config file pointing it at the fake server, whose scenario serves the shortcuts"""
+    with open(source) as f:
+        content = f.read().replace("http://127.0.0.1:4723", server_url).replace("shortcuts = false", "shortcuts = true")
+    destination.write_text(content)
+    return str(destination)
+
+
+@pytest.fixture(autouse=True)
+def process_cache(monkeypatch):
+    monkeypatch.setattr(navigation, "_process_cache", {})
+
+
+@pytest.fixture
+def production_check(monkeypatch):
+    monkeypatch.syspath_prepend(PRODUCTION_CHECK_DIR)
+    import test_production_check
+    return test_production_check
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer(initial_screen="home", delay_scale=0) as server:
+        server.app_data["shared_prefs/session.xml"] = server.scenario.app_data["shared_prefs/session.xml"]
+        yield server
+
+
+@pytest.fixture
+def driver(server):
+    options = AppiumOptions().load_capabilities({"platformName": "Android", "appium:deviceName": "tablet"})
+    driver = webdriver.Remote(server.url, options=options)
+    yield driver
+    driver.quit()
+
+
+def navigator(driver, production_check, cache_file=None):
+    waits = WaitEngine(driver, timeout=2, poll_frequency=0.05)
+    return ShortcutNavigator(driver, PACKAGE, production_check.SHORTCUTS, waits, production_check.SCREENS,
+                             cache_file, settle_timeout=0.5)
+
+
+class TestShortcut:
+    """Test class for Shortcut"""
+
+    def test_needs_a_target(self):
+        with pytest.raises(ValueError):
+            Shortcut("nowhere", "home")
+
+    def test_settings(self):
+        class Config:
+            def __init__(self, values):
+                self.values = values
+
+            def get(self, section, key, fallback=None):
+                return self.values.get(key, fallback)
+
+        assert navigation_settings(Config({})) == (False, None)
+        assert navigation_settings(Config({"shortcuts": "true"})) == (True, None)
+        assert navigation_settings(Config({"shortcuts": "false", "cache_file": "nav.json"})) == (False, "nav.json")
+
+
+class TestShortcutNavigator:
+    """Test class for ShortcutNavigator"""
+
+    def test_deep_link_and_activity(self, server, driver, production_check):
+        shortcuts = navigator(driver, production_check)
+
+        assert shortcuts.app_version() == server.scenario.version
+        assert shortcuts.open("audit", audit_id="206697")
+        assert server.sessions[driver.session_id].screen == "audit_detail"
+        assert shortcuts.open("production_check", audit_id="206697")
+        assert server.sessions[driver.session_id].screen == "production_check"
+
+    def test_support_is_cached_per_version(self, server, driver, production_check, tmp_path):
+        cache_file = str(tmp_path / "navigation_cache.json")
+        server.scenario.deep_links = {}
+        shortcuts = navigator(driver, production_check, cache_file)
+
+        assert not shortcuts.open("production_check", audit_id="206697")
+        assert shortcuts.open("audit", audit_id="206697")
+
+        with open(cache_file) as f:
+            cached = json.load(f)
+        assert cached == {f"{PACKAGE}@{server.scenario.version}": {"audit": True, "production_check": False}}
+
+        # A new process only reads the file and never retries the unsupported shortcut
+        navigation._process_cache.clear()
+        executed = server.command_counts["execute"]
+        again = navigator(driver, production_check, cache_file)
+        assert not again.open("production_check", audit_id="206697")
+        assert server.command_counts["execute"] - executed == 1  # the version lookup
+
+    def test_unknown_version_is_not_persisted(self, driver, production_check, tmp_path, monkeypatch):
+        cache_file = tmp_path / "navigation_cache.json"
+        shortcuts = navigator(driver, production_check, str(cache_file))
+        monkeypatch.setattr(shortcuts, "_version", "")
+
+        assert shortcuts.open("audit", audit_id="206697")
+        assert shortcuts.supported("audit") is True
+        assert not cache_file.exists()
+
+
+class TestShortcutFlow:
+    """Test class for the production check flow using shortcuts"""
+
+    def run_flow(self, server, production_check, tmp_path):
+        config_path = write_config(os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url,
+                                   tmp_path / "config.ini")
+        test = production_check.ProductionCheckTest(config_path)
+        try:
+            assert test.run("amitks", "secret")
+        finally:
+            test.teardown()
+        return {span.name for span in test.timer.spans}
+
+    def test_deep_link_skips_the_menus(self, server, production_check, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        steps = self.run_flow(server, production_check, tmp_path)
+
+        assert "open_shortcut" in steps
+        assert not steps & {"navigate_to_audits", "select_audit", "navigate_to_production_check"}
+        assert "verify_total_units" in steps
+
+    def test_falls_back_to_taps(self, server, production_check, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        server.scenario.deep_links = {}
+        server.scenario.exported_activities = []
+
+        steps = self.run_flow(server, production_check, tmp_path)
+
+        assert {"navigate_to_audits", "select_audit", "navigate_to_production_check"} <= steps
+        with open(tmp_path / "navigation_cache.json") as f:
+            assert all(not supported for supported in json.load(f)[f"{PACKAGE}@4.12.0"].values())
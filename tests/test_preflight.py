@@ -0,0 +1,162 @@
+"""
+Pytest test suite for the preflight health checks
+
+The server check runs against the fake Appium server and a closed port; adb
+is replaced by a scripted subprocess.run.
+"""
+
+import json
+import socket
+import subprocess
+import time
+
+import pytest
+
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.preflight import CACHED, FAILED, PASSED, SKIPPED, Preflight, preflight_from_config
+
+PACKAGE = "com.inditex.trazabilidapp"
+
+
+class FakeAdb:
+    """subprocess.run stand-in answering adb commands"""
+
+    def __init__(self, devices=("R52T1234ABC",), packages=(PACKAGE,), delay=0.0):
+        self.devices = devices
+        self.packages = packages
+        self.delay = delay
+        self.commands = []
+
+    def __call__(self, command, capture_output=True, text=True, timeout=None):
+        self.commands.append(command)
+        if self.delay:
+            if self.delay > timeout:
+                time.sleep(timeout)
+                raise subprocess.TimeoutExpired(command, timeout)
+            time.sleep(self.delay)
+        args = command[1:]
+        udid = None
+        if args[0] == "-s":
+            udid, args = args[1], args[2:]
+        if args == ["devices"]:
+            listing = "".join(f"{device}\tdevice\n" for device in self.devices)
+            return subprocess.CompletedProcess(command, 0, "List of devices attached\n" + listing, "")
+        if udid not in self.devices:
+            return subprocess.CompletedProcess(command, 1, "", f"error: device '{udid}' not found")
+        if args == ["get-state"]:
+            return subprocess.CompletedProcess(command, 0, "device\n", "")
+        if args[:3] == ["shell", "pm", "path"]:
+            found = args[3] in self.packages
+            return subprocess.CompletedProcess(command, 0 if found else 1,
+                                               f"package:/data/app/{args[3]}/base.apk\n" if found else "", "")
+        raise AssertionError(f"unexpected adb command {command}")
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer(delay_scale=0) as server:
+        yield server
+
+
+def statuses(report):
+    return {result.name.split()[0]: result.status for result in report.results}
+
+
+class TestPreflight:
+    """Test class for Preflight"""
+
+    def test_healthy(self, server):
+        preflight = Preflight(run=FakeAdb())
+
+        report = preflight.check([(server.url, "R52T1234ABC", PACKAGE)])
+
+        assert report.ok
+        assert statuses(report) == {"server": PASSED, "device": PASSED, "app": PASSED}
+
+    def test_missing_device_and_app(self, server):
+        preflight = Preflight(run=FakeAdb(packages=()))
+
+        report = preflight.check([(server.url, "R52T1234ABC", PACKAGE), (server.url, "R52T5678DEF", PACKAGE)])
+
+        assert not report.ok
+        failed = [result.name for result in report.failures]
+        assert failed == [f"app {PACKAGE} on R52T1234ABC", "device R52T5678DEF", f"app {PACKAGE} on R52T5678DEF"]
+        # The shared server is checked once
+        assert [result.name for result in report.results].count(f"server {server.url}") == 1
+
+    def test_server_down_fails_fast(self):
+        preflight = Preflight(run=FakeAdb())
+
+        started = time.perf_counter()
+        report = preflight.check([(closed_port_url(), None, PACKAGE)])
+
+        assert time.perf_counter() - started < 1
+        assert statuses(report)["server"] == FAILED
+        assert statuses(report)["device"] == PASSED
+
+    def test_hung_check_is_cut_off(self, server):
+        preflight = Preflight(timeout=0.3, run=FakeAdb(delay=5))
+
+        started = time.perf_counter()
+        report = preflight.check([(server.url, "R52T1234ABC", PACKAGE)])
+
+        assert time.perf_counter() - started < 1
+        assert statuses(report) == {"server": PASSED, "device": FAILED, "app": FAILED}
+
+    def test_without_adb(self, server):
+        def no_adb(command, **kwargs):
+            raise FileNotFoundError(command[0])
+
+        report = Preflight(run=no_adb).check([(server.url, None, PACKAGE)])
+
+        assert report.ok
+        assert statuses(report) == {"server": PASSED, "device": SKIPPED, "app": SKIPPED}
+
+    def test_remote_server_skips_adb(self):
+        adb = FakeAdb()
+
+        report = Preflight(timeout=0.2, run=adb).check([("http://192.0.2.1:4723", "R52T1234ABC", PACKAGE)])
+
+        assert [result.name.split()[0] for result in report.results] == ["server"]
+        assert not adb.commands
+
+    def test_healthy_results_are_cached(self, server, tmp_path):
+        cache_file = str(tmp_path / "preflight.json")
+        adb = FakeAdb()
+
+        first = Preflight(cache_file=cache_file, run=adb).check([(server.url, "R52T1234ABC", PACKAGE)])
+        second = Preflight(cache_file=cache_file, run=adb).check([(server.url, "R52T1234ABC", PACKAGE)])
+        expired = Preflight(cache_file=cache_file, ttl=0, run=adb).check([(server.url, "R52T1234ABC", PACKAGE)])
+
+        assert first.ok and second.ok and expired.ok
+        assert set(statuses(second).values()) == {CACHED}
+        assert set(statuses(expired).values()) == {PASSED}
+        assert len(adb.commands) == 4
+        with open(cache_file) as f:
+            assert len(json.load(f)) == 3
+
+    def test_failures_are_not_cached(self, tmp_path):
+        cache_file = tmp_path / "preflight.json"
+
+        Preflight(cache_file=str(cache_file), run=FakeAdb(devices=())).check([(closed_port_url(), None, None)])
+
+        assert not cache_file.exists()
+
+    def test_from_config(self):
+        class Config:
+            def __init__(self, values):
+                self.values = values
+
+            def get(self, section, key, fallback=None):
+                return self.values.get(key, fallback)
+
+        preflight = preflight_from_config(Config({"timeout": "0.5", "ttl": "10"}))
+
+        assert (preflight.timeout, preflight.ttl, preflight.cache_file) == (0.5, 10.0, None)
+        assert preflight_from_config(Config({"enabled": "false"})) is None
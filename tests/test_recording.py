@@ -0,0 +1,145 @@
+"""
+Pytest test suite for the WebDriver command recordings
+
+The login flow is recorded against the fake Appium server, then summarised,
+compared and replayed on a fresh server.
+"""
+
+import gzip
+import os
+
+import pytest
+from appium import webdriver
+from appium.options.common import AppiumOptions
+
+from inditex_automation.commands import CommandEvent
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.recording import (
+    REDACTED, CommandRecorder, command_stats, diff_stats, format_diff, format_stats, load, main, replay,
+)
+from inditex_login_enhanced import InditexLoginAutomationEnhanced
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def write_config(server_url, destination, recordings):
+    """Copy the login config pointing it at the fake server with recording enabled"""
+    with open(os.path.join(TESTS_DIR, "config.ini")) as f:
+        content = f.read().replace("http://127.0.0.1:4723", server_url)
+    content = content.replace("enabled = false\ndirectory = recordings",
+                              f"enabled = true\ndirectory = {recordings}")
+    destination.write_text(content)
+    return str(destination)
+
+
+def finished(command, params, response=None, duration=0.01, error=None):
+    event = CommandEvent(command, params)
+    event.response, event.duration, event.error = response, duration, error
+    return event
+
+
+@pytest.fixture
+def recording(tmp_path, monkeypatch):
+    """Path of a recorded login run"""
+    monkeypatch.chdir(tmp_path)
+    with FakeAppiumServer(delay_scale=0) as server:
+        config_path = write_config(server.url, tmp_path / "config.ini", tmp_path / "recordings")
+        automation = InditexLoginAutomationEnhanced(config_path)
+        try:
+            assert automation.setup_driver()
+            assert automation.perform_login()
+        finally:
+            path = automation.stop_recording()
+            automation.cleanup()
+    return path
+
+
+class TestCommandRecorder:
+    """Test class for CommandRecorder"""
+
+    def test_login_is_recorded_without_credentials(self, recording):
+        with gzip.open(recording, "rt") as f:
+            raw = f.read()
+        header, records = load(recording)
+
+        assert "amitks" not in raw and "Pl@tinum@82026" not in raw
+        assert header["flow"] == "login" and os.path.basename(recording).startswith(header["run_id"])
+        typed = [record for record in records if record["command"] == "sendKeysToElement"]
+        assert typed and all(record["params"]["text"] == REDACTED for record in typed)
+        assert all("sessionId" not in record["params"] for record in records)
+
+    def test_large_responses_are_digested(self, tmp_path):
+        recorder = CommandRecorder(str(tmp_path / "run.commands.jsonl.gz"), "login")
+        recorder.command_finished(finished("getPageSource", {}, {"value": "<hierarchy>" + "x" * 5000}))
+        recorder.command_finished(finished("w3cExecuteScript", {"script": "mobile: pullFolder", "args": []},
+                                           {"value": "UEsDBBQ="}))
+        recorder.command_finished(finished("w3cExecuteScript", {
+            "script": "mobile: pushFile", "args": [{"remotePath": "/data", "payload": "c2VjcmV0"}]}))
+        recorder.close()
+
+        _, records = load(recorder.path)
+
+        assert records[0]["response"]["$length"] == 5011
+        assert records[1]["response"] == REDACTED
+        assert records[2]["params"]["args"][0]["payload"] == REDACTED
+
+    def test_errors_are_recorded(self, tmp_path):
+        recorder = CommandRecorder(str(tmp_path / "run.commands.jsonl.gz"), "login", secrets=["secret"])
+        recorder.command_finished(finished("findElement", {"using": "id", "value": "secret"},
+                                           error=ValueError("no element secret")))
+        recorder.close()
+
+        _, records = load(recorder.path)
+
+        assert records[0]["error"] == f"ValueError: no element {REDACTED}"
+        assert command_stats(records)["findElement"]["errors"] == 1
+
+
+class TestAnalysis:
+    """Test class for summaries and diffs"""
+
+    def test_stats_per_command(self, recording):
+        _, records = load(recording)
+
+        stats = command_stats(records)
+
+        assert stats["sendKeysToElement"]["n"] == 2
+        assert sum(item["n"] for item in stats.values()) == len(records)
+        assert "total" in format_stats(stats)
+
+    def test_diff_shows_extra_commands(self):
+        baseline = [{"command": "findElement", "params": {}, "duration": 0.01}] * 2
+        current = baseline * 3 + [{"command": "getPageSource", "params": {}, "duration": 0.2}]
+
+        rows = diff_stats(command_stats(baseline), command_stats(current))
+
+        assert rows == [("findElement", 2, 6, 0.01, 0.01), ("getPageSource", 0, 1, None, 0.2)]
+        assert "2 -> 7 (+250%)" in format_diff(rows, len(baseline), len(current))
+
+    def test_cli(self, recording, capsys):
+        main(["summary", recording])
+        assert "sendKeysToElement" in capsys.readouterr().out
+
+        main(["diff", recording, recording])
+        assert "No command count changed" in capsys.readouterr().out
+
+
+class TestReplay:
+    """Test class for replaying a recording"""
+
+    def test_replay_on_a_new_session(self, recording):
+        _, records = load(recording)
+
+        with FakeAppiumServer(delay_scale=0) as server:
+            options = AppiumOptions().load_capabilities({"platformName": "Android", "appium:deviceName": "tablet"})
+            driver = webdriver.Remote(server.url, options=options)
+            try:
+                replayed = replay(records, driver)
+                screen = server.sessions[driver.session_id].screen
+            finally:
+                driver.quit()
+
+        assert len(replayed) == len(records)
+        assert [record["command"] for record in replayed] == [record["command"] for record in records]
+        assert sum("error" in record for record in replayed) == sum("error" in record for record in records)
+        assert screen == "home"
@@ -0,0 +1,52 @@
+"""
+Pytest test suite for the run_automation.py entry point
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import run_automation
+
+# Prints the heavy packages loaded after running the given arguments
+PROBE = """
+import sys
+sys.argv = ["run_automation.py"] + sys.argv[1:]
+import run_automation
+try:
+    run_automation.main()
+except SystemExit:
+    pass
+print("loaded:" + ",".join(sorted({name.split(".")[0] for name in sys.modules} & {"appium", "selenium", "pytest"})))
+"""
+
+
+def loaded_packages(*args):
+    result = subprocess.run([sys.executable, "-c", PROBE, *args], cwd=REPO_ROOT, capture_output=True, text=True,
+                            check=True)
+    return result.stdout.splitlines()[-1].split("loaded:", 1)[1]
+
+
+class TestRunAutomation:
+    """Test class for the runner's start-up paths"""
+
+    @pytest.mark.parametrize("args", [["--help"], ["--check"]])
+    def test_light_paths_do_not_import_appium(self, args):
+        assert loaded_packages(*args) == ""
+
+    def test_tests_run_in_process(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(pytest, "main", lambda args: calls.append(args) or 0)
+
+        assert run_automation.run_tests("http://127.0.0.1:4799") is True
+        assert calls == [["tests/test_inditex_login.py", "-v", "--tb=short", "--warm-daemon", "http://127.0.0.1:4799"]]
+
+    def test_failed_tests(self, monkeypatch):
+        monkeypatch.setattr(pytest, "main", lambda args: 1)
+
+        assert run_automation.run_tests() is False
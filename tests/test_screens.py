@@ -0,0 +1,199 @@
+"""
+Pytest test suite for the screen classifier and resumable flows
+
+Classification runs against the recorded screens of the fake Appium server;
+the flows are resumed from screens part way through them.
+"""
+
+import os
+import time
+
+import pytest
+
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.screens import UNKNOWN_SCREEN, FlowGraph, ScreenClassifier
+from inditex_automation.snapshot import PageSnapshot
+from inditex_login_enhanced import (
+    HOME_SCREEN, LOGIN_FLOW, LOGIN_SCREEN, LOGIN_SCREENS, PASSWORD_SCREEN, InditexLoginAutomationEnhanced,
+)
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PRODUCTION_CHECK_DIR = os.path.join(os.path.dirname(TESTS_DIR), "appium-client", "tests")
+SCENARIO_DIR = os.path.join(os.path.dirname(TESTS_DIR), "inditex_automation", "scenarios", "trazabilidapp")
+
+
+def recorded(screen):
+    with open(os.path.join(SCENARIO_DIR, f"{screen}.xml")) as f:
+        return PageSnapshot(f.read())
+
+
+def write_config(source, server_url, destination):
+    """Copy a config file pointing it at the fake server"""
+    with open(source) as f:
+        content = f.read().replace("http://127.0.0.1:4723", server_url)
+    destination.write_text(content)
+    return str(destination)
+
+
+@pytest.fixture
+def production_check(monkeypatch):
+    monkeypatch.syspath_prepend(PRODUCTION_CHECK_DIR)
+    import test_production_check
+    return test_production_check
+
+
+class TestScreenClassifier:
+    """Test class for ScreenClassifier"""
+
+    def test_login_screens(self):
+        assert LOGIN_SCREENS.classify(recorded("login_email")) == "login"
+        assert LOGIN_SCREENS.classify(recorded("login_password")) == PASSWORD_SCREEN
+        assert LOGIN_SCREENS.classify(recorded("home")) == HOME_SCREEN
+        assert LOGIN_SCREENS.classify(recorded("confirm_units")) == UNKNOWN_SCREEN
+
+    @pytest.mark.parametrize("screen", [
+        "login_native", "home", "audits", "audit_detail", "production_check", "item_detail", "confirm_units",
+    ])
+    def test_production_check_screens(self, production_check, screen):
+        expected = "login" if screen == "login_native" else screen
+
+        assert production_check.SCREENS.classify(recorded(screen)) == expected
+
+    def test_order_decides_between_matches(self):
+        snapshot = recorded("confirm_units")
+        tabs = ("tabs", ["//*[@resource-id='com.inditex.trazabilidapp:id/tabs']"])
+        units = ("units", ["//*[@resource-id='com.inditex.trazabilidapp:id/edRealUnits']"])
+
+        assert ScreenClassifier([units, tabs]).classify(snapshot) == "units"
+        assert ScreenClassifier([tabs, units]).classify(snapshot) == "tabs"
+
+    def test_all_anchors_must_match(self):
+        classifier = ScreenClassifier([("home", ["//*[@text='Audits']", "//*[@text='Missing']"])])
+
+        assert classifier.classify(recorded("home")) == UNKNOWN_SCREEN
+
+
+class TestFlowGraph:
+    """Test class for FlowGraph"""
+
+    def test_remaining(self):
+        assert LOGIN_FLOW.remaining("login") == ["enter_email", "click_continue", "enter_password", "click_login"]
+        assert LOGIN_FLOW.remaining(PASSWORD_SCREEN) == ["enter_password", "click_login"]
+        assert LOGIN_FLOW.remaining(HOME_SCREEN) == []
+        assert LOGIN_FLOW.remaining(UNKNOWN_SCREEN) is None
+
+    def test_between(self):
+        flow = FlowGraph([("a", "first"), ("b", "second"), ("c", "third")], final="done")
+
+        assert flow.screens == ["first", "second", "third", "done"]
+        assert flow.between("first", "third") == ["a", "b"]
+        assert flow.between("second", "done") == ["b", "c"]
+        assert flow.between("third", "first") is None
+        assert flow.between(UNKNOWN_SCREEN, "done") is None
+
+
+class TestResumedFlows:
+    """Test class for the flows starting part way through"""
+
+    def test_login_resumes_on_password_page(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with FakeAppiumServer(initial_screen="login_password", delay_scale=0) as server:
+            config_path = write_config(os.path.join(TESTS_DIR, "config.ini"), server.url, tmp_path / "config.ini")
+            automation = InditexLoginAutomationEnhanced(config_path)
+            try:
+                assert automation.setup_driver()
+                assert automation.perform_login()
+                assert automation.current_login_state() == HOME_SCREEN
+            finally:
+                automation.cleanup()
+
+        steps = [span.name for span in automation.timer.spans]
+        assert "enter_email" not in steps and "enter_password" in steps
+
+    def test_login_screen_is_reached_without_clearing_app_data(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with FakeAppiumServer(initial_screen="login_password", delay_scale=0) as server:
+            config_path = write_config(os.path.join(TESTS_DIR, "config.ini"), server.url, tmp_path / "config.ini")
+            automation = InditexLoginAutomationEnhanced(config_path)
+            try:
+                assert automation.setup_driver()
+                assert automation.navigate_to_state(HOME_SCREEN)
+                session = next(iter(server.sessions.values()))
+
+                # Logged in: no way back to the login screen unless clearing the app data is allowed
+                assert not automation.navigate_to_state(LOGIN_SCREEN)
+                assert session.authenticated()
+                assert automation.navigate_to_state(LOGIN_SCREEN, allow_reset=True)
+                assert not session.authenticated()
+
+                # An unknown screen (app in the background) is left by a relaunch
+                automation.driver.terminate_app("com.inditex.trazabilidapp")
+                assert automation.navigate_to_state(PASSWORD_SCREEN)
+            finally:
+                automation.cleanup()
+
+    def test_login_verification_skips_the_implicit_wait(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with FakeAppiumServer(initial_screen="home", delay_scale=0) as server:
+            config_path = write_config(os.path.join(TESTS_DIR, "config.ini"), server.url, tmp_path / "config.ini")
+            automation = InditexLoginAutomationEnhanced(config_path)
+            try:
+                assert automation.setup_driver()
+                started = time.monotonic()
+                assert automation.verify_login_success()
+                elapsed = time.monotonic() - started
+            finally:
+                automation.cleanup()
+
+        assert elapsed < automation.config.server.implicit_wait / 2, "The absent login form should cost one lookup"
+
+    def test_login_suspends_the_implicit_wait_once(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with FakeAppiumServer(initial_screen="login_email", delay_scale=0) as server:
+            config_path = write_config(os.path.join(TESTS_DIR, "config.ini"), server.url, tmp_path / "config.ini")
+            automation = InditexLoginAutomationEnhanced(config_path)
+            try:
+                assert automation.setup_driver()
+                implicit_waits = []
+                implicitly_wait = automation.driver.implicitly_wait
+                monkeypatch.setattr(automation.driver, "implicitly_wait",
+                                    lambda seconds: implicit_waits.append(seconds) or implicitly_wait(seconds))
+                assert automation.perform_login()
+            finally:
+                automation.cleanup()
+
+        assert implicit_waits == [0, automation.config.server.implicit_wait]
+
+    @pytest.mark.parametrize("screen, skipped", [
+        ("audits", {"authenticate", "navigate_to_audits"}),
+        ("production_check", {"authenticate", "select_audit", "navigate_to_production_check"}),
+        ("confirm_units", {"authenticate", "select_first_item", "navigate_to_confirm_units_tab"}),
+    ])
+    def test_production_check_resumes(self, tmp_path, monkeypatch, production_check, screen, skipped):
+        monkeypatch.chdir(tmp_path)
+        with FakeAppiumServer(initial_screen=screen, delay_scale=0) as server:
+            config_path = write_config(os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url,
+                                       tmp_path / "config.ini")
+            test = production_check.ProductionCheckTest(config_path)
+            try:
+                assert test.run("amitks", "secret")
+            finally:
+                test.teardown()
+
+        steps = {span.name for span in test.timer.spans}
+        assert not steps & skipped
+        assert "verify_total_units" in steps
+
+    def test_other_audit_is_left(self, tmp_path, monkeypatch, production_check):
+        monkeypatch.chdir(tmp_path)
+        with FakeAppiumServer(initial_screen="audit_detail", delay_scale=0) as server:
+            config_path = write_config(os.path.join(PRODUCTION_CHECK_DIR, "config.ini"), server.url,
+                                       tmp_path / "config.ini")
+            test = production_check.ProductionCheckTest(config_path)
+            test.audit_id = "206698"
+            try:
+                steps, _ = test.remaining_steps()
+            finally:
+                test.teardown()
+
+        assert steps[0] == "select_audit"
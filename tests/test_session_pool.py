@@ -0,0 +1,80 @@
+"""
+Pytest test suite for the warm session pool
+"""
+
+import pytest
+
+from inditex_automation.session_pool import SessionPool, capabilities_key
+
+
+class FakeSession:
+    """Session stand-in recording whether it was closed"""
+
+    def __init__(self, name, alive=True):
+        self.name = name
+        self.alive = alive
+        self.closed = False
+
+    def cleanup(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    return SessionPool(alive=lambda session: session.alive)
+
+
+class TestSessionPool:
+    """Test class for SessionPool"""
+
+    def test_capabilities_key_is_order_independent(self):
+        assert capabilities_key({"a": 1, "b": 2}) == capabilities_key({"b": 2, "a": 1})
+
+    def test_released_session_is_reused(self, pool):
+        caps = {"deviceName": "tablet"}
+        first = pool.acquire(caps, lambda: FakeSession("first"))
+        pool.release(first)
+
+        second = pool.acquire(caps, lambda: FakeSession("second"))
+
+        assert second is first
+        assert (pool.created, pool.reused) == (1, 1)
+
+    def test_sessions_are_keyed_by_capabilities(self, pool):
+        tablet = pool.acquire({"deviceName": "tablet"}, lambda: FakeSession("tablet"))
+        pool.release(tablet)
+
+        phone = pool.acquire({"deviceName": "phone"}, lambda: FakeSession("phone"))
+
+        assert phone.name == "phone"
+
+    def test_leased_session_is_not_handed_out_twice(self, pool):
+        caps = {"deviceName": "tablet"}
+        first = pool.acquire(caps, lambda: FakeSession("first"))
+
+        second = pool.acquire(caps, lambda: FakeSession("second"))
+
+        assert second is not first
+
+    def test_dead_session_is_replaced(self, pool):
+        caps = {"deviceName": "tablet"}
+        dead = pool.acquire(caps, lambda: FakeSession("dead"))
+        pool.release(dead)
+        dead.alive = False
+
+        fresh = pool.acquire(caps, lambda: FakeSession("fresh"))
+
+        assert fresh.name == "fresh"
+        assert dead.closed
+
+    def test_close_all(self, pool):
+        session = pool.acquire({}, lambda: FakeSession("s"))
+        pool.release(session)
+
+        pool.close_all()
+
+        assert session.closed
+
+    def test_release_unknown_session(self, pool):
+        with pytest.raises(ValueError):
+            pool.release(FakeSession("stranger"))
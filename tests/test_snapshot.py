@@ -0,0 +1,149 @@
+"""
+Pytest test suite for single-round-trip page snapshots
+
+The hierarchy below mirrors the UiAutomator2 page source of the
+Production check screen.
+"""
+
+import pytest
+
+from inditex_automation import snapshot as snapshot_module
+from inditex_automation.snapshot import PageSnapshot, snapshot_contains
+
+PRODUCTION_CHECK_SOURCE = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy index="0" class="hierarchy" rotation="0" width="1600" height="2560">
+  <android.widget.FrameLayout index="0" class="android.widget.FrameLayout" bounds="[0,0][1600,2560]">
+    <android.widget.TextView index="0" text="Production check" bounds="[40,60][600,120]"/>
+    <androidx.recyclerview.widget.RecyclerView index="1" resource-id="com.inditex.trazabilidapp:id/rvItems" bounds="[0,200][1600,2000]">
+      <android.view.ViewGroup index="0" bounds="[0,200][1600,400]">
+        <android.widget.TextView index="0" resource-id="com.inditex.trazabilidapp:id/tvModel" text="1234/567" bounds="[10,210][800,260]"/>
+      </android.view.ViewGroup>
+      <android.view.ViewGroup index="1" bounds="[0,400][1600,600]">
+        <android.widget.TextView index="0" resource-id="com.inditex.trazabilidapp:id/tvModel" text="8910/111" bounds="[10,410][800,460]"/>
+      </android.view.ViewGroup>
+    </androidx.recyclerview.widget.RecyclerView>
+    <android.widget.TextView index="2" resource-id="com.inditex.trazabilidapp:id/tvBottomAssignedTotal" text="16.351"/>
+    <android.widget.TextView index="3" resource-id="com.inditex.trazabilidapp:id/tvBottomRealTotal" text="0"/>
+  </android.widget.FrameLayout>
+</hierarchy>"""
+
+ASSIGNED_XPATH = "//android.widget.TextView[@resource-id='com.inditex.trazabilidapp:id/tvBottomAssignedTotal']"
+REAL_XPATH = "//android.widget.TextView[@resource-id='com.inditex.trazabilidapp:id/tvBottomRealTotal']"
+
+
+class PageSourceDriver:
+    """Driver stand-in that counts page_source round trips"""
+
+    def __init__(self, source):
+        self.source = source
+        self.page_source_calls = 0
+
+    @property
+    def page_source(self):
+        self.page_source_calls += 1
+        return self.source
+
+
+@pytest.fixture
+def snapshot():
+    return PageSnapshot(PRODUCTION_CHECK_SOURCE)
+
+
+class TestPageSnapshot:
+    """Test class for PageSnapshot lookups"""
+
+    def test_read_many_locators_from_one_dump(self, snapshot):
+        totals = snapshot.read({"total_assigned": ASSIGNED_XPATH, "total_real": REAL_XPATH, "missing": "//x"})
+
+        assert totals == {"total_assigned": "16.351", "total_real": "0", "missing": None}
+
+    def test_structural_query(self, snapshot):
+        items = snapshot.find_all(
+            "//android.view.ViewGroup[.//android.widget.TextView[contains(@resource-id, 'tvModel')]]"
+        )
+
+        assert [item.get_attribute("bounds") for item in items] == ["[0,200][1600,400]", "[0,400][1600,600]"]
+
+    def test_results_in_document_order(self, snapshot):
+        texts = [element.text for element in snapshot.find_all("//android.widget.TextView")]
+
+        assert texts == ["Production check", "1234/567", "8910/111", "16.351", "0"]
+
+    def test_positional_predicates(self, snapshot):
+        second = snapshot.find("(//androidx.recyclerview.widget.RecyclerView//android.view.ViewGroup)[2]")
+        first_per_parent = snapshot.find_all("//android.view.ViewGroup/android.widget.TextView[1]")
+
+        assert second.get_attribute("index") == "1"
+        assert len(first_per_parent) == 2
+
+    def test_boolean_predicates_and_parent_step(self, snapshot):
+        assert snapshot.exists("//android.widget.TextView[@text='Production check' and @index='0']")
+        assert snapshot.find("//*[@text='8910/111']/..").get_attribute("index") == "1"
+        assert len(snapshot.find_all("//android.widget.TextView[not(starts-with(@resource-id, 'com'))]")) == 1
+
+    def test_attribute_and_bounds(self, snapshot):
+        model = snapshot.find("//android.widget.TextView[@text='1234/567']")
+
+        assert snapshot.attribute(REAL_XPATH, "index") == "3"
+        assert model.rect == {"x": 10, "y": 210, "width": 790, "height": 50}
+        assert model.center == (405, 235)
+
+    def test_parent_and_children(self, snapshot):
+        model = snapshot.find("//*[@text='8910/111']")
+        row = snapshot.parent(model)
+
+        assert row.get_attribute("bounds") == "[0,400][1600,600]"
+        assert [child.text for child in snapshot.children(row)] == ["8910/111"]
+        assert snapshot.parent(snapshot.find("/hierarchy")) is None
+
+    def test_unsupported_xpath_raises(self, snapshot):
+        with pytest.raises(ValueError):
+            snapshot.find("//android.widget.TextView[@text='a' | @text='b']")
+
+
+@pytest.fixture(params=["builtin", "lxml"])
+def evaluator(request, monkeypatch):
+    """Run a test with the built-in evaluator and, when installed, with lxml"""
+    if request.param == "lxml":
+        monkeypatch.setattr(snapshot_module, "lxml_etree", pytest.importorskip("lxml.etree"))
+    else:
+        monkeypatch.setattr(snapshot_module, "lxml_etree", None)
+    return request.param
+
+
+class TestEvaluators:
+    """Test class for answers that must not depend on whether lxml is installed"""
+
+    def test_text_node_test_is_rejected(self, evaluator):
+        snapshot = PageSnapshot(PRODUCTION_CHECK_SOURCE)
+
+        for xpath in ("//android.widget.TextView[text()='Production check']",
+                      "//*[contains(text(), '1234')]", "//android.widget.TextView/text()"):
+            with pytest.raises(ValueError, match="text\\(\\)"):
+                snapshot.find_all(xpath)
+        assert snapshot.exists("//android.widget.TextView[@text='text()']") is False
+
+    def test_same_results(self, evaluator):
+        snapshot = PageSnapshot(PRODUCTION_CHECK_SOURCE)
+
+        assert [element.text for element in snapshot.find_all("//*[@text='1234/567']/..//*")] == ["1234/567"]
+        assert snapshot.find_all("//android.view.ViewGroup[android.widget.TextView='1234/567']") == []
+        assert len(snapshot.find_all("//android.view.ViewGroup[android.widget.TextView]")) == 2
+
+
+class TestSnapshotCondition:
+    """Test class for the snapshot_contains wait condition"""
+
+    def test_all_locators_resolved_with_one_round_trip(self):
+        driver = PageSourceDriver(PRODUCTION_CHECK_SOURCE)
+
+        result = snapshot_contains(ASSIGNED_XPATH, REAL_XPATH)(driver)
+
+        assert result.text(ASSIGNED_XPATH) == "16.351"
+        assert driver.page_source_calls == 1
+
+    def test_match_any(self):
+        driver = PageSourceDriver(PRODUCTION_CHECK_SOURCE)
+
+        assert snapshot_contains("//missing", REAL_XPATH)(driver) is False
+        assert snapshot_contains("//missing", REAL_XPATH, match_all=False)(driver)
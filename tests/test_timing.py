@@ -0,0 +1,178 @@
+"""
+Pytest test suite for per-step latency instrumentation and command hooks
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from inditex_automation.commands import instrument
+from inditex_automation.timing import HTTP, SLEEP, WAIT, RunTimer, timed_step
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeExecutor:
+    """Command executor stand-in advancing the clock per command"""
+
+    def __init__(self, clock, latency=0.0):
+        self.clock = clock
+        self.latency = latency
+        self.commands = []
+
+    def execute(self, command, params):
+        self.commands.append(command)
+        self.clock.advance(self.latency)
+        if command == "fail":
+            raise RuntimeError("boom")
+        return {"value": command}
+
+
+class FakeDriver:
+    def __init__(self, executor):
+        self.command_executor = executor
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def timer(clock):
+    return RunTimer("login", run_id="run-1", clock=clock)
+
+
+class TestRunTimer:
+    """Test class for RunTimer"""
+
+    def test_time_is_split_between_categories(self, timer, clock):
+        driver = FakeDriver(FakeExecutor(clock, latency=0.2))
+        instrument(driver).add(timer)
+
+        with timer.span("enter_email"):
+            clock.advance(0.1)
+            with timer.measure(WAIT):
+                clock.advance(0.5)
+                driver.command_executor.execute("findElements", {})
+            with timer.measure(SLEEP):
+                clock.advance(1.0)
+
+        span = timer.spans[0].to_dict()
+        assert span["duration"] == pytest.approx(1.8)
+        assert span["other"] == pytest.approx(0.1)
+        assert span["wait"] == pytest.approx(0.5)
+        assert span[HTTP] == pytest.approx(0.2)
+        assert span["sleep"] == pytest.approx(1.0)
+        assert span["commands"] == 1
+
+    def test_nested_spans_share_the_breakdown(self, timer, clock):
+        with timer.span("login"):
+            with timer.span("enter_email"):
+                with timer.measure(WAIT):
+                    clock.advance(1.0)
+            with timer.span("click_login"):
+                clock.advance(0.5)
+
+        login, enter_email, click_login = timer.spans
+        assert (enter_email.parent, click_login.parent) == ("login", "login")
+        assert login.duration == pytest.approx(1.5)
+        assert login.breakdown[WAIT] == pytest.approx(1.0)
+        assert timer.totals()["duration"] == pytest.approx(1.5)
+
+    def test_exception_marks_span(self, timer):
+        with pytest.raises(RuntimeError):
+            with timer.span("select_audit"):
+                raise RuntimeError("not found")
+
+        assert timer.spans[0].status == "error"
+
+    def test_export_json(self, timer, clock, tmp_path):
+        with timer.span("verify"):
+            clock.advance(0.25)
+
+        path = timer.export(str(tmp_path / "timings"))
+
+        with open(path) as f:
+            data = json.load(f)
+        assert data["flow"] == "login"
+        assert data["run_id"] == "run-1"
+        assert data["spans"][0]["name"] == "verify"
+        assert data["totals"]["duration"] == pytest.approx(0.25)
+        assert "verify" in timer.summary()
+
+
+class TestTimedStep:
+    """Test class for the timed_step decorator"""
+
+    class Flow:
+        def __init__(self, timer):
+            self.timer = timer
+
+        @timed_step("enter_email")
+        def enter_email(self, ok):
+            return ok
+
+        @timed_step("login")
+        async def login_async(self, seconds):
+            self.timer._clock.advance(seconds)
+            await asyncio.sleep(0)
+            return False
+
+    def test_false_result_marks_step_failed(self, timer):
+        flow = self.Flow(timer)
+
+        assert flow.enter_email(True) is True
+        assert flow.enter_email(False) is False
+
+        assert [span.status for span in timer.spans] == ["ok", "failed"]
+
+    def test_without_timer(self):
+        assert self.Flow(None).enter_email(True) is True
+
+    def test_coroutine_is_timed_until_it_completes(self, timer):
+        assert asyncio.run(self.Flow(timer).login_async(2.0)) is False
+
+        assert [(span.name, span.duration, span.status) for span in timer.spans] == [("login", 2.0, "failed")]
+
+
+class TestCommandHooks:
+    """Test class for instrument()"""
+
+    def test_installed_once_and_listeners_notified(self, clock):
+        executor = FakeExecutor(clock, latency=0.1)
+        driver = FakeDriver(executor)
+        events = []
+
+        class Listener:
+            def command_finished(self, event):
+                events.append((event.command, event.response, event.error))
+
+        listener = Listener()
+        assert instrument(driver) is instrument(driver)
+        instrument(driver).add(listener)
+        instrument(driver).add(listener)
+
+        driver.command_executor.execute("getPageSource", {})
+        with pytest.raises(RuntimeError):
+            driver.command_executor.execute("fail", {})
+
+        assert [event[0] for event in events] == ["getPageSource", "fail"]
+        assert events[0][1] == {"value": "getPageSource"}
+        assert isinstance(events[1][2], RuntimeError)
+
+        instrument(driver).remove(listener)
+        driver.command_executor.execute("getPageSource", {})
+        assert len(events) == 2
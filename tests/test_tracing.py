@@ -0,0 +1,201 @@
+"""
+Pytest test suite for the step/command trace export
+
+Unit tests drive a RunTimer with a hand-advanced clock; the login flow is
+traced end to end against the fake Appium server.
+"""
+
+import json
+import os
+
+import pytest
+
+from inditex_automation.commands import instrument
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.timing import RunTimer
+from inditex_automation.tracing import CHROME, OTLP, FlowTracer, main, merge, tracer_from_config
+from inditex_login_enhanced import InditexLoginAutomationEnhanced
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 50.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeExecutor:
+    """Command executor stand-in advancing the clock per command"""
+
+    def __init__(self, clock, latency=0.1):
+        self.clock = clock
+        self.latency = latency
+
+    def execute(self, command, params):
+        self.clock.advance(self.latency)
+        if command == "fail":
+            raise RuntimeError("boom")
+        return {"value": None}
+
+
+class FakeDriver:
+    def __init__(self, executor):
+        self.command_executor = executor
+
+
+@pytest.fixture
+def traced_run():
+    """Tracer of a run with a nested step and three commands"""
+    clock = FakeClock()
+    timer = RunTimer("login", run_id="run-1", clock=clock)
+    driver = FakeDriver(FakeExecutor(clock))
+    tracer = FlowTracer(timer, device="tablet")
+    instrument(driver).add(timer)
+    instrument(driver).add(tracer)
+
+    with timer.span("login"):
+        with timer.span("enter_email"):
+            driver.command_executor.execute("findElement", {"using": "id", "value": "idToken7"})
+            driver.command_executor.execute("sendKeysToElement", {"text": "secret", "value": ["s"]})
+        clock.advance(0.5)
+    driver.command_executor.execute("getPageSource", {})
+    return tracer
+
+
+def write_config(server_url, destination, traces, trace_format):
+    """Copy the login config pointing it at the fake server with tracing enabled"""
+    with open(os.path.join(TESTS_DIR, "config.ini")) as f:
+        content = f.read().replace("http://127.0.0.1:4723", server_url)
+    content = content.replace("enabled = false\ndirectory = traces\nformat = chrome",
+                              f"enabled = true\ndirectory = {traces}\nformat = {trace_format}")
+    destination.write_text(content)
+    return str(destination)
+
+
+class TestFlowTracer:
+    """Test class for FlowTracer"""
+
+    def test_commands_nest_under_their_step(self, traced_run):
+        spans = {span.name: span for span in traced_run.spans()}
+
+        assert spans["login"].parent.name == "login" and spans["login"].parent.category == "run"
+        assert spans["enter_email"].parent is spans["login"]
+        assert spans["findElement"].parent is spans["enter_email"]
+        assert spans["sendKeysToElement"].parent is spans["enter_email"]
+        assert spans["getPageSource"].parent.category == "run"
+        assert spans["findElement"].end - spans["findElement"].start == pytest.approx(0.1)
+
+    def test_typed_text_is_not_traced(self, traced_run):
+        spans = {span.name: span for span in traced_run.spans()}
+
+        assert spans["findElement"].args == {"using": "id", "value": "idToken7"}
+        assert spans["sendKeysToElement"].args == {}
+        assert "secret" not in json.dumps(traced_run.to_chrome())
+
+    def test_chrome_export(self, traced_run, tmp_path):
+        path = traced_run.export(str(tmp_path), CHROME)
+
+        with open(path) as f:
+            trace = json.load(f)
+        events = {event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"}
+        assert os.path.basename(path) == "run-1.trace.json"
+        assert events["enter_email"]["ts"] == 0 and events["enter_email"]["dur"] == pytest.approx(2e5)
+        assert events["login"]["dur"] == pytest.approx(7e5)
+        assert events["enter_email"]["args"]["commands"] == 2
+        assert trace["otherData"]["device"] == "tablet"
+
+    def test_otlp_export(self, traced_run, tmp_path):
+        path = traced_run.export(str(tmp_path), OTLP)
+
+        with open(path) as f:
+            spans = json.load(f)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        by_name = {span["name"]: span for span in spans}
+        assert os.path.basename(path) == "run-1.otlp.json"
+        assert len({span["traceId"] for span in spans}) == 1
+        assert by_name["findElement"]["parentSpanId"] == by_name["enter_email"]["spanId"]
+        assert int(by_name["findElement"]["endTimeUnixNano"]) - int(by_name["findElement"]["startTimeUnixNano"]) \
+            == pytest.approx(1e8, rel=1e-3)
+
+    def test_failed_commands_and_steps(self):
+        clock = FakeClock()
+        timer = RunTimer("login", clock=clock)
+        driver = FakeDriver(FakeExecutor(clock))
+        tracer = FlowTracer(timer)
+        instrument(driver).add(tracer)
+
+        with pytest.raises(RuntimeError):
+            with timer.span("click_login"):
+                driver.command_executor.execute("fail", {})
+
+        spans = {span.name: span for span in tracer.spans()}
+        assert spans["fail"].error == "RuntimeError: boom"
+        assert spans["click_login"].error == "error"
+
+    def test_unknown_format(self, traced_run, tmp_path):
+        with pytest.raises(ValueError):
+            traced_run.export(str(tmp_path), "svg")
+
+    def test_disabled_by_default(self):
+        class Config:
+            def get(self, section, key, fallback=None):
+                return fallback
+
+        assert tracer_from_config(Config(), RunTimer("login")) is None
+
+
+class TestMerge:
+    """Test class for merging traces of several runs"""
+
+    def test_runs_get_a_process_each(self, traced_run, tmp_path):
+        first = traced_run.export(str(tmp_path / "a"))
+        traced_run.timer.started_epoch += 2.0
+        second = traced_run.export(str(tmp_path / "b"))
+
+        merged = merge([first, second])
+
+        starts = {event["pid"]: event["ts"] for event in merged["traceEvents"] if event.get("name") == "enter_email"}
+        assert starts[2] - starts[1] == pytest.approx(2e6)
+
+    def test_cli(self, traced_run, tmp_path, capsys):
+        path = traced_run.export(str(tmp_path))
+        output = str(tmp_path / "merged.json")
+
+        main(["merge", path, "-o", output])
+
+        assert os.path.exists(output)
+        assert "Merged 1 traces" in capsys.readouterr().out
+
+
+class TestTracedFlow:
+    """Test class for tracing a real flow"""
+
+    def test_login_steps_contain_their_commands(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with FakeAppiumServer(delay_scale=0) as server:
+            config_path = write_config(server.url, tmp_path / "config.ini", tmp_path / "traces", CHROME)
+            automation = InditexLoginAutomationEnhanced(config_path)
+            try:
+                assert automation.setup_driver()
+                assert automation.perform_login()
+            finally:
+                path = automation.export_trace()
+                automation.cleanup()
+
+        with open(path) as f:
+            events = [event for event in json.load(f)["traceEvents"] if event["ph"] == "X"]
+        steps = [event for event in events if event["cat"] == "step"]
+        commands = [event for event in events if event["cat"] == "command"]
+        assert {"login", "enter_email", "click_login"} <= {step["name"] for step in steps}
+        enter_email = next(step for step in steps if step["name"] == "enter_email")
+        inside = [command["name"] for command in commands
+                  if enter_email["ts"] <= command["ts"] <= enter_email["ts"] + enter_email["dur"]]
+        assert "sendKeysToElement" in inside
+        assert "Pl@tinum@82026" not in json.dumps(events)
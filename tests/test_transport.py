@@ -0,0 +1,122 @@
+"""
+Pytest test suite for the pooled WebDriver transport
+
+Sessions live on the local fake Appium server.
+"""
+
+import configparser
+
+import pytest
+import urllib3
+from appium import webdriver
+from appium.options.common import AppiumOptions
+
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.transport import (
+    PooledAppiumConnection,
+    TransportSettings,
+    connection_stats,
+    transport_from_config,
+)
+from inditex_automation.warm_daemon import WarmSessionDaemon, connect
+
+OPTIONS = {"platformName": "Android", "appium:automationName": "UiAutomator2", "appium:deviceName": "tablet"}
+
+
+def options():
+    return AppiumOptions().load_capabilities(OPTIONS)
+
+
+def settings_from(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return transport_from_config(config)
+
+
+class TestTransport:
+    """Test class for PooledAppiumConnection and its settings"""
+
+    def test_commands_reuse_one_connection(self):
+        with FakeAppiumServer(delay_scale=0) as server:
+            driver = connect(server.url, options(), transport=TransportSettings())
+            for _ in range(5):
+                driver.page_source
+            driver.quit()
+
+        stats = connection_stats(driver)
+        assert isinstance(driver.command_executor, PooledAppiumConnection)
+        assert stats.requests == 7
+        assert stats.connections == 1
+        assert stats.reused == 6
+
+    def test_gzip_responses_are_decoded(self):
+        with FakeAppiumServer(delay_scale=0, compress=True) as server:
+            driver = connect(server.url, options(), transport=TransportSettings(compress=True))
+            source = driver.page_source
+            driver.quit()
+
+        assert source.startswith("<?xml")
+        assert connection_stats(driver).compressed == 3
+
+    def test_uncompressed_when_disabled(self):
+        with FakeAppiumServer(delay_scale=0, compress=True) as server:
+            driver = connect(server.url, options(), transport=TransportSettings(compress=False))
+            driver.page_source
+            driver.quit()
+
+        assert connection_stats(driver).compressed == 0
+
+    def test_per_command_timeout(self):
+        with FakeAppiumServer(delay_scale=0, latency={"source": 0.5}) as server:
+            transport = TransportSettings(command_timeouts={"getPageSource": 0.1})
+            driver = connect(server.url, options(), transport=transport)
+            assert driver.current_activity == ".LoginActivity"
+            with pytest.raises(urllib3.exceptions.ReadTimeoutError):
+                driver.page_source
+            driver.quit()
+
+        assert connection_stats(driver).errors == 1
+
+    def test_attached_driver_uses_transport(self):
+        with FakeAppiumServer(delay_scale=0) as server, WarmSessionDaemon(port=0, keepalive=0) as daemon:
+            driver = connect(server.url, options(), daemon_url=daemon.url, transport=TransportSettings())
+            driver.current_activity
+            driver.quit()
+
+        stats = connection_stats(driver)
+        assert stats.requests >= 1
+        assert stats.connections == 1
+
+    def test_plain_driver_has_no_stats(self):
+        with FakeAppiumServer(delay_scale=0) as server:
+            driver = webdriver.Remote(server.url, options=options())
+            driver.quit()
+
+        assert connection_stats(driver) is None
+
+    def test_settings_from_config(self):
+        settings = settings_from(
+            "[TRANSPORT]\n"
+            "pool_size = 2\n"
+            "pool_block = true\n"
+            "connect_timeout = 5\n"
+            "read_timeout = 0\n"
+            "command_timeouts = getPageSource:30, newSession:0\n"
+            "compress = false\n"
+        )
+
+        assert settings.pool_size == 2
+        assert settings.pool_block is True
+        assert settings.compress is False
+        assert settings.timeout("getPageSource").read_timeout == 30.0
+        assert settings.timeout("newSession").read_timeout is None
+        assert settings.timeout("findElement").read_timeout is None
+        assert settings.timeout().connect_timeout == 5.0
+
+    def test_settings_defaults(self):
+        settings = settings_from("[SERVER]\n")
+
+        assert settings.keep_alive is True
+        assert settings.pool_size == 1
+        assert settings.compress is True
+        assert settings.command_timeouts == {}
@@ -0,0 +1,149 @@
+"""
+Pytest test suite for the condition-driven wait engine
+
+These tests run without an Appium server by driving the engine with a
+scripted stand-in driver.
+"""
+
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from inditex_automation.waits import (
+    WaitEngine,
+    activity_changed_from,
+    any_of,
+    element_absent,
+    element_present,
+    text_changed,
+)
+
+
+class ScriptedElement:
+    """Element stand-in exposing only the text property"""
+
+    def __init__(self, text=""):
+        self.text = text
+
+
+class ScriptedDriver:
+    """Driver stand-in whose elements appear after a given delay"""
+
+    def __init__(self, appear_after=None, activity=".LoginActivity"):
+        self.started = time.monotonic()
+        self.appear_after = appear_after or {}
+        self.activity = activity
+        self.implicit_waits = []
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def find_elements(self, by, value):
+        delay = self.appear_after.get(value)
+        if delay is not None and self.elapsed() >= delay:
+            return [ScriptedElement(f"{value}@{delay}")]
+        return []
+
+    def implicitly_wait(self, seconds):
+        self.implicit_waits.append(seconds)
+
+    @property
+    def current_activity(self):
+        return self.activity
+
+
+class TestWaitEngine:
+    """Test class for WaitEngine"""
+
+    def test_settle_returns_as_soon_as_condition_holds(self):
+        driver = ScriptedDriver(appear_after={"anchor": 0.1})
+        engine = WaitEngine(driver, poll_frequency=0.02)
+
+        started = time.monotonic()
+        result = engine.settle(element_present("xpath", "anchor"), 5)
+
+        assert result is not None, "Anchor element should be returned"
+        assert time.monotonic() - started < 1, "Settle should not wait for the full bound"
+
+    def test_settle_returns_none_at_upper_bound(self):
+        driver = ScriptedDriver()
+        engine = WaitEngine(driver, poll_frequency=0.02)
+
+        started = time.monotonic()
+        result = engine.settle(element_present("xpath", "missing"), 0.2)
+
+        assert result is None, "Settle should report that the bound was reached"
+        assert 0.2 <= time.monotonic() - started < 1
+
+    def test_until_raises_timeout(self):
+        engine = WaitEngine(ScriptedDriver(), timeout=0.1, poll_frequency=0.02)
+
+        with pytest.raises(TimeoutException):
+            engine.until(element_present("xpath", "missing"))
+
+    def test_implicit_wait_suspended_while_polling(self):
+        driver = ScriptedDriver(appear_after={"anchor": 0})
+        engine = WaitEngine(driver, poll_frequency=0.02, implicit_wait=10)
+
+        engine.until(element_present("xpath", "anchor"))
+
+        assert driver.implicit_waits == [0, 10], "Implicit wait should be zeroed and restored"
+
+    def test_any_of_returns_first_truthy_result(self):
+        driver = ScriptedDriver(appear_after={"home": 0}, activity=".HomeActivity")
+        condition = any_of(element_present("xpath", "login"), element_present("xpath", "home"))
+
+        assert condition(driver).text == "home@0"
+
+    def test_element_absent(self):
+        driver = ScriptedDriver(appear_after={"login": 0})
+
+        assert element_absent("xpath", "missing")(driver) is True
+        assert element_absent("xpath", "login")(driver) is False
+
+    def test_activity_changed_from(self):
+        driver = ScriptedDriver(activity=".LoginActivity")
+        condition = activity_changed_from(".LoginActivity")
+
+        assert condition(driver) is False
+        driver.activity = ".HomeActivity"
+        assert condition(driver) == ".HomeActivity"
+
+    def test_text_changed(self):
+        driver = ScriptedDriver(appear_after={"total": 0})
+
+        assert text_changed("xpath", "total", "0")(driver) == "total@0"
+        assert text_changed("xpath", "total", "total@0")(driver) is False
+
+    def test_nested_waits_reset_implicit_wait_once(self):
+        driver = ScriptedDriver(appear_after={"anchor": 0})
+        engine = WaitEngine(driver, poll_frequency=0.02, implicit_wait=10)
+
+        with engine.implicit_wait_suspended():
+            engine.until(element_present("xpath", "anchor"))
+
+        assert driver.implicit_waits == [0, 10]
+
+
+class TestProbes:
+    """Test class for the short-deadline presence and absence probes"""
+
+    def test_absence_costs_one_lookup(self):
+        driver = ScriptedDriver()
+        engine = WaitEngine(driver, poll_frequency=0.02, implicit_wait=10)
+
+        started = time.monotonic()
+        assert engine.is_absent("xpath", "login")
+        assert not engine.is_present("xpath", "login")
+
+        assert time.monotonic() - started < 0.1, "A probe should not poll without a deadline"
+        assert driver.implicit_waits == [0, 10, 0, 10]
+
+    def test_probe_waits_up_to_its_deadline(self):
+        driver = ScriptedDriver(appear_after={"anchor": 0.1})
+        engine = WaitEngine(driver, poll_frequency=0.02)
+
+        assert not engine.is_present("xpath", "anchor")
+        assert engine.is_present("xpath", "anchor", timeout=1)
+        assert not engine.is_absent("xpath", "anchor", timeout=0.1)
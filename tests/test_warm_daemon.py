@@ -0,0 +1,144 @@
+"""
+Pytest test suite for the warm session daemon
+
+Sessions live on the local fake Appium server.
+"""
+
+import os
+
+import pytest
+from appium.options.common import AppiumOptions
+
+from inditex_automation.fake_server import FakeAppiumServer
+from inditex_automation.warm_daemon import DaemonError, WarmSessionClient, WarmSessionDaemon, connect, is_loopback
+from inditex_login_enhanced import HOME_SCREEN, InditexLoginAutomationEnhanced
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+OPTIONS = {"platformName": "Android", "appium:automationName": "UiAutomator2", "appium:deviceName": "tablet"}
+
+
+def options():
+    return AppiumOptions().load_capabilities(OPTIONS)
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer(delay_scale=0) as server:
+        yield server
+
+
+@pytest.fixture
+def daemon():
+    with WarmSessionDaemon(port=0, keepalive=0) as daemon:
+        yield daemon
+
+
+class TestWarmSessionDaemon:
+    """Test class for WarmSessionDaemon and its client"""
+
+    def test_attached_session_is_reused(self, server, daemon):
+        first = connect(server.url, options(), daemon_url=daemon.url)
+        session_id = first.session_id
+        assert first.current_activity == ".LoginActivity"
+        first.quit()
+
+        second = connect(server.url, options(), daemon_url=daemon.url)
+        assert second.session_id == session_id
+        second.quit()
+
+        assert server.command_counts["new_session"] == 1
+        assert server.command_counts["delete_session"] == 0
+        assert WarmSessionClient(daemon.url).status() == {
+            "created": 1, "reused": 1, "reconnects": 0, "leased": 0, "idle": 1
+        }
+
+    def test_concurrent_leases_get_separate_sessions(self, server, daemon):
+        client = WarmSessionClient(daemon.url)
+
+        first = client.attach(server.url, options())
+        second = client.attach(server.url, options())
+
+        assert first.session_id != second.session_id
+        first.quit()
+        second.quit()
+
+    def test_dead_idle_session_is_reconnected(self, server, daemon):
+        driver = connect(server.url, options(), daemon_url=daemon.url)
+        dead_id = driver.session_id
+        driver.quit()
+        server.sessions.pop(dead_id)
+
+        daemon.check_sessions()
+
+        assert daemon.reconnects == 1
+        driver = connect(server.url, options(), daemon_url=daemon.url)
+        assert driver.session_id not in (None, dead_id)
+        assert driver.current_activity
+        driver.quit()
+
+    def test_expired_lease_is_not_handed_out_again(self, server, daemon):
+        daemon.lease_timeout = 0
+        abandoned = WarmSessionClient(daemon.url).attach(server.url, options())
+
+        daemon.check_sessions()
+
+        assert (daemon.status()["leased"], daemon.status()["idle"]) == (0, 0)
+        assert abandoned.session_id not in server.sessions
+        daemon.lease_timeout = 900
+        driver = connect(server.url, options(), daemon_url=daemon.url)
+        assert driver.session_id != abandoned.session_id
+        driver.quit()
+
+    def test_loopback_only(self):
+        with pytest.raises(ValueError):
+            WarmSessionDaemon(host="0.0.0.0", port=0, keepalive=0)
+        assert is_loopback("localhost") and is_loopback("::1")
+        assert not is_loopback("192.168.1.20")
+
+    def test_release_unknown_session(self, daemon):
+        with pytest.raises(DaemonError) as error:
+            WarmSessionClient(daemon.url).release("missing")
+
+        assert error.value.status == 404
+
+    def test_falls_back_without_daemon(self, server):
+        unreachable = WarmSessionDaemon(port=0, keepalive=0)
+        url = unreachable.url
+        unreachable.stop()
+
+        driver = connect(server.url, options(), daemon_url=url)
+        driver.quit()
+
+        assert (server.command_counts["new_session"], server.command_counts["delete_session"]) == (1, 1)
+
+    def test_stop_closes_sessions(self, server):
+        with WarmSessionDaemon(port=0, keepalive=0) as daemon:
+            connect(server.url, options(), daemon_url=daemon.url).quit()
+
+        assert server.command_counts["delete_session"] == 1
+
+
+class TestWarmLoginFlow:
+    """Test class for the login flow running inside a daemon session"""
+
+    def test_runs_share_one_session(self, server, daemon, tmp_path, monkeypatch):
+        with open(os.path.join(TESTS_DIR, "config.ini")) as f:
+            (tmp_path / "config.ini").write_text(f.read().replace("http://127.0.0.1:4723", server.url))
+        monkeypatch.chdir(tmp_path)
+
+        first = InditexLoginAutomationEnhanced(str(tmp_path / "config.ini"), daemon_url=daemon.url)
+        try:
+            assert first.setup_driver()
+            assert first.launch_app()
+            assert first.perform_login()
+        finally:
+            first.cleanup()
+
+        second = InditexLoginAutomationEnhanced(str(tmp_path / "config.ini"), daemon_url=daemon.url)
+        try:
+            assert second.setup_driver()
+            assert second.current_login_state() == HOME_SCREEN
+        finally:
+            second.cleanup()
+
+        assert server.command_counts["new_session"] == 1